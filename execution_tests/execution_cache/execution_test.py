@@ -0,0 +1,59 @@
+from pathlib import Path
+import subprocess
+import sys
+import unittest
+
+from spinedb_api import create_new_spine_database, DatabaseMapping, import_functions
+
+
+class ExecutionCache(unittest.TestCase):
+    _root_path = Path(__file__).parent
+    _cache_path = _root_path / ".spinetoolbox" / "local" / "execution_cache.json"
+    _source_database_1_path = _root_path / ".spinetoolbox" / "items" / "first_source" / "source 1.sqlite"
+    _source_database_2_path = _root_path / ".spinetoolbox" / "items" / "second_source" / "source 2.sqlite"
+    _sink_database_path = _root_path / ".spinetoolbox" / "items" / "sink" / "sink.sqlite"
+
+    def setUp(self):
+        if self._cache_path.exists():
+            self._cache_path.unlink()
+        source_paths = (self._source_database_1_path, self._source_database_2_path)
+        for database_path in source_paths + (self._sink_database_path,):
+            database_path.parent.mkdir(parents=True, exist_ok=True)
+            if database_path.exists():
+                database_path.unlink()
+        spoon_volumes = {self._source_database_1_path: 1.0, self._source_database_2_path: 99.0}
+        for database_path, spoon_volume in spoon_volumes.items():
+            self._write_spoon_volume(database_path, spoon_volume, create=True)
+        create_new_spine_database("sqlite:///" + str(self._sink_database_path))
+
+    @staticmethod
+    def _write_spoon_volume(database_path, spoon_volume, create=False):
+        with DatabaseMapping("sqlite:///" + str(database_path), create=create) as db_map:
+            import_functions.import_entity_classes(db_map, ("Widget",))
+            import_functions.import_entities(db_map, (("Widget", "spoon"),))
+            import_functions.import_parameter_definitions(db_map, (("Widget", "volume"),))
+            import_functions.import_parameter_values(db_map, (("Widget", "spoon", "volume", spoon_volume, "Base"),))
+            db_map.commit_session("Add test data.")
+
+    def _execute(self):
+        completed = subprocess.run(
+            (sys.executable, "-m", "spinetoolbox", "--execute-only", str(self._root_path)),
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        return completed.stdout
+
+    def test_second_run_skips_everything(self):
+        self.assertIn("Execution cache: 0 item(s) up to date, 5 item(s) executed.", self._execute())
+        self.assertIn("Execution cache: 5 item(s) up to date, 0 item(s) executed.", self._execute())
+
+    def test_second_run_after_source_change_skips_everything(self):
+        self._execute()
+        self._write_spoon_volume(self._source_database_2_path, 50.0)
+        self.assertNotIn("0 item(s) executed.", self._execute())
+        self.assertIn("Execution cache: 5 item(s) up to date, 0 item(s) executed.", self._execute())
+
+
+if __name__ == '__main__':
+    unittest.main()
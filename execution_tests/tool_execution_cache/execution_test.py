@@ -0,0 +1,30 @@
+from pathlib import Path
+import subprocess
+import sys
+import unittest
+
+
+class ToolExecutionCache(unittest.TestCase):
+    _root_path = Path(__file__).parent
+    _cache_path = _root_path / ".spinetoolbox" / "local" / "execution_cache.json"
+
+    def setUp(self):
+        if self._cache_path.exists():
+            self._cache_path.unlink()
+
+    def _execute(self):
+        completed = subprocess.run(
+            (sys.executable, "-m", "spinetoolbox", "--execute-only", str(self._root_path)),
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        return completed.stdout
+
+    def test_second_run_skips_tool(self):
+        self.assertIn("Execution cache: 0 item(s) up to date, 1 item(s) executed.", self._execute())
+        self.assertIn("Execution cache: 1 item(s) up to date, 0 item(s) executed.", self._execute())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,5 @@
+import csv
+
+with open("data.csv", "w", newline="") as data_file:
+    writer = csv.writer(data_file)
+    writer.writerows([[f"T{i:03}", i] for i in range(10)])
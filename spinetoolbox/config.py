@@ -50,6 +50,7 @@ PROJECT_FILENAME = "project.json"
 PROJECT_LOCAL_DATA_DIR_NAME = "local"
 PROJECT_LOCAL_DATA_FILENAME = "project_local_data.json"
 SPECIFICATION_LOCAL_DATA_FILENAME = "specification_local_data.json"
+EXECUTION_CACHE_FILENAME = "execution_cache.json"
 PROJECT_ZIP_FILENAME = "project_package"  # ZIP-file name for remote execution
 
 # Stylesheets
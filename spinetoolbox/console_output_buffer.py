@@ -0,0 +1,187 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a bounded buffer for console output that is waiting to be rendered."""
+from collections import deque
+from dataclasses import dataclass
+import json
+import tempfile
+
+
+@dataclass(frozen=True)
+class SpilledOutput:
+    """A range of output chunks that did not fit into the buffer and were written to the spill file."""
+
+    offset: int
+    """Byte offset of the first chunk in spill file or None if output was discarded."""
+    count: int
+    """Number of chunks."""
+
+
+class ConsoleOutputBuffer:
+    """A ring buffer for console output chunks.
+
+    When producers outpace rendering, the oldest pending chunks are evicted into a temporary spill file
+    from where they can be read back on demand.
+    """
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): maximum number of pending chunks
+        """
+        self._chunks = deque()
+        self._capacity = capacity
+        self._spill_file = None
+        self._spill_failed = False
+        self._spilled = None
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def put(self, text, with_prompt=False):
+        """Appends an output chunk evicting the oldest chunk if the buffer is full.
+
+        Args:
+            text (str): output text
+            with_prompt (bool): True if text is input that should be rendered after a prompt
+
+        Returns:
+            bool: True if buffer was empty before, False otherwise
+        """
+        was_empty = not self._chunks and self._spilled is None
+        if len(self._chunks) == self._capacity:
+            self._spill(self._chunks.popleft())
+        self._chunks.append((text, with_prompt))
+        return was_empty
+
+    def has_pending(self):
+        """Checks if there is anything to render.
+
+        Returns:
+            bool: True if there are pending chunks or spilled output, False otherwise
+        """
+        return bool(self._chunks) or self._spilled is not None
+
+    def take(self, max_chunks):
+        """Takes pending chunks merging consecutive output chunks into one.
+
+        Args:
+            max_chunks (int): maximum number of chunks to take
+
+        Returns:
+            tuple: output spilled since last call or None, and a list of (text, with_prompt) tuples
+        """
+        spilled = self._spilled
+        self._spilled = None
+        merged = []
+        output_lines = []
+        for _ in range(min(max_chunks, len(self._chunks))):
+            text, with_prompt = self._chunks.popleft()
+            if with_prompt:
+                if output_lines:
+                    merged.append(("\n".join(output_lines), False))
+                    output_lines = []
+                merged.append((text, True))
+            else:
+                output_lines.append(text)
+        if output_lines:
+            merged.append(("\n".join(output_lines), False))
+        return spilled, merged
+
+    def read_spilled(self, spilled, max_chunks):
+        """Reads spilled chunks back from the spill file.
+
+        Args:
+            spilled (SpilledOutput): spilled range
+            max_chunks (int): maximum number of chunks to read; the last chunks of the range are returned
+
+        Returns:
+            list of tuple: (text, with_prompt) tuples
+        """
+        if spilled.offset is None or self._spill_file is None:
+            return []
+        chunks = deque(maxlen=max_chunks)
+        position = self._spill_file.tell()
+        try:
+            self._spill_file.seek(spilled.offset)
+            for _ in range(spilled.count):
+                text, with_prompt = json.loads(self._spill_file.readline())
+                chunks.append((text, with_prompt))
+        finally:
+            self._spill_file.seek(position)
+        return list(chunks)
+
+    def clear(self):
+        """Drops pending chunks and spilled output."""
+        self._chunks.clear()
+        self._spilled = None
+        self.close()
+
+    def close(self):
+        """Closes and deletes the spill file."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _spill(self, chunk):
+        """Writes an evicted chunk to spill file.
+
+        Args:
+            chunk (tuple): text and with_prompt flag
+        """
+        offset = self._write_to_spill_file(chunk)
+        if self._spilled is None:
+            self._spilled = SpilledOutput(offset, 1)
+        else:
+            self._spilled = SpilledOutput(self._spilled.offset if offset is not None else None, self._spilled.count + 1)
+
+    def _write_to_spill_file(self, chunk):
+        """Appends a chunk to spill file creating the file if needed.
+
+        Args:
+            chunk (tuple): text and with_prompt flag
+
+        Returns:
+            int: chunk's offset or None if spill file is not available
+        """
+        if self._spill_failed:
+            return None
+        try:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+            offset = self._spill_file.tell()
+            self._spill_file.write(json.dumps(chunk).encode("utf-8") + b"\n")
+        except OSError:
+            self._spill_failed = True
+            return None
+        return offset
+
+
+def next_batch_size(batch_size, elapsed, budget, minimum, maximum):
+    """Scales the number of chunks rendered per flush so that a flush fits into the frame budget.
+
+    Args:
+        batch_size (int): chunks rendered during the last flush
+        elapsed (float): time the last flush took in milliseconds
+        budget (float): target time per flush in milliseconds
+        minimum (int): smallest allowed batch size
+        maximum (int): largest allowed batch size
+
+    Returns:
+        int: batch size for the next flush
+    """
+    if elapsed <= 0.0:
+        scaled = 2 * batch_size
+    else:
+        scaled = int(batch_size * min(2.0, budget / elapsed))
+    return max(minimum, min(maximum, scaled))
@@ -0,0 +1,184 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a scheduler that decides which independent DAGs may execute concurrently."""
+from enum import Enum, unique
+import heapq
+from itertools import count
+import os
+import re
+
+ITEM_MEMORY_ESTIMATE = 256 * 2**20
+"""Rough estimate of the memory in bytes a single executed project item needs."""
+
+_MEMORY_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+_MEMORY_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$", re.IGNORECASE)
+
+
+@unique
+class FailurePolicy(Enum):
+    """What to do with pending DAGs when a DAG fails."""
+
+    FAIL_FAST = "fail fast"
+    """Do not start pending DAGs after a failure."""
+    CONTINUE = "continue"
+    """Keep executing the remaining DAGs."""
+
+
+def parse_memory_size(text):
+    """Converts a human readable memory size such as '512M' or '4G' to bytes.
+
+    Args:
+        text (str): memory size; plain numbers are bytes
+
+    Returns:
+        int: size in bytes
+
+    Raises:
+        ValueError: raised if text is not a valid memory size
+    """
+    match = _MEMORY_SIZE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"invalid memory size '{text}'")
+    number, unit = match.groups()
+    return int(float(number) * _MEMORY_UNITS[unit.upper()])
+
+
+def estimate_dag_memory(execution_permits):
+    """Estimates the memory needed to execute a DAG.
+
+    Args:
+        execution_permits (dict): mapping from item name to a boolean telling if the item is executed
+
+    Returns:
+        int: estimated memory in bytes
+    """
+    return sum(1 for permitted in execution_permits.values() if permitted) * ITEM_MEMORY_ESTIMATE
+
+
+class DagScheduler:
+    """Keeps track of pending and running DAG executions and tells when the next ones can be started.
+
+    Jobs are opaque to the scheduler; they can be anything hashable, e.g. DAG indices or engine workers.
+    Pending jobs are started in priority order, highest priority first and in insertion order among equal priorities,
+    as long as the number of running jobs and their combined memory stay within the budget.
+    A job that exceeds the memory budget by itself is started when nothing else is running.
+    """
+
+    def __init__(self, max_jobs=None, max_memory=None, failure_policy=FailurePolicy.FAIL_FAST):
+        """
+        Args:
+            max_jobs (int, optional): maximum number of concurrently running jobs; defaults to the number of CPUs
+            max_memory (int, optional): memory budget in bytes; None means no limit
+            failure_policy (FailurePolicy): what to do with pending jobs when a job fails
+        """
+        if max_jobs is None:
+            max_jobs = os.cpu_count() or 1
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be positive")
+        self._max_jobs = max_jobs
+        self._max_memory = max_memory
+        self._failure_policy = failure_policy
+        self._pending = []
+        self._counter = count()
+        self._running = {}
+        self._memory_in_use = 0
+        self._failed = False
+
+    @property
+    def failure_policy(self):
+        return self._failure_policy
+
+    @property
+    def has_failed(self):
+        """True if any finished job has failed."""
+        return self._failed
+
+    @property
+    def is_done(self):
+        """True if there are no pending or running jobs."""
+        return not self._pending and not self._running
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def running_count(self):
+        return len(self._running)
+
+    def is_running(self, job):
+        """Checks if given job has been started but not finished.
+
+        Args:
+            job (Hashable): job
+
+        Returns:
+            bool: True if job is running, False otherwise
+        """
+        return job in self._running
+
+    def add(self, job, priority=0, memory=0):
+        """Adds a pending job.
+
+        Args:
+            job (Hashable): job to schedule
+            priority (int): job's priority; jobs with higher priority are started first
+            memory (int): memory in bytes the job is estimated to need
+        """
+        heapq.heappush(self._pending, (-priority, next(self._counter), job, memory))
+
+    def start_ready(self):
+        """Marks as many pending jobs running as the budget allows.
+
+        Returns:
+            list: jobs that should be started now
+        """
+        started = []
+        if self._failed and self._failure_policy == FailurePolicy.FAIL_FAST:
+            return started
+        while self._pending and len(self._running) < self._max_jobs:
+            _, _, job, memory = self._pending[0]
+            if self._running and self._max_memory is not None and self._memory_in_use + memory > self._max_memory:
+                break
+            heapq.heappop(self._pending)
+            self._running[job] = memory
+            self._memory_in_use += memory
+            started.append(job)
+        return started
+
+    def finish(self, job, failed=False):
+        """Marks a running job finished.
+
+        Under the fail fast policy pending jobs are discarded after a failure.
+
+        Args:
+            job (Hashable): finished job
+            failed (bool): True if the job failed
+
+        Returns:
+            list: jobs that should be started now
+        """
+        self._memory_in_use -= self._running.pop(job)
+        if failed:
+            self._failed = True
+            if self._failure_policy == FailurePolicy.FAIL_FAST:
+                self.cancel_pending()
+        return self.start_ready()
+
+    def cancel_pending(self):
+        """Discards all pending jobs.
+
+        Returns:
+            list: cancelled jobs
+        """
+        cancelled = [job for _, _, job, _ in sorted(self._pending)]
+        self._pending.clear()
+        return cancelled
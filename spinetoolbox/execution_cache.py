@@ -0,0 +1,353 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a cache that lets execution skip project items whose inputs have not changed since their last success."""
+import hashlib
+import json
+import os
+import pathlib
+import networkx as nx
+from sqlalchemy.engine.url import URL
+from sqlalchemy.exc import SQLAlchemyError
+from spinedb_api import DatabaseMapping, SpineDBAPIError
+from spine_engine.config import TOOL_OUTPUT_DIR
+from spine_engine.utils.helpers import shorten
+from spine_engine.utils.serialization import deserialize_path
+from .config import EXECUTION_CACHE_FILENAME, PROJECT_LOCAL_DATA_DIR_NAME
+
+_RUN_GENERATED_DIR_NAMES = frozenset(("logs", TOOL_OUTPUT_DIR))
+"""Subdirectories of an item's data directory that every execution writes to."""
+
+_IGNORED_ITEM_KEYS = {"x", "y", "description"}
+"""Item dict keys that do not affect execution."""
+
+
+class ExecutionCache:
+    """Stores a content key for each project item that finished its last execution successfully.
+
+    An item whose current key matches the stored one is up to date:
+    its previous output resources can be reused instead of executing it again.
+    """
+
+    def __init__(self, project_config_dir):
+        """
+        Args:
+            project_config_dir (Path or str): project's .spinetoolbox directory
+        """
+        self._path = pathlib.Path(project_config_dir, PROJECT_LOCAL_DATA_DIR_NAME, EXECUTION_CACHE_FILENAME)
+        self._keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        """Reads the cache from disk; a missing or corrupted file gives an empty cache."""
+        try:
+            with self._path.open(encoding="utf-8") as cache_file:
+                keys = json.load(cache_file)
+        except (OSError, json.decoder.JSONDecodeError):
+            keys = {}
+        self._keys = keys if isinstance(keys, dict) else {}
+
+    def save(self):
+        """Writes the cache to disk.
+
+        Raises:
+            OSError: raised if writing fails
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("w", encoding="utf-8") as cache_file:
+            json.dump(self._keys, cache_file, sort_keys=True, indent=0)
+
+    def is_up_to_date(self, item_name, key):
+        """Checks if item's stored key matches given key and updates hit/miss statistics.
+
+        Args:
+            item_name (str): item's name
+            key (str, optional): item's current key; None if the item cannot be cached
+
+        Returns:
+            bool: True if item is up to date, False otherwise
+        """
+        up_to_date = key is not None and self._keys.get(item_name) == key
+        if up_to_date:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return up_to_date
+
+    def store(self, item_name, key):
+        """Stores item's key; None removes the item from the cache.
+
+        Args:
+            item_name (str): item's name
+            key (str, optional): item's key
+        """
+        if key is None:
+            self.discard(item_name)
+            return
+        self._keys[item_name] = key
+
+    def discard(self, item_name):
+        """Removes item from the cache.
+
+        Args:
+            item_name (str): item's name
+        """
+        self._keys.pop(item_name, None)
+
+
+def item_keys(dag, item_dicts, specification_dicts, connection_dicts, project_dir):
+    """Computes content keys for all items in a DAG.
+
+    An item's key covers its item dict, specification, incoming connections including filter settings,
+    fingerprints of its data directory and of the files and databases it refers to, the keys of its predecessors
+    and the file and database fingerprints of its direct successors, since those may hold the item's results.
+    Items that cannot be fingerprinted, and all their successors, get None as key.
+
+    Args:
+        dag (DiGraph): DAG whose nodes are item names
+        item_dicts (dict): mapping from item name to item dict
+        specification_dicts (dict): mapping from item type to list of specification dicts
+        connection_dicts (list of dict): serialized connections
+        project_dir (Path or str): project directory
+
+    Returns:
+        dict: mapping from item name to key
+    """
+    project_dir = str(project_dir)
+    items_dir = os.path.join(project_dir, ".spinetoolbox", "items")
+    resource_fingerprints = {}
+    for item_name in dag:
+        item_dict = item_dicts[item_name]
+        database_fingerprints = _database_fingerprints(item_dict)
+        if database_fingerprints is None:
+            resource_fingerprints[item_name] = None
+            continue
+        resource_fingerprints[item_name] = {
+            "files": _file_fingerprints(item_dict, project_dir),
+            "data_dir": _path_fingerprint(
+                os.path.join(items_dir, shorten(item_name)), excluded_dir_names=_RUN_GENERATED_DIR_NAMES
+            )
+            or [],
+            "databases": database_fingerprints,
+        }
+    keys = {}
+    for item_name in nx.topological_sort(dag):
+        predecessor_keys = [keys[predecessor] for predecessor in sorted(dag.predecessors(item_name))]
+        successor_resources = [resource_fingerprints[successor] for successor in sorted(dag.successors(item_name))]
+        resources = resource_fingerprints[item_name]
+        if resources is None or any(key is None for key in predecessor_keys) or None in successor_resources:
+            keys[item_name] = None
+            continue
+        item_dict = item_dicts[item_name]
+        specification_dict = _specification_dict(item_dict, specification_dicts)
+        content = {
+            "item": {key: value for key, value in item_dict.items() if key not in _IGNORED_ITEM_KEYS},
+            "specification": _specification_content(specification_dict),
+            "connections": [c for c in connection_dicts if c["to"][0] == item_name],
+            "include_files": _include_file_fingerprints(specification_dict),
+            "resources": resources,
+            "predecessors": predecessor_keys,
+            "successor_resources": successor_resources,
+        }
+        serialized = json.dumps(content, sort_keys=True, default=str)
+        keys[item_name] = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    return keys
+
+
+def _specification_dict(item_dict, specification_dicts):
+    """Finds the specification dict of an item.
+
+    Args:
+        item_dict (dict): item dict
+        specification_dicts (dict): mapping from item type to list of specification dicts
+
+    Returns:
+        dict: specification dict or None if item has no specification
+    """
+    name = item_dict.get("specification")
+    if not name:
+        return None
+    return next((d for d in specification_dicts.get(item_dict["type"], []) if d["name"] == name), None)
+
+
+def _specification_content(specification_dict):
+    """Returns the part of specification dict that affects execution.
+
+    Args:
+        specification_dict (dict, optional): specification dict
+
+    Returns:
+        dict: specification content
+    """
+    if specification_dict is None:
+        return None
+    return {key: value for key, value in specification_dict.items() if key != "definition_file_path"}
+
+
+def _include_file_fingerprints(specification_dict):
+    """Fingerprints the source files a specification includes, e.g. Tool programs.
+
+    Args:
+        specification_dict (dict, optional): specification dict
+
+    Returns:
+        dict: mapping from file path to its fingerprint
+    """
+    if specification_dict is None or not specification_dict.get("includes"):
+        return {}
+    definition_file_path = specification_dict.get("definition_file_path")
+    if not definition_file_path:
+        return {}
+    main_path = os.path.join(
+        os.path.dirname(definition_file_path), specification_dict.get("includes_main_path") or os.curdir
+    )
+    paths = (os.path.normpath(os.path.join(main_path, include)) for include in specification_dict["includes"])
+    return {path: _path_fingerprint(path) for path in paths}
+
+
+def _file_fingerprints(item_dict, project_dir):
+    """Fingerprints all files and directories an item dict refers to.
+
+    Args:
+        item_dict (dict): item dict
+        project_dir (str): project directory
+
+    Returns:
+        dict: mapping from path to its fingerprint
+    """
+    fingerprints = {}
+    for serialized in _serialized_paths(item_dict):
+        path = deserialize_path(serialized, project_dir)
+        if serialized["type"] == "file_url":
+            path = path.partition(":///")[2].partition("?")[0]
+        fingerprints[path] = _path_fingerprint(path)
+    return fingerprints
+
+
+def _serialized_paths(value):
+    """Yields serialized paths found in a nested item dict.
+
+    Args:
+        value (Any): item dict or a value within it
+
+    Yields:
+        dict: serialized path
+    """
+    if isinstance(value, dict):
+        if value.get("type") in ("path", "file_url") and "path" in value:
+            yield value
+            return
+        for child in value.values():
+            yield from _serialized_paths(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _serialized_paths(child)
+
+
+def _path_fingerprint(path, excluded_dir_names=frozenset()):
+    """Fingerprints a file by its size and modification time, or a directory by its contents.
+
+    Args:
+        path (str): path to file or directory
+        excluded_dir_names (frozenset of str): names of top-level subdirectories to leave out of the fingerprint
+
+    Returns:
+        list: fingerprint or None if path does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path):
+        return [stat.st_size, stat.st_mtime_ns]
+    fingerprint = []
+    for root, dir_names, file_names in os.walk(path):
+        if root == path:
+            dir_names[:] = [name for name in dir_names if name not in excluded_dir_names]
+        dir_names.sort()
+        for name in sorted(file_names):
+            file_path = os.path.join(root, name)
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            fingerprint.append([os.path.relpath(file_path, path), file_stat.st_size, file_stat.st_mtime_ns])
+    return fingerprint
+
+
+def _database_fingerprints(item_dict):
+    """Fingerprints the database servers an item dict refers to by their latest commit ids.
+
+    SQLite databases are files and get fingerprinted by :func:`_file_fingerprints`.
+
+    Args:
+        item_dict (dict): item dict
+
+    Returns:
+        list: database fingerprints or None if a database could not be reached
+    """
+    fingerprints = []
+    for url in _url_dicts(item_dict):
+        if url["dialect"] == "sqlite":
+            continue
+        commit_id = _latest_commit_id(url)
+        if commit_id is None:
+            return None
+        fingerprints.append([url.get("host"), url.get("port"), url.get("database"), commit_id])
+    return fingerprints
+
+
+def _url_dicts(value):
+    """Yields database URL dicts found in a nested item dict.
+
+    Args:
+        value (Any): item dict or a value within it
+
+    Yields:
+        dict: URL dict
+    """
+    if isinstance(value, dict):
+        if "dialect" in value:
+            yield value
+            return
+        for child in value.values():
+            yield from _url_dicts(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _url_dicts(child)
+
+
+def _latest_commit_id(url):
+    """Queries the id of the latest commit in a database.
+
+    Args:
+        url (dict): URL dict
+
+    Returns:
+        int: commit id or None if the database could not be read
+    """
+    try:
+        sa_url = URL(
+            url["dialect"],
+            username=url.get("username") or None,
+            password=url.get("password") or None,
+            host=url.get("host") or None,
+            port=int(url["port"]) if url.get("port") else None,
+            database=url.get("database") or None,
+        )
+        with DatabaseMapping(sa_url) as db_map:
+            commit_sq = db_map.commit_sq
+            latest = db_map.query(commit_sq.c.id).order_by(commit_sq.c.id.desc()).first()
+    except (SpineDBAPIError, SQLAlchemyError, ValueError, TypeError):
+        return None
+    return latest.id if latest is not None else 0
@@ -0,0 +1,244 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains an on-disk store for execution log records."""
+import os
+import sqlite3
+
+EXECUTION_LOG_FILENAME = "execution_log.sqlite"
+"""Name of the log store file in project's logs directory."""
+DEFAULT_RETAINED_RUNS = 50
+"""Default number of runs kept in the store; 0 keeps all runs."""
+
+
+class ExecutionLogStore:
+    """Appends execution log records to an indexed SQLite file and queries them.
+
+    Each record has a run (the execution time stamp), time, item name, filter id, message type and plain text.
+    Message text is full-text indexed if SQLite has the FTS5 extension; otherwise searches fall back to substring
+    matching.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): path to the store file; the file is created if it does not exist
+
+        Raises:
+            sqlite3.Error: raised if the file cannot be opened
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS record ("
+            "id INTEGER PRIMARY KEY, run TEXT NOT NULL, time REAL NOT NULL, item TEXT NOT NULL, "
+            "filter_id TEXT NOT NULL, type TEXT NOT NULL, text TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS record_run_item ON record (run, item, filter_id)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS record_item ON record (item, filter_id)")
+        self._full_text_search = self._create_full_text_index()
+        self._connection.commit()
+
+    def _create_full_text_index(self):
+        """Creates an external content FTS5 index for message texts.
+
+        Returns:
+            bool: True if full-text index is available, False otherwise
+        """
+        try:
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS record_text USING fts5(text, content='record', content_rowid='id')"
+            )
+        except sqlite3.OperationalError:
+            return False
+        self._connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS record_text_insert AFTER INSERT ON record BEGIN "
+            "INSERT INTO record_text (rowid, text) VALUES (new.id, new.text); END"
+        )
+        self._connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS record_text_delete AFTER DELETE ON record BEGIN "
+            "INSERT INTO record_text (record_text, rowid, text) VALUES ('delete', old.id, old.text); END"
+        )
+        return True
+
+    def close(self):
+        """Closes the store file."""
+        self._connection.close()
+
+    def append(self, records):
+        """Appends records to the store.
+
+        Args:
+            records (Iterable of tuple): (run, time, item, filter id, type, text) tuples
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO record (run, time, item, filter_id, type, text) VALUES (?, ?, ?, ?, ?, ?)", records
+            )
+
+    def delete_run(self, run):
+        """Deletes all records of a run.
+
+        Args:
+            run (str): run identifier
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM record WHERE run = ?", (run,))
+
+    def prune(self, max_runs):
+        """Deletes records of all but the newest runs.
+
+        Args:
+            max_runs (int): number of runs to keep; 0 or less keeps none
+
+        Returns:
+            list of str: deleted runs in chronological order
+        """
+        runs = self.runs()
+        deleted = runs[: max(0, len(runs) - max(0, max_runs))]
+        if deleted:
+            with self._connection:
+                self._connection.executemany("DELETE FROM record WHERE run = ?", ((run,) for run in deleted))
+        return deleted
+
+    def runs(self):
+        """Returns run identifiers in chronological order.
+
+        Returns:
+            list of str: runs
+        """
+        rows = self._connection.execute("SELECT run FROM record GROUP BY run ORDER BY MIN(id)")
+        return [row[0] for row in rows]
+
+    def items(self, run=None):
+        """Returns names of items that have records.
+
+        Args:
+            run (str, optional): restrict to given run
+
+        Returns:
+            list of str: item names
+        """
+        where, parameters = self._where(run=run)
+        rows = self._connection.execute(f"SELECT DISTINCT item FROM record{where} ORDER BY item", parameters)
+        return [row[0] for row in rows]
+
+    def filter_ids(self, run=None, item=None):
+        """Returns filter ids that have records.
+
+        Args:
+            run (str, optional): restrict to given run
+            item (str, optional): restrict to given item
+
+        Returns:
+            list of str: filter ids
+        """
+        where, parameters = self._where(run=run, item=item)
+        rows = self._connection.execute(f"SELECT DISTINCT filter_id FROM record{where} ORDER BY filter_id", parameters)
+        return [row[0] for row in rows]
+
+    def last_id(self):
+        """Returns the id of the newest record.
+
+        Record ids grow in insertion order.
+
+        Returns:
+            int: record id or 0 if the store is empty
+        """
+        return self._connection.execute("SELECT MAX(id) FROM record").fetchone()[0] or 0
+
+    def count(self, run=None, item=None, filter_id=None, search="", after_id=0):
+        """Counts records that match given criteria.
+
+        Args:
+            run (str, optional): run identifier
+            item (str, optional): item name
+            filter_id (str, optional): filter id
+            search (str): text to search for
+            after_id (int): count only records whose id is greater than this
+
+        Returns:
+            int: number of records
+        """
+        where, parameters = self._where(run, item, filter_id, search, after_id)
+        return self._connection.execute(f"SELECT COUNT(*) FROM record{where}", parameters).fetchone()[0]
+
+    def fetch(self, after_id, limit, run=None, item=None, filter_id=None, search=""):
+        """Fetches records that match given criteria in insertion order.
+
+        Args:
+            after_id (int): fetch records whose id is greater than this
+            limit (int): maximum number of records to return
+            run (str, optional): run identifier
+            item (str, optional): item name
+            filter_id (str, optional): filter id
+            search (str): text to search for
+
+        Returns:
+            list of tuple: (id, run, time, item, filter id, type, text) tuples
+        """
+        where, parameters = self._where(run, item, filter_id, search, after_id)
+        rows = self._connection.execute(
+            f"SELECT id, run, time, item, filter_id, type, text FROM record{where} ORDER BY id LIMIT ?",
+            parameters + [limit],
+        )
+        return rows.fetchall()
+
+    def skip(self, after_id, count, run=None, item=None, filter_id=None, search=""):
+        """Returns the id of the record that comes given number of matching records after given id.
+
+        Args:
+            after_id (int): id to start from
+            count (int): number of matching records to skip; must be positive
+            run (str, optional): run identifier
+            item (str, optional): item name
+            filter_id (str, optional): filter id
+            search (str): text to search for
+
+        Returns:
+            int: record id or None if there are not enough matching records
+        """
+        where, parameters = self._where(run, item, filter_id, search, after_id)
+        row = self._connection.execute(
+            f"SELECT id FROM record{where} ORDER BY id LIMIT 1 OFFSET ?", parameters + [count - 1]
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _where(self, run=None, item=None, filter_id=None, search="", after_id=0):
+        """Builds a WHERE clause for given criteria.
+
+        Returns:
+            tuple: clause and list of parameters
+        """
+        conditions = []
+        parameters = []
+        if after_id:
+            conditions.append("id > ?")
+            parameters.append(after_id)
+        for column, value in (("run", run), ("item", item), ("filter_id", filter_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        words = search.split()
+        if words:
+            if self._full_text_search:
+                conditions.append("id IN (SELECT rowid FROM record_text WHERE record_text MATCH ?)")
+                parameters.append(" ".join('"' + word.replace('"', '""') + '"*' for word in words))
+            else:
+                for word in words:
+                    conditions.append("text LIKE ? ESCAPE '\\'")
+                    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    parameters.append(f"%{escaped}%")
+        if not conditions:
+            return "", parameters
+        return " WHERE " + " AND ".join(conditions), parameters
@@ -11,15 +11,32 @@
 ######################################################################################################################
 
 """The FetchParent and FlexibleFetchParent classes."""
+from enum import IntEnum, unique
 from PySide6.QtCore import QTimer, Signal, QObject, Qt
 from .helpers import busy_effect
 
 
+@unique
+class FetchPriority(IntEnum):
+    """Priorities of DB queries made on behalf of fetch parents. Queries with smaller values are run first."""
+
+    TREE = 0
+    """Items shown in tree views."""
+    DEFAULT = 1
+    """Items shown in tables and elsewhere."""
+    PIVOT = 2
+    """Items for pivot tables."""
+    PREFETCH = 3
+    """Items queried in advance in the background."""
+
+
 class FetchParent(QObject):
 
     _changes_pending = Signal()
+    obsoleted = Signal()
+    """Emitted when the parent becomes obsolete."""
 
-    def __init__(self, index=None, owner=None, chunk_size=1000):
+    def __init__(self, index=None, owner=None, chunk_size=1000, priority=FetchPriority.DEFAULT):
         """
         Args:
             index (FetchIndex, optional): an index to speedup looking up fetched items
@@ -27,6 +44,7 @@ class FetchParent(QObject):
                 If it's a QObject instance, then this FetchParent becomes obsolete whenever the owner is destroyed
             chunk_size (int, optional): the number of items this parent should be happy with fetching at a time.
                 If None, then no limit is imposed and the parent should fetch the entire contents of the DB.
+            priority (FetchPriority): priority of DB queries made for this parent
         """
         super().__init__()
         self._version = 0
@@ -49,6 +67,7 @@ class FetchParent(QObject):
             self._owner.destroyed.connect(lambda obj=None: self.set_obsolete(True))
             self.setParent(self._owner)
         self.chunk_size = chunk_size
+        self.priority = priority
 
     def apply_changes_immediately(self):
         # For tests
@@ -204,7 +223,10 @@ class FetchParent(QObject):
         """
         if obsolete:
             self.set_busy(False)
+        was_obsolete = self._obsolete
         self._obsolete = obsolete
+        if obsolete and not was_obsolete:
+            self.obsoleted.emit()
 
     @property
     def is_fetched(self):
@@ -264,8 +286,8 @@ class FetchParent(QObject):
 
 
 class ItemTypeFetchParent(FetchParent):
-    def __init__(self, fetch_item_type, index=None, owner=None, chunk_size=1000):
-        super().__init__(index=index, owner=owner, chunk_size=chunk_size)
+    def __init__(self, fetch_item_type, index=None, owner=None, chunk_size=1000, priority=FetchPriority.DEFAULT):
+        super().__init__(index=index, owner=owner, chunk_size=chunk_size, priority=priority)
         self._fetch_item_type = fetch_item_type
 
     @property
@@ -302,8 +324,9 @@ class FlexibleFetchParent(ItemTypeFetchParent):
         index=None,
         owner=None,
         chunk_size=1000,
+        priority=FetchPriority.DEFAULT,
     ):
-        super().__init__(fetch_item_type, index=index, owner=owner, chunk_size=chunk_size)
+        super().__init__(fetch_item_type, index=index, owner=owner, chunk_size=chunk_size, priority=priority)
         self._handle_items_added = handle_items_added
         self._handle_items_removed = handle_items_removed
         self._handle_items_updated = handle_items_updated
@@ -0,0 +1,290 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Contains a project-wide catalog of the scenario and alternative names that connections can filter by."""
+from spinedb_api.db_mapping_base import Status
+from spinedb_api.filters.alternative_filter import ALTERNATIVE_FILTER_TYPE
+from spinedb_api.filters.scenario_filter import SCENARIO_FILTER_TYPE
+from .fetch_parent import FetchPriority, FlexibleFetchParent
+
+FILTER_ITEM_TYPES = {ALTERNATIVE_FILTER_TYPE: "alternative", SCENARIO_FILTER_TYPE: "scenario"}
+"""Mapping from filter type to the database item type it filters by."""
+
+
+class FilterCatalog:
+    """Keeps the names of filterable database items of every database the project's connections filter.
+
+    All subscribers of a URL share the database manager's mapping, a single listener registration
+    and one fetch parent per item type. Names are fetched in the background and changes
+    are pushed to subscribers as deltas through their ``receive_filter_names_changed()`` method.
+
+    Only committed names are listed since filters are applied to the database's contents;
+    uncommitted edits in the shared mapping show up once they have been committed.
+    """
+
+    def __init__(self, toolbox):
+        """
+        Args:
+            toolbox (ToolboxUI): toolbox; provides the database manager and logs database opening errors
+        """
+        self._toolbox = toolbox
+        self._entries = {}
+
+    @property
+    def _db_mngr(self):
+        return self._toolbox.db_mngr
+
+    def subscribe(self, subscriber, url, ignore_version_error=False):
+        """Subscribes to name changes of given database starting to fetch the names if needed.
+
+        Args:
+            subscriber (object): subscriber
+            url (str): database URL
+            ignore_version_error (bool): if True, ignore database version errors when opening the database
+
+        Returns:
+            bool: True if subscription succeeded, False if the database could not be opened
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            db_map = self._db_mngr.get_db_map(url, self._toolbox, ignore_version_error=ignore_version_error)
+            if db_map is None:
+                return False
+            entry = _CatalogEntry(url, db_map)
+            for filter_type, item_type in FILTER_ITEM_TYPES.items():
+                entry.names[filter_type] = _committed_names(db_map, item_type)
+                entry.fetch_parents[filter_type] = self._make_fetch_parent(entry, filter_type)
+            self._entries[url] = entry
+            self._db_mngr.register_listener(self, db_map)
+            self._fetch_more(entry)
+        entry.subscribers.add(subscriber)
+        return True
+
+    def unsubscribe(self, subscriber, url):
+        """Removes subscription.
+
+        The database is released when it has no subscribers left.
+
+        Args:
+            subscriber (object): subscriber
+            url (str): database URL
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return
+        entry.subscribers.discard(subscriber)
+        if entry.subscribers:
+            return
+        del self._entries[url]
+        for fetch_parent in entry.fetch_parents.values():
+            fetch_parent.set_obsolete(True)
+            fetch_parent.deleteLater()
+        self._db_mngr.unregister_listener(self, entry.db_map)
+
+    def names(self, url, filter_type):
+        """Returns the names known so far.
+
+        Args:
+            url (str): database URL
+            filter_type (str): filter type
+
+        Returns:
+            set of str: names or None if nobody has subscribed to the URL
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        return entry.names[filter_type]
+
+    def is_complete(self, url):
+        """Checks if all names of given database have been fetched.
+
+        Args:
+            url (str): database URL
+
+        Returns:
+            bool: True if names are complete, False otherwise
+        """
+        entry = self._entries.get(url)
+        return entry is not None and all(parent.is_fetched for parent in entry.fetch_parents.values())
+
+    def complete(self, url):
+        """Fetches the remaining names of given database in the calling thread if background fetching is unfinished.
+
+        Args:
+            url (str): database URL
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return
+        for filter_type, fetch_parent in entry.fetch_parents.items():
+            if fetch_parent.is_fetched:
+                continue
+            self._db_mngr.get_items(entry.db_map, FILTER_ITEM_TYPES[filter_type])
+            self._reconcile(entry, filter_type, keep_unseen=False)
+
+    def receive_session_committed(self, db_maps, cookie):
+        for entry in list(self._entries.values()):
+            if entry.db_map in db_maps:
+                for filter_type, fetch_parent in entry.fetch_parents.items():
+                    self._reconcile(entry, filter_type, keep_unseen=not fetch_parent.is_fetched)
+        self._refetch(db_maps)
+
+    def receive_session_rolled_back(self, db_maps):
+        self._refetch(db_maps)
+
+    def receive_session_refreshed(self, db_maps):
+        self._refetch(db_maps)
+
+    def receive_error_msg(self, _db_map_error_log):
+        pass
+
+    def _make_fetch_parent(self, entry, filter_type):
+        """Creates a fetch parent that keeps entry's names of given filter type up to date.
+
+        Args:
+            entry (_CatalogEntry): catalog entry
+            filter_type (str): filter type
+
+        Returns:
+            _NameFetchParent: fetch parent
+        """
+        db_map = entry.db_map
+        return _NameFetchParent(
+            FILTER_ITEM_TYPES[filter_type],
+            handle_fetched=lambda: self._reconcile(entry, filter_type, keep_unseen=False),
+            handle_items_added=lambda db_map_data: self._add_names(entry, filter_type, db_map_data.get(db_map, ())),
+            handle_items_removed=lambda _: None,
+            handle_items_updated=lambda _: None,
+        )
+
+    def _refetch(self, db_maps):
+        """Restarts fetching for databases whose mapping has been reset.
+
+        Args:
+            db_maps (Iterable of DatabaseMapping): database mappings
+        """
+        for entry in list(self._entries.values()):
+            if entry.db_map in db_maps:
+                self._fetch_more(entry)
+
+    def _fetch_more(self, entry):
+        """Requests more names from the database manager unless everything has been fetched.
+
+        Args:
+            entry (_CatalogEntry): catalog entry
+        """
+        for fetch_parent in entry.fetch_parents.values():
+            if self._db_mngr.can_fetch_more(entry.db_map, fetch_parent):
+                self._db_mngr.fetch_more(entry.db_map, fetch_parent)
+
+    def _add_names(self, entry, filter_type, items):
+        """Adds names of fetched items; items added by uncommitted edits are ignored.
+
+        Args:
+            entry (_CatalogEntry): catalog entry
+            filter_type (str): filter type
+            items (Iterable of PublicItem): added items
+        """
+        names = {item["name"] for item in items if item.is_committed()}
+        self._update_names(entry, filter_type, entry.names[filter_type] | names)
+
+    def _reconcile(self, entry, filter_type, keep_unseen):
+        """Updates names from the committed items of the in-memory mapping.
+
+        Args:
+            entry (_CatalogEntry): catalog entry
+            filter_type (str): filter type
+            keep_unseen (bool): if True, keep names that are not (yet) in the mapping
+        """
+        names = _committed_names(entry.db_map, FILTER_ITEM_TYPES[filter_type])
+        if keep_unseen:
+            names |= entry.names[filter_type]
+        self._update_names(entry, filter_type, names)
+
+    @staticmethod
+    def _update_names(entry, filter_type, names):
+        """Replaces entry's names and pushes the differences to subscribers.
+
+        Args:
+            entry (_CatalogEntry): catalog entry
+            filter_type (str): filter type
+            names (set of str): new names
+        """
+        old_names = entry.names[filter_type]
+        added = names - old_names
+        removed = old_names - names
+        if not added and not removed:
+            return
+        entry.names[filter_type] = names
+        for subscriber in list(entry.subscribers):
+            subscriber.receive_filter_names_changed(entry.url, filter_type, added, removed)
+
+
+def _committed_names(db_map, item_type):
+    """Collects the names items of given type have in the database.
+
+    Names of items that have been added but not committed are left out
+    while updated and removed items contribute their committed names.
+
+    Args:
+        db_map (DatabaseMapping): database mapping
+        item_type (str): item type
+
+    Returns:
+        set of str: committed names
+    """
+    names = set()
+    for item in db_map.mapped_table(item_type).values():
+        status = item.status
+        if status == Status.to_update:
+            names.add(item.backup["name"])
+        elif status == Status.to_remove or (status == Status.committed and not item.removed):
+            names.add(item["name"])
+    return names
+
+
+class _CatalogEntry:
+    """Catalog's bookkeeping for a single database."""
+
+    def __init__(self, url, db_map):
+        """
+        Args:
+            url (str): database URL
+            db_map (DatabaseMapping): database mapping
+        """
+        self.url = url
+        self.db_map = db_map
+        self.subscribers = set()
+        self.names = {}
+        self.fetch_parents = {}
+
+
+class _NameFetchParent(FlexibleFetchParent):
+    """A fetch parent that fetches all items of its type and reports when it is done."""
+
+    def __init__(self, fetch_item_type, handle_fetched, **kwargs):
+        """
+        Args:
+            fetch_item_type (str): item type to fetch
+            handle_fetched (Callable): called when all items have been fetched
+            **kwargs: keyword arguments passed to :class:`FlexibleFetchParent`
+        """
+        super().__init__(fetch_item_type, chunk_size=None, priority=FetchPriority.PREFETCH, **kwargs)
+        self._handle_fetched = handle_fetched
+
+    def set_fetched(self, fetched):
+        was_fetched = self.is_fetched
+        super().set_fetched(fetched)
+        if fetched and not was_fetched and not self.is_obsolete:
+            self._handle_fetched()
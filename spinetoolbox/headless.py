@@ -16,18 +16,22 @@ from copy import deepcopy
 from enum import IntEnum, unique
 import json
 import pathlib
+import queue
 import sys
+import threading
+import time
 from PySide6.QtCore import QCoreApplication, QEvent, QObject, QSettings, Signal, Slot
 import networkx as nx
 from spine_engine import SpineEngineState
 from spine_engine.exception import EngineInitFailed
 from spine_engine.load_project_items import load_item_specification_factories
 from spine_engine.utils.serialization import deserialize_path
-from spine_engine.utils.helpers import get_file_size
-from spine_engine.server.util.zip_handler import ZipHandler
+from spine_engine.utils.helpers import get_file_size, ItemExecutionFinishState
 from .server.engine_client import EngineClient, RemoteEngineInitFailed, ClientSecurityModel
 from .project_item.logging_connection import HeadlessConnection
-from .config import LATEST_PROJECT_VERSION, PROJECT_ZIP_FILENAME
+from .config import LATEST_PROJECT_VERSION
+from .dag_scheduler import DagScheduler, FailurePolicy, estimate_dag_memory
+from .execution_cache import ExecutionCache, item_keys
 from .helpers import (
     make_settings_dict_for_engine,
     plugins_dirs,
@@ -188,6 +192,7 @@ class ActionsWithProject(QObject):
         self._startup_event_type = startup_event_type
         self._start.connect(self._execute)
         self._node_messages = dict()
+        self._successful_items = set()
         self._project_dir = None
         self._app_settings = None
         self._item_dicts = None
@@ -343,13 +348,26 @@ class ActionsWithProject(QObject):
         deselected = {name for name_list in self._args.deselect for name in name_list} if self._args.deselect else None
         executed_items = set()
         skipped_items = set()
+        scheduler = DagScheduler(
+            max_jobs=self._args.jobs,
+            max_memory=self._args.max_memory,
+            failure_policy=FailurePolicy.CONTINUE if self._args.keep_going else FailurePolicy.FAIL_FAST,
+        )
+        exec_remotely = True if self._server_config else False
+        execution_cache = None
+        if not exec_remotely:
+            execution_cache = ExecutionCache(self._project_dir / ".spinetoolbox")
+            execution_cache.load()
+        cached_dags = []
+        engine_data_by_dag = []
         for dag in dags:
             item_names_in_dag = set(dag.nodes)
             if not nx.is_directed_acyclic_graph(dag):
                 self._logger.msg_error.emit("The project contains a graph that is not a Directed Acyclic Graph.")
                 return Status.ERROR
+            # The engine may modify the dicts in-place, so it gets copies to keep execution cache keys stable.
             item_dicts_in_dag = {
-                name: item_dict for name, item_dict in self._item_dicts.items() if name in item_names_in_dag
+                name: deepcopy(item_dict) for name, item_dict in self._item_dicts.items() if name in item_names_in_dag
             }
             execution_permits = {
                 item_name: (selected is None or item_name in selected)
@@ -359,7 +377,15 @@ class ActionsWithProject(QObject):
             skipped_items |= {name for name, selected in execution_permits.items() if not selected}
             if all(not permitted for permitted in execution_permits.values()):
                 continue
-            executed_items |= {name for name, selected in execution_permits.items() if selected}
+            permitted_items = {name for name, selected in execution_permits.items() if selected}
+            executed_items |= permitted_items
+            if execution_cache is not None and not any(jump["from"][0] in dag for jump in self._jump_dicts):
+                up_to_date_items = self._find_up_to_date_items(dag, permitted_items, execution_cache)
+                execution_permits.update(dict.fromkeys(up_to_date_items, False))
+                permitted_items -= up_to_date_items
+                cached_dags.append((dag, permitted_items, up_to_date_items))
+                if not permitted_items:
+                    continue
             engine_data = {
                 "items": item_dicts_in_dag,
                 "specifications": self._specification_dicts,
@@ -370,20 +396,15 @@ class ActionsWithProject(QObject):
                 "settings": settings,
                 "project_dir": solve_project_dir(self._project_dir),
             }
-            exec_remotely = True if self._server_config else False
-            engine_manager = make_engine_manager(exec_remotely, job_id=job_id)
-            try:
-                engine_manager.run_engine(engine_data)
-            except EngineInitFailed as error:
-                self._logger.msg_error.emit(f"Engine failed to start: {error}")
-                return Status.ERROR
-            while True:
-                event_type, data = engine_manager.get_engine_event()
-                self._process_engine_event(event_type, data)
-                if event_type == "dag_exec_finished":
-                    if data == str(SpineEngineState.FAILED):
-                        return Status.ERROR
-                    break
+            scheduler.add(
+                len(engine_data_by_dag), priority=len(permitted_items), memory=estimate_dag_memory(execution_permits)
+            )
+            engine_data_by_dag.append(engine_data)
+        status = self._run_dags(engine_data_by_dag, scheduler, exec_remotely, job_id)
+        if execution_cache is not None:
+            self._update_execution_cache(execution_cache, cached_dags)
+        if status != Status.OK:
+            return status
         selected_invalid = selected - executed_items if selected is not None else None
         deselected_invalid = deselected - skipped_items if deselected is not None else None
         if selected_invalid:
@@ -396,6 +417,116 @@ class ActionsWithProject(QObject):
             )
         return Status.OK
 
+    def _find_up_to_date_items(self, dag, permitted_items, execution_cache):
+        """Finds permitted items that do not need to be executed because their inputs have not changed.
+
+        Args:
+            dag (DiGraph): DAG
+            permitted_items (set of str): names of items permitted for execution
+            execution_cache (ExecutionCache): execution cache
+
+        Returns:
+            set of str: names of up-to-date items
+        """
+        if self._args.force:
+            execution_cache.misses += len(permitted_items)
+            return set()
+        keys = item_keys(dag, self._item_dicts, self._specification_dicts, self._connection_dicts, self._project_dir)
+        up_to_date_items = {name for name in permitted_items if execution_cache.is_up_to_date(name, keys[name])}
+        for name in sorted(up_to_date_items):
+            self._logger.msg.emit(f"<b>{name}</b> is up to date, reusing its previous results.")
+        return up_to_date_items
+
+    def _update_execution_cache(self, execution_cache, cached_dags):
+        """Stores the keys of successfully executed and up-to-date items and reports cache statistics.
+
+        Keys are recomputed after execution for up-to-date items as well
+        since they cover the resources of successors which may have been executed.
+
+        Args:
+            execution_cache (ExecutionCache): execution cache
+            cached_dags (list of tuple): DAGs, the names of their executed items and the names of up-to-date items
+        """
+        for dag, executed_items, up_to_date_items in cached_dags:
+            keys = item_keys(
+                dag, self._item_dicts, self._specification_dicts, self._connection_dicts, self._project_dir
+            )
+            for name in executed_items:
+                if name in self._successful_items:
+                    execution_cache.store(name, keys[name])
+                else:
+                    execution_cache.discard(name)
+            for name in up_to_date_items:
+                execution_cache.store(name, keys[name])
+        try:
+            execution_cache.save()
+        except OSError as error:
+            self._logger.msg_warning.emit(f"Failed to save execution cache: {error}")
+        self._logger.msg.emit(
+            f"Execution cache: {execution_cache.hits} item(s) up to date, {execution_cache.misses} item(s) executed."
+        )
+
+    def _run_dags(self, engine_data_by_dag, scheduler, exec_remotely, job_id):
+        """Executes DAGs concurrently as permitted by the scheduler.
+
+        Args:
+            engine_data_by_dag (list of dict): engine data for each DAG
+            scheduler (DagScheduler): scheduler that has indices of ``engine_data_by_dag`` as jobs
+            exec_remotely (bool): True if DAGs should be executed on a server
+            job_id (str): remote execution job id
+
+        Returns:
+            Status: status code
+        """
+        events = queue.Queue()
+        stop_requested = threading.Event()
+        engine_managers = {}
+        start_times = {}
+        dag_time = 0.0
+        wall_clock_start = time.monotonic()
+
+        def start(dag_index):
+            engine_manager = make_engine_manager(exec_remotely, job_id=job_id)
+            engine_managers[dag_index] = engine_manager
+            start_times[dag_index] = time.monotonic()
+            thread = threading.Thread(
+                target=_forward_engine_events,
+                args=(dag_index, engine_manager, engine_data_by_dag[dag_index], events, stop_requested),
+                daemon=True,
+            )
+            thread.start()
+
+        for dag_index in scheduler.start_ready():
+            start(dag_index)
+        while not scheduler.is_done:
+            dag_index, event_type, data = events.get()
+            if event_type == "engine_init_failed":
+                self._logger.msg_error.emit(f"Engine failed to start: {data}")
+                failed = True
+            elif event_type in ("remote_execution_init_failed", "server_init_failed"):
+                self._logger.msg_error.emit(f"{data}")
+                failed = True
+            else:
+                self._process_engine_event(event_type, data)
+                if event_type != "dag_exec_finished":
+                    continue
+                failed = data == str(SpineEngineState.FAILED)
+            dag_time += time.monotonic() - start_times.pop(dag_index)
+            del engine_managers[dag_index]
+            next_dags = scheduler.finish(dag_index, failed)
+            if failed and scheduler.failure_policy == FailurePolicy.FAIL_FAST and not stop_requested.is_set():
+                stop_requested.set()
+                for engine_manager in engine_managers.values():
+                    engine_manager.stop_engine()
+            for next_index in next_dags:
+                start(next_index)
+        wall_clock_time = time.monotonic() - wall_clock_start
+        self._logger.msg.emit(
+            f"Executed {len(engine_data_by_dag)} DAG(s) in {wall_clock_time:.2f} s "
+            f"(combined DAG execution time {dag_time:.2f} s)."
+        )
+        return Status.ERROR if scheduler.has_failed else Status.OK
+
     def _process_engine_event(self, event_type, data):
         handler = {
             "exec_started": self._handle_node_execution_started,
@@ -436,6 +567,8 @@ class ActionsWithProject(QObject):
             data (dict): execution end data
         """
         item_name = data["item_name"]
+        if str(data["direction"]) == "FORWARD" and str(data["item_state"]) == str(ItemExecutionFinishState.SUCCESS):
+            self._successful_items.add(item_name)
         messages = self._node_messages.get(item_name)
         if messages is None:
             return
@@ -572,26 +705,16 @@ class ActionsWithProject(QObject):
             self._logger.msg_error.emit(f"Server is not responding in {host}:{port}. {e}.")
             return ""
         engine_client.set_start_time()  # Set start_time for upload operation
-        # Archive the project into a zip-file
-        dest_dir = os.path.join(self._project_dir, os.pardir)  # Parent dir of project_dir
         _, project_name = os.path.split(self._project_dir)
-        self._logger.msg.emit(f"Squeezing project <b>{project_name}</b> into {PROJECT_ZIP_FILENAME}.zip")
+        self._logger.msg_warning.emit(f"Uploading project <b>{project_name}</b> ...")
         try:
-            ZipHandler.package(src_folder=self._project_dir, dst_folder=dest_dir, fname=PROJECT_ZIP_FILENAME)
-        except Exception as e:
-            self._logger.msg_error.emit(f"{e}")
+            job_id, upload_size = engine_client.upload_project_dir(project_name, self._project_dir)
+        except (OSError, RemoteEngineInitFailed) as e:
+            self._logger.msg_error.emit(f"Uploading project failed: {e}")
             engine_client.close()
             return ""
-        project_zip_file = os.path.abspath(os.path.join(self._project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
-        if not os.path.isfile(project_zip_file):
-            self._logger.msg_error.emit(f"Project zip-file {project_zip_file} does not exist")
-            engine_client.close()
-            return ""
-        file_size = get_file_size(os.path.getsize(project_zip_file))
-        self._logger.msg_warning.emit(f"Uploading project [{file_size}] ...")
-        job_id = engine_client.upload_project(project_name, project_zip_file)
         t = engine_client.get_elapsed_time()
-        self._logger.msg.emit(f"Upload time: {t}. Job ID: <b>{job_id}</b>")
+        self._logger.msg.emit(f"Upload time: {t} [{get_file_size(upload_size)}]. Job ID: <b>{job_id}</b>")
         engine_client.close()
         return job_id
 
@@ -676,6 +799,32 @@ def solve_project_dir(pd):
     return str(pd).replace(os.sep, "/")
 
 
+def _forward_engine_events(dag_index, engine_manager, engine_data, events, stop_requested):
+    """Runs an engine and puts its events into a queue until the DAG has finished.
+
+    Meant to be run in a thread of its own.
+
+    Args:
+        dag_index (int): index identifying the DAG
+        engine_manager (SpineEngineManagerBase): engine manager
+        engine_data (dict): engine data
+        events (Queue): queue for (DAG index, event type, data) tuples
+        stop_requested (threading.Event): set when running engines should stop
+    """
+    try:
+        engine_manager.run_engine(engine_data)
+    except (EngineInitFailed, RemoteEngineInitFailed) as error:
+        events.put((dag_index, "engine_init_failed", str(error)))
+        return
+    if stop_requested.is_set():
+        engine_manager.stop_engine()
+    while True:
+        event_type, data = engine_manager.get_engine_event()
+        events.put((dag_index, event_type, data))
+        if event_type in ("dag_exec_finished", "remote_execution_init_failed", "server_init_failed"):
+            break
+
+
 @unique
 class Status(IntEnum):
     """Status codes returned from headless execution."""
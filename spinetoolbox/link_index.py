@@ -0,0 +1,143 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains an index that finds connections and jumps by their end points."""
+
+
+class LinkIndex:
+    """Indexes connections or jumps by source, destination and both.
+
+    Links are indexed by their ``source`` and ``destination`` attributes at the time they are added;
+    use :meth:`rename_item` to change the end points of indexed links.
+    Queries return links in the order they were added.
+    """
+
+    def __init__(self):
+        self._serials = {}
+        self._next_serial = 0
+        self._by_source = {}
+        self._by_destination = {}
+        self._by_end_points = {}
+
+    def __contains__(self, link):
+        """Checks if an equal link exists between the same end points."""
+        return any(other == link for other in self._by_end_points.get((link.source, link.destination), {}).values())
+
+    def add(self, link):
+        """Adds a link to the index.
+
+        Args:
+            link (ConnectionBase): connection or jump
+        """
+        self._serials[id(link)] = self._next_serial
+        self._next_serial += 1
+        self._index(link)
+
+    def remove(self, link):
+        """Removes a link from the index.
+
+        Args:
+            link (ConnectionBase): connection or jump
+
+        Raises:
+            ValueError: raised if link is not in the index
+        """
+        if self._serials.pop(id(link), None) is None:
+            raise ValueError("link not in index")
+        self._unindex(link)
+
+    def rename_item(self, previous_name, new_name):
+        """Renames an end point of all links connected to given item keeping the links' order.
+
+        Args:
+            previous_name (str): item's previous name
+            new_name (str): item's new name
+        """
+        links = self.links_for_item(previous_name)
+        for link in links:
+            self._unindex(link)
+            if link.source == previous_name:
+                link.source = new_name
+            if link.destination == previous_name:
+                link.destination = new_name
+            self._index(link)
+        for link in links:
+            for index, key in self._keys(link):
+                index[key] = dict(sorted(index[key].items(), key=lambda item: self._serials[item[0]]))
+
+    def _keys(self, link):
+        """Returns lookup tables and link's keys in them."""
+        return (
+            (self._by_source, link.source),
+            (self._by_destination, link.destination),
+            (self._by_end_points, (link.source, link.destination)),
+        )
+
+    def _index(self, link):
+        """Adds link to end point lookup tables."""
+        for index, key in self._keys(link):
+            index.setdefault(key, {})[id(link)] = link
+
+    def _unindex(self, link):
+        """Removes link from end point lookup tables."""
+        for index, key in self._keys(link):
+            links = index[key]
+            del links[id(link)]
+            if not links:
+                del index[key]
+
+    def outgoing(self, name):
+        """Returns links that have given item as source.
+
+        Args:
+            name (str): item's name
+
+        Returns:
+            list of ConnectionBase: links
+        """
+        return list(self._by_source.get(name, {}).values())
+
+    def incoming(self, name):
+        """Returns links that have given item as destination.
+
+        Args:
+            name (str): item's name
+
+        Returns:
+            list of ConnectionBase: links
+        """
+        return list(self._by_destination.get(name, {}).values())
+
+    def links_for_item(self, name):
+        """Returns links that have given item as source or destination.
+
+        Args:
+            name (str): item's name
+
+        Returns:
+            list of ConnectionBase: links
+        """
+        links = dict(self._by_source.get(name, {}))
+        links.update(self._by_destination.get(name, {}))
+        return [links[key] for key in sorted(links, key=self._serials.get)]
+
+    def find(self, source_name, destination_name):
+        """Finds a link between given items.
+
+        Args:
+            source_name (str): source item's name
+            destination_name (str): destination item's name
+
+        Returns:
+            ConnectionBase: link or None if not found
+        """
+        return next(iter(self._by_end_points.get((source_name, destination_name), {}).values()), None)
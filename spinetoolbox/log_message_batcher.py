@@ -0,0 +1,194 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a batcher that collects execution log messages from engine workers and renders them in time slices."""
+import os
+import sqlite3
+import threading
+import time
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal, Slot
+from spine_engine.utils.helpers import shorten
+from .helpers import format_log_message, HTMLTagFilter
+
+FLUSH_INTERVAL = 100
+"""Time in milliseconds messages are collected before they are rendered."""
+DEFAULT_MAX_MESSAGE_RATE = 5000
+"""Default number of messages per second an item and filter may render before the rest is written to a file."""
+
+
+class LogMessageBatcher(QObject):
+    """Collects formatted log messages from any thread and hands them to project items in batches.
+
+    Messages are grouped by item and filter id so each group gets rendered in a single document edit.
+    When an item produces messages faster than the maximum rate allows, the overflow is written to a log file
+    and a link to the file is shown instead.
+    If an execution log store has been set, every message is also appended to it as a structured record.
+    """
+
+    _messages_pending = Signal()
+    flushed = Signal()
+    """Emitted after queued messages have been rendered and stored."""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, max_message_rate=DEFAULT_MAX_MESSAGE_RATE, parent=None):
+        """
+        Args:
+            flush_interval (int): milliseconds between renders
+            max_message_rate (int): maximum messages per second per item and filter; 0 means no limit
+            parent (QObject, optional): parent object
+        """
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+        self._max_messages_per_flush = None
+        self.set_max_message_rate(max_message_rate)
+        self._spill_dir = None
+        self._spill_files = {}
+        self._tag_filter = HTMLTagFilter()
+        self._log_store = None
+        self._run = None
+        self._messages_pending.connect(self._schedule_flush)
+
+    def set_max_message_rate(self, max_message_rate):
+        """Sets the rate after which messages are written to file.
+
+        Args:
+            max_message_rate (int): maximum messages per second per item and filter; 0 means no limit
+        """
+        if max_message_rate <= 0:
+            self._max_messages_per_flush = None
+            return
+        self._max_messages_per_flush = max(1, max_message_rate * self._timer.interval() // 1000)
+
+    def set_spill_directory(self, spill_dir):
+        """Sets the directory for overflow log files; None disables writing overflow to files.
+
+        Args:
+            spill_dir (str, optional): path to directory
+        """
+        self._spill_dir = spill_dir
+        self._spill_files = {}
+
+    def set_execution_log(self, log_store, run):
+        """Sets the store where messages are recorded; None disables recording.
+
+        Args:
+            log_store (ExecutionLogStore, optional): execution log store
+            run (str, optional): identifier of current execution
+        """
+        self.flush()
+        self._log_store = log_store
+        self._run = run
+
+    def put(self, item, filter_id, message, msg_type="msg", msg_text=None):
+        """Queues a message for rendering. Safe to call from any thread.
+
+        Args:
+            item (LogMixin): project item or connection the message belongs to
+            filter_id (str): filter identifier
+            message (str): formatted message
+            msg_type (str): message type for the execution log
+            msg_text (str, optional): unformatted message text for the execution log; if None, taken from message
+        """
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.append((item, filter_id, message, msg_type, msg_text, time.time()))
+        if was_empty:
+            self._messages_pending.emit()
+
+    @Slot()
+    def _schedule_flush(self):
+        """Starts the flush timer unless it is already running."""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @Slot()
+    def flush(self):
+        """Renders all queued messages."""
+        self._timer.stop()
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        if not pending:
+            return
+        batches = {}
+        for item, filter_id, message, *_ in pending:
+            batches.setdefault((item, filter_id), []).append(message)
+        for (item, filter_id), messages in batches.items():
+            if self._max_messages_per_flush is not None and len(messages) > self._max_messages_per_flush:
+                messages = self._spill(item, filter_id, messages)
+            item.add_log_messages(filter_id, messages)
+        if self._log_store is not None:
+            self._store(pending)
+        self.flushed.emit()
+
+    def _store(self, pending):
+        """Appends messages to the execution log store.
+
+        Recording is switched off if the store cannot be written.
+
+        Args:
+            pending (list of tuple): queued messages
+        """
+        records = []
+        for item, filter_id, message, msg_type, msg_text, timestamp in pending:
+            if msg_text is None:
+                msg_text = message
+            self._tag_filter.feed(msg_text)
+            records.append((self._run, timestamp, item.name, filter_id, msg_type, self._tag_filter.drain()))
+        try:
+            self._log_store.append(records)
+        except sqlite3.Error:
+            self._log_store = None
+
+    def _spill(self, item, filter_id, messages):
+        """Writes messages that exceed the rate limit to a file.
+
+        Args:
+            item (LogMixin): project item or connection
+            filter_id (str): filter identifier
+            messages (list of str): formatted messages
+
+        Returns:
+            list of str: messages to render
+        """
+        if self._spill_dir is None:
+            return messages
+        kept = messages[: self._max_messages_per_flush]
+        overflow = messages[self._max_messages_per_flush :]
+        key = (item.name, filter_id)
+        path = self._spill_files.get(key)
+        is_new_file = path is None
+        if is_new_file:
+            file_name = shorten(item.name) + ("_" + shorten(filter_id) if filter_id else "") + ".log"
+            path = os.path.join(self._spill_dir, file_name)
+        try:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as log_file:
+                for message in overflow:
+                    self._tag_filter.feed(message)
+                    log_file.write(self._tag_filter.drain() + "\n")
+        except OSError:
+            return messages
+        if is_new_file:
+            self._spill_files[key] = path
+            url = QUrl.fromLocalFile(path).toString()
+            kept.append(
+                format_log_message(
+                    "msg_warning",
+                    f"Too many messages, the rest are written to <a href='{url}'>{os.path.basename(path)}</a>",
+                )
+            )
+        return kept
@@ -24,6 +24,15 @@ class LogMixin:
         """
         self._toolbox.add_log_message(self.name, filter_id, message)
 
+    def add_log_messages(self, filter_id, messages):
+        """Adds multiple messages to the log document at once.
+
+        Args:
+            filter_id (str): filter identifier
+            messages (list of str): formatted messages
+        """
+        self._toolbox.add_log_messages(self.name, filter_id, messages)
+
     def add_event_message(self, filter_id, msg_type, msg_text):
         """Adds a message to the log document.
 
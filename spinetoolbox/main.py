@@ -20,7 +20,7 @@ plugin_path = os.path.join(dirname, "plugins", "platforms")
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = plugin_path
 
 # pylint: disable=wrong-import-position, wrong-import-order
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 import sys
 import logging
 from PySide6.QtCore import QTimer
@@ -33,6 +33,7 @@ from spine_items import resources_icons_rc  # pylint: disable=unused-import
 
 from .ui_main import ToolboxUI
 from .version import __version__
+from .dag_scheduler import parse_memory_size
 from .headless import headless_main, Status
 from .helpers import pyside6_version_check
 
@@ -98,9 +99,63 @@ def _make_argument_parser():
         metavar="ITEM",
     )
     parser.add_argument("--execute-remotely", help="execute remotely", action="append", metavar="SERVER CONFIG FILE")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="headless mode: maximum number of DAGs to execute concurrently (default: number of CPUs)",
+        type=_positive_int,
+        metavar="N",
+    )
+    parser.add_argument(
+        "--max-memory",
+        help="headless mode: memory budget for concurrently executing DAGs, e.g. 512M or 4G",
+        type=_memory_size,
+        metavar="SIZE",
+    )
+    parser.add_argument(
+        "--force",
+        help="headless mode: execute all permitted items even if their inputs have not changed",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--keep-going", help="headless mode: keep executing other DAGs when a DAG fails", action="store_true"
+    )
     return parser
 
 
+def _positive_int(text):
+    """Converts command line argument to a positive integer.
+
+    Args:
+        text (str): argument
+
+    Returns:
+        int: converted value
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid integer '{text}'")
+    if value < 1:
+        raise ArgumentTypeError("value must be at least 1")
+    return value
+
+
+def _memory_size(text):
+    """Converts command line argument to memory size in bytes.
+
+    Args:
+        text (str): argument
+
+    Returns:
+        int: size in bytes
+    """
+    try:
+        return parse_memory_size(text)
+    except ValueError as error:
+        raise ArgumentTypeError(str(error))
+
+
 def _add_pywin32_system32_to_path():
     """Adds a directory to PATH on Windows that is required to make pywin32 work
     on (Conda) Python 3.8. See https://github.com/spine-tools/Spine-Toolbox/issues/1230."""
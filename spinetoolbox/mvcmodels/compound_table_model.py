@@ -12,10 +12,45 @@
 
 """Models that vertically concatenate two or more table models."""
 import bisect
+import numpy as np
 from PySide6.QtCore import Qt, Signal, Slot, QModelIndex, QTimer
 from ..mvcmodels.minimal_table_model import MinimalTableModel
 
 
+class _RowBlock:
+    """Accepted rows of a single sub model in the compound model."""
+
+    __slots__ = ("model", "rows", "_positions")
+
+    def __init__(self, model, rows):
+        """
+        Args:
+            model (MinimalTableModel): sub model
+            rows (range or numpy.ndarray): accepted sub model rows in ascending order
+        """
+        self.model = model
+        self.rows = rows
+        self._positions = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def position(self, sub_row):
+        """Returns the position of given sub model row within the block.
+
+        Args:
+            sub_row (int): row in sub model
+
+        Returns:
+            int: position or None if the row has not been accepted
+        """
+        if isinstance(self.rows, range):
+            return sub_row if 0 <= sub_row < len(self.rows) else None
+        if self._positions is None:
+            self._positions = dict(zip(self.rows.tolist(), range(len(self.rows))))
+        return self._positions.get(sub_row)
+
+
 class CompoundTableModel(MinimalTableModel):
     """A model that concatenates several sub table models vertically."""
 
@@ -30,8 +65,11 @@ class CompoundTableModel(MinimalTableModel):
         """
         super().__init__(parent=parent, header=header)
         self.sub_models = []
-        self._row_map = []  # Maps compound row to tuple (sub_model, sub_row)
-        self._inv_row_map = {}  # Maps tuple (sub_model, sub_row) to compound row
+        self._row_blocks = []  # Accepted rows of sub models in compound order
+        self._row_offsets = []  # First compound row of each row block
+        self._block_index = {}  # Maps sub model to its index in _row_blocks
+        self._row_count = 0
+        self._accepted_row_cache = {}  # Maps sub model to tuple (sub model row count, accepted rows)
         self._next_sub_model = None
 
     def map_to_sub(self, index):
@@ -43,12 +81,9 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             QModelIndex: the equivalent index in one of the submodels
         """
-        if not index.isValid():
-            return QModelIndex()
-        try:
-            sub_model, sub_row = self._row_map[index.row()]
-        except IndexError:
+        if not index.isValid() or not 0 <= index.row() < self._row_count:
             return QModelIndex()
+        sub_model, sub_row = self._sub_row_at(index.row())
         return sub_model.index(sub_row, index.column())
 
     def map_from_sub(self, sub_model, sub_index):
@@ -61,12 +96,49 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             QModelIndex: the equivalent index in the compound model
         """
-        try:
-            row = self._inv_row_map[sub_model, sub_index.row()]
-        except KeyError:
+        row = self._compound_row(sub_model, sub_index.row())
+        if row is None:
             return QModelIndex()
         return self.index(row, sub_index.column())
 
+    def _sub_row_at(self, row):
+        """Finds the sub model and sub model row corresponding to given compound row.
+
+        Args:
+            row (int): row in compound model; negative rows count from the end
+
+        Returns:
+            tuple: sub model and row in sub model
+
+        Raises:
+            IndexError: raised if row is out of range
+        """
+        if row < 0:
+            row += self._row_count
+        if not 0 <= row < self._row_count:
+            raise IndexError("compound row out of range")
+        block_index = bisect.bisect_right(self._row_offsets, row) - 1
+        block = self._row_blocks[block_index]
+        return block.model, int(block.rows[row - self._row_offsets[block_index]])
+
+    def _compound_row(self, sub_model, sub_row):
+        """Finds the compound row corresponding to given sub model row.
+
+        Args:
+            sub_model (MinimalTableModel): sub model
+            sub_row (int): row in sub model
+
+        Returns:
+            int: row in compound model or None if sub model row is not in the compound model
+        """
+        block_index = self._block_index.get(sub_model)
+        if block_index is None:
+            return None
+        position = self._row_blocks[block_index].position(sub_row)
+        if position is None:
+            return None
+        return self._row_offsets[block_index] + position
+
     def item_at_row(self, row):
         """Returns the item at given row.
 
@@ -76,7 +148,7 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             object
         """
-        sub_model, sub_row = self._row_map[row]
+        sub_model, sub_row = self._sub_row_at(row)
         return sub_model._main_data[sub_row]
 
     def sub_model_at_row(self, row):
@@ -88,7 +160,7 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             MinimalTableModel
         """
-        sub_model, _ = self._row_map[row]
+        sub_model, _ = self._sub_row_at(row)
         return sub_model
 
     def sub_model_row(self, row):
@@ -100,7 +172,7 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             int: row in sub model
         """
-        _, sub_row = self._row_map[row]
+        _, sub_row = self._sub_row_at(row)
         return sub_row
 
     @Slot()
@@ -113,48 +185,89 @@ class CompoundTableModel(MinimalTableModel):
             self.fetchMore(QModelIndex())
 
     def _do_refresh(self):
-        """Recomputes the row and inverse row maps."""
-        self._row_map.clear()
-        self._inv_row_map.clear()
-        for model in self.sub_models:
-            row_map = self._row_map_for_model(model)
-            self._append_row_map(row_map)
+        """Recomputes the row map.
+
+        Accepted rows are recomputed only for sub models whose rows have been invalidated."""
+        self._accepted_row_cache = {
+            model: cached for model, cached in self._accepted_row_cache.items() if model in self.sub_models
+        }
+        self._replace_row_blocks(0, len(self._row_blocks), map(self._row_block_for_model, self.sub_models))
         self.refreshed.emit()
 
-    def _append_row_map(self, row_map):
-        """Appends given row map to the tail of the model.
+    def _replace_row_blocks(self, first, last, blocks):
+        """Replaces row blocks in given range by new blocks and updates offsets.
 
         Args:
-            row_map (list): tuples (model, row number)
+            first (int): index of first block to replace
+            last (int): index after last block to replace
+            blocks (Iterable of _RowBlock): new blocks; None items are skipped
         """
-        for model_row_tup in row_map:
-            self._inv_row_map[model_row_tup] = self.rowCount()
-            self._row_map.append(model_row_tup)
-
-    def _row_map_iterator_for_model(self, model):
-        """Yields row map for given model.
-        The base class implementation just yields all model rows.
+        self._row_blocks[first:last] = [block for block in blocks if block is not None]
+        del self._row_offsets[first:]
+        row = self._row_offsets[-1] + len(self._row_blocks[first - 1]) if first > 0 else 0
+        for block_index in range(first, len(self._row_blocks)):
+            self._row_offsets.append(row)
+            row += len(self._row_blocks[block_index])
+        self._row_count = row
+        self._block_index = {block.model: block_index for block_index, block in enumerate(self._row_blocks)}
+
+    def filter_accepts_model(self, model):
+        """Returns True if given sub model is shown in the compound model.
+        The base class implementation accepts all models.
 
         Args:
             model (MinimalTableModel)
 
-        Yields:
-            tuple: (model, row number)
+        Returns:
+            bool
         """
-        for i in range(model.rowCount()):
-            yield (model, i)
+        return True
 
-    def _row_map_for_model(self, model):
-        """Returns row map for given model.
+    def _accepted_sub_rows(self, model):
+        """Returns accepted rows of given model.
         The base class implementation just returns all model rows.
 
         Args:
             model (MinimalTableModel)
 
         Returns:
-            list: tuples (model, row number)
+            Iterable of int: accepted rows in ascending order
+        """
+        return range(model.rowCount())
+
+    def _invalidate_sub_model_rows(self, model):
+        """Makes the compound model recompute the accepted rows of given sub model on next refresh.
+
+        Args:
+            model (MinimalTableModel)
+        """
+        self._accepted_row_cache.pop(model, None)
+
+    def _row_block_for_model(self, model):
+        """Returns row block for given model.
+
+        Args:
+            model (MinimalTableModel)
+
+        Returns:
+            _RowBlock: row block or None if model has no accepted rows
         """
-        return list(self._row_map_iterator_for_model(model))
+        if not self.filter_accepts_model(model):
+            return None
+        row_count = model.rowCount()
+        cached = self._accepted_row_cache.get(model)
+        if cached is not None and cached[0] == row_count:
+            rows = cached[1]
+        else:
+            rows = self._accepted_sub_rows(model)
+            if not isinstance(rows, range):
+                rows = rows if isinstance(rows, np.ndarray) else np.fromiter(rows, dtype=np.int64)
+                if len(rows) == row_count:
+                    rows = range(row_count)
+            self._accepted_row_cache[model] = row_count, rows
+        if len(rows) == 0:
+            return None
+        return _RowBlock(model, rows)
 
     def canFetchMore(self, parent):
         """Returns True if any of the submodels that haven't been fetched yet can fetch more."""
@@ -176,9 +289,33 @@ class CompoundTableModel(MinimalTableModel):
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         return self.map_to_sub(index).data(role)
 
+    def bulk_data(self, rows, columns, role=Qt.ItemDataRole.EditRole):
+        """Returns the data of a block of cells column by column fetching it from each sub model in one go.
+
+        Args:
+            rows (Sequence of int): rows
+            columns (Sequence of int): columns
+            role (int): data role
+
+        Returns:
+            list of list: data of each column in the order of ``rows``
+        """
+        sub_rows_by_model = {}
+        for position, row in enumerate(rows):
+            sub_model, sub_row = self._sub_row_at(row)
+            positions, sub_rows = sub_rows_by_model.setdefault(sub_model, ([], []))
+            positions.append(position)
+            sub_rows.append(sub_row)
+        data = [len(rows) * [None] for _ in columns]
+        for sub_model, (positions, sub_rows) in sub_rows_by_model.items():
+            for column_data, sub_column_data in zip(data, sub_model.bulk_data(sub_rows, columns, role)):
+                for position, value in zip(positions, sub_column_data):
+                    column_data[position] = value
+        return data
+
     def rowCount(self, parent=QModelIndex()):
         """Returns the sum of rows in all models."""
-        return len(self._row_map)
+        return self._row_count
 
     def batch_set_data(self, indexes, data):
         """Sets data for indexes in batch.
@@ -195,8 +332,8 @@ class CompoundTableModel(MinimalTableModel):
                 continue
             rows.append(index.row())
             columns.append(index.column())
-            sub_model, _ = self._row_map[index.row()]
             sub_index = self.map_to_sub(index)
+            sub_model = sub_index.model()
             d.setdefault(sub_model, list()).append((sub_index, value))
         for model, index_value_tuples in d.items():
             indexes, values = zip(*index_value_tuples)
@@ -220,9 +357,9 @@ class CompoundTableModel(MinimalTableModel):
         if count < 1:
             return False
         if row < self.rowCount():
-            sub_model, sub_row = self._row_map[row]
+            sub_model, sub_row = self._sub_row_at(row)
         else:
-            sub_model, sub_row = self._row_map[-1]
+            sub_model, sub_row = self._sub_row_at(-1)
             sub_row += 1
         self.beginInsertRows(parent, row, row + count - 1)
         sub_model.insertRows(sub_row, count, self.map_to_sub(parent))
@@ -243,12 +380,12 @@ class CompoundTableModel(MinimalTableModel):
         self.beginRemoveRows(parent, first, last)
         while first <= last:
             try:
-                sub_model, sub_row = self._row_map[first]
+                sub_model, sub_row = self._sub_row_at(first)
                 sub_count = min(sub_model.rowCount(), count)
                 first += sub_count
                 count -= sub_count
             except IndexError:
-                sub_model, sub_row = self._row_map[-1]
+                sub_model, sub_row = self._sub_row_at(-1)
                 sub_count = min(sub_model.rowCount(), count)
                 break
             finally:
@@ -291,6 +428,7 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
         """Connects signals so changes in the submodels are acknowledged by the compound."""
         model.modelReset.connect(lambda model=model: self._handle_single_model_reset(model))
         model.modelAboutToBeReset.connect(lambda model=model: self._handle_single_model_about_to_be_reset(model))
+        model.dataChanged.connect(lambda *args, model=model: self._invalidate_sub_model_rows(model))
         model.dataChanged.connect(
             lambda top_left, bottom_right, roles, model=model: self.dataChanged.emit(
                 self.map_from_sub(model, top_left), self.map_from_sub(model, bottom_right), roles
@@ -299,19 +437,15 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
 
     def _recompute_empty_row_map(self):
         """Recomputes the part of the row map corresponding to the empty model."""
-        empty_row_map = self._row_map_for_model(self.empty_model)
-        try:
-            row = self._inv_row_map[self.empty_model, 0]
-            self._row_map = self._row_map[:row]
-        except KeyError:
-            pass
-        self._append_row_map(empty_row_map)
+        self._invalidate_sub_model_rows(self.empty_model)
+        first = self._block_index.get(self.empty_model, len(self._row_blocks))
+        self._replace_row_blocks(first, len(self._row_blocks), [self._row_block_for_model(self.empty_model)])
 
     @Slot(QModelIndex, int, int)
     def _handle_empty_rows_removed(self, parent, empty_first, empty_last):
         """Updates row_map when rows are removed from the empty model."""
-        first = self._inv_row_map[self.empty_model, empty_first]
-        last = self._inv_row_map[self.empty_model, empty_last]
+        first = self._compound_row(self.empty_model, empty_first)
+        last = self._compound_row(self.empty_model, empty_last)
         self.beginRemoveRows(QModelIndex(), first, last)
         self._recompute_empty_row_map()
         self.endRemoveRows()
@@ -322,30 +456,24 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
         Updates row_map, then emits rowsInserted so the new rows become visible.
         """
         self._recompute_empty_row_map()
-        first = self._inv_row_map[self.empty_model, empty_first]
-        last = self._inv_row_map[self.empty_model, empty_last]
+        first = self._compound_row(self.empty_model, empty_first)
+        last = self._compound_row(self.empty_model, empty_last)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _handle_single_model_about_to_be_reset(self, model):
         """Runs when given model is about to reset."""
         if model not in self.single_models:
             return
-        row_map = self._row_map_for_model(model)
-        if not row_map:
-            return
-        try:
-            first = self._inv_row_map[row_map[0]]
-        except KeyError:
-            # Sometimes the submodel may get reset before it has been added to the inverted row map.
+        self._invalidate_sub_model_rows(model)
+        block_index = self._block_index.get(model)
+        if block_index is None:
+            # Sometimes the submodel may get reset before it has been added to the row map.
             # In this case there are no rows to remove, so we can bail out here.
             return
-        last = first + len(row_map) - 1
-        tail_row_map = self._row_map[last + 1 :]
+        first = self._row_offsets[block_index]
+        last = first + len(self._row_blocks[block_index]) - 1
         self.beginRemoveRows(QModelIndex(), first, last)
-        for key in self._row_map[first:]:
-            del self._inv_row_map[key]
-        self._row_map[first:] = []
-        self._append_row_map(tail_row_map)
+        self._replace_row_blocks(block_index, block_index + 1, ())
         self.endRemoveRows()
 
     def _handle_single_model_reset(self, model):
@@ -356,54 +484,50 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
             self._insert_single_model(model)
 
     def _refresh_single_model(self, model):
-        single_row_map = self._row_map_for_model(model)
+        self._invalidate_sub_model_rows(model)
+        block = self._row_block_for_model(model)
         pos = self.single_models.index(model) + 1
-        self._insert_row_map(pos, single_row_map)
+        self._insert_row_block(pos, block)
 
     def _get_insert_position(self, model):
         return bisect.bisect_left(self.single_models, model)
 
     def _insert_single_model(self, model):
-        single_row_map = self._row_map_for_model(model)
+        block = self._row_block_for_model(model)
         pos = self._get_insert_position(model)
-        self._insert_row_map(pos, single_row_map)
+        self._insert_row_block(pos, block)
         self.sub_models.insert(pos, model)
 
-    def _get_row_for_insertion(self, pos):
+    def _get_block_index_for_insertion(self, pos):
         for model in self.sub_models[pos:]:
-            first_row_map_item = next(self._row_map_iterator_for_model(model), None)
-            if first_row_map_item is not None:
-                try:
-                    return self._inv_row_map[first_row_map_item]
-                except KeyError:
-                    # Sometimes the submodel is not yet in the inverted row map.
-                    # In this case we just skip it and try another insertion point.
-                    pass
-        return self.rowCount()
-
-    def _insert_row_map(self, pos, single_row_map):
-        if not single_row_map:
+            block_index = self._block_index.get(model)
+            if block_index is not None:
+                return block_index
+        return len(self._row_blocks)
+
+    def _insert_row_block(self, pos, block):
+        if block is None:
             # Emit layoutChanged to trigger fetching.
             # The QTimer is to avoid funny situations where the user enters new data via the empty row model,
             # and those rows need to be removed at the same time as we fetch the added data.
             # Doing it in the same loop cycle was causing bugs.
             QTimer.singleShot(0, self.layoutChanged.emit)
             return
-        row = self._get_row_for_insertion(pos)
-        last = row + len(single_row_map) - 1
+        block_index = self._get_block_index_for_insertion(pos)
+        row = self._row_offsets[block_index] if block_index < len(self._row_blocks) else self._row_count
+        last = row + len(block) - 1
         self.beginInsertRows(QModelIndex(), row, last)
-        self._row_map, tail_row_map = self._row_map[:row], self._row_map[row:]
-        self._append_row_map(single_row_map)
-        self._append_row_map(tail_row_map)
+        self._replace_row_blocks(block_index, block_index, [block])
         self.endInsertRows()
 
     def clear_model(self):
         """Clears the model."""
-        if self._row_map:
+        if self._row_count:
             self.beginResetModel()
-            self._row_map.clear()
+            self._replace_row_blocks(0, len(self._row_blocks), ())
             self.endResetModel()
         for m in self.sub_models:
             m.deleteLater()
         self.sub_models.clear()
-        self._inv_row_map.clear()
+        self._replace_row_blocks(0, len(self._row_blocks), ())
+        self._accepted_row_cache.clear()
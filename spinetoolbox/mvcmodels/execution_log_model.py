@@ -0,0 +1,178 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a table model that shows records of an execution log store."""
+from collections import OrderedDict
+from datetime import datetime
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+PAGE_SIZE = 500
+"""Number of records fetched from the store at once."""
+MAX_CACHED_PAGES = 20
+"""Number of pages kept in memory."""
+
+
+class ExecutionLogModel(QAbstractTableModel):
+    """A model that fetches execution log records from the store page by page as the view asks for them."""
+
+    HEADER = ("Time", "Item", "Filter", "Type", "Message")
+    _TIME_COLUMN = 0
+    _ITEM_COLUMN = 1
+    _FILTER_COLUMN = 2
+    _TYPE_COLUMN = 3
+    _TEXT_COLUMN = 4
+    _RECORD_FIELDS = {_TIME_COLUMN: 2, _ITEM_COLUMN: 3, _FILTER_COLUMN: 4, _TYPE_COLUMN: 5, _TEXT_COLUMN: 6}
+    _COLORS = {
+        "msg_success": QColor(Qt.GlobalColor.darkGreen),
+        "msg_warning": QColor(Qt.GlobalColor.darkYellow),
+        "msg_error": QColor(Qt.GlobalColor.red),
+        "stderr": QColor(Qt.GlobalColor.red),
+    }
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent (QObject, optional): parent object
+        """
+        super().__init__(parent)
+        self._store = None
+        self._criteria = {"run": None, "item": None, "filter_id": None, "search": ""}
+        self._row_count = 0
+        self._last_id = 0
+        self._pages = OrderedDict()
+        self._page_starts = {}
+
+    def set_store(self, store):
+        """Sets the execution log store and resets the model.
+
+        Args:
+            store (ExecutionLogStore, optional): log store
+        """
+        self._store = store
+        self._reset()
+
+    def set_filter(self, run=None, item=None, filter_id=None, search=""):
+        """Sets the criteria records need to match and resets the model.
+
+        Args:
+            run (str, optional): run identifier; None matches all runs
+            item (str, optional): item name; None matches all items
+            filter_id (str, optional): filter id; None matches all filters
+            search (str): text to search for
+        """
+        self._criteria = {"run": run, "item": item, "filter_id": filter_id, "search": search}
+        self._reset()
+
+    def _reset(self):
+        """Recounts rows and drops cached pages."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._page_starts = {0: 0}
+        if self._store is not None:
+            self._last_id = self._store.last_id()
+            self._row_count = self._store.count(**self._criteria)
+        else:
+            self._last_id = 0
+            self._row_count = 0
+        self.endResetModel()
+
+    def refresh(self):
+        """Appends rows for records that have been added to the store since last reset or refresh."""
+        if self._store is None:
+            return
+        last_id = self._store.last_id()
+        if last_id == self._last_id:
+            return
+        new_row_count = self._store.count(**self._criteria, after_id=self._last_id)
+        self._last_id = last_id
+        if new_row_count == 0:
+            return
+        if self._row_count % PAGE_SIZE != 0:
+            self._pages.pop(self._row_count // PAGE_SIZE, None)
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + new_row_count - 1)
+        self._row_count += new_row_count
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADER)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADER[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            record = self._record(index.row())
+            value = record[self._RECORD_FIELDS[index.column()]]
+            if index.column() == self._TIME_COLUMN:
+                return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+            return value
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == self._TEXT_COLUMN:
+            return self._record(index.row())[self._RECORD_FIELDS[self._TEXT_COLUMN]]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._COLORS.get(self._record(index.row())[self._RECORD_FIELDS[self._TYPE_COLUMN]])
+        return None
+
+    def _record(self, row):
+        """Returns record at given row fetching its page from the store if needed.
+
+        Args:
+            row (int): row
+
+        Returns:
+            tuple: (id, run, time, item, filter id, type, text) record
+        """
+        page_number = row // PAGE_SIZE
+        page = self._pages.get(page_number)
+        if page is None:
+            page = self._store.fetch(self._page_start(page_number), PAGE_SIZE, **self._criteria)
+            if len(page) == PAGE_SIZE:
+                self._page_starts[page_number + 1] = page[-1][0]
+            self._pages[page_number] = page
+            if len(self._pages) > MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_number)
+        return page[row % PAGE_SIZE]
+
+    def _page_start(self, page_number):
+        """Returns the id after which given page starts.
+
+        Pages are fetched by record id rather than by offset.
+        If the page has not been reached by fetching its predecessors,
+        its start is found by skipping rows from the nearest known page start.
+
+        Args:
+            page_number (int): page number
+
+        Returns:
+            int: record id
+        """
+        start = self._page_starts.get(page_number)
+        if start is None:
+            known_page = max(number for number in self._page_starts if number < page_number)
+            start = self._store.skip(
+                self._page_starts[known_page], (page_number - known_page) * PAGE_SIZE, **self._criteria
+            )
+            self._page_starts[page_number] = start
+        return start
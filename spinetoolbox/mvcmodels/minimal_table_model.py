@@ -10,7 +10,7 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
 
-""" Contains a minimal table model. """
+"""Contains a minimal table model."""
 from PySide6.QtCore import Qt, QModelIndex, QAbstractTableModel
 
 
@@ -125,6 +125,21 @@ class MinimalTableModel(QAbstractTableModel):
         except IndexError:
             return None
 
+    def bulk_data(self, rows, columns, role=Qt.ItemDataRole.EditRole):
+        """Returns the data of a block of cells column by column.
+
+        Args:
+            rows (Sequence of int): rows
+            columns (Sequence of int): columns
+            role (int): data role
+
+        Returns:
+            list of list: data of each column in the order of ``rows``
+        """
+        index = self.index
+        data = self.data
+        return [[data(index(row, column), role) for row in rows] for column in columns]
+
     def row_data(self, row, role=Qt.ItemDataRole.DisplayRole):
         """Returns the data stored under the given role for the given row.
 
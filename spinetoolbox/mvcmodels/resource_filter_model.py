@@ -10,7 +10,8 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
 
-""" Contains ResourceFilterModel. """
+"""Contains ResourceFilterModel."""
+from bisect import bisect_left
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 from spinedb_api.filters.alternative_filter import ALTERNATIVE_FILTER_TYPE
@@ -47,13 +48,7 @@ class ResourceFilterModel(QStandardItemModel):
 
         def append_filter_items(parent_item, filter_names, filter_type, online, online_default, enabled):
             for name in filter_names[filter_type]:
-                filter_item = QStandardItem(name)
-                filter_item.setCheckState(
-                    Qt.CheckState.Checked if online.get(name, online_default) else Qt.CheckState.Unchecked
-                )
-                filter_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsUserCheckable)
-                filter_item.setEnabled(enabled)
-                parent_item.appendRow(filter_item)
+                parent_item.appendRow(self._make_filter_item(name, online.get(name, online_default), enabled))
 
         self.clear()
         self.setHorizontalHeaderItem(0, QStandardItem("DB resource filters"))
@@ -91,6 +86,62 @@ class ResourceFilterModel(QStandardItemModel):
                 self._set_all_selected_item(resource_label, filter_parent)
         self.tree_built.emit()
 
+    @staticmethod
+    def _make_filter_item(name, is_online, enabled):
+        """Creates a checkable filter item.
+
+        Args:
+            name (str): filter name
+            is_online (bool): True if filter is online
+            enabled (bool): True if filter type is enabled
+
+        Returns:
+            QStandardItem: filter item
+        """
+        filter_item = QStandardItem(name)
+        filter_item.setCheckState(Qt.CheckState.Checked if is_online else Qt.CheckState.Unchecked)
+        filter_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsUserCheckable)
+        filter_item.setEnabled(enabled)
+        return filter_item
+
+    def update_filter_names(self, resource_label, filter_type, added, removed):
+        """Inserts and removes filter items without rebuilding the entire tree.
+
+        Falls back to rebuilding if the resource or filter type has no filter items yet or loses all of them.
+
+        Args:
+            resource_label (str): resource label
+            filter_type (str): filter type
+            added (set of str): new filter names
+            removed (set of str): filter names to remove
+        """
+        if not self.findItems(resource_label):
+            if added:
+                self.build_tree()
+            return
+        filter_type_item = self._find_filter_type_item(resource_label, filter_type)
+        if filter_type_item.rowCount() == 0 or filter_type_item.child(0).text() != self._SELECT_ALL:
+            if added:
+                self.build_tree()
+            return
+        for row in reversed(range(1, filter_type_item.rowCount())):
+            if filter_type_item.child(row).text() in removed:
+                filter_type_item.removeRow(row)
+        if not added and filter_type_item.rowCount() == 1:
+            self.build_tree()
+            return
+        if added:
+            online = self._connection.online_filters(resource_label, filter_type)
+            online_default = self._connection.is_filter_online_by_default
+            enabled = self._connection.is_filter_type_enabled(filter_type)
+            names = [filter_type_item.child(row).text() for row in range(1, filter_type_item.rowCount())]
+            for name in sorted(added):
+                row = bisect_left(names, name)
+                names.insert(row, name)
+                filter_item = self._make_filter_item(name, online.get(name, online_default), enabled)
+                filter_type_item.insertRow(row + 1, [filter_item])
+        self._set_all_selected_item(resource_label, filter_type_item, True)
+
     def fetch_filters(self):
         filters = {}
         for resource in self._connection.database_resources:
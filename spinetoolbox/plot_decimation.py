@@ -0,0 +1,163 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains level-of-detail decimation for line plots of large data."""
+import numpy as np
+
+POINTS_PER_BUCKET = 4
+"""Maximum number of points decimation keeps per bucket."""
+
+
+def min_max_decimate(x, y, bucket_count):
+    """Selects the first, last, minimum and maximum point of each bucket.
+
+    Buckets divide the x range into equal-width intervals, typically one per pixel column.
+    A line drawn through the selected points is indistinguishable from a line drawn through all points
+    at that resolution.
+
+    Args:
+        x (ndarray): numeric x values in ascending order
+        y (ndarray): numeric y values
+        bucket_count (int): number of buckets
+
+    Returns:
+        ndarray: indexes of selected points in ascending order
+    """
+    point_count = len(x)
+    if point_count <= POINTS_PER_BUCKET * bucket_count:
+        return np.arange(point_count)
+    span = x[-1] - x[0]
+    if span > 0:
+        buckets = np.minimum(((x - x[0]) * (bucket_count / span)).astype(np.int64), bucket_count - 1)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    else:
+        starts = np.zeros(1, dtype=np.int64)
+    counts = np.diff(np.append(starts, point_count))
+    ends = starts + counts - 1
+    y = np.asarray(y, dtype=float)
+    minimums = _first_extreme_indexes(y, starts, counts, np.fmin)
+    maximums = _first_extreme_indexes(y, starts, counts, np.fmax)
+    return np.unique(np.concatenate((starts, ends, minimums, maximums)))
+
+
+def _first_extreme_indexes(y, starts, counts, reduce_function):
+    """Finds the first index of each bucket's extreme value.
+
+    Args:
+        y (ndarray): y values
+        starts (ndarray): indexes of buckets' first points
+        counts (ndarray): numbers of points in buckets
+        reduce_function (numpy.ufunc): either ``numpy.fmin`` or ``numpy.fmax``
+
+    Returns:
+        ndarray: indexes of extreme values; buckets that contain only NaNs get their first index
+    """
+    extremes = reduce_function.reduceat(y, starts)
+    positions = np.flatnonzero(y == np.repeat(extremes, counts))
+    if positions.size == 0:
+        return starts
+    indexes = positions[np.minimum(np.searchsorted(positions, starts), positions.size - 1)]
+    return np.where((indexes >= starts) & (indexes < starts + counts), indexes, starts)
+
+
+class LineDecimator:
+    """Keeps full resolution data of lines on an axes and feeds decimated data to the lines.
+
+    Lines are re-decimated for the visible x range whenever the axes get zoomed or panned.
+    """
+
+    def __init__(self, axes):
+        """
+        Args:
+            axes (Axes): axes whose lines to decimate
+        """
+        self._axes = axes
+        self._lines = []
+        self._callbacks = axes.callbacks
+        self._callback_id = self._callbacks.connect("xlim_changed", self._update_visible)
+
+    def is_connected(self):
+        """Checks if decimator still follows the axes.
+
+        Clearing the axes drops their callbacks which disconnects the decimator.
+
+        Returns:
+            bool: True if decimator is connected to axes, False otherwise
+        """
+        return self._axes.callbacks is self._callbacks
+
+    def add_line(self, line):
+        """Starts decimating a line if it has enough points.
+
+        Only lines that have numeric or datetime x data in ascending order are decimated.
+
+        Args:
+            line (Line2D): line to decimate
+
+        Returns:
+            bool: True if line is decimated, False otherwise
+        """
+        x = np.asarray(line.get_xdata(orig=True))
+        y = np.asarray(line.get_ydata(orig=True))
+        if x.dtype.kind not in "fiuM" or y.dtype.kind not in "fiu":
+            return False
+        if len(x) <= POINTS_PER_BUCKET * self._bucket_count():
+            return False
+        numeric_x = np.asarray(self._axes.convert_xunits(x), dtype=float)
+        if np.any(np.diff(numeric_x) < 0.0):
+            return False
+        self._lines.append((line, x, y, numeric_x))
+        self._decimate(line, x, y, numeric_x, 0, len(x))
+        return True
+
+    def update(self):
+        """Re-decimates all lines for current view."""
+        self._update_visible(self._axes)
+
+    def disconnect(self):
+        """Stops listening to view changes and forgets lines."""
+        self._callbacks.disconnect(self._callback_id)
+        self._lines.clear()
+
+    def _bucket_count(self):
+        """Returns number of buckets for current axes width.
+
+        Returns:
+            int: one bucket per pixel column
+        """
+        return max(1, int(round(self._axes.bbox.width)))
+
+    def _update_visible(self, axes):
+        """Decimates lines for the visible x range.
+
+        Args:
+            axes (Axes): axes whose view changed
+        """
+        left, right = sorted(axes.get_xlim())
+        for line, x, y, numeric_x in self._lines:
+            first = max(0, np.searchsorted(numeric_x, left, side="left") - 1)
+            last = min(len(x), np.searchsorted(numeric_x, right, side="right") + 1)
+            self._decimate(line, x, y, numeric_x, first, last)
+
+    def _decimate(self, line, x, y, numeric_x, first, last):
+        """Sets decimated data of given range to line.
+
+        Args:
+            line (Line2D): line
+            x (ndarray): full x data
+            y (ndarray): full y data
+            numeric_x (ndarray): x data converted to floats
+            first (int): index of first point in range
+            last (int): index one past the last point in range
+        """
+        indexes = min_max_decimate(numeric_x[first:last], y[first:last], self._bucket_count()) + first
+        line.set_data(x[indexes], y[indexes])
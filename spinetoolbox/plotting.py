@@ -17,7 +17,7 @@ import math
 from contextlib import contextmanager
 from dataclasses import dataclass, field, replace
 import functools
-from operator import methodcaller, itemgetter
+from operator import methodcaller
 from typing import Dict, List, Optional, Union
 from matplotlib.patches import Patch
 from matplotlib.ticker import MaxNLocator
@@ -47,6 +47,8 @@ _BASE_SETTINGS = {"alpha": 0.7}
 _SCATTER_PLOT_SETTINGS = {"linestyle": "", "marker": "o"}
 _LINE_PLOT_SETTINGS = {"linestyle": "solid"}
 _SCATTER_LINE_PLOT_SETTINGS = dict(_SCATTER_PLOT_SETTINGS, **_LINE_PLOT_SETTINGS)
+_DECIMATED_PLOT_TYPES = (PlotType.SCATTER_LINE, PlotType.LINE)
+_NATIVE_X_TYPES = {float, int, str, np.float64, np.int64}
 
 
 class PlottingError(Exception):
@@ -59,17 +61,64 @@ class IndexName:
     id: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class XYData:
-    """Two-dimensional data for plotting."""
+    """Two-dimensional data for plotting.
+
+    Sequences given as x and y are converted to NumPy arrays.
+    """
 
-    x: List[Union[float, int, str, np.datetime64]]
-    y: List[Union[float, int]]
+    x: np.ndarray
+    y: np.ndarray
     x_label: IndexName
     y_label: str
     data_index: List[str]
     index_names: List[IndexName]
 
+    def __post_init__(self):
+        object.__setattr__(self, "x", _to_x_array(self.x))
+        object.__setattr__(self, "y", np.asarray(self.y))
+
+    def __eq__(self, other):
+        if not isinstance(other, XYData):
+            return NotImplemented
+        return (
+            np.array_equal(self.x, other.x)
+            and np.array_equal(self.y, other.y)
+            and self.x_label == other.x_label
+            and self.y_label == other.y_label
+            and self.data_index == other.data_index
+            and self.index_names == other.index_names
+        )
+
+
+def _to_x_array(x):
+    """Converts x values to NumPy array.
+
+    Values of mixed or non-native types are stored as objects so their types can still be checked.
+
+    Args:
+        x (Sequence): x values
+
+    Returns:
+        ndarray: x values
+    """
+    if isinstance(x, np.ndarray):
+        return x
+    if not x:
+        return np.array([], dtype=float)
+    types = set(map(type, x))
+    if len(types) == 1:
+        x_type = next(iter(types))
+        if x_type is np.datetime64:
+            # Time stamps come from the indexes of a single value so they share the same unit.
+            return np.array(x, dtype=x[0].dtype)
+        if x_type in _NATIVE_X_TYPES:
+            return np.array(x)
+    array = np.empty(len(x), dtype=object)
+    array[:] = x
+    return array
+
 
 @dataclass
 class TreeNode:
@@ -100,7 +149,14 @@ def convert_indexed_value_to_tree(value):
         ValueError: raised when leaf value couldn't be converted to float
     """
     d = TreeNode(value.index_name)
-    for index, x in zip(value.indexes, value.values):
+    values = value.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+        d.content = dict(zip(value.indexes, values.astype(float).tolist()))
+        return d
+    if set(map(type, values)) <= {float, int}:
+        d.content = dict(zip(value.indexes, map(float, values)))
+        return d
+    for index, x in zip(value.indexes, values):
         if isinstance(x, IndexedValue):
             x = convert_indexed_value_to_tree(x)
         else:
@@ -132,15 +188,18 @@ def turn_node_to_xy_data(root_node, y_label_position, index_names=None, indexes=
         root_node.label if isinstance(root_node.label, IndexName) else IndexName(root_node.label, len(index_names))
     )
     current_index_names = index_names + [index_name]
-    x = []
-    y = []
-    for index, sub_node in root_node.content.items():
-        if isinstance(sub_node, TreeNode):
-            current_indexes = indexes + [index]
-            yield from turn_node_to_xy_data(sub_node, y_label_position, current_index_names, current_indexes)
-        else:
-            x.append(index)
-            y.append(sub_node)
+    content = root_node.content
+    if TreeNode not in set(map(type, content.values())):
+        x = list(content)
+        y = list(content.values())
+    else:
+        for index, sub_node in content.items():
+            if isinstance(sub_node, TreeNode):
+                current_indexes = indexes + [index]
+                yield from turn_node_to_xy_data(sub_node, y_label_position, current_index_names, current_indexes)
+        leaves = {index: leaf for index, leaf in content.items() if not isinstance(leaf, TreeNode)}
+        x = list(leaves)
+        y = list(leaves.values())
     if x:
         x_label = current_index_names[-1]
         y_label = indexes[y_label_position] if y_label_position is not None else ""
@@ -172,14 +231,27 @@ def raise_if_incompatible_x(data_list):
     Raises:
         PlottingError: raised if x data types don't match.
     """
-    if not data_list:
-        return
-    data = data_list[0]
-    if not data.x:
-        return
-    first_type = type(data.x[0])
-    if any(type(x) is not first_type for data in data_list for x in data.x):
-        raise PlottingError("Incompatible x axes.")
+    x_types = set()
+    for data in data_list:
+        x_types |= _x_types(data.x)
+        if len(x_types) > 1:
+            raise PlottingError("Incompatible x axes.")
+
+
+def _x_types(x):
+    """Collects the types of x values.
+
+    Args:
+        x (ndarray): x values
+
+    Returns:
+        set: dtype kind for typed arrays or the types of values for object arrays
+    """
+    if not x.size:
+        return set()
+    if x.dtype != object:
+        return {x.dtype.kind}
+    return set(map(type, x))
 
 
 def reduce_indexes(data_list):
@@ -225,13 +297,14 @@ def combine_data_with_same_indexes(data_list):
         if len(list_is) == 1:
             combined_data.append(data_list[list_is[0]])
             continue
-        combined_xy = []
-        for i in list_is:
-            combined_xy += [(x, y) for x, y in zip(data_list[i].x, data_list[i].y)]
-        combined_xy.sort(key=itemgetter(0))
-        x, y = zip(*combined_xy)
+        xs = [data_list[i].x for i in list_is]
+        if len({x.dtype for x in xs}) > 1:
+            xs = [x.astype(object) for x in xs]
+        x = np.concatenate(xs)
+        y = np.concatenate([data_list[i].y for i in list_is])
+        order = np.argsort(x, kind="stable")
         model_data = data_list[list_is[0]]
-        combined_data.append(replace(model_data, x=list(x), y=list(y)))
+        combined_data.append(replace(model_data, x=x[order], y=y[order]))
     return combined_data
 
 
@@ -261,9 +334,9 @@ def plot_data(data_list, plot_widget=None, plot_type=None):
     """
     if plot_widget is None:
         plot_widget = PlotWidget(
-            legend_axes_position=LegendPosition.BOTTOM
-            if len(data_list) < LEGEND_PLACEMENT_THRESHOLD
-            else LegendPosition.RIGHT
+            legend_axes_position=(
+                LegendPosition.BOTTOM if len(data_list) < LEGEND_PLACEMENT_THRESHOLD else LegendPosition.RIGHT
+            )
         )
         needs_redraw = False
     else:
@@ -282,7 +355,7 @@ def plot_data(data_list, plot_widget=None, plot_type=None):
     if needs_redraw:
         _clear_plot(plot_widget)
     if plot_type is None:
-        plot_type = PlotType.SCATTER_LINE if not isinstance(squeezed_data[0].x[0], np.datetime64) else PlotType.LINE
+        plot_type = PlotType.SCATTER_LINE if squeezed_data[0].x.dtype.kind != "M" else PlotType.LINE
     _limit_string_x_tick_labels(squeezed_data, plot_widget)
     y_labels = sorted({xy_data.y_label for xy_data in data_list})
     if len(y_labels) == 1 or _always_single_y_axis(plot_type):
@@ -295,7 +368,7 @@ def plot_data(data_list, plot_widget=None, plot_type=None):
     plot_title = " | ".join(map(str, common_indexes))
     plot_widget.canvas.axes.set_title(plot_title)
     for data in data_list:
-        if type(data.x[0]) not in (float, np.float_, int):
+        if data.x.dtype.kind not in "fiu":
             plot_widget.canvas.axes.tick_params(axis="x", labelrotation=30)
     if len(squeezed_data) > 1:
         plot_widget.add_legend(legend_handles)
@@ -327,6 +400,7 @@ def _plot_single_y_axis(data_list, y_label, axes, plot_type):
         plot_label = " | ".join(map(str, data.data_index))
         x = _make_x_plottable(data.x)
         handles = plot(x, data.y, label=plot_label)
+        _decimate_lines(axes, handles, plot_type)
         legend_handles += handles
     axes.set_ylabel(y_label)
     return legend_handles
@@ -343,7 +417,7 @@ def _plot_stacked_line(data_list, y_label, axes):
     Returns:
         list: legend handles
     """
-    if any(data.x != data_list[0].x for data in data_list[1:]):
+    if any(not np.array_equal(data.x, data_list[0].x) for data in data_list[1:]):
         raise PlottingError("Cannot stack plots when x-axes don't match.")
     x = _make_x_plottable(data_list[0].x)
     y = [data.y for data in data_list]
@@ -406,13 +480,16 @@ def _plot_double_y_axis(data_list, y_labels, plot_widget, plot_type):
         x = _make_x_plottable(data.x)
         if data.y_label == left_label:
             plot = plot_left
+            axes = plot_widget.canvas.axes
             color = "crimson"
             marker = "s"
         else:
             plot = plot_right
+            axes = right_axes
             color = None
             marker = "o"
         handles = plot(x, data.y, label=plot_label, color=color, marker=marker)
+        _decimate_lines(axes, handles, plot_type)
         legend_handles += handles
     plot_widget.canvas.axes.set_ylabel(left_label)
     right_axes.set_ylabel(right_label)
@@ -423,16 +500,30 @@ def _make_x_plottable(xs):
     """Converts x-axis values to something matplotlib can handle.
 
     Args:
-        xs (list): x values
+        xs (ndarray): x values
 
     Returns:
-        list: x values
+        ndarray: x values
     """
-    if xs and isinstance(xs[0], DateTime):
-        return [np.datetime64(x.value, NUMPY_DATETIME64_UNIT) for x in xs]
+    if xs.size and isinstance(xs[0], DateTime):
+        return np.array([np.datetime64(x.value, NUMPY_DATETIME64_UNIT) for x in xs])
     return xs
 
 
+def _decimate_lines(axes, lines, plot_type):
+    """Makes the canvas decimate large line plots to the resolution of the axes.
+
+    Args:
+        axes (Axes): plot axes
+        lines (list): plotted artists
+        plot_type (PlotType): plot type
+    """
+    if plot_type not in _DECIMATED_PLOT_TYPES:
+        return
+    for line in lines:
+        axes.figure.canvas.decimate_line(axes, line)
+
+
 class _PlotStackedBars:
     def __init__(self, axes):
         self._axes = axes
@@ -543,6 +634,7 @@ def _clear_plot(plot_widget):
     Args:
         plot_widget (PlotWidget): plot widget
     """
+    plot_widget.canvas.clear_decimated_lines()
     plot_widget.canvas.axes.clear()
     legend = plot_widget.canvas.legend_axes.get_legend()
     if legend is not None:
@@ -860,8 +952,10 @@ def add_array_plot(plot_widget, value):
         plot_widget (PlotWidget): a plot widget to modify
         value (Array): the array to plot
     """
-    plot_widget.canvas.axes.plot(value.indexes, value.values, **_LINE_PLOT_SETTINGS, **_BASE_SETTINGS)
-    plot_widget.canvas.axes.set_xlabel(value.index_name)
+    axes = plot_widget.canvas.axes
+    lines = axes.plot(value.indexes, value.values, **_LINE_PLOT_SETTINGS, **_BASE_SETTINGS)
+    _decimate_lines(axes, lines, PlotType.LINE)
+    axes.set_xlabel(value.index_name)
 
 
 def add_time_series_plot(plot_widget, value):
@@ -872,12 +966,12 @@ def add_time_series_plot(plot_widget, value):
         plot_widget (PlotWidget): a plot widget to modify
         value (TimeSeries): the time series to plot
     """
-    plot_widget.canvas.axes.step(
-        value.indexes, value.values, **_make_time_series_settings(_LINE_PLOT_SETTINGS), **_BASE_SETTINGS
-    )
-    plot_widget.canvas.axes.set_xlabel(value.index_name)
+    axes = plot_widget.canvas.axes
+    lines = axes.step(value.indexes, value.values, **_make_time_series_settings(_LINE_PLOT_SETTINGS), **_BASE_SETTINGS)
+    _decimate_lines(axes, lines, PlotType.LINE)
+    axes.set_xlabel(value.index_name)
     # matplotlib cannot have time stamps before 0001-01-01T00:00 on the x axis
-    left, _ = plot_widget.canvas.axes.get_xlim()
+    left, _ = axes.get_xlim()
     if left < 1.0:
         # 1.0 corresponds to 0001-01-01T00:00
-        plot_widget.canvas.axes.set_xlim(left=1.0)
+        axes.set_xlim(left=1.0)
@@ -20,6 +20,7 @@ from PySide6.QtCore import Signal, QCoreApplication
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import QMessageBox
 import networkx as nx
+from spine_engine import SpineEngineState
 from spine_engine.exception import EngineInitFailed, RemoteEngineInitFailed
 from spine_engine.utils.helpers import create_timestamp, gather_leaf_data
 from .project_item.logging_connection import LoggingConnection, LoggingJump
@@ -33,7 +34,6 @@ from spine_engine.utils.helpers import (
     connections_to_selected_items,
 )
 from spine_engine.utils.serialization import deserialize_path, serialize_path
-from spine_engine.server.util.zip_handler import ZipHandler
 from .project_settings import ProjectSettings
 from .server.engine_client import EngineClient
 from .metaobject import MetaObject
@@ -57,10 +57,14 @@ from .config import (
     PROJECT_LOCAL_DATA_FILENAME,
     FG_COLOR,
     SPECIFICATION_LOCAL_DATA_FILENAME,
-    PROJECT_ZIP_FILENAME,
 )
 from .project_commands import SetProjectDescriptionCommand
 from .spine_engine_worker import SpineEngineWorker
+from .dag_scheduler import DagScheduler, FailurePolicy, estimate_dag_memory
+from .link_index import LinkIndex
+from .resource_graph import ResourceGraph
+from .project_topology import ProjectTopology
+from .filter_catalog import FilterCatalog
 
 
 @unique
@@ -125,11 +129,18 @@ class SpineToolboxProject(MetaObject):
         self._project_items = dict()
         self._specifications = dict(enumerate(plugin_specs))
         self._connections = list()
+        self._connection_index = LinkIndex()
         self._jumps = list()
+        self._jump_index = LinkIndex()
+        self._resource_graph = ResourceGraph()
+        self._topology = ProjectTopology()
+        self._filter_catalog = FilterCatalog(toolbox)
+        self._displayed_ranks = {}
         self._logger = logger
         self._app_settings = app_settings
         self._settings = settings
         self._engine_workers = []
+        self._dag_scheduler = None
         self._execution_in_progress = False
         self.project_dir = None  # Full path to project directory
         self.config_dir = None  # Full path to .spinetoolbox directory
@@ -160,6 +171,10 @@ class SpineToolboxProject(MetaObject):
     def settings(self):
         return self._settings
 
+    @property
+    def filter_catalog(self):
+        return self._filter_catalog
+
     def has_items(self):
         """Returns True if project has project items.
 
@@ -363,10 +378,7 @@ class SpineToolboxProject(MetaObject):
         connections = list(map(self.connection_from_dict, connection_dicts))
         for connection in connections:
             self.add_connection(connection, silent=True, notify_resource_changes=False)
-        for connection in connections:
-            destination = self._project_items[connection.destination]
-            source = self._project_items[connection.source]
-            self._notify_rsrc_changes(destination, source)
+        self._update_all_resources()
         for connection in connections:
             connection.link.update_icons()
         self._logger.msg.emit("Restoring jumps...")
@@ -625,9 +637,11 @@ class SpineToolboxProject(MetaObject):
         if item.name in self._project_items:
             raise RuntimeError("Item already in project.")
         self._project_items[item.name] = item
+        self._topology.add_node(item.name)
         name = item.name
         self.item_added.emit(name)
         item.set_up()
+        self._displayed_ranks[name] = 0
 
     def rename_item(self, previous_name, new_name, rename_data_dir_message):
         """Renames a project item
@@ -666,16 +680,11 @@ class SpineToolboxProject(MetaObject):
             self._project_items[previous_name] = item
             return False
         self._project_items[new_name] = item
-        for connection in self._connections:
-            if connection.source == previous_name:
-                connection.source = new_name
-            if connection.destination == previous_name:
-                connection.destination = new_name
-        for jump in self._jumps:
-            if jump.source == previous_name:
-                jump.source = new_name
-            if jump.destination == previous_name:
-                jump.destination = new_name
+        self._topology.rename_node(previous_name, new_name)
+        self._displayed_ranks[new_name] = self._displayed_ranks.pop(previous_name, None)
+        self._connection_index.rename_item(previous_name, new_name)
+        self._resource_graph.rename(previous_name, new_name)
+        self._jump_index.rename_item(previous_name, new_name)
         new_resources_to_predecessors = item.resources_for_direct_predecessors()
         self.notify_resource_replacement_to_predecessors(item, resources_to_predecessors, new_resources_to_predecessors)
         new_resources_to_successors = item.resources_for_direct_successors()
@@ -716,9 +725,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             Connection: connection instance or None if there is no connection
         """
-        return next(
-            (c for c in self._connections if c.source == source_name and c.destination == destination_name), None
-        )
+        return self._connection_index.find(source_name, destination_name)
 
     def connections_for_item(self, item_name):
         """Returns connections that have given item as source or destination.
@@ -729,7 +736,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             list of Connection: connections connected to item
         """
-        return [c for c in self._connections if item_name in (c.source, c.destination)]
+        return self._connection_index.links_for_item(item_name)
 
     def add_connection(self, *args, silent=False, notify_resource_changes=True):
         """Adds a connection to the project.
@@ -749,15 +756,16 @@ class SpineToolboxProject(MetaObject):
             connection = args[0]
         else:
             connection = LoggingConnection(*args, toolbox=self._toolbox)
-        if connection in self._connections:
+        if connection in self._connection_index:
             return False
-        if None in (self.dag_with_node(connection.source), self.dag_with_node(connection.destination)):
+        if connection.source not in self._project_items or connection.destination not in self._project_items:
             return False
         self._connections.append(connection)
-        dag = self.dag_with_node(connection.source)
+        self._connection_index.add(connection)
+        self._topology.add_edge(connection.source, connection.destination)
         self.connection_established.emit(connection)
         self._update_jump_icons()
-        if not self._is_dag_valid(dag):
+        if self._topology.has_cycle(connection.source):
             self.remove_connection(connection)
             msg = "This connection creates a cycle into the DAG.\n\nWould you like to add a Loop connection?"
             title = f"Add Loop?"
@@ -782,7 +790,7 @@ class SpineToolboxProject(MetaObject):
             self._notify_rsrc_changes(destination, source)
         if not silent:
             destination.notify_destination(source)
-        self._update_ranks(dag)
+        self._update_ranks(connection.source)
         return True
 
     def _notify_rsrc_changes(self, destination, source):
@@ -803,17 +811,21 @@ class SpineToolboxProject(MetaObject):
         """
         self.connection_about_to_be_removed.emit(connection)
         self._connections.remove(connection)
-        dags = [self.dag_with_node(connection.source), self.dag_with_node(connection.destination)]
-        valid_dags = [dag for dag in dags if self._is_dag_valid(dag)]
-        updateable_nodes = set(chain(*(dag.nodes for dag in valid_dags)))
+        self._connection_index.remove(connection)
+        self._topology.remove_edge(connection.source, connection.destination)
+        dag_nodes = [connection.source]
+        if connection.destination not in self._topology.component_nodes(connection.source):
+            dag_nodes.append(connection.destination)
+        valid_nodes = [node for node in dag_nodes if not self._topology.has_cycle(node)]
+        updateable_nodes = set(chain(*(self._topology.component_nodes(node) for node in valid_nodes)))
         destination = self._project_items[connection.destination]
         if destination.name in updateable_nodes:
             self._update_item_resources(destination, ExecutionDirection.FORWARD)
         source = self._project_items[connection.source]
         if source.name in updateable_nodes:
             self._update_item_resources(source, ExecutionDirection.BACKWARD)
-        for dag in valid_dags:
-            self._update_ranks(dag)
+        for node in valid_nodes:
+            self._update_ranks(node)
         self._update_jump_icons()
         connection.tear_down()
 
@@ -841,7 +853,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             list of Jump: jumps connected to item
         """
-        return [c for c in self._jumps if item_name in (c.source, c.destination)]
+        return self._jump_index.links_for_item(item_name)
 
     def add_jump(self, jump, silent=False):
         """Adds a jump to project.
@@ -851,13 +863,16 @@ class SpineToolboxProject(MetaObject):
             silent (bool): if True, don't log messages
         """
         self._jumps.append(jump)
+        self._jump_index.add(jump)
         self.jump_added.emit(jump)
         destination = self._project_items[jump.destination]
         source = self._project_items[jump.source]
         self._update_incoming_connection_and_jump_resources(
-            destination.name, destination.resources_for_direct_predecessors()
+            destination.name, self._resource_graph.resources(destination, ExecutionDirection.BACKWARD)
+        )
+        self._update_outgoing_connection_and_jump_resources(
+            source.name, self._resource_graph.resources(source, ExecutionDirection.FORWARD)
         )
-        self._update_outgoing_connection_and_jump_resources(source.name, source.resources_for_direct_successors())
         self._update_jump_icons()
         return True
 
@@ -871,7 +886,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             Jump: connection instance or None if there is no jump
         """
-        return next((j for j in self._jumps if j.source == source_name and j.destination == destination_name), None)
+        return self._jump_index.find(source_name, destination_name)
 
     def remove_jump(self, jump):
         """Removes a jump from the project.
@@ -881,6 +896,7 @@ class SpineToolboxProject(MetaObject):
         """
         self.jump_about_to_be_removed.emit(jump)
         self._jumps.remove(jump)
+        self._jump_index.remove(jump)
         self._update_jump_icons()
 
     def update_jump(self, jump, source_position, destination_position):
@@ -925,15 +941,11 @@ class SpineToolboxProject(MetaObject):
         Yields:
             DiGraph
         """
-        graph = nx.DiGraph()
-        graph.add_nodes_from(self._project_items)
-        graph.add_edges_from(((x.source, x.destination) for x in self._connections))
-        for nodes in nx.weakly_connected_components(graph):
-            yield graph.subgraph(nodes)
+        yield from self._topology.dags()
 
     def dag_with_node(self, node):
         """Returns the DiGraph that contains the given node (project item) name (str)."""
-        return next((x for x in self._dag_iterator() if x.has_node(node)), None)
+        return self._topology.dag_with_node(node)
 
     def restore_project_items(self, items_dict, item_factories):
         """Restores project items from dictionary.
@@ -983,6 +995,9 @@ class SpineToolboxProject(MetaObject):
         for j in self.jumps_for_item(item_name):
             self.remove_jump(j)
         item = self._project_items.pop(item_name)
+        self._topology.remove_node(item_name)
+        self._displayed_ranks.pop(item_name, None)
+        self._resource_graph.discard(item_name)
         item.tear_down()
         if delete_data:
             try:
@@ -1030,6 +1045,11 @@ class SpineToolboxProject(MetaObject):
         settings = make_settings_dict_for_engine(self._app_settings)
         darker_fg_color = QColor(FG_COLOR).darker().name()
         darker = lambda x: f'<span style="color: {darker_fg_color}">{x}</span>'
+        # Zero means no limit: all DAGs start at once.
+        max_jobs = int(self._app_settings.value("engineSettings/maxConcurrentDags", defaultValue="0"))
+        self._dag_scheduler = DagScheduler(
+            max_jobs=max_jobs or max(1, len(dags)), failure_policy=FailurePolicy.CONTINUE
+        )
         for k, (dag, execution_permits) in enumerate(zip(dags, execution_permits_list)):
             dag_identifier = f"{k + 1}/{len(dags)}"
             worker = self.create_engine_worker(dag, execution_permits, dag_identifier, settings, job_id)
@@ -1040,12 +1060,14 @@ class SpineToolboxProject(MetaObject):
             self._logger.msg.emit(darker(" -> ").join(item_names))
             worker.finished.connect(lambda worker=worker: self._handle_engine_worker_finished(worker))
             self._engine_workers.append(worker)
+            priority = sum(1 for permitted in execution_permits.values() if permitted)
+            self._dag_scheduler.add(worker, priority=priority, memory=estimate_dag_memory(execution_permits))
         timestamp = create_timestamp()
         self._toolbox.make_execution_timestamp(timestamp)
         # NOTE: Don't start the workers as they are created. They may finish too quickly, before the others
         # are added to ``_engine_workers``, and thus ``_handle_engine_worker_finished()`` will believe
         # that the project is done executing before it's fully loaded.
-        for worker in self._engine_workers:
+        for worker in self._dag_scheduler.start_ready():
             worker.start()
 
     def create_engine_worker(self, dag, execution_permits, dag_identifier, settings, job_id):
@@ -1091,7 +1113,16 @@ class SpineToolboxProject(MetaObject):
             "settings": settings,
             "project_dir": self.project_dir.replace(os.sep, "/"),
         }
-        worker = SpineEngineWorker(data, dag, dag_identifier, items, connections, self._logger, job_id)
+        worker = SpineEngineWorker(
+            data,
+            dag,
+            dag_identifier,
+            items,
+            connections,
+            self._logger,
+            job_id,
+            log_batcher=self._toolbox.log_message_batcher(),
+        )
         return worker
 
     def _handle_engine_worker_finished(self, worker):
@@ -1100,9 +1131,14 @@ class SpineToolboxProject(MetaObject):
             "FAILED": [self._logger.msg_error, "failed"],
             "COMPLETED": [self._logger.msg_success, "completed successfully"],
         }
+        self._toolbox.log_message_batcher().flush()
         outcome = finished_outcomes.get(worker.engine_final_state())
         if outcome is not None:
             outcome[0].emit(f"<b>DAG {worker.dag_identifier} {outcome[1]}</b>")
+        if self._dag_scheduler is not None and self._dag_scheduler.is_running(worker):
+            failed = worker.engine_final_state() == str(SpineEngineState.FAILED)
+            for next_worker in self._dag_scheduler.finish(worker, failed):
+                next_worker.start()
         if any(worker.engine_final_state() not in finished_outcomes for worker in self._engine_workers):
             return
         # Only after all workers have finished, notify changes and handle successful executions.
@@ -1110,12 +1146,15 @@ class SpineToolboxProject(MetaObject):
         # (needed to create DatabaseMapping instances). It seems that the lock gets confused when
         # being acquired by threads from different processes or maybe even different QThreads.
         # Can't say I really understand the whole extent of it.
+        # Execution may have created or removed files that items advertise as resources.
+        self._resource_graph.invalidate()
         for finished_worker in self._engine_workers:
             for item, direction, state in finished_worker.successful_executions:
                 item.handle_execution_successful(direction, state)
             finished_worker.clean_up()
         self.finalize_remote_execution(worker.job_id)
         self._engine_workers.clear()
+        self._dag_scheduler = None
         self.project_execution_finished.emit()
 
     def execute_selected(self, names):
@@ -1192,7 +1231,7 @@ class SpineToolboxProject(MetaObject):
         for dag in dags:
             if not dag.nodes:
                 raise RuntimeError("Logic error: DAG should never have no nodes.")
-            if not nx.is_directed_acyclic_graph(dag):
+            if not self._topology.is_acyclic(dag):
                 items = ", ".join(dag.nodes)
                 self._logger.msg_error.emit(f"<b>Skipping execution of items as they are in a cycle: {items}</b>")
                 continue
@@ -1206,9 +1245,13 @@ class SpineToolboxProject(MetaObject):
             return
         self._logger.msg.emit("Stopping...")
         self._execution_in_progress = False
+        cancelled_workers = self._dag_scheduler.cancel_pending() if self._dag_scheduler is not None else []
         # Stop engines
         for worker in self._engine_workers:
-            worker.stop_engine()
+            if worker not in cancelled_workers:
+                worker.stop_engine()
+        for worker in cancelled_workers:
+            worker.cancel()
 
     def notify_resource_changes_to_predecessors(self, item):
         """Updates resources for direct predecessors of given item.
@@ -1217,13 +1260,10 @@ class SpineToolboxProject(MetaObject):
             item (ProjectItem): item whose resources have changed
         """
         item_name = item.name
-        predecessor_names = {c.source for c in self.incoming_connections(item_name)}
-        successor_connections = self.outgoing_connections
-        update_resources = self._update_predecessor
-        trigger_resources = item.resources_for_direct_predecessors()
-        self._notify_resource_changes(
-            item_name, predecessor_names, successor_connections, update_resources, trigger_resources
-        )
+        trigger_resources = self._resource_graph.refresh(item, ExecutionDirection.BACKWARD)
+        for predecessor_name in {c.source for c in self.incoming_connections(item_name)}:
+            predecessor = self._project_items[predecessor_name]
+            self._update_predecessor(predecessor, self.outgoing_connections(predecessor_name))
         self._update_incoming_connection_and_jump_resources(item_name, trigger_resources)
 
     def _update_incoming_connection_and_jump_resources(self, item_name, trigger_resources):
@@ -1237,38 +1277,43 @@ class SpineToolboxProject(MetaObject):
             item (ProjectItem): item whose resources have changed
         """
         item_name = item.name
-        successor_names = {c.destination for c in self.outgoing_connections(item_name)}
-        predecessor_connections = self.incoming_connections
-        update_resources = self._update_successor
-        trigger_resources = item.resources_for_direct_successors()
-        self._notify_resource_changes(
-            item_name, successor_names, predecessor_connections, update_resources, trigger_resources
-        )
+        trigger_resources = self._resource_graph.refresh(item, ExecutionDirection.FORWARD)
+        for successor_name in {c.destination for c in self.outgoing_connections(item_name)}:
+            successor = self._project_items[successor_name]
+            self._update_successor(successor, self.incoming_connections(successor_name))
         self._update_outgoing_connection_and_jump_resources(item_name, trigger_resources)
 
     def _update_outgoing_connection_and_jump_resources(self, item_name, trigger_resources):
         for connection in self._outgoing_connections_and_jumps(item_name):
             connection.receive_resources_from_source(trigger_resources)
 
-    def _notify_resource_changes(
-        self, trigger_name, target_names, provider_connections, update_resources, trigger_resources
-    ):
-        """Updates resources in given direction for immediate neighbours of an item.
-
-        Args:
-            trigger_name (str): item whose resources have changed
-            target_names (Iterable of str): items to be notified
-            provider_connections (Callable): function that receives a target item name and returns a list of
-                Connections from resource providers
-            update_resources (Callable): function that takes an item name, a list of provider names, and a dictionary
-                of resources, and does the updating
-            trigger_resources (list of ProjectItemResource): resources from the trigger item
-        """
-        resource_cache = {trigger_name: trigger_resources}
-        for target_name in target_names:
-            target_item = self._project_items[target_name]
-            connections = provider_connections(target_name)
-            update_resources(target_item, connections, resource_cache)
+    def _update_all_resources(self):
+        """Sends resources to all connected items.
+
+        Upstream resources are sent in topological order and downstream resources in reverse topological order
+        so that items whose own resources depend on their neighbours' resources get updated before they are read.
+        """
+        for component in self._topology.components():
+            node = next(iter(component))
+            nodes = self._topology.topological_order(node) or list(component)
+            for item_name in nodes:
+                incoming_connections = self.incoming_connections(item_name)
+                if incoming_connections:
+                    self._update_successor(self._project_items[item_name], incoming_connections)
+            for item_name in reversed(nodes):
+                outgoing_connections = self.outgoing_connections(item_name)
+                if outgoing_connections:
+                    self._update_predecessor(self._project_items[item_name], outgoing_connections)
+            for item_name in nodes:
+                item = self._project_items[item_name]
+                if self.outgoing_connections(item_name):
+                    self._update_outgoing_connection_and_jump_resources(
+                        item_name, self._resource_graph.resources(item, ExecutionDirection.FORWARD)
+                    )
+                if self.incoming_connections(item_name):
+                    self._update_incoming_connection_and_jump_resources(
+                        item_name, self._resource_graph.resources(item, ExecutionDirection.BACKWARD)
+                    )
 
     def notify_resource_replacement_to_successors(self, item, old, new):
         """Replaces resources for direct successors and outgoing connections of given item.
@@ -1280,9 +1325,9 @@ class SpineToolboxProject(MetaObject):
         """
         if not old:
             return
-        for connection in self._connections:
-            if connection.source != item.name:
-                continue
+        self._resource_graph.set_resources(item.name, ExecutionDirection.FORWARD, new)
+        for connection in self.outgoing_connections(item.name):
+            self._resource_graph.forget_delivery(connection.destination, ExecutionDirection.FORWARD)
             connection.replace_resources_from_source(old, new)
             old_converted = connection.convert_forward_resources(old)
             new_converted = connection.convert_forward_resources(new)
@@ -1296,9 +1341,9 @@ class SpineToolboxProject(MetaObject):
             old (list of ProjectItemResource): old resources
             new (list of ProjectItemResource): new resources
         """
-        for connection in self._connections:
-            if connection.destination != item.name:
-                continue
+        self._resource_graph.set_resources(item.name, ExecutionDirection.BACKWARD, new)
+        for connection in self.incoming_connections(item.name):
+            self._resource_graph.forget_delivery(connection.source, ExecutionDirection.BACKWARD)
             self.get_item(connection.source).replace_resources_from_downstream(old, new)
 
     def _update_item_resources(self, target_item, direction):
@@ -1312,10 +1357,10 @@ class SpineToolboxProject(MetaObject):
         target_name = target_item.name
         if direction == ExecutionDirection.FORWARD:
             connections = self.incoming_connections(target_name)
-            self._update_successor(target_item, connections, resource_cache={})
+            self._update_successor(target_item, connections)
         else:
             connections = self.outgoing_connections(target_name)
-            self._update_predecessor(target_item, connections, resource_cache={})
+            self._update_predecessor(target_item, connections)
 
     def predecessor_names(self, name):
         """Collects direct predecessor item names.
@@ -1340,7 +1385,7 @@ class SpineToolboxProject(MetaObject):
         return {c.destination for c in self.outgoing_connections(name)}
 
     def descendant_names(self, name):
-        """Yields descendant item names.
+        """Yields descendant item names; each descendant is yielded once.
 
         Args:
             name (str): name of the project item whose descendants to collect
@@ -1348,9 +1393,15 @@ class SpineToolboxProject(MetaObject):
         Yields:
             str: descendant name
         """
-        for succ_name in self.successor_names(name):
-            yield succ_name
-            yield from self.descendant_names(succ_name)
+        visited = {name}
+        stack = [name]
+        while stack:
+            for succ_name in self.successor_names(stack.pop()):
+                if succ_name in visited:
+                    continue
+                visited.add(succ_name)
+                yield succ_name
+                stack.append(succ_name)
 
     def outgoing_connections(self, name):
         """Collects outgoing connections.
@@ -1361,7 +1412,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             set of Connection: outgoing connections
         """
-        return [c for c in self._connections if c.source == name]
+        return self._connection_index.outgoing(name)
 
     def _outgoing_jumps(self, name):
         """Collects outgoing jumps.
@@ -1372,7 +1423,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             set of Jump: outgoing jumps
         """
-        return [c for c in self._jumps if c.source == name]
+        return self._jump_index.outgoing(name)
 
     def _outgoing_connections_and_jumps(self, name):
         """Collects outgoing connections and jumps.
@@ -1394,7 +1445,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             set of Connection: incoming connections
         """
-        return [c for c in self._connections if c.destination == name]
+        return self._connection_index.incoming(name)
 
     def _incoming_jumps(self, name):
         """Collects incoming jumps.
@@ -1405,7 +1456,7 @@ class SpineToolboxProject(MetaObject):
         Returns:
             set of Jump: incoming jumps
         """
-        return [c for c in self._jumps if c.destination == name]
+        return self._jump_index.incoming(name)
 
     def _incoming_connections_and_jumps(self, name):
         """Collects incoming connections and jumps.
@@ -1418,42 +1469,45 @@ class SpineToolboxProject(MetaObject):
         """
         return self.incoming_connections(name) + self._incoming_jumps(name)
 
-    def _update_successor(self, successor, incoming_connections, resource_cache):
+    def _update_successor(self, successor, incoming_connections):
+        """Sends combined resources from direct predecessors to an item unless they are unchanged.
+
+        Args:
+            successor (ProjectItem): receiving item
+            incoming_connections (list of LoggingConnection): item's incoming connections
+        """
         combined_resources = list()
         for conn in incoming_connections:
-            item_name = conn.source
-            predecessor = self._project_items[item_name]
-            resources = resource_cache.get(item_name)
-            if resources is None:
-                resources = predecessor.resources_for_direct_successors()
-                resource_cache[item_name] = resources
-            resources = conn.convert_forward_resources(resources)
-            combined_resources += resources
-        successor.upstream_resources_updated(combined_resources)
-
-    def _update_predecessor(self, predecessor, outgoing_connections, resource_cache):
+            predecessor = self._project_items[conn.source]
+            resources = self._resource_graph.resources(predecessor, ExecutionDirection.FORWARD)
+            combined_resources += conn.convert_forward_resources(resources)
+        if self._resource_graph.deliver(successor.name, ExecutionDirection.FORWARD, combined_resources):
+            successor.upstream_resources_updated(combined_resources)
+
+    def _update_predecessor(self, predecessor, outgoing_connections):
+        """Sends combined resources from direct successors to an item unless they are unchanged.
+
+        Args:
+            predecessor (ProjectItem): receiving item
+            outgoing_connections (list of LoggingConnection): item's outgoing connections
+        """
         combined_resources = list()
         for conn in outgoing_connections:
-            item_name = conn.destination
-            successor = self._project_items[item_name]
-            resources = resource_cache.get(item_name)
-            if resources is None:
-                resources = successor.resources_for_direct_predecessors()
-                resource_cache[item_name] = resources
-            combined_resources += resources
-        predecessor.downstream_resources_updated(combined_resources)
-
-    def _is_dag_valid(self, dag):
-        if not nx.is_directed_acyclic_graph(dag):
-            return False
-        return True
+            successor = self._project_items[conn.destination]
+            combined_resources += self._resource_graph.resources(successor, ExecutionDirection.BACKWARD)
+        if self._resource_graph.deliver(predecessor.name, ExecutionDirection.BACKWARD, combined_resources):
+            predecessor.downstream_resources_updated(combined_resources)
 
-    def _update_ranks(self, dag):
-        node_successors_ = node_successors(dag)
-        ranks = _ranks(node_successors_)
-        for item_name in node_successors_:
-            item = self._project_items[item_name]
-            item.set_rank(ranks[item_name])
+    def _update_ranks(self, node):
+        """Updates rank labels of items in the DAG that contains given node.
+
+        Args:
+            node (str): item name
+        """
+        for item_name, rank in self._topology.ranks(node).items():
+            if self._displayed_ranks.get(item_name) != rank:
+                self._project_items[item_name].set_rank(rank)
+                self._displayed_ranks[item_name] = rank
 
     @property
     def app_settings(self):
@@ -1490,28 +1544,17 @@ class SpineToolboxProject(MetaObject):
             )
             return ""
         engine_client.set_start_time()  # Set start_time for upload operation
-        # Archive the project into a zip-file
-        dest_dir = os.path.join(self.project_dir, os.pardir)  # Parent dir of project_dir
-        self._logger.msg.emit(f"Squeezing project <b>{self.name}</b> into {PROJECT_ZIP_FILENAME}.zip")
+        self._logger.msg_warning.emit(f"Uploading project <b>{self.name}</b> ...")
         QCoreApplication.processEvents()
+        _, project_dir_name = os.path.split(self.project_dir)
         try:
-            ZipHandler.package(src_folder=self.project_dir, dst_folder=dest_dir, fname=PROJECT_ZIP_FILENAME)
-        except Exception as e:
-            self._logger.msg_error.emit(f"{e}")
-            engine_client.close()
-            return ""
-        project_zip_file = os.path.abspath(os.path.join(self.project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
-        if not os.path.isfile(project_zip_file):
-            self._logger.msg_error.emit(f"Project zip-file {project_zip_file} does not exist")
+            job_id, upload_size = engine_client.upload_project_dir(project_dir_name, self.project_dir)
+        except (OSError, RemoteEngineInitFailed) as e:
+            self._logger.msg_error.emit(f"Uploading project failed: {e}")
             engine_client.close()
             return ""
-        file_size = get_file_size(os.path.getsize(project_zip_file))
-        self._logger.msg_warning.emit(f"Uploading project [{file_size}] ...")
-        QCoreApplication.processEvents()
-        _, project_dir_name = os.path.split(self.project_dir)
-        job_id = engine_client.upload_project(project_dir_name, project_zip_file)
         t = engine_client.get_elapsed_time()
-        self._logger.msg.emit(f"Upload time: {t}. Job ID: <b>{job_id}</b>")
+        self._logger.msg.emit(f"Upload time: {t} [{get_file_size(upload_size)}]. Job ID: <b>{job_id}</b>")
         engine_client.close()
         return job_id
 
@@ -1534,15 +1577,6 @@ class SpineToolboxProject(MetaObject):
             return
         engine_client.remove_project_from_server(job_id)
         engine_client.close()
-        project_zip_file = os.path.abspath(os.path.join(self.project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
-        if not os.path.isfile(project_zip_file):
-            return
-        try:
-            os.remove(project_zip_file)  # Remove the uploaded project ZIP file
-        except OSError:
-            self._logger.msg_warning.emit(
-                f"[OSError] Removing ZIP file {project_zip_file} failed. " f"Please remove it manually."
-            )
 
     def tear_down(self):
         """Cleans up project."""
@@ -1566,28 +1600,3 @@ def node_successors(g):
         dict
     """
     return {n: list(g.successors(n)) for n in nx.topological_sort(g)}
-
-
-def _ranks(node_successors):
-    """Calculates node ranks.
-
-    Args:
-        node_successors (dict): a mapping from successor name to a list of predecessor names
-
-    Returns:
-        dict: a mapping from node name to rank
-    """
-    node_predecessors = dict()
-    for predecessor, successors in node_successors.items():
-        node_predecessors.setdefault(predecessor, list())
-        for successor in successors:
-            node_predecessors.setdefault(successor, list()).append(predecessor)
-    ranking = []
-    while node_predecessors:
-        same_ranks = [node for node, predecessor in node_predecessors.items() if not predecessor]
-        for ranked_node in same_ranks:
-            del node_predecessors[ranked_node]
-            for node, successors in node_predecessors.items():
-                node_predecessors[node] = [s for s in successors if s != ranked_node]
-        ranking.append(same_ranks)
-    return {node: rank for rank, nodes in enumerate(ranking) for node in nodes}
@@ -18,10 +18,7 @@ from spine_engine.project_item.connection import ResourceConvertingConnection, J
 from ..log_mixin import LogMixin
 from ..mvcmodels.resource_filter_model import ResourceFilterModel
 from ..helpers import busy_effect
-from ..fetch_parent import FlexibleFetchParent
-
-
-_DATABASE_ITEM_TYPE = {ALTERNATIVE_FILTER_TYPE: "alternative", SCENARIO_FILTER_TYPE: "scenario"}
+from ..filter_catalog import FILTER_ITEM_TYPES
 
 
 class HeadlessConnection(ResourceConvertingConnection):
@@ -148,8 +145,8 @@ class LoggingConnection(LogMixin, HeadlessConnection):
         self.link = None
         self._source_item_type = self._toolbox.project().get_item(self.source).item_type()
         self._destination_item_type = self._toolbox.project().get_item(self.destination).item_type()
-        self._db_maps = {}
-        self._fetch_parents = {}
+        self._filter_catalog = toolbox.project().filter_catalog
+        self._subscribed_urls = set()
 
     def __hash__(self):
         return super(ConnectionBase, self).__hash__()
@@ -172,12 +169,11 @@ class LoggingConnection(LogMixin, HeadlessConnection):
             url = resource.url
             if not url:
                 continue
-            db_map = self._get_db_map(url, ignore_version_error=True)
-            if db_map is None:
-                continue
             known_filters = self._filter_settings.known_filters.get(resource.label, {})
-            for filter_type, item_type in _DATABASE_ITEM_TYPE.items():
-                available = {x["name"] for x in self._toolbox.db_mngr.get_items(db_map, item_type)}
+            for filter_type in FILTER_ITEM_TYPES:
+                available = self._filter_names(url, filter_type, ignore_version_error=True)
+                if available is None:
+                    break
                 filters = known_filters.get(filter_type, {})
                 if any(enabled for s, enabled in filters.items() if s in available):
                     return True
@@ -185,68 +181,59 @@ class LoggingConnection(LogMixin, HeadlessConnection):
                     return True
         return False
 
-    def _get_db_map(self, url, ignore_version_error=False):
-        if url not in self._db_maps:
-            db_map = self._toolbox.db_mngr.get_db_map(url, self._toolbox, ignore_version_error=ignore_version_error)
-            if db_map is None:
+    def _filter_names(self, url, filter_type, ignore_version_error=False):
+        """Returns the names available for filtering in given database subscribing to the catalog if needed.
+
+        Args:
+            url (str): database URL
+            filter_type (str): filter type
+            ignore_version_error (bool): if True, ignore database version errors
+
+        Returns:
+            set of str: names or None if the database could not be opened
+        """
+        if url not in self._subscribed_urls:
+            if not self._filter_catalog.subscribe(self, url, ignore_version_error=ignore_version_error):
                 return None
-            self._db_maps[url] = db_map
-            self._toolbox.db_mngr.register_listener(self, db_map)
-            self._fetch_more_if_possible()
-        return self._db_maps[url]
+            self._subscribed_urls.add(url)
+        return self._filter_catalog.names(url, filter_type)
+
+    def _complete_filter_names(self, url):
+        """Makes sure all names available for filtering in given database have been fetched.
+
+        Args:
+            url (str): database URL
+        """
+        if url and self._filter_names(url, SCENARIO_FILTER_TYPE) is not None:
+            self._filter_catalog.complete(url)
 
-    def _pop_unused_db_maps(self):
-        """Removes unused database maps and unregisters from listening the DB manager."""
+    def _unsubscribe_unused_urls(self):
+        """Unsubscribes from databases that are no longer among connection's resources."""
         resource_urls = {resource.url for resource in self._resources}
         resource_urls.discard(None)
-        obsolete_urls = set(self._db_maps) - resource_urls
-        for url in obsolete_urls:
-            db_map = self._db_maps.pop(url)
-            self._fetch_parents.pop(db_map)
-            self._toolbox.db_mngr.unregister_listener(self, db_map)
-
-    def _make_fetch_parent(self, db_map, item_type):
-        fetch_parents = self._fetch_parents.setdefault(db_map, {})
-        if item_type not in fetch_parents:
-            fetch_parents[item_type] = self._fetch_parents.setdefault(db_map, {}).setdefault(
-                item_type,
-                FlexibleFetchParent(
-                    item_type,
-                    handle_items_added=lambda _: self._receive_data_changed(),
-                    handle_items_removed=lambda _: self._receive_data_changed(),
-                    handle_items_updated=lambda _: self._receive_data_changed(),
-                    owner=self.resource_filter_model,
-                ),
-            )
-        return fetch_parents[item_type]
+        for url in self._subscribed_urls - resource_urls:
+            self._filter_catalog.unsubscribe(self, url)
+        self._subscribed_urls &= resource_urls
 
-    def _fetch_more_if_possible(self):
-        for db_map in self._db_maps.values():
-            for item_type in ("scenario",):
-                fetch_parent = self._make_fetch_parent(db_map, item_type)
-                if self._toolbox.db_mngr.can_fetch_more(db_map, fetch_parent):
-                    self._toolbox.db_mngr.fetch_more(db_map, fetch_parent)
+    def receive_filter_names_changed(self, url, filter_type, added, removed):
+        """Updates filter icons and filter model when filterable names change in a database.
 
-    def _receive_data_changed(self):
+        Args:
+            url (str): database URL
+            filter_type (str): filter type
+            added (set of str): new names
+            removed (set of str): names that no longer exist
+        """
         self.link.update_icons()
-        self.refresh_resource_filter_model()
-        self._fetch_more_if_possible()
-
-    def receive_session_committed(self, db_maps, cookie):
-        self._receive_data_changed()
-
-    def receive_session_rolled_back(self, db_map):
-        self._receive_data_changed()
-
-    def receive_error_msg(self, _db_map_error_log):
-        pass
+        for resource in self._resources:
+            if resource.url == url:
+                self.resource_filter_model.update_filter_names(resource.label, filter_type, added, removed)
 
     def get_filter_item_names(self, filter_type, url):
-        db_map = self._get_db_map(url)
-        if db_map is None:
+        names = self._filter_names(url, filter_type)
+        if names is None:
             return []
-        item_type = _DATABASE_ITEM_TYPE[filter_type]
-        return sorted(x["name"] for x in self._toolbox.db_mngr.get_items(db_map, item_type))
+        return sorted(names)
 
     def _do_purge_before_writing(self, resources):
         purged_urls = super()._do_purge_before_writing(resources)
@@ -340,6 +327,8 @@ class LoggingConnection(LogMixin, HeadlessConnection):
 
     def refresh_resource_filter_model(self):
         """Makes resource filter mode fetch filter data from database."""
+        for resource in self._resources:
+            self._complete_filter_names(resource.url)
         self.resource_filter_model.build_tree()
 
     def set_filter_type_enabled(self, filter_type, enabled):
@@ -352,13 +341,13 @@ class LoggingConnection(LogMixin, HeadlessConnection):
     def receive_resources_from_source(self, resources):
         """See base class."""
         super().receive_resources_from_source(resources)
-        self._pop_unused_db_maps()
+        self._unsubscribe_unused_urls()
         self.link.update_icons()
 
     def replace_resources_from_source(self, old, new):
         """See base class."""
         super().replace_resources_from_source(old, new)
-        self._pop_unused_db_maps()
+        self._unsubscribe_unused_urls()
         self.link.update_icons()
 
     @busy_effect
@@ -391,6 +380,7 @@ class LoggingConnection(LogMixin, HeadlessConnection):
             enabled_filter_types=self._filter_settings.enabled_filter_types,
         )
         for resource in self._resources:
+            self._complete_filter_names(resource.url)
             for filter_type in (SCENARIO_FILTER_TYPE, ALTERNATIVE_FILTER_TYPE):
                 online_filters = self._resource_filters_online(resource, filter_type)
                 if online_filters is not None:
@@ -401,11 +391,9 @@ class LoggingConnection(LogMixin, HeadlessConnection):
         url = resource.url
         if not url:
             return None
-        db_map = self._get_db_map(url)
-        if db_map is None:
+        available_filters = self._filter_names(url, filter_type)
+        if available_filters is None:
             return None
-        db_item_type = _DATABASE_ITEM_TYPE[filter_type]
-        available_filters = (x["name"] for x in self._toolbox.db_mngr.get_items(db_map, db_item_type))
         specific_filter_settings = self._filter_settings.known_filters.get(resource.label, {}).get(filter_type, {})
         checked_specific_filter_settings = {}
         for name in sorted(available_filters):
@@ -428,8 +416,9 @@ class LoggingConnection(LogMixin, HeadlessConnection):
 
     def tear_down(self):
         """Releases system resources held by the connection."""
-        for db_map in self._db_maps.values():
-            self._toolbox.db_mngr.unregister_listener(self, db_map)
+        for url in self._subscribed_urls:
+            self._filter_catalog.unsubscribe(self, url)
+        self._subscribed_urls.clear()
         self.resource_filter_model.deleteLater()
 
 
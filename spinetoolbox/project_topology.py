@@ -0,0 +1,341 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a service that keeps the project graph split into DAGs and caches their topology."""
+import networkx as nx
+
+
+class ProjectTopology:
+    """Maintains the project graph and its weakly connected components incrementally.
+
+    Node ranks are kept up to date when edges are added; other changes invalidate the affected component
+    whose ranks and topological order are then recomputed with a single pass of Kahn's algorithm on demand.
+    Components are served as frozen :class:`DiGraph` objects that are cached until the component changes.
+    """
+
+    def __init__(self):
+        self._graph = nx.DiGraph()
+        self._component_of = {}
+        self._components = {}
+        self._next_component_id = 0
+        self._dags = {}
+        self._orders = {}
+        self._ranks = {}
+
+    def add_node(self, name):
+        """Adds an isolated node.
+
+        Args:
+            name (str): node name
+        """
+        self._graph.add_node(name)
+        component_id = self._new_component({name})
+        self._ranks[component_id] = {name: 0}
+
+    def remove_node(self, name):
+        """Removes a node and its edges.
+
+        Args:
+            name (str): node name
+        """
+        component_id = self._component_of.pop(name)
+        nodes = self._components.pop(component_id)
+        nodes.discard(name)
+        self._forget(component_id)
+        self._graph.remove_node(name)
+        self._split(nodes)
+
+    def rename_node(self, previous_name, new_name):
+        """Renames a node keeping its edges.
+
+        Args:
+            previous_name (str): node's current name
+            new_name (str): node's new name
+        """
+        nx.relabel_nodes(self._graph, {previous_name: new_name}, copy=False)
+        component_id = self._component_of.pop(previous_name)
+        self._component_of[new_name] = component_id
+        nodes = self._components[component_id]
+        nodes.discard(previous_name)
+        nodes.add(new_name)
+        ranks = self._ranks.get(component_id)
+        self._forget(component_id)
+        if ranks is not None:
+            ranks[new_name] = ranks.pop(previous_name)
+            self._ranks[component_id] = ranks
+
+    def add_edge(self, source, destination):
+        """Adds an edge; parallel edges are counted.
+
+        Args:
+            source (str): source node
+            destination (str): destination node
+        """
+        if self._graph.has_edge(source, destination):
+            self._graph.edges[source, destination]["count"] += 1
+            return
+        source_id = self._component_of[source]
+        destination_id = self._component_of[destination]
+        ranks = self._ranks.get(source_id)
+        if source_id != destination_id:
+            destination_ranks = self._ranks.get(destination_id)
+            if ranks is not None and destination_ranks is not None:
+                if len(ranks) < len(destination_ranks):
+                    ranks, destination_ranks = destination_ranks, ranks
+                ranks.update(destination_ranks)
+            else:
+                ranks = None
+            source_id = self._merge(source_id, destination_id)
+        elif ranks is not None and self._has_path(destination, source, ranks):
+            ranks = None
+        self._graph.add_edge(source, destination, count=1)
+        self._forget(source_id)
+        if ranks is not None:
+            self._raise_ranks(destination, ranks[source] + 1, ranks)
+            self._ranks[source_id] = ranks
+
+    def remove_edge(self, source, destination):
+        """Removes an edge or decrements its count if there are parallel edges.
+
+        Args:
+            source (str): source node
+            destination (str): destination node
+        """
+        edge = self._graph.edges[source, destination]
+        edge["count"] -= 1
+        if edge["count"] > 0:
+            return
+        self._graph.remove_edge(source, destination)
+        component_id = self._component_of[source]
+        self._forget(component_id)
+        self._split(self._components.pop(component_id))
+
+    def components(self):
+        """Returns the nodes of each component.
+
+        Returns:
+            list of set: nodes
+        """
+        return list(self._components.values())
+
+    def component_nodes(self, node):
+        """Returns the nodes of the component that contains given node.
+
+        Args:
+            node (str): node name
+
+        Returns:
+            set of str: nodes
+        """
+        return self._components[self._component_of[node]]
+
+    def dags(self):
+        """Returns all components as graphs.
+
+        Returns:
+            list of DiGraph: frozen graphs
+        """
+        return [self._dag(component_id) for component_id in self._components]
+
+    def dag_with_node(self, node):
+        """Returns the component that contains given node as a graph.
+
+        Args:
+            node (str): node name
+
+        Returns:
+            DiGraph: frozen graph or None if node does not exist
+        """
+        component_id = self._component_of.get(node)
+        if component_id is None:
+            return None
+        return self._dag(component_id)
+
+    def has_cycle(self, node):
+        """Checks if the component that contains given node has cycles.
+
+        Args:
+            node (str): node name
+
+        Returns:
+            bool: True if component has cycles, False otherwise
+        """
+        return self.ranks(node) is None
+
+    def ranks(self, node):
+        """Returns node ranks of the component that contains given node.
+
+        A node's rank is the length of the longest path from any source node to it.
+
+        Args:
+            node (str): node name
+
+        Returns:
+            dict: mapping from node name to rank or None if component has cycles
+        """
+        component_id = self._component_of[node]
+        if component_id not in self._ranks:
+            self._compute_order_and_ranks(component_id)
+        return self._ranks[component_id]
+
+    def topological_order(self, node):
+        """Returns the nodes of the component that contains given node in topological order.
+
+        Args:
+            node (str): node name
+
+        Returns:
+            list of str: nodes or None if component has cycles
+        """
+        component_id = self._component_of[node]
+        if component_id not in self._orders:
+            self._compute_order_and_ranks(component_id)
+        return self._orders[component_id]
+
+    def is_acyclic(self, dag):
+        """Checks if a graph has no cycles using cached results if the graph is a component.
+
+        Args:
+            dag (DiGraph): graph to check
+
+        Returns:
+            bool: True if graph is acyclic, False otherwise
+        """
+        if dag:
+            node = next(iter(dag))
+            component_id = self._component_of.get(node)
+            if component_id is not None and self._dags.get(component_id) is dag:
+                return not self.has_cycle(node)
+        return nx.is_directed_acyclic_graph(dag)
+
+    def _new_component(self, nodes):
+        """Registers a new component.
+
+        Returns:
+            int: component id
+        """
+        component_id = self._next_component_id
+        self._next_component_id += 1
+        self._components[component_id] = nodes
+        for node in nodes:
+            self._component_of[node] = component_id
+        return component_id
+
+    def _merge(self, component_id1, component_id2):
+        """Merges the smaller of two components into the larger one.
+
+        Returns:
+            int: id of merged component
+        """
+        if len(self._components[component_id1]) < len(self._components[component_id2]):
+            component_id1, component_id2 = component_id2, component_id1
+        self._forget(component_id2)
+        merged = self._components.pop(component_id2)
+        self._components[component_id1] |= merged
+        for node in merged:
+            self._component_of[node] = component_id1
+        return component_id1
+
+    def _split(self, nodes):
+        """Registers weakly connected components of given nodes as new components."""
+        if not nodes:
+            return
+        for component in nx.weakly_connected_components(self._graph.subgraph(nodes)):
+            self._new_component(set(component))
+
+    def _forget(self, component_id):
+        """Drops cached data of a component."""
+        self._dags.pop(component_id, None)
+        self._orders.pop(component_id, None)
+        self._ranks.pop(component_id, None)
+
+    def _dag(self, component_id):
+        """Returns the cached frozen graph of a component, building it if needed."""
+        dag = self._dags.get(component_id)
+        if dag is None:
+            dag = nx.freeze(self._graph.subgraph(self._components[component_id]).copy())
+            self._dags[component_id] = dag
+        return dag
+
+    def _has_path(self, source, target, ranks):
+        """Checks if there is a path between two nodes in an acyclic component.
+
+        Nodes along a path have strictly increasing ranks which limits the search.
+        """
+        if source == target:
+            return True
+        target_rank = ranks[target]
+        if ranks[source] >= target_rank:
+            return False
+        visited = {source}
+        stack = [source]
+        while stack:
+            for successor in self._graph.successors(stack.pop()):
+                if successor == target:
+                    return True
+                if successor not in visited and ranks[successor] < target_rank:
+                    visited.add(successor)
+                    stack.append(successor)
+        return False
+
+    def _raise_ranks(self, node, rank, ranks):
+        """Raises node's rank to at least given value and propagates the change to descendants."""
+        if ranks[node] >= rank:
+            return
+        ranks[node] = rank
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            successor_rank = ranks[current] + 1
+            for successor in self._graph.successors(current):
+                if ranks[successor] < successor_rank:
+                    ranks[successor] = successor_rank
+                    stack.append(successor)
+
+    def _compute_order_and_ranks(self, component_id):
+        """Computes topological order and ranks of a component in a single pass."""
+        order, ranks = kahn_ranks(self._graph.subgraph(self._components[component_id]))
+        self._orders[component_id] = order
+        self._ranks[component_id] = ranks
+
+
+def kahn_ranks(graph):
+    """Computes topological order and node ranks with Kahn's algorithm in O(V + E).
+
+    A node's rank is the length of the longest path from any source node to it.
+
+    Args:
+        graph (DiGraph): graph
+
+    Returns:
+        tuple: list of nodes in topological order and a mapping from node to rank;
+            both are None if the graph has cycles
+    """
+    in_degrees = dict(graph.in_degree())
+    frontier = [node for node, degree in in_degrees.items() if degree == 0]
+    order = []
+    ranks = {}
+    rank = 0
+    while frontier:
+        next_frontier = []
+        for node in frontier:
+            order.append(node)
+            ranks[node] = rank
+            for successor in graph.successors(node):
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    next_frontier.append(successor)
+        frontier = next_frontier
+        rank += 1
+    if len(order) != len(in_degrees):
+        return None, None
+    return order, ranks
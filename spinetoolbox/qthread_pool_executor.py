@@ -11,6 +11,8 @@
 ######################################################################################################################
 
 """Qt-based thread pool executor."""
+from collections import deque
+import logging
 import os
 from PySide6.QtCore import QMutex, QSemaphore, QThread
 
@@ -19,6 +21,10 @@ class TimeOutError(Exception):
     """An exception to raise when a timeouts expire"""
 
 
+class CancelledError(Exception):
+    """An exception to raise when the result of a cancelled future is requested."""
+
+
 class _CustomQSemaphore(QSemaphore):
     def tryAcquire(self, n, timeout=None):
         if timeout is None:
@@ -28,68 +34,147 @@ class _CustomQSemaphore(QSemaphore):
 
 
 class QtBasedQueue:
-    """A Qt-based clone of queue.Queue."""
+    """A Qt-based clone of queue.SimpleQueue."""
 
     def __init__(self):
-        self._items = []
-        self._mutex = QMutex()
+        # deque's append() and popleft() are atomic, so the semaphore is the only synchronization we need.
+        self._items = deque()
         self._semafore = _CustomQSemaphore()
 
     def put(self, item):
-        self._mutex.lock()
         self._items.append(item)
-        self._mutex.unlock()
         self._semafore.release()
 
     def get(self, timeout=None):
         if not self._semafore.tryAcquire(1, timeout):
             raise TimeOutError()
-        self._mutex.lock()
-        item = self._items.pop(0)
-        self._mutex.unlock()
-        return item
+        return self._items.popleft()
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+
+_PENDING = "pending"
+_RUNNING = "running"
+_CANCELLED = "cancelled"
+_FINISHED = "finished"
 
 
 class QtBasedFuture:
     """A Qt-based clone of concurrent.futures.Future."""
 
     def __init__(self):
+        self._mutex = QMutex()
         self._semafore = _CustomQSemaphore()
-        self._done = False
+        self._state = _PENDING
         self._result = None
         self._exception = None
         self._done_callbacks = []
 
+    def cancel(self):
+        """Cancels the future unless it is running or done already.
+
+        Returns:
+            bool: True if future was cancelled, False otherwise
+        """
+        self._mutex.lock()
+        state = self._state
+        if state == _PENDING:
+            self._state = _CANCELLED
+            callbacks = self._take_done_callbacks()
+        self._mutex.unlock()
+        if state != _PENDING:
+            return state == _CANCELLED
+        self._semafore.release()
+        self._invoke_callbacks(callbacks)
+        return True
+
+    def cancelled(self):
+        return self._state == _CANCELLED
+
+    def running(self):
+        return self._state == _RUNNING
+
+    def done(self):
+        return self._state in (_CANCELLED, _FINISHED)
+
+    def set_running_or_notify_cancel(self):
+        """Marks the future running unless it has been cancelled.
+
+        Returns:
+            bool: False if future has been cancelled, True otherwise
+        """
+        self._mutex.lock()
+        cancelled = self._state == _CANCELLED
+        if not cancelled:
+            self._state = _RUNNING
+        self._mutex.unlock()
+        return not cancelled
+
     def set_result(self, result):
+        self._finish(result, None)
+
+    def set_exception(self, exc):
+        self._finish(None, exc)
+
+    def _finish(self, result, exc):
+        self._mutex.lock()
+        if self.done():
+            self._mutex.unlock()
+            return
         self._result = result
-        self._done = True
+        self._exception = exc
+        self._state = _FINISHED
+        callbacks = self._take_done_callbacks()
+        self._mutex.unlock()
         self._semafore.release()
-        for callback in self._done_callbacks:
-            callback(self)
+        self._invoke_callbacks(callbacks)
+
+    def _take_done_callbacks(self):
+        callbacks = self._done_callbacks
         self._done_callbacks = []
+        return callbacks
 
-    def set_exception(self, exc):
-        self._exception = exc
-        self._done = True
+    def _invoke_callbacks(self, callbacks):
+        for callback in callbacks:
+            self._invoke_callback(callback)
+
+    def _invoke_callback(self, callback):
+        try:
+            callback(self)
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("Exception in future's done callback")
+
+    def _wait(self, timeout):
+        if self.done():
+            return
+        if not self._semafore.tryAcquire(1, timeout):
+            raise TimeOutError()
+        # Let other waiters through, too.
         self._semafore.release()
 
     def result(self, timeout=None):
-        if not self._done and not self._semafore.tryAcquire(1, timeout):
-            raise TimeOutError()
+        self._wait(timeout)
+        if self._state == _CANCELLED:
+            raise CancelledError()
         if self._exception is not None:
             raise self._exception
         return self._result
 
     def exception(self, timeout=None):
-        if not self._done and not self._semafore.tryAcquire(1, timeout):
-            raise TimeOutError()
+        self._wait(timeout)
+        if self._state == _CANCELLED:
+            raise CancelledError()
         return self._exception
 
     def add_done_callback(self, callback):
-        if self._done:
-            callback(self)
-            return
-        self._done_callbacks.append(callback)
+        self._mutex.lock()
+        done = self.done()
+        if not done:
+            self._done_callbacks.append(callback)
+        self._mutex.unlock()
+        if done:
+            self._invoke_callback(callback)
 
 
 class QtBasedThread(QThread):
@@ -113,17 +198,19 @@ class QtBasedThreadPoolExecutor:
         self._max_workers = max_workers
         self._threads = set()
         self._requests = QtBasedQueue()
-        self._semafore = QSemaphore()
+        self._idle_workers = QSemaphore()
         self._shutdown = False
 
     def submit(self, fn, *args, **kwargs):
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
         future = QtBasedFuture()
         self._requests.put((future, fn, args, kwargs))
         self._spawn_thread()
         return future
 
     def _spawn_thread(self):
-        if self._semafore.tryAcquire():
+        if self._idle_workers.tryAcquire():
             # No need to spawn a new thread
             return
         if len(self._threads) == self._max_workers:
@@ -136,11 +223,12 @@ class QtBasedThreadPoolExecutor:
     def _do_work(self):
         while True:
             request = self._requests.get()
-            if self._shutdown:
+            if self._shutdown or request is None:
                 break
             future, fn, args, kwargs = request
-            _set_future_result_and_exc(future, fn, *args, **kwargs)
-            self._semafore.release()
+            if future.set_running_or_notify_cancel():
+                _set_future_result_and_exc(future, fn, *args, **kwargs)
+            self._idle_workers.release()
 
     def shutdown(self):
         self._shutdown = True
@@ -150,11 +238,19 @@ class QtBasedThreadPoolExecutor:
             thread = self._threads.pop()
             thread.wait()
             thread.deleteLater()
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except TimeOutError:
+                break
+            if request is not None:
+                request[0].cancel()
 
 
 class SynchronousExecutor:
     def submit(self, fn, *args, **kwargs):
         future = QtBasedFuture()
+        future.set_running_or_notify_cancel()
         _set_future_result_and_exc(future, fn, *args, **kwargs)
         return future
 
@@ -165,6 +261,7 @@ class SynchronousExecutor:
 def _set_future_result_and_exc(future, fn, *args, **kwargs):
     try:
         result = fn(*args, **kwargs)
-        future.set_result(result)
     except Exception as exc:  # pylint: disable=broad-except
         future.set_exception(exc)
+        return
+    future.set_result(result)
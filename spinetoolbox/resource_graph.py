@@ -0,0 +1,159 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a cache for resources that project items exchange with their neighbours."""
+from spine_engine.utils.helpers import ExecutionDirection
+
+
+class ResourceGraph:
+    """Caches the resources each project item advertises to its successors and predecessors,
+    and remembers the combined resources last delivered to each item.
+
+    Advertised resources are recomputed only when an item reports a change, and every change bumps
+    the item's version stamp. Deliveries that equal the previous one can be skipped.
+    """
+
+    def __init__(self):
+        self._advertised = {}
+        self._delivered = {}
+        self._next_version = 1
+
+    def resources(self, item, direction):
+        """Returns resources item advertises in given direction, computing them if they are not cached.
+
+        Args:
+            item (ProjectItem): project item
+            direction (ExecutionDirection): FORWARD for resources to successors, BACKWARD for resources to predecessors
+
+        Returns:
+            list of ProjectItemResource: resources
+        """
+        cached = self._advertised.get((item.name, direction))
+        if cached is not None:
+            return cached[1]
+        return self.refresh(item, direction)
+
+    def refresh(self, item, direction):
+        """Recomputes resources item advertises in given direction.
+
+        Args:
+            item (ProjectItem): project item
+            direction (ExecutionDirection): FORWARD for resources to successors, BACKWARD for resources to predecessors
+
+        Returns:
+            list of ProjectItemResource: resources
+        """
+        if direction == ExecutionDirection.FORWARD:
+            resources = item.resources_for_direct_successors()
+        else:
+            resources = item.resources_for_direct_predecessors()
+        self.set_resources(item.name, direction, resources)
+        return resources
+
+    def set_resources(self, item_name, direction, resources):
+        """Stores resources item advertises in given direction.
+
+        Args:
+            item_name (str): item's name
+            direction (ExecutionDirection): resource direction
+            resources (list of ProjectItemResource): resources
+        """
+        key = (item_name, direction)
+        cached = self._advertised.get(key)
+        if cached is not None and _fingerprint(cached[1]) == _fingerprint(resources):
+            self._advertised[key] = (cached[0], resources)
+            return
+        self._advertised[key] = (self._next_version, resources)
+        self._next_version += 1
+
+    def version(self, item_name, direction):
+        """Returns the version stamp of item's advertised resources.
+
+        Args:
+            item_name (str): item's name
+            direction (ExecutionDirection): resource direction
+
+        Returns:
+            int: version or None if resources are not cached
+        """
+        cached = self._advertised.get((item_name, direction))
+        return cached[0] if cached is not None else None
+
+    def deliver(self, item_name, direction, resources):
+        """Records resources delivered to an item.
+
+        Args:
+            item_name (str): receiving item's name
+            direction (ExecutionDirection): FORWARD for resources from upstream, BACKWARD for resources from downstream
+            resources (list of ProjectItemResource): combined resources
+
+        Returns:
+            bool: True if resources differ from previous delivery and need to be sent to the item, False otherwise
+        """
+        fingerprint = _fingerprint(resources)
+        key = (item_name, direction)
+        if self._delivered.get(key) == fingerprint:
+            return False
+        self._delivered[key] = fingerprint
+        return True
+
+    def forget_delivery(self, item_name, direction):
+        """Forgets what was delivered to an item so the next delivery is always sent.
+
+        Args:
+            item_name (str): item's name
+            direction (ExecutionDirection): resource direction
+        """
+        self._delivered.pop((item_name, direction), None)
+
+    def invalidate(self):
+        """Drops all cached advertised resources; version stamps keep increasing."""
+        self._advertised.clear()
+
+    def rename(self, previous_name, new_name):
+        """Moves cached data of an item under a new name.
+
+        Args:
+            previous_name (str): item's previous name
+            new_name (str): item's new name
+        """
+        for cache in (self._advertised, self._delivered):
+            for direction in ExecutionDirection:
+                value = cache.pop((previous_name, direction), None)
+                if value is not None:
+                    cache[(new_name, direction)] = value
+
+    def discard(self, item_name):
+        """Removes cached data of an item.
+
+        Args:
+            item_name (str): item's name
+        """
+        for cache in (self._advertised, self._delivered):
+            for direction in ExecutionDirection:
+                cache.pop((item_name, direction), None)
+
+
+def _fingerprint(resources):
+    """Returns a comparable summary of resources.
+
+    Unlike resource equality, the fingerprint includes labels.
+
+    Args:
+        resources (list of ProjectItemResource): resources
+
+    Returns:
+        list of tuple: fingerprint
+    """
+    return [
+        (r.provider_name, r.type_, r.label, r.url, repr(sorted(r.metadata.items())), r.filterable) for r in resources
+    ]
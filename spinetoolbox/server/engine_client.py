@@ -15,11 +15,22 @@ import os
 import time
 import random
 import json
+import zlib
 from enum import Enum
+from tempfile import TemporaryDirectory
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
 import zmq
 import zmq.auth
 from spine_engine.server.util.server_message import ServerMessage
 from spine_engine.exception import RemoteEngineInitFailed
+from ..config import PROJECT_ZIP_FILENAME
+
+CHUNK_SIZE = 1024 * 1024  # Default size of streamed file chunks [bytes]
+UPLOAD_WINDOW = 8  # Default number of unacknowledged upload chunks in flight
+MAX_CHUNK_RETRIES = 2  # Number of times a chunk is resent if server reports a checksum mismatch
+DOWNLOAD_HIGH_WATER_MARK = 16  # Maximum number of received but unprocessed messages in the PULL socket
+PING_TIMEOUT = 1000  # Time to wait for a ping reply [ms]
+STREAMING_UPLOAD_CAPABILITY = "prepare_execution_stream"  # Advertised in ping reply by servers that accept streams
 
 
 class ClientSecurityModel(Enum):
@@ -27,6 +38,84 @@ class ClientSecurityModel(Enum):
     STONEHOUSE = 1  # ZMQ stonehouse security model
 
 
+class _ChunkBuffer:
+    """Write-only, unseekable stream that collects bytes for chunked transfer."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop_chunks(self, chunk_size, final=False):
+        """Yields full chunks from the buffer.
+
+        Args:
+            chunk_size (int): chunk size in bytes
+            final (bool): if True, yields also the last partial chunk
+
+        Yields:
+            bytes: chunk
+        """
+        while len(self._buffer) >= chunk_size:
+            yield bytes(self._buffer[:chunk_size])
+            del self._buffer[:chunk_size]
+        if final and self._buffer:
+            yield bytes(self._buffer)
+            self._buffer.clear()
+
+
+def iter_zipped_directory(src_folder, chunk_size=CHUNK_SIZE):
+    """Zips a directory on the fly without writing the archive to disk.
+
+    Args:
+        src_folder (str): directory to zip
+        chunk_size (int): chunk size in bytes
+
+    Yields:
+        bytes: next chunk of the ZIP archive; all chunks but the last one are chunk_size long
+    """
+    buffer = _ChunkBuffer()
+    with ZipFile(buffer, "w", compression=ZIP_DEFLATED) as zip_file:
+        for root, dirs, files in os.walk(src_folder):
+            dirs.sort()
+            rel_root = os.path.relpath(root, src_folder)
+            if rel_root != os.curdir:
+                zip_file.write(root, rel_root)
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                info = ZipInfo.from_file(path, os.path.join(rel_root, file_name))
+                info.compress_type = ZIP_DEFLATED
+                with open(path, "rb") as src, zip_file.open(info, "w") as dst:
+                    while data := src.read(chunk_size):
+                        dst.write(data)
+                        yield from buffer.pop_chunks(chunk_size)
+                yield from buffer.pop_chunks(chunk_size)
+    yield from buffer.pop_chunks(chunk_size, final=True)
+
+
+class _Download:
+    """State of a file that is being downloaded in chunks."""
+
+    def __init__(self, dst_fpath, rel_path, file):
+        """
+        Args:
+            dst_fpath (str): absolute path to destination file
+            rel_path (str): path relative to project directory
+            file (BinaryIO): open destination file
+        """
+        self.dst_fpath = dst_fpath
+        self.rel_path = rel_path
+        self.file = file
+        self.crc32 = 0
+        self.size = 0
+        self.error = None
+
+
 class EngineClient:
     def __init__(self, host, port, sec_model, sec_folder, ping=True):
         """
@@ -44,11 +133,13 @@ class EngineClient:
         self.dealer_socket = self._context.socket(zmq.DEALER)
         self.dealer_socket.setsockopt(zmq.LINGER, 1)
         self.pull_socket = self._context.socket(zmq.PULL)
+        self.pull_socket.setsockopt(zmq.RCVHWM, DOWNLOAD_HIGH_WATER_MARK)
         self.poller = zmq.Poller()
         self.poller.register(self.dealer_socket, zmq.POLLIN)
         self.poller.register(self.pull_socket, zmq.POLLIN)
         self.client_project_dir = None
         self.start_time = 0
+        self._server_capabilities = None
         if sec_model == ClientSecurityModel.STONEHOUSE:
             # Security configs
             # implementation below based on https://github.com/zeromq/pyzmq/blob/main/examples/security/stonehouse.py
@@ -71,7 +162,7 @@ class EngineClient:
         self.dealer_socket.connect(self.protocol + "://" + self.host + ":" + str(self.port))
         if ping:
             try:
-                self._check_connectivity(1000)  # Ping server
+                self._check_connectivity(PING_TIMEOUT)  # Ping server
             except RemoteEngineInitFailed:
                 self.close()
                 raise
@@ -104,6 +195,9 @@ class EngineClient:
     def _check_connectivity(self, timeout):
         """Pings server, waits for the response, and acts accordingly.
 
+        Servers list the optional requests they support in the ping reply's data
+        as ``{"capabilities": [...]}``; the list is stored for later requests.
+
         Args:
             timeout (int): Time to wait for a response before giving up [ms]
 
@@ -128,6 +222,8 @@ class EngineClient:
                 raise RemoteEngineInitFailed(
                     f"Ping failed. Request Id '{random_id}' does not " f"match reply Id '{response_id}'"
                 )
+            data = response.getData()
+            self._server_capabilities = set(data.get("capabilities", ())) if isinstance(data, dict) else set()
             stop_time_ms = round(time.time() * 1000.0)  # debugging
         return
 
@@ -150,12 +246,143 @@ class EngineClient:
         with open(fpath, "rb") as f:
             file_data = f.read()  # Read file into bytes string
         _, zip_filename = os.path.split(fpath)
+        return self._send_project_in_single_frame(project_dir_name, zip_filename, file_data)
+
+    def _send_project_in_single_frame(self, project_dir_name, zip_filename, file_data):
+        """Sends zipped project to server as a single frame.
+
+        Args:
+            project_dir_name (str): Project directory name
+            zip_filename (str): ZIP file name
+            file_data (bytes): zipped project
+
+        Returns:
+            str: Project execution job Id
+        """
         req = ServerMessage("prepare_execution", "1", json.dumps(project_dir_name), [zip_filename])
         self.dealer_socket.send_multipart([req.to_bytes(), file_data])
         response = self.dealer_socket.recv_multipart()
         response_server_message = ServerMessage.parse(response[1])
         return response_server_message.getId()
 
+    def upload_project_dir(self, project_dir_name, project_dir, chunk_size=CHUNK_SIZE, window=UPLOAD_WINDOW):
+        """Zips project directory on the fly and streams it to server in chunks.
+
+        The transfer is opened with a 'prepare_execution_stream' request.
+        The server replies with transfer Id and may lower the chunk size and window.
+        Each chunk is sent as a two-frame 'upload_chunk' message whose header contains
+        the sequence number and CRC-32 of the chunk. At most ``window`` chunks
+        are sent before server acknowledges them. A chunk is resent if server reports
+        a checksum mismatch. Finally, an 'upload_end' message with total size and checksum
+        is sent and the server replies with the job Id.
+
+        Streaming is used only if the server advertises it in its ping reply.
+        Otherwise, the project is zipped into a temporary file and sent as a single frame.
+
+        Args:
+            project_dir_name (str): Project directory name
+            project_dir (str): Absolute path to project directory
+            chunk_size (int): Preferred chunk size in bytes
+            window (int): Preferred maximum number of unacknowledged chunks
+
+        Returns:
+            tuple: Project execution job Id and number of uploaded bytes
+
+        Raises:
+            RemoteEngineInitFailed: raised if server rejects the upload
+        """
+        zip_filename = PROJECT_ZIP_FILENAME + ".zip"
+        if self._server_capabilities is None:
+            self._check_connectivity(PING_TIMEOUT)
+        if STREAMING_UPLOAD_CAPABILITY not in self._server_capabilities:
+            return self._upload_project_dir_as_file(project_dir_name, project_dir, zip_filename, chunk_size)
+        req = ServerMessage("prepare_execution_stream", "1", json.dumps(project_dir_name), [zip_filename])
+        self.dealer_socket.send_multipart([req.to_bytes()])
+        response = ServerMessage.parse(self.dealer_socket.recv_multipart()[1])
+        if response.getCommand() != "prepare_execution_stream":
+            raise RemoteEngineInitFailed(f"Uploading project failed: {response.getData()}")
+        transfer_id = response.getId()
+        transfer_settings = response.getData() or {}
+        chunk_size = min(chunk_size, transfer_settings.get("chunk_size", chunk_size))
+        window = max(1, min(window, transfer_settings.get("window", window)))
+        in_flight = {}  # Maps sequence number to [chunk, retry count]
+        chunk_count = 0
+        total_size = 0
+        total_crc = 0
+        for chunk in iter_zipped_directory(project_dir, chunk_size):
+            while len(in_flight) >= window:
+                self._receive_chunk_ack(transfer_id, in_flight)
+            in_flight[chunk_count] = [chunk, 0]
+            self._send_chunk(transfer_id, chunk_count, chunk)
+            chunk_count += 1
+            total_size += len(chunk)
+            total_crc = zlib.crc32(chunk, total_crc)
+        while in_flight:
+            self._receive_chunk_ack(transfer_id, in_flight)
+        end = ServerMessage(
+            "upload_end", transfer_id, json.dumps({"chunks": chunk_count, "size": total_size, "crc32": total_crc})
+        )
+        self.dealer_socket.send_multipart([end.to_bytes()])
+        response = ServerMessage.parse(self.dealer_socket.recv_multipart()[1])
+        if response.getCommand() != "prepare_execution":
+            raise RemoteEngineInitFailed(f"Uploading project failed: {response.getData()}")
+        return response.getId(), total_size
+
+    def _upload_project_dir_as_file(self, project_dir_name, project_dir, zip_filename, chunk_size):
+        """Zips project directory into a temporary file and uploads it as a single frame.
+
+        Args:
+            project_dir_name (str): Project directory name
+            project_dir (str): Absolute path to project directory
+            zip_filename (str): ZIP file name
+            chunk_size (int): size of chunks written to the file in bytes
+
+        Returns:
+            tuple: Project execution job Id and number of uploaded bytes
+        """
+        with TemporaryDirectory() as temp_dir:
+            zip_path = os.path.join(temp_dir, zip_filename)
+            with open(zip_path, "wb") as zip_file:
+                for chunk in iter_zipped_directory(project_dir, chunk_size):
+                    zip_file.write(chunk)
+            return self.upload_project(project_dir_name, zip_path), os.path.getsize(zip_path)
+
+    def _send_chunk(self, transfer_id, seq, chunk):
+        """Sends a chunk of an upload.
+
+        Args:
+            transfer_id (str): transfer Id
+            seq (int): chunk sequence number
+            chunk (bytes): chunk data
+        """
+        header = ServerMessage("upload_chunk", transfer_id, json.dumps({"seq": seq, "crc32": zlib.crc32(chunk)}))
+        self.dealer_socket.send_multipart([header.to_bytes(), chunk], copy=False)
+
+    def _receive_chunk_ack(self, transfer_id, in_flight):
+        """Waits for server to acknowledge a chunk and resends the chunk if needed.
+
+        Args:
+            transfer_id (str): transfer Id
+            in_flight (dict): mapping from sequence number to chunk and retry count
+
+        Raises:
+            RemoteEngineInitFailed: raised if server rejects the chunk
+        """
+        response = ServerMessage.parse(self.dealer_socket.recv_multipart()[1])
+        ack = response.getData()
+        if response.getCommand() != "upload_chunk" or not isinstance(ack, dict) or ack.get("seq") not in in_flight:
+            raise RemoteEngineInitFailed(f"Uploading project failed: {ack}")
+        seq = ack["seq"]
+        status = ack.get("status", "ok")
+        if status == "ok":
+            del in_flight[seq]
+            return
+        chunk_and_retries = in_flight[seq]
+        if status != "checksum_mismatch" or chunk_and_retries[1] >= MAX_CHUNK_RETRIES:
+            raise RemoteEngineInitFailed(f"Uploading project failed: chunk {seq} rejected ({status})")
+        chunk_and_retries[1] += 1
+        self._send_chunk(transfer_id, seq, chunk_and_retries[0])
+
     def start_execution(self, engine_data, job_id):
         """Sends the start execution request along with job Id and engine (dag) data to the server.
         Response message data contains the push/pull socket port if execution starts successfully.
@@ -200,11 +427,20 @@ class EngineClient:
         self.socket.send_multipart([req.to_bytes()])
 
     def download_files(self, q):
-        """Pulls files from server until b'END' is received."""
+        """Pulls files from server until b'END' is received.
+
+        Files arrive either as single [path, data] messages or in chunks.
+        A chunked file consists of [b'file_chunk', path, header, data] messages,
+        where header contains the CRC-32 of the chunk, followed by a [b'file_end', path, header] message.
+        Chunks are written to disk as they arrive.
+        """
         i = 0
+        downloads = {}
         while True:
             rcv = self.rcv_next("pull")
             if rcv[0] == b"END":
+                for download in downloads.values():
+                    self._abort_download(download)
                 if i > 0:
                     q.put(("server_status_msg", {"msg_type": "neutral", "text": f"Downloaded {i} files"}))
                 break
@@ -212,35 +448,133 @@ class EngineClient:
                 q.put(
                     ("server_status_msg", {"msg_type": "warning", "text": "Downloading file " + rcv[1].decode("utf-8")})
                 )
+            elif rcv[0] == b"file_chunk":
+                self._save_downloaded_chunk(downloads, rcv[1], json.loads(rcv[2].decode("utf-8")), rcv[3])
+            elif rcv[0] == b"file_end":
+                success, txt = self._finish_download(downloads, rcv[1], json.loads(rcv[2].decode("utf-8")))
+                q.put(("server_status_msg", {"msg_type": success, "text": txt}))
+                i += 1
             else:
                 success, txt = self.save_downloaded_file(rcv[0], rcv[1])
                 q.put(("server_status_msg", {"msg_type": success, "text": txt}))
                 i += 1
 
-    def save_downloaded_file(self, b_rel_path, file_data):
-        """Saves downloaded file to project directory.
+    def _destination_path(self, rel_path):
+        """Resolves and creates the destination directory for a downloaded file.
 
         Args:
-            b_rel_path (bytes): Relative path (to project dir) where the file should be saved
-            file_data (bytes): File as bytes object
+            rel_path (str): Relative path (to project dir) where the file should be saved
+
+        Returns:
+            tuple: absolute destination path and None, or None and error message
         """
-        rel_path = b_rel_path.decode("utf-8")
         if not self.client_project_dir:
-            return "fail", f"Project dir should be {self.client_project_dir} but it was not found"
+            return None, f"Project dir should be {self.client_project_dir} but it was not found"
         dst_fpath = os.path.abspath(os.path.join(self.client_project_dir, rel_path))
-        rel_path_wo_fname, _ = os.path.split(rel_path)
         dst_dir, fname = os.path.split(dst_fpath)
         if not os.path.exists(dst_dir):
             try:
                 os.makedirs(dst_dir)  # Create dst directory
             except OSError:
-                return "fail", f"Creating destination dir {dst_dir} for file {fname} failed"
+                return None, f"Creating destination dir {dst_dir} for file {fname} failed"
+        return dst_fpath, None
+
+    @staticmethod
+    def _saved_file_message(rel_path):
+        rel_path_wo_fname, fname = os.path.split(rel_path)
+        return "neutral", f"<b>{fname}</b> saved to  <b>&#x227A;project_dir&#x227B;/{rel_path_wo_fname}</b>"
+
+    def save_downloaded_file(self, b_rel_path, file_data):
+        """Saves downloaded file to project directory.
+
+        Args:
+            b_rel_path (bytes): Relative path (to project dir) where the file should be saved
+            file_data (bytes): File as bytes object
+        """
+        rel_path = b_rel_path.decode("utf-8")
+        dst_fpath, error = self._destination_path(rel_path)
+        if error is not None:
+            return "fail", error
         try:
             with open(dst_fpath, "wb") as f:
                 f.write(file_data)
         except Exception as e:
             return "fail", f"Saving the received file to '{dst_fpath}' failed. [{type(e).__name__}: {e}"
-        return "neutral", f"<b>{fname}</b> saved to  <b>&#x227A;project_dir&#x227B;/{rel_path_wo_fname}</b>"
+        return self._saved_file_message(rel_path)
+
+    def _save_downloaded_chunk(self, downloads, b_rel_path, header, data):
+        """Appends a downloaded chunk to its file.
+
+        Args:
+            downloads (dict): mapping from relative path to ongoing download
+            b_rel_path (bytes): Relative path (to project dir) where the file should be saved
+            header (dict): chunk header
+            data (bytes): chunk data
+        """
+        download = downloads.get(b_rel_path)
+        if download is None:
+            rel_path = b_rel_path.decode("utf-8")
+            dst_fpath, error = self._destination_path(rel_path)
+            file = None
+            if error is None:
+                try:
+                    file = open(dst_fpath, "wb")  # pylint: disable=consider-using-with
+                except OSError as e:
+                    error = f"Saving the received file to '{dst_fpath}' failed. [{type(e).__name__}: {e}"
+            download = downloads[b_rel_path] = _Download(dst_fpath, rel_path, file)
+            download.error = error
+        if download.error is not None:
+            return
+        if zlib.crc32(data) != header["crc32"]:
+            download.error = f"Checksum mismatch in chunk {header.get('seq')} of '{download.rel_path}'"
+            self._abort_download(download)
+            return
+        try:
+            download.file.write(data)
+        except OSError as e:
+            download.error = f"Saving the received file to '{download.dst_fpath}' failed. [{type(e).__name__}: {e}"
+            self._abort_download(download)
+            return
+        download.crc32 = zlib.crc32(data, download.crc32)
+        download.size += len(data)
+
+    def _finish_download(self, downloads, b_rel_path, header):
+        """Closes a chunked download and verifies the complete file.
+
+        Args:
+            downloads (dict): mapping from relative path to ongoing download
+            b_rel_path (bytes): Relative path (to project dir) of the file
+            header (dict): end header with total size and CRC-32 of the file
+
+        Returns:
+            tuple: message type and message text
+        """
+        download = downloads.pop(b_rel_path, None)
+        if download is None:
+            # Empty files have no chunks.
+            return self.save_downloaded_file(b_rel_path, b"")
+        if download.error is None and (download.size, download.crc32) != (header["size"], header["crc32"]):
+            download.error = f"Received file '{download.rel_path}' is corrupted"
+        if download.error is not None:
+            self._abort_download(download)
+            return "fail", download.error
+        download.file.close()
+        return self._saved_file_message(download.rel_path)
+
+    @staticmethod
+    def _abort_download(download):
+        """Closes and removes a partially downloaded file.
+
+        Args:
+            download (_Download): download to abort
+        """
+        if download.file is None or download.file.closed:
+            return
+        download.file.close()
+        try:
+            os.remove(download.dst_fpath)
+        except OSError:
+            pass
 
     def retrieve_project(self, job_id):
         """Retrieves a zipped project file from server.
@@ -414,6 +414,23 @@ class EntityItem(QGraphicsRectItem):
         self._rotate_svg_item()
         self.update_entity_pos()
 
+    def remove_arc_item(self, arc_item):
+        """Removes an item from the list of arcs.
+
+        Args:
+            arc_item (ArcItem)
+        """
+        self.arc_items.remove(arc_item)
+        self._rotate_svg_item()
+
+    def set_offset(self, offset):
+        """Sets the offset from the center of elements.
+
+        Args:
+            offset (_Offset, optional): offset
+        """
+        self._offset = offset
+
     def update_entity_pos(self):
         for arc_item in self.arc_items:
             arc_item.ent_item.do_update_entity_pos()
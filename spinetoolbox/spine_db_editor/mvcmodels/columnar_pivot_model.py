@@ -0,0 +1,928 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Provides ColumnarPivotModel, a pivot model that stores index values as integer code arrays."""
+from itertools import groupby, product
+import numpy as np
+from .pivot_model import PivotModel
+
+
+class _Codebook:
+    """Assigns consecutive integer codes to the values of a single index."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        """Returns the code of given value assigning a new code if needed.
+
+        Args:
+            value (Hashable): index value
+
+        Returns:
+            int: code
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value):
+        """Returns the code of given value.
+
+        Args:
+            value (Hashable): index value
+
+        Returns:
+            int: code or -1 if value has no code
+        """
+        return self.codes.get(value, -1)
+
+
+class _AxisHeader:
+    """Sorted header of one pivot axis.
+
+    Every header value has a stable id so cells can be addressed independently of header positions
+    and new values can be merged into the header without rebuilding it.
+    """
+
+    def __init__(self, values=(), codes=()):
+        """
+        Args:
+            values (list of tuple): header values in header order
+            codes (list of tuple): code rows of header values
+        """
+        self.values = list(values)
+        self.codes = list(codes)
+        self.id_by_codes = dict(zip(self.codes, range(len(self.codes))))
+        self.ids = np.arange(len(self.codes), dtype=np.int64)
+
+    def merge(self, values, codes, sort_key):
+        """Inserts new values into the header.
+
+        Args:
+            values (list of tuple): new header values sorted by ``sort_key``
+            codes (list of tuple): code rows of new values
+            sort_key (Callable): function that returns the sort key of a code row
+
+        Returns:
+            list of int: positions of new values in the updated header in ascending order
+        """
+        insert_points = []
+        low = 0
+        for code_row in codes:
+            key = sort_key(code_row)
+            high = len(self.ids)
+            while low < high:
+                middle = (low + high) // 2
+                if key < sort_key(self.codes[self.ids[middle]]):
+                    high = middle
+                else:
+                    low = middle + 1
+            insert_points.append(low)
+        first_id = len(self.codes)
+        new_ids = range(first_id, first_id + len(codes))
+        self.codes += codes
+        self.id_by_codes.update(zip(codes, new_ids))
+        self.ids = np.insert(self.ids, insert_points, new_ids)
+        merged = []
+        previous = 0
+        for point, value in zip(insert_points, values):
+            merged += self.values[previous:point]
+            merged.append(value)
+            previous = point
+        merged += self.values[previous:]
+        self.values = merged
+        return [point + offset for offset, point in enumerate(insert_points)]
+
+
+def _product_rows(blocks):
+    """Returns the Cartesian product of code blocks as a single code array.
+
+    Args:
+        blocks (list of numpy.ndarray): two-dimensional code arrays
+
+    Returns:
+        numpy.ndarray: array where each row is a concatenation of one row from each block
+    """
+    result = np.zeros((1, 0), dtype=np.int64)
+    for block in blocks:
+        result = np.hstack((np.repeat(result, len(block), axis=0), np.tile(block, (len(result), 1))))
+    return result
+
+
+def _unique_rows(codes):
+    """Returns unique rows of a two-dimensional code array.
+
+    Args:
+        codes (numpy.ndarray): code array
+
+    Returns:
+        numpy.ndarray: unique rows in lexicographical order
+    """
+    if codes.shape[1] == 0:
+        return codes[:1]
+    return np.unique(codes, axis=0)
+
+
+class ColumnarPivotModel(PivotModel):
+    """A pivot model for large data sets.
+
+    Index values are replaced by integer codes and keys are stored as rows of a code array
+    instead of as dictionary keys. Headers are built with vectorized group-by operations
+    and extended incrementally when data is added; data lookups go through header ids
+    which stay valid as new header values are merged in.
+
+    In addition to explicit data, the model has a virtual *product space* of keys that have no value:
+    for each *part* (e.g. database mapping), the space is the Cartesian product of *factors*,
+    sets of partial keys that, concatenated in order, make a full key.
+    Keys in the product space are never materialized;
+    they only contribute to headers, index values and frozen values.
+    """
+
+    def __init__(self, factor_sizes=None):
+        """
+        Args:
+            factor_sizes (Sequence of int, optional): number of indexes in each product space factor
+        """
+        super().__init__()
+        self._codebooks = []
+        self._codes = np.zeros((0, 0), dtype=np.int64)
+        self._size = 0
+        self._keys = []
+        self._values = []
+        self._entry_by_key = {}
+        self._factor_sizes = tuple(factor_sizes) if factor_sizes is not None else None
+        self._parts = {}
+        self._part_codes = {}
+        self._row_header = _AxisHeader()
+        self._column_header = _AxisHeader()
+        self._cells = None
+        self._sort_keys = {}
+        self._ranks = {}
+
+    @property
+    def _row_data_header(self):
+        return self._row_header.values
+
+    @property
+    def _column_data_header(self):
+        return self._column_header.values
+
+    def reset_model(self, data, top_left_headers=(), rows=(), columns=(), frozen=(), frozen_value=()):
+        """Resets the model."""
+        if self._factor_sizes is not None and sum(self._factor_sizes) != len(top_left_headers):
+            raise ValueError("factors don't add up to full keys")
+        self._reset_storage(len(top_left_headers))
+        super().reset_model({}, top_left_headers, rows, columns, frozen, frozen_value)
+        self._data = None
+        if data:
+            self._append_entries(data)
+            self._count_index_values(data)
+            self._reset_headers()
+
+    def clear_model(self):
+        super().clear_model()
+        self._data = None
+        self._reset_storage(0)
+
+    def _reset_storage(self, index_count):
+        """Drops all data.
+
+        Args:
+            index_count (int): number of indexes
+        """
+        self._codebooks = [_Codebook() for _ in range(index_count)]
+        self._codes = np.zeros((64, index_count), dtype=np.int64)
+        self._size = 0
+        self._keys = []
+        self._values = []
+        self._entry_by_key = {}
+        self._parts = {}
+        self._part_codes = {}
+        self._row_header = _AxisHeader()
+        self._column_header = _AxisHeader()
+        self._cells = None
+        self._sort_keys = {}
+        self._ranks = {}
+
+    def update_model(self, data):
+        new_data = {}
+        for key, value in data.items():
+            entry = self._entry_by_key.get(key)
+            if entry is None:
+                new_data[key] = value
+            else:
+                self._values[entry] = value
+        if new_data:
+            first_entry = self._size
+            self._append_entries(new_data)
+            if self._cells is not None:
+                self._add_cells(first_entry)
+
+    def add_to_model(self, data):
+        """Adds data to model.
+
+        Args:
+            data (dict): pivot model data
+
+        Returns:
+            tuple: positions of added rows and positions of added columns, both in ascending order
+        """
+        new_data = {}
+        for key, value in data.items():
+            entry = self._entry_by_key.get(key)
+            if entry is None:
+                new_data[key] = value
+            elif value is not None:
+                self._values[entry] = value
+        if not new_data:
+            return [], []
+        first_entry = self._size
+        self._append_entries(new_data)
+        self._count_index_values(new_data)
+
+        def new_combinations(positions, frozen_positions, frozen_codes):
+            codes = self._codes[first_entry : self._size]
+            if frozen_positions:
+                codes = codes[np.all(codes[:, frozen_positions] == frozen_codes, axis=1)]
+            return [codes[:, positions]]
+
+        return self._update_headers(new_combinations=new_combinations, first_new_entry=first_entry)
+
+    def remove_from_model(self, data):
+        """Removes data from model.
+
+        Args:
+            data (Iterable of tuple): keys to remove
+
+        Returns:
+            tuple: positions of removed rows and positions of removed columns before the removal,
+                both in ascending order
+        """
+        removed_keys = [key for key in data if key in self._entry_by_key]
+        if not removed_keys:
+            return [], []
+        for key in removed_keys:
+            entry = self._entry_by_key.pop(key)
+            last = self._size - 1
+            if entry != last:
+                moved_key = self._keys[last]
+                self._codes[entry] = self._codes[last]
+                self._keys[entry] = moved_key
+                self._values[entry] = self._values[last]
+                self._entry_by_key[moved_key] = entry
+            self._keys.pop()
+            self._values.pop()
+            self._size = last
+        self._uncount_index_values(removed_keys)
+        return self._update_headers(added=False)
+
+    def add_product(self, products):
+        """Adds keys to the product space.
+
+        Args:
+            products (dict): mapping from part to list of factors; each factor is an iterable of partial keys
+
+        Returns:
+            tuple: positions of added rows and positions of added columns, both in ascending order
+        """
+        added = []
+        for part, factors in products.items():
+            self._check_factors(factors)
+            part_factors = self._parts.setdefault(part, [{} for _ in factors])
+            member_codes = self._part_codes.get(part)
+            for factor, (offset, size, factor_members, members) in enumerate(
+                zip(self._factor_offsets(), self._factor_sizes, part_factors, factors)
+            ):
+                new_members = [member for member in members if member not in factor_members]
+                if not new_members:
+                    continue
+                factor_members.update(dict.fromkeys(new_members))
+                new_codes = np.zeros((len(new_members), size), dtype=np.int64)
+                for local, values in enumerate(zip(*new_members)):
+                    codebook = self._codebooks[offset + local]
+                    new_codes[:, local] = [codebook.code(value) for value in values]
+                self._count_members(offset, new_members, 1)
+                if member_codes is not None:
+                    member_codes[factor] = np.concatenate((member_codes[factor], new_codes))
+                added.append((part, factor, new_codes))
+        if not added:
+            return [], []
+
+        def new_combinations(positions, frozen_positions, frozen_codes):
+            blocks = []
+            for part, factor, new_codes in added:
+                combinations = self._part_combinations(
+                    part, positions, frozen_positions, frozen_codes, {factor: new_codes}
+                )
+                if combinations is not None:
+                    blocks.append(combinations)
+            return blocks
+
+        return self._update_headers(new_combinations=new_combinations)
+
+    def remove_product(self, products):
+        """Removes keys from the product space.
+
+        Args:
+            products (dict): mapping from part to list of factors; each factor is an iterable of partial keys;
+                members of each factor are removed from the part's corresponding factor
+
+        Returns:
+            tuple: positions of removed rows and positions of removed columns before the removal,
+                both in ascending order
+        """
+        removed = False
+        for part, factors in products.items():
+            part_factors = self._parts.get(part)
+            if part_factors is None:
+                continue
+            for offset, factor_members, members in zip(self._factor_offsets(), part_factors, factors):
+                removed_members = [member for member in members if member in factor_members]
+                if not removed_members:
+                    continue
+                for member in removed_members:
+                    del factor_members[member]
+                self._count_members(offset, removed_members, -1)
+                removed = True
+            self._part_codes.pop(part, None)
+        if not removed:
+            return [], []
+        return self._update_headers(added=False)
+
+    def product_frozen_values(self, products):
+        """Collects frozen values from product space keys.
+
+        Factors that are empty in ``products`` are taken from the current product space.
+
+        Args:
+            products (dict): mapping from part to list of factors
+
+        Returns:
+            set of tuple: frozen values
+        """
+        frozen_positions = [self.index_ids.index(i) for i in self.pivot_frozen]
+        frozen_values = set()
+        for part, factors in products.items():
+            current_factors = self._parts.get(part, [{} for _ in factors])
+            projections = []
+            for offset, size, members, current_members in zip(
+                self._factor_offsets(), self._factor_sizes, factors, current_factors
+            ):
+                local = [(p, p - offset) for p in frozen_positions if offset <= p < offset + size]
+                projections.append({tuple((p, member[j]) for p, j in local) for member in members or current_members})
+            for combination in product(*projections):
+                by_position = dict(pair for pairs in combination for pair in pairs)
+                frozen_values.add(tuple(by_position[p] for p in frozen_positions))
+        return frozen_values
+
+    def has_frozen_value(self, value):
+        """Checks if any key has given frozen value.
+
+        Args:
+            value (tuple): frozen value
+
+        Returns:
+            bool: True if frozen value exists in data, False otherwise
+        """
+        frozen_positions = [self.index_ids.index(i) for i in self.pivot_frozen]
+        frozen_codes = self._encode_values(frozen_positions, value)
+        if frozen_codes is None:
+            return False
+        codes = self._codes[: self._size]
+        if np.any(np.all(codes[:, frozen_positions] == frozen_codes, axis=1)):
+            return True
+        return any(
+            self._part_combinations(part, [], frozen_positions, frozen_codes) is not None for part in self._parts
+        )
+
+    def index_value_combinations(self, indexes):
+        """Returns unique combinations of values of given indexes in data and product space.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            list of tuple: index value combinations
+        """
+        positions = [self.index_ids.index(i) for i in indexes]
+        combinations = self._combinations(positions, [], np.zeros(0, dtype=np.int64))
+        return self._decode(positions, combinations)
+
+    def _get_unique_index_values(self, indexes):
+        """Returns unique indexes that match the frozen condition.
+
+        Args:
+            indexes (tuple): indexes to match
+
+        Returns:
+            list: unique indexes
+        """
+        return self._axis_header(indexes).values
+
+    def _reset_frozen_value_counts(self):
+        self._frozen_getter = self._index_key_getter(self.pivot_frozen)
+
+    def _reset_headers(self):
+        self._row_header = self._axis_header(self.pivot_rows)
+        self._column_header = self._axis_header(self.pivot_columns)
+        self._cells = None
+
+    def rekey_headers(self, index_values):
+        """See base class."""
+        rekeyed = False
+        for index_id, codebook in zip(self.index_ids, self._codebooks):
+            cached = self._sort_keys.get(index_id)
+            if cached is None:
+                continue
+            accepted, sort_keys = cached
+            header = self.top_left_headers[index_id]
+            index_rekeyed = False
+            for value in index_values:
+                code = codebook.find(value)
+                if not 0 <= code < len(sort_keys) or not accepted[code]:
+                    continue
+                sort_key = header.header_data(value)
+                sort_key = sort_key if sort_key is not None else ""
+                if sort_key != sort_keys[code]:
+                    sort_keys[code] = sort_key
+                    index_rekeyed = True
+            if index_rekeyed:
+                self._ranks.pop(index_id, None)
+                rekeyed = True
+        if not rekeyed:
+            return False
+        old_rows = self._row_header.values
+        old_columns = self._column_header.values
+        self._reset_headers()
+        return self._row_header.values != old_rows or self._column_header.values != old_columns
+
+    def _update_headers(self, added=True, new_combinations=None, first_new_entry=None):
+        """Updates headers after data or product space has changed.
+
+        Args:
+            added (bool): True if keys were added, False if they were removed
+            new_combinations (Callable, optional): function that returns code blocks of added keys
+                projected to given index positions; if given, new values are merged into current headers
+                instead of rebuilding them
+            first_new_entry (int, optional): first added data entry
+
+        Returns:
+            tuple: positions of changed rows and positions of changed columns, both in ascending order;
+                positions refer to the new headers if values were added, otherwise to the old headers
+        """
+        if added and not any(self.frozen_value):
+            frozen_value = self._frozen_getter(self._first_key())
+            if frozen_value != self.frozen_value:
+                self.frozen_value = frozen_value
+                self._reset_headers()
+                return list(range(len(self._row_header.values))), list(range(len(self._column_header.values)))
+        if added and new_combinations is not None:
+            return self._merge_headers(new_combinations, first_new_entry)
+        old_rows = self._row_header.values
+        old_columns = self._column_header.values
+        self._reset_headers()
+        return (
+            _changed_positions(old_rows, self._row_header.values),
+            _changed_positions(old_columns, self._column_header.values),
+        )
+
+    def _merge_headers(self, new_combinations, first_new_entry):
+        """Merges added keys into current headers and cell table.
+
+        Args:
+            new_combinations (Callable): function that returns code blocks of added keys
+                projected to given index positions
+            first_new_entry (int, optional): first added data entry
+
+        Returns:
+            tuple: positions of added rows and positions of added columns, both in ascending order
+        """
+        frozen_positions = [self.index_ids.index(i) for i in self.pivot_frozen]
+        frozen_codes = self._encode_values(frozen_positions, self.frozen_value)
+        if frozen_codes is None:
+            return [], []
+        added_positions = []
+        for indexes, header in ((self.pivot_rows, self._row_header), (self.pivot_columns, self._column_header)):
+            if not indexes:
+                added_positions.append([])
+                continue
+            positions = [self.index_ids.index(i) for i in indexes]
+            blocks = [block for block in new_combinations(positions, frozen_positions, frozen_codes) if len(block)]
+            if not blocks:
+                added_positions.append([])
+                continue
+            accepted = []
+            sort_keys = []
+            for index_id, position in zip(indexes, positions):
+                index_accepted, index_sort_keys = self._sort_keys_of_index(index_id, position)
+                accepted.append(index_accepted)
+                sort_keys.append(index_sort_keys)
+            new_codes = [
+                code_row
+                for code_row in map(tuple, _unique_rows(np.concatenate(blocks)).tolist())
+                if code_row not in header.id_by_codes
+                and all(index_accepted[code] for index_accepted, code in zip(accepted, code_row))
+            ]
+            if not new_codes:
+                added_positions.append([])
+                continue
+
+            def sort_key(code_row):
+                return tuple(keys[code] for keys, code in zip(sort_keys, code_row)) + code_row
+
+            new_codes.sort(key=sort_key)
+            new_values = self._decode(positions, np.array(new_codes, dtype=np.int64))
+            added_positions.append(header.merge(new_values, new_codes, sort_key))
+        if self._cells is not None and first_new_entry is not None:
+            self._add_cells(first_new_entry)
+        return tuple(added_positions)
+
+    def _first_key(self):
+        """Returns the first key of the model.
+
+        Returns:
+            tuple: key or None if model is empty
+        """
+        if self._keys:
+            return self._keys[0]
+        for factors in self._parts.values():
+            if all(factors):
+                return sum((next(iter(members)) for members in factors), ())
+        return None
+
+    def _check_factors(self, factors):
+        """Checks that factors are compatible with the product space.
+
+        Args:
+            factors (list): factors
+        """
+        if self._factor_sizes is None:
+            raise RuntimeError("model has no product space")
+        if len(factors) != len(self._factor_sizes):
+            raise ValueError("wrong number of factors")
+
+    def _factor_offsets(self):
+        """Returns the position of each factor's first index.
+
+        Returns:
+            list of int: offsets
+        """
+        offsets = []
+        offset = 0
+        for size in self._factor_sizes:
+            offsets.append(offset)
+            offset += size
+        return offsets
+
+    def _count_members(self, offset, members, increment):
+        """Updates index value counts after factor members have been added or removed.
+
+        Args:
+            offset (int): position of the factor's first index
+            members (list of tuple): added or removed members
+            increment (int): 1 for added members, -1 for removed members
+        """
+        for local, values in enumerate(zip(*members)):
+            counts = self.index_values[self.index_ids[offset + local]]
+            for value in values:
+                count = counts.get(value, 0) + increment
+                if count > 0:
+                    counts[value] = count
+                else:
+                    del counts[value]
+
+    def _uncount_index_values(self, keys):
+        """Removes given keys from index value counts.
+
+        Args:
+            keys (list of tuple): removed data keys
+        """
+        for index_id, values in zip(self.index_ids, zip(*keys)):
+            counts = self.index_values[index_id]
+            for value in values:
+                count = counts[value] - 1
+                if count:
+                    counts[value] = count
+                else:
+                    del counts[value]
+
+    def _append_entries(self, data):
+        """Appends explicit data entries.
+
+        Args:
+            data (dict): mapping from new keys to values
+        """
+        new_size = self._size + len(data)
+        if new_size > len(self._codes):
+            capacity = max(new_size, 2 * len(self._codes))
+            codes = np.zeros((capacity, len(self._codebooks)), dtype=np.int64)
+            codes[: self._size] = self._codes[: self._size]
+            self._codes = codes
+        block = self._codes[self._size : new_size]
+        for position, (codebook, values) in enumerate(zip(self._codebooks, zip(*data))):
+            block[:, position] = [codebook.code(value) for value in values]
+        for entry, key in enumerate(data, start=self._size):
+            self._entry_by_key[key] = entry
+        self._keys += data.keys()
+        self._values += data.values()
+        self._size = new_size
+
+    def _encode_values(self, positions, values):
+        """Encodes values of given index positions.
+
+        Args:
+            positions (list of int): index positions
+            values (tuple): values
+
+        Returns:
+            numpy.ndarray: codes or None if some value has no code
+        """
+        codes = np.array([self._codebooks[p].find(v) for p, v in zip(positions, values)], dtype=np.int64)
+        if np.any(codes < 0):
+            return None
+        return codes
+
+    def _decode(self, positions, codes):
+        """Converts code rows back to value tuples.
+
+        Args:
+            positions (list of int): index positions of code columns
+            codes (numpy.ndarray): code array
+
+        Returns:
+            list of tuple: values
+        """
+        value_lists = [self._codebooks[p].values for p in positions]
+        return [tuple(values[c] for values, c in zip(value_lists, row)) for row in codes.tolist()]
+
+    def _member_codes(self, part):
+        """Returns factor members of given part as code arrays.
+
+        Args:
+            part (Hashable): part
+
+        Returns:
+            list of numpy.ndarray: code array for each factor
+        """
+        member_codes = self._part_codes.get(part)
+        if member_codes is None:
+            member_codes = []
+            offset = 0
+            for members, size in zip(self._parts[part], self._factor_sizes):
+                codes = np.zeros((len(members), size), dtype=np.int64)
+                for local, values in enumerate(zip(*members)):
+                    codebook = self._codebooks[offset + local]
+                    codes[:, local] = [codebook.code(value) for value in values]
+                member_codes.append(codes)
+                offset += size
+            self._part_codes[part] = member_codes
+        return member_codes
+
+    def _part_combinations(self, part, positions, frozen_positions, frozen_codes, restricted=None):
+        """Projects the product space of a part to given index positions.
+
+        Args:
+            part (Hashable): part
+            positions (list of int): index positions to project to
+            frozen_positions (list of int): positions of frozen indexes
+            frozen_codes (numpy.ndarray): codes of frozen values
+            restricted (dict, optional): mapping from factor number to code array
+                that replaces the factor's members in the projection
+
+        Returns:
+            numpy.ndarray: code array with columns in the order of ``positions``
+                or None if no key of the part matches the frozen values
+        """
+        if self._factor_sizes is None or not all(self._parts[part]):
+            return None
+        blocks = []
+        block_positions = []
+        offset = 0
+        for factor, (codes, size) in enumerate(zip(self._member_codes(part), self._factor_sizes)):
+            if restricted is not None and factor in restricted:
+                codes = restricted[factor]
+            frozen_local = [
+                (p - offset, c) for p, c in zip(frozen_positions, frozen_codes) if offset <= p < offset + size
+            ]
+            if frozen_local:
+                mask = np.all([codes[:, local] == code for local, code in frozen_local], axis=0)
+                codes = codes[mask]
+                if len(codes) == 0:
+                    return None
+            local_positions = [p - offset for p in positions if offset <= p < offset + size]
+            if local_positions:
+                blocks.append(_unique_rows(codes[:, local_positions]))
+                block_positions += [offset + local for local in local_positions]
+            offset += size
+        combinations = _product_rows(blocks)
+        order = [block_positions.index(p) for p in positions]
+        return combinations[:, order]
+
+    def _combinations(self, positions, frozen_positions, frozen_codes):
+        """Returns unique combinations of codes at given positions
+        in explicit data and product space that match the frozen values.
+
+        Args:
+            positions (list of int): index positions
+            frozen_positions (list of int): positions of frozen indexes
+            frozen_codes (numpy.ndarray): codes of frozen values
+
+        Returns:
+            numpy.ndarray: unique code rows
+        """
+        codes = self._codes[: self._size]
+        if frozen_positions:
+            codes = codes[np.all(codes[:, frozen_positions] == frozen_codes, axis=1)]
+        blocks = [codes[:, positions]]
+        for part in self._parts:
+            combinations = self._part_combinations(part, positions, frozen_positions, frozen_codes)
+            if combinations is not None:
+                blocks.append(combinations)
+        return _unique_rows(np.concatenate(blocks))
+
+    def _axis_header(self, indexes):
+        """Builds sorted header for given indexes.
+
+        Args:
+            indexes (tuple): header indexes
+
+        Returns:
+            _AxisHeader: header
+        """
+        if not indexes:
+            return _AxisHeader()
+        positions = [self.index_ids.index(i) for i in indexes]
+        frozen_positions = [self.index_ids.index(i) for i in self.pivot_frozen]
+        frozen_codes = self._encode_values(frozen_positions, self.frozen_value)
+        if frozen_codes is None:
+            return _AxisHeader()
+        combinations = self._combinations(positions, frozen_positions, frozen_codes)
+        accepted = np.ones(len(combinations), dtype=bool)
+        ranks = []
+        for column, (index_id, position) in enumerate(zip(indexes, positions)):
+            index_accepted, index_ranks = self._ranks_of_index(index_id, position)
+            accepted &= index_accepted[combinations[:, column]]
+            ranks.append(index_ranks[combinations[:, column]])
+        combinations = combinations[accepted]
+        if len(combinations) > 1:
+            combinations = combinations[np.lexsort([rank[accepted] for rank in reversed(ranks)])]
+        return _AxisHeader(self._decode(positions, combinations), list(map(tuple, combinations.tolist())))
+
+    def _sort_keys_of_index(self, index_id, position):
+        """Returns acceptance flags and sort keys for all codes of an index.
+
+        Sort keys are looked up once per code so the order of existing header values stays stable.
+
+        Args:
+            index_id (str): index id
+            position (int): index position
+
+        Returns:
+            tuple: list of acceptance flags and list of sort keys, both indexed by code
+        """
+        codebook = self._codebooks[position]
+        accepted, sort_keys = self._sort_keys.setdefault(index_id, ([], []))
+        if len(sort_keys) < len(codebook.values):
+            header = self.top_left_headers[index_id]
+            for value in codebook.values[len(sort_keys) :]:
+                is_accepted = header.accepts(value)
+                accepted.append(is_accepted)
+                sort_key = header.header_data(value) if is_accepted else None
+                sort_keys.append(sort_key if sort_key is not None else "")
+        return accepted, sort_keys
+
+    def _ranks_of_index(self, index_id, position):
+        """Returns acceptance flags and dense sort ranks for all codes of an index.
+
+        Args:
+            index_id (str): index id
+            position (int): index position
+
+        Returns:
+            tuple: boolean array of accepted codes and integer array of ranks
+        """
+        accepted, sort_keys = self._sort_keys_of_index(index_id, position)
+        cached = self._ranks.get(index_id)
+        if cached is not None and len(cached[1]) == len(sort_keys):
+            return cached
+        ranks = np.zeros(len(sort_keys), dtype=np.int64)
+        order = sorted(range(len(sort_keys)), key=sort_keys.__getitem__)
+        for rank, (_, group) in enumerate(groupby(order, key=sort_keys.__getitem__)):
+            ranks[list(group)] = rank
+        cached = self._ranks[index_id] = np.array(accepted, dtype=bool), ranks
+        return cached
+
+    def _cell_table(self):
+        """Returns the cells of explicit data in current frozen slice.
+
+        Returns:
+            dict: mapping from row header id and column header id to entry
+        """
+        if self._cells is None:
+            self._cells = {}
+            self._add_cells(0)
+        return self._cells
+
+    def _add_cells(self, first_entry):
+        """Adds cells of data entries to the cell table.
+
+        Args:
+            first_entry (int): first entry to add; all entries after it are added as well
+        """
+        codes = self._codes[first_entry : self._size]
+        entries = np.arange(first_entry, self._size)
+        frozen_positions = [self.index_ids.index(i) for i in self.pivot_frozen]
+        frozen_codes = self._encode_values(frozen_positions, self.frozen_value)
+        if frozen_codes is None:
+            return
+        if frozen_positions:
+            mask = np.all(codes[:, frozen_positions] == frozen_codes, axis=1)
+            codes = codes[mask]
+            entries = entries[mask]
+        rows = self._header_ids(codes, self.pivot_rows, self._row_header)
+        columns = self._header_ids(codes, self.pivot_columns, self._column_header)
+        self._cells.update(
+            ((row, column), entry)
+            for row, column, entry in zip(rows, columns, entries.tolist())
+            if row >= 0 and column >= 0
+        )
+
+    def _header_ids(self, codes, indexes, header):
+        """Finds the header id of each code row.
+
+        Args:
+            codes (numpy.ndarray): code rows of data keys
+            indexes (tuple): header indexes
+            header (_AxisHeader): header
+
+        Returns:
+            list of int: header ids; -1 where key is not in header
+        """
+        if not indexes:
+            return [0] * len(codes)
+        positions = [self.index_ids.index(i) for i in indexes]
+        id_by_codes = header.id_by_codes
+        return [id_by_codes.get(code_row, -1) for code_row in map(tuple, codes[:, positions].tolist())]
+
+    def get_pivoted_data(self, row_mask, column_mask):
+        """Returns data for indexes in row_mask and column_mask.
+
+        Args:
+            row_mask (list)
+            column_mask (list)
+
+        Returns:
+            list(list)
+        """
+        if not self.rows and not self.columns:
+            if self.pivot_frozen and len(self.pivot_frozen) == len(self.index_ids):
+                # special case when all indexes are in pivot frozen
+                entry = self._entry_by_key.get(self._key_getter(self.frozen_value))
+                return [[self._values[entry] if entry is not None else None]]
+            # no data
+            return []
+        if self.pivot_rows and any(r >= len(self.rows) or r < 0 for r in row_mask):
+            raise ValueError("row_mask contains invalid indexes for current row pivot")
+        if self.pivot_columns and any(c >= len(self.columns) or c < 0 for c in column_mask):
+            raise ValueError("column_mask contains invalid indexes for current column pivot")
+        rows = self._row_header.ids[list(row_mask)].tolist() if self.pivot_rows else [0] * len(row_mask)
+        columns = self._column_header.ids[list(column_mask)].tolist() if self.pivot_columns else [0] * len(column_mask)
+        cells = self._cell_table()
+        values = self._values
+        return [
+            [values[entry] if (entry := cells.get((row, column))) is not None else None for column in columns]
+            for row in rows
+        ]
+
+
+def _changed_positions(old, new):
+    """Returns positions of values that are in one list but not in the other.
+
+    If ``new`` is longer than ``old``, returns positions of added values in ``new``,
+    otherwise positions of removed values in ``old``.
+
+    Args:
+        old (list): old values
+        new (list): new values
+
+    Returns:
+        list of int: positions in ascending order
+    """
+    if len(new) >= len(old):
+        old_values = set(old)
+        return [position for position, value in enumerate(new) if value not in old_values]
+    new_values = set(new)
+    return [position for position, value in enumerate(old) if value not in new_values]
@@ -0,0 +1,142 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Contains a lazy model for browsing database commits."""
+from enum import IntEnum, unique
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal, Slot
+
+
+@unique
+class CommitColumn(IntEnum):
+    """Identifiers for commit list columns."""
+
+    COMMENT = 0
+    USER = 1
+    DATE = 2
+
+
+_HEADER = ("Comment", "User", "Date")
+PAGE_SIZE = 100
+"""Number of commits queried at a time."""
+
+
+class CommitListModel(QAbstractTableModel):
+    """A model that pages through a database's commits newest first.
+
+    Commits are queried in the database manager's worker thread
+    only when the view asks for more rows.
+    """
+
+    _page_received = Signal(object)
+
+    def __init__(self, db_mngr, db_map, page_size=PAGE_SIZE, parent=None):
+        """
+        Args:
+            db_mngr (SpineDBManager): database manager
+            db_map (DatabaseMapping): database mapping
+            page_size (int): number of commits to query at a time
+            parent (QObject, optional): parent object
+        """
+        super().__init__(parent)
+        self._db_mngr = db_mngr
+        self._db_map = db_map
+        self._page_size = page_size
+        self._commits = []
+        self._fetching = False
+        self._all_fetched = False
+        self._page_received.connect(self._add_page)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._commits)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(_HEADER)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return _HEADER[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        commit = self._commits[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == CommitColumn.COMMENT:
+                return str(commit["comment"]) or "<no comment>"
+            if column == CommitColumn.USER:
+                return str(commit["user"])
+            return str(commit["date"])
+        if role == Qt.ItemDataRole.ToolTipRole and column == CommitColumn.COMMENT:
+            return str(commit["comment"])
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._all_fetched and not self._fetching
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        before_id = self._commits[-1]["id"] if self._commits else None
+        future = self._db_mngr.fetch_commits(self._db_map, before_id, self._page_size)
+        future.add_done_callback(self._page_received.emit)
+
+    def is_fetching(self):
+        """Checks if a page of commits is being queried.
+
+        Returns:
+            bool: True if query is running, False otherwise
+        """
+        return self._fetching
+
+    def commit_id(self, row):
+        """Returns the id of commit on given row.
+
+        Args:
+            row (int): row
+
+        Returns:
+            int: commit id
+        """
+        return self._commits[row]["id"]
+
+    @Slot(object)
+    def _add_page(self, future):
+        """Appends queried commits to the model.
+
+        Args:
+            future (QtBasedFuture): query's future
+        """
+        self._fetching = False
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._all_fetched = True
+            self._db_mngr.error_msg.emit({self._db_map: [f"Failed to fetch commits: {error}"]})
+            return
+        commits = future.result()
+        if len(commits) < self._page_size:
+            self._all_fetched = True
+        if not commits:
+            return
+        first = len(self._commits)
+        self.beginInsertRows(QModelIndex(), first, first + len(commits) - 1)
+        self._commits += commits
+        self.endInsertRows()
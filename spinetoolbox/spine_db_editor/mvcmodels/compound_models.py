@@ -10,7 +10,7 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
 
-""" Compound models. These models concatenate several 'single' models and one 'empty' model. """
+"""Compound models. These models concatenate several 'single' models and one 'empty' model."""
 from PySide6.QtCore import Qt, Slot, QTimer, QModelIndex
 from PySide6.QtGui import QFont
 from spinedb_api.parameter_value import join_value_and_type
@@ -138,6 +138,11 @@ class CompoundModelBase(CompoundWithEmptyTableModel):
             menu.filterChanged.connect(self.set_auto_filter)
         return self._auto_filter_menus[field]
 
+    def batch_set_data(self, indexes, data):
+        """Sets data for indexes in batch so that all resulting database changes undo as one."""
+        with self.db_mngr.command_group():
+            return super().batch_set_data(indexes, data)
+
     def headerData(self, section, orientation=Qt.Orientation.Horizontal, role=Qt.ItemDataRole.DisplayRole):
         """Returns an italic font in case the given column has an autofilter installed."""
         field = self.header[section]
@@ -259,22 +264,20 @@ class CompoundModelBase(CompoundWithEmptyTableModel):
         """
         values = self._auto_filter[field].get((model.db_map, model.entity_class_id), set())
         if model.set_auto_filter(field, values):
+            self._invalidate_sub_model_rows(model)
             self._invalidate_filter()
 
-    def _row_map_iterator_for_model(self, model):
-        """Yields row map for the given model.
-        Reimplemented to take filter status into account.
+    def _accepted_sub_rows(self, model):
+        """Returns accepted rows of given model.
+        Reimplemented to take the sub model's filters into account.
 
         Args:
             model (SingleParameterModel, EmptyParameterModel)
 
-        Yields:
-            tuple: (model, row number) for each accepted row
+        Returns:
+            Iterable of int: accepted rows
         """
-        if not self.filter_accepts_model(model):
-            return ()
-        for i in model.accepted_rows():
-            yield (model, i)
+        return model.accepted_rows()
 
     def _models_with_db_map(self, db_map):
         """Returns a collection of single models with given db_map.
@@ -372,6 +375,10 @@ class CompoundModelBase(CompoundWithEmptyTableModel):
         Args:
             db_map_data (dict): list of updated dict-items keyed by DatabaseMapping
         """
+        for model in self.single_models:
+            if model.db_map in db_map_data:
+                model.clear_filter_cache()
+                self._invalidate_sub_model_rows(model)
         self.dataChanged.emit(
             self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1), [Qt.ItemDataRole.DisplayRole]
         )
@@ -403,6 +410,8 @@ class CompoundModelBase(CompoundWithEmptyTableModel):
                             break
                 for row, count in sorted(rows_to_row_count_tuples(removed_rows), reverse=True):
                     del model._main_data[row : row + count]
+                model.clear_filter_cache()
+                self._invalidate_sub_model_rows(model)
                 if model.rowCount() == 0:
                     emptied_single_model_indexes.append(model_index)
             for model_index in reversed(emptied_single_model_indexes):
@@ -459,12 +468,14 @@ class FilterEntityAlternativeMixin:
         self._filter_entity_ids = entity_ids
         for model in self.single_models:
             if model.set_filter_entity_ids(entity_ids):
+                self._invalidate_sub_model_rows(model)
                 self._invalidate_filter()
 
     def set_filter_alternative_ids(self, alternative_ids):
         self._filter_alternative_ids = alternative_ids
         for model in self.single_models:
             if model.set_filter_alternative_ids(alternative_ids):
+                self._invalidate_sub_model_rows(model)
                 self._invalidate_filter()
 
     def _create_single_model(self, db_map, entity_class_id, committed):
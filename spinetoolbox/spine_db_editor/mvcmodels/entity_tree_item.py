@@ -14,7 +14,7 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QBrush, QIcon
 from spinetoolbox.helpers import DB_ITEM_SEPARATOR, plain_to_tool_tip
-from spinetoolbox.fetch_parent import FlexibleFetchParent, FetchIndex
+from spinetoolbox.fetch_parent import FlexibleFetchParent, FetchIndex, FetchPriority
 from .multi_db_tree_item import MultiDBTreeItem
 
 
@@ -179,6 +179,7 @@ class EntityItem(MultiDBTreeItem):
             index=self._entity_group_index,
             key_for_index=self._key_for_entity_group_index,
             owner=self,
+            priority=FetchPriority.TREE,
         )
 
     @property
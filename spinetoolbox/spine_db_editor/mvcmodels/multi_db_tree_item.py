@@ -14,7 +14,7 @@
 from operator import attrgetter
 from PySide6.QtCore import Qt
 from ...helpers import rows_to_row_count_tuples, bisect_chunks
-from ...fetch_parent import FlexibleFetchParent
+from ...fetch_parent import FetchPriority, FlexibleFetchParent
 from ...mvcmodels.minimal_tree_model import TreeItem
 
 
@@ -46,6 +46,7 @@ class MultiDBTreeItem(TreeItem):
             index=self._fetch_index,
             key_for_index=self._key_for_index,
             owner=self,
+            priority=FetchPriority.TREE,
         )
 
     @property
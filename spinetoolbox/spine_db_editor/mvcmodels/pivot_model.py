@@ -11,14 +11,149 @@
 ######################################################################################################################
 
 """Provides PivotModel."""
+import bisect
+import itertools
 import operator
 from ...helpers import tuple_itemgetter
 
 
+class _AxisHeader:
+    """Unique header values of a pivot axis in sorted order.
+
+    Keeps count of the data keys that share each header value
+    so values can be added and removed in batches without going through all data.
+    """
+
+    _INSORT_LIMIT = 64
+    """Batches larger than this are merged into the header in one go instead of inserting values one by one."""
+
+    def __init__(self, key_getter=None, sort_key=None):
+        """
+        Args:
+            key_getter (Callable, optional): function that returns header value for a data key;
+                if None, the axis has no header
+            sort_key (Callable, optional): function that returns sort key for a header value
+                or None if the value is not accepted to the header
+        """
+        self.values = []
+        self._key_getter = key_getter
+        self._sort_key = sort_key
+        self._entries = []  # (sort key, sequence number, value) triplets parallel to values
+        self._entry_by_value = {}
+        self._counts = {}
+        self._sequence = itertools.count()
+
+    def add(self, keys):
+        """Adds data keys to the header.
+
+        Args:
+            keys (Iterable of tuple): data keys
+
+        Returns:
+            list of int: positions of new header values in ascending order
+        """
+        if self._key_getter is None:
+            return []
+        new_entries = []
+        for key in keys:
+            value = self._key_getter(key)
+            count = self._counts.get(value, 0)
+            self._counts[value] = count + 1
+            if count:
+                continue
+            sort_key = self._sort_key(value)
+            if sort_key is None:
+                continue
+            entry = (sort_key, next(self._sequence), value)
+            self._entry_by_value[value] = entry
+            new_entries.append(entry)
+        if not new_entries:
+            return []
+        if len(new_entries) <= self._INSORT_LIMIT:
+            for entry in new_entries:
+                position = bisect.bisect(self._entries, entry)
+                self._entries.insert(position, entry)
+                self.values.insert(position, entry[2])
+        else:
+            self._entries += sorted(new_entries)
+            self._entries.sort()
+            self.values[:] = [entry[2] for entry in self._entries]
+        return sorted(bisect.bisect_left(self._entries, entry) for entry in new_entries)
+
+    def remove(self, keys):
+        """Removes data keys from the header.
+
+        Args:
+            keys (Iterable of tuple): data keys that have been added before
+
+        Returns:
+            list of int: positions of removed header values before the removal in ascending order
+        """
+        if self._key_getter is None:
+            return []
+        removed_entries = []
+        for key in keys:
+            value = self._key_getter(key)
+            count = self._counts[value] - 1
+            if count:
+                self._counts[value] = count
+                continue
+            del self._counts[value]
+            entry = self._entry_by_value.pop(value, None)
+            if entry is not None:
+                removed_entries.append(entry)
+        if not removed_entries:
+            return []
+        positions = sorted(bisect.bisect_left(self._entries, entry) for entry in removed_entries)
+        if len(positions) <= self._INSORT_LIMIT:
+            for position in reversed(positions):
+                del self._entries[position]
+                del self.values[position]
+        else:
+            removed = set(positions)
+            self._entries = [entry for i, entry in enumerate(self._entries) if i not in removed]
+            self.values[:] = [entry[2] for entry in self._entries]
+        return positions
+
+    def rekey(self, index_values):
+        """Recomputes sort keys of header values that contain given index values and restores header order.
+
+        Args:
+            index_values (set): index values whose sort keys may have changed, e.g. renamed items
+
+        Returns:
+            bool: True if header order changed, False otherwise
+        """
+        if self._key_getter is None or not index_values:
+            return False
+        stale_entries = []
+        for entry in self._entries:
+            value = entry[2]
+            if index_values.isdisjoint(value):
+                continue
+            sort_key = self._sort_key(value)
+            if sort_key is None or sort_key == entry[0]:
+                continue
+            stale_entries.append((entry, (sort_key,) + entry[1:]))
+        if not stale_entries:
+            return False
+        old_values = list(self.values)
+        for old_entry, new_entry in stale_entries:
+            self._entry_by_value[new_entry[2]] = new_entry
+        if len(stale_entries) <= self._INSORT_LIMIT:
+            for old_entry, new_entry in stale_entries:
+                del self._entries[bisect.bisect_left(self._entries, old_entry)]
+                bisect.insort(self._entries, new_entry)
+        else:
+            self._entries = sorted(self._entry_by_value[entry[2]] for entry in self._entries)
+        self.values[:] = [entry[2] for entry in self._entries]
+        return self.values != old_values
+
+
 class PivotModel:
     def __init__(self):
         self._data = {}  # dictionary of unpivoted data
-        self.index_values = {}  # Maps index id to a sorted set of values for that index
+        self.index_values = {}  # Maps index id to a dict from index value to the number of keys having that value
         self.index_ids = ()  # ids of the indexes in _data, cannot contain duplicates
         self.top_left_headers = {}
         self.pivot_rows = ()  # current selected rows indexes
@@ -26,8 +161,18 @@ class PivotModel:
         self.pivot_frozen = ()  # current filtered frozen indexes
         self.frozen_value = ()  # current selected value of index_frozen
         self._key_getter = None  # operator.itemgetter placeholder used to translate pivot to keys in _data
-        self._row_data_header = []  # header values for row data
-        self._column_data_header = []  # header values for column data
+        self._frozen_getter = lambda _: ()
+        self._frozen_value_counts = {}  # Maps frozen values to the number of keys having that value
+        self._row_header = _AxisHeader()  # header values for row data
+        self._column_header = _AxisHeader()  # header values for column data
+
+    @property
+    def _row_data_header(self):
+        return self._row_header.values
+
+    @property
+    def _column_data_header(self):
+        return self._column_header.values
 
     def reset_model(self, data, top_left_headers=(), rows=(), columns=(), frozen=(), frozen_value=()):
         """Resets the model."""
@@ -41,10 +186,15 @@ class PivotModel:
         self.pivot_columns = ()
         self.pivot_frozen = ()
         self.frozen_value = ()
+        self._frozen_getter = lambda _: ()
+        self._frozen_value_counts = {}
+        self._row_header = _AxisHeader()
+        self._column_header = _AxisHeader()
         # create data dict with keys as long as index_ids
         self._data = data
-        self.index_values = dict(zip(top_left_headers, zip(*data.keys())))
         self.index_ids = tuple(top_left_headers)
+        self.index_values = {index_id: {} for index_id in self.index_ids}
+        self._count_index_values(data)
         self.top_left_headers = top_left_headers
         self.set_pivot(rows, columns, frozen, frozen_value)
 
@@ -57,8 +207,10 @@ class PivotModel:
         self.pivot_frozen = ()
         self.frozen_value = ()
         self._key_getter = None
-        self._row_data_header = []
-        self._column_data_header = []
+        self._frozen_getter = lambda _: ()
+        self._frozen_value_counts = {}
+        self._row_header = _AxisHeader()
+        self._column_header = _AxisHeader()
 
     def update_model(self, data):
         self._data.update(data)
@@ -70,35 +222,132 @@ class PivotModel:
             data (dict): pivot model data
 
         Returns:
-            tuple: added row count and added column count
+            tuple: positions of added rows and positions of added columns, both in ascending order
         """
         addable_data = {k: v for k, v in data.items() if v is not None or k not in self._data}
         if not addable_data:
-            return 0, 0
+            return [], []
+        new_keys = [key for key in addable_data if key not in self._data]
         self._data.update(addable_data)
+        if not new_keys:
+            return [], []
+        self._count_index_values(new_keys)
+        self._count_frozen_values(new_keys)
         if not any(self.frozen_value):
             first = next(iter(self._data), None)
-            frozen_getter = self._index_key_getter(self.pivot_frozen)
-            self.frozen_value = frozen_getter(first)
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        added_row_count = len(self._row_data_header) - old_row_count
-        added_column_count = len(self._column_data_header) - old_column_count
-        return added_row_count, added_column_count
+            frozen_value = self._frozen_getter(first)
+            if frozen_value != self.frozen_value:
+                self.frozen_value = frozen_value
+                self._reset_headers()
+                return list(range(len(self.rows))), list(range(len(self.columns)))
+        frozen_keys = self._frozen_keys(new_keys)
+        return self._row_header.add(frozen_keys), self._column_header.add(frozen_keys)
 
     def remove_from_model(self, data):
-        self._data = {key: self._data[key] for key in self._data if key not in data}
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        removed_row_count = old_row_count - len(self._row_data_header)
-        removed_column_count = old_column_count - len(self._column_data_header)
-        return removed_row_count, removed_column_count
+        """Removes data from model.
+
+        Args:
+            data (Iterable of tuple): keys to remove
+
+        Returns:
+            tuple: positions of removed rows and positions of removed columns before the removal,
+                both in ascending order
+        """
+        removed_keys = [key for key in data if key in self._data]
+        if not removed_keys:
+            return [], []
+        for key in removed_keys:
+            del self._data[key]
+        for index_id, values in zip(self.index_ids, zip(*removed_keys)):
+            counts = self.index_values[index_id]
+            for value in values:
+                count = counts[value] - 1
+                if count:
+                    counts[value] = count
+                else:
+                    del counts[value]
+        for key in removed_keys:
+            frozen_value = self._frozen_getter(key)
+            count = self._frozen_value_counts[frozen_value] - 1
+            if count:
+                self._frozen_value_counts[frozen_value] = count
+            else:
+                del self._frozen_value_counts[frozen_value]
+        frozen_keys = self._frozen_keys(removed_keys)
+        return self._row_header.remove(frozen_keys), self._column_header.remove(frozen_keys)
+
+    def rekey_headers(self, index_values):
+        """Restores header order after items that are shown in the headers have been renamed.
+
+        Args:
+            index_values (set): renamed index values
+
+        Returns:
+            bool: True if row or column header order changed, False otherwise
+        """
+        rows_changed = self._row_header.rekey(index_values)
+        columns_changed = self._column_header.rekey(index_values)
+        return rows_changed or columns_changed
+
+    def has_frozen_value(self, value):
+        """Checks if any data has given frozen value.
+
+        Args:
+            value (tuple): frozen value
+
+        Returns:
+            bool: True if frozen value exists in data, False otherwise
+        """
+        return value in self._frozen_value_counts
+
+    def index_value_combinations(self, indexes):
+        """Returns unique combinations of values of given indexes in data.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            list of tuple: index value combinations
+        """
+        index_getter = self._index_key_getter(indexes)
+        return list(dict.fromkeys(index_getter(key) for key in self._data))
+
+    def _count_index_values(self, keys):
+        """Adds given keys to index value counts.
+
+        Args:
+            keys (Iterable of tuple): data keys
+        """
+        for index_id, values in zip(self.index_ids, zip(*keys)):
+            counts = self.index_values[index_id]
+            for value in values:
+                counts[value] = counts.get(value, 0) + 1
+
+    def _count_frozen_values(self, keys):
+        """Adds given keys to frozen value counts.
+
+        Args:
+            keys (Iterable of tuple): data keys
+        """
+        counts = self._frozen_value_counts
+        for key in keys:
+            frozen_value = self._frozen_getter(key)
+            counts[frozen_value] = counts.get(frozen_value, 0) + 1
+
+    def _frozen_keys(self, keys):
+        """Filters keys that match current frozen value.
+
+        Args:
+            keys (Iterable of tuple): data keys
+
+        Returns:
+            Iterable of tuple: matching keys
+        """
+        if not self.pivot_frozen:
+            return keys
+        frozen_getter = self._frozen_getter
+        frozen_value = self.frozen_value
+        return [key for key in keys if frozen_getter(key) == frozen_value]
 
     def frozen_values(self, data):
         """Collects frozen values from data.
@@ -109,7 +358,7 @@ class PivotModel:
         Returns:
             set of tuple: frozen values
         """
-        frozen_getter = self._index_key_getter(self.pivot_frozen)
+        frozen_getter = self._frozen_getter
         return {frozen_getter(item) for item in data}
 
     def _check_pivot(self, rows, columns, frozen, frozen_value):
@@ -158,27 +407,44 @@ class PivotModel:
         Returns:
             list: unique indexes
         """
+        return self._make_axis_header(indexes).values
+
+    def _make_axis_header(self, indexes):
+        """Builds header for given indexes from data that matches the frozen condition.
+
+        Args:
+            indexes (tuple): header indexes
+
+        Returns:
+            _AxisHeader: header
+        """
         if not indexes:
-            return []
-        index_getter = self._index_key_getter(indexes)
-        if self.pivot_frozen:
-            frozen_getter = self._index_key_getter(self.pivot_frozen)
-            result = {index_getter(k): None for k in self._data if frozen_getter(k) == self.frozen_value}
-        else:
-            result = {index_getter(k): None for k in self._data}
-        accepted = {}
-        headers = self.top_left_headers
-        for x in result:
+            return _AxisHeader()
+        headers = [self.top_left_headers[header_name] for header_name in indexes]
+
+        def sort_key(value):
             sort_keys = []
-            for header_name, header_id in zip(indexes, x):
-                header = headers[header_name]
+            for header, header_id in zip(headers, value):
                 if not header.accepts(header_id):
-                    break
-                sort_key = header.header_data(header_id)
-                sort_keys.append(sort_key if sort_key is not None else "")
-            else:
-                accepted[x] = sort_keys
-        return [item[0] for item in sorted(accepted.items(), key=operator.itemgetter(1))]
+                    return None
+                key = header.header_data(header_id)
+                sort_keys.append(key if key is not None else "")
+            return tuple(sort_keys)
+
+        axis_header = _AxisHeader(self._index_key_getter(indexes), sort_key)
+        axis_header.add(self._frozen_keys(self._data))
+        return axis_header
+
+    def _reset_headers(self):
+        """Rebuilds row and column headers from data."""
+        self._row_header = self._make_axis_header(self.pivot_rows)
+        self._column_header = self._make_axis_header(self.pivot_columns)
+
+    def _reset_frozen_value_counts(self):
+        """Recounts frozen values from data."""
+        self._frozen_getter = self._index_key_getter(self.pivot_frozen)
+        self._frozen_value_counts = {}
+        self._count_frozen_values(self._data)
 
     def set_pivot(self, rows, columns, frozen, frozen_value):
         """Sets pivot."""
@@ -198,8 +464,8 @@ class PivotModel:
         order = tuple(self.index_ids.index(i) for i in self.pivot_rows + self.pivot_columns + self.pivot_frozen)
         order = tuple(sorted(range(len(order)), key=order.__getitem__))
         self._key_getter = tuple_itemgetter(operator.itemgetter(*order), len(order))
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
+        self._reset_frozen_value_counts()
+        self._reset_headers()
 
     def set_frozen_value(self, value):
         """Sets values for the frozen indexes.
@@ -222,6 +488,7 @@ class PivotModel:
         if len(frozen) != len(self.frozen_value):
             raise ValueError("'frozen' must have same length as 'self.frozen_value'")
         self.pivot_frozen = tuple(frozen)
+        self._reset_frozen_value_counts()
 
     def get_pivoted_data(self, row_mask, column_mask):
         """Returns data for indexes in row_mask and column_mask.
@@ -22,8 +22,9 @@ from spinedb_api import DatabaseMapping
 from spinedb_api.helpers import name_from_elements
 from spinedb_api.parameter_value import IndexedValue, join_value_and_type, split_value_and_type
 from spinetoolbox.helpers import DB_ITEM_SEPARATOR, parameter_identifier, plain_to_tool_tip
-from spinetoolbox.fetch_parent import FlexibleFetchParent
+from spinetoolbox.fetch_parent import FetchPriority, FlexibleFetchParent
 from .colors import FIXED_FIELD_COLOR, PIVOT_TABLE_HEADER_COLOR
+from .columnar_pivot_model import ColumnarPivotModel
 from .pivot_model import PivotModel
 from ...mvcmodels.shared import PARSED_ROLE
 from ..widgets.custom_delegates import (
@@ -406,6 +407,18 @@ class PivotTableModelBase(QAbstractTableModel):
         """Returns the item type."""
         raise NotImplementedError()
 
+    def _handle_header_items_updated(self, db_map_data):
+        """Restores header order after items shown in headers have been updated.
+
+        Args:
+            db_map_data (dict): mapping from database map to list of updated items
+        """
+        header_ids = {(db_map, item["id"]) for db_map, items in db_map_data.items() for item in items}
+        self.layoutAboutToBeChanged.emit()
+        self.model.rekey_headers(header_ids)
+        self.layoutChanged.emit()
+        self._parent.refresh_views()
+
     @Slot()
     def _reset_data_count(self):
         self._data_row_count = 0
@@ -448,8 +461,17 @@ class PivotTableModelBase(QAbstractTableModel):
     def make_delegate(parent):
         raise NotImplementedError()
 
+    def _make_pivot_model(self):
+        """Returns the pivot model to use after reset.
+
+        Returns:
+            PivotModel: pivot model
+        """
+        return self.model
+
     def reset_model(self, data, index_ids, rows=(), columns=(), frozen=(), frozen_value=()):
         self.beginResetModel()
+        self.model = self._make_pivot_model()
         self.model.reset_model(data, index_ids, rows, columns, frozen, frozen_value)
         self._active = True
         self.endResetModel()
@@ -481,37 +503,139 @@ class PivotTableModelBase(QAbstractTableModel):
         frozen_values = self.model.frozen_values(db_map_data)
         if frozen_values:
             self.frozen_values_added.emit(frozen_values)
-        row_count, column_count = self.model.add_to_model(db_map_data)
-        if row_count > 0:
-            first = self.headerRowCount() + self.dataRowCount()
-            self.beginInsertRows(QModelIndex(), first, first + row_count - 1)
-            self._data_row_count += row_count
-            self.endInsertRows()
-        if column_count > 0:
-            first = self.headerColumnCount() + self.dataColumnCount()
-            self.beginInsertColumns(QModelIndex(), first, first + column_count - 1)
-            self._data_column_count += column_count
-            self.endInsertColumns()
-        self._emit_all_data_changed()
+        frozen_value = self.model.frozen_value
+        row_positions, column_positions = self.model.add_to_model(db_map_data)
+        self._finish_addition(frozen_value, row_positions, column_positions)
 
     def remove_from_model(self, data):
         if not data:
             return
-        row_count, column_count = self.model.remove_from_model(data)
-        removed_frozen_values = self.model.frozen_values(data) - self.model.frozen_values(self.model._data)
+        row_positions, column_positions = self.model.remove_from_model(data)
+        removed_frozen_values = {
+            value for value in self.model.frozen_values(data) if not self.model.has_frozen_value(value)
+        }
+        self._finish_removal(removed_frozen_values, row_positions, column_positions)
+
+    def add_product_to_model(self, products):
+        """Adds keys to the product space of a columnar pivot model.
+
+        Args:
+            products (dict): mapping from part to list of factors
+        """
+        if not products:
+            return
+        frozen_values = self.model.product_frozen_values(products)
+        if frozen_values:
+            self.frozen_values_added.emit(frozen_values)
+        frozen_value = self.model.frozen_value
+        row_positions, column_positions = self.model.add_product(products)
+        self._finish_addition(frozen_value, row_positions, column_positions)
+
+    def remove_product_from_model(self, products):
+        """Removes keys from the product space of a columnar pivot model.
+
+        Args:
+            products (dict): mapping from part to list of factors
+        """
+        if not products:
+            return
+        row_positions, column_positions = self.model.remove_product(products)
+        removed_frozen_values = {
+            value for value in self.model.product_frozen_values(products) if not self.model.has_frozen_value(value)
+        }
+        self._finish_removal(removed_frozen_values, row_positions, column_positions)
+
+    def _finish_addition(self, frozen_value, row_positions, column_positions):
+        """Notifies views after data has been added to the pivot model.
+
+        Args:
+            frozen_value (tuple): frozen value before the addition
+            row_positions (list of int): positions of added rows
+            column_positions (list of int): positions of added columns
+        """
+        if self.model.frozen_value != frozen_value:
+            self.beginResetModel()
+            self.endResetModel()
+            return
+        self._insert_data_rows(row_positions)
+        self._insert_data_columns(column_positions)
+        self._emit_all_data_changed()
+
+    def _finish_removal(self, removed_frozen_values, row_positions, column_positions):
+        """Notifies views after data has been removed from the pivot model.
+
+        Args:
+            removed_frozen_values (set of tuple): frozen values that no longer exist
+            row_positions (list of int): positions of removed rows
+            column_positions (list of int): positions of removed columns
+        """
         if removed_frozen_values:
             self.frozen_values_removed.emit(removed_frozen_values)
-        if row_count > 0:
-            first = self.headerRowCount()
-            self.beginRemoveRows(QModelIndex(), first, first + row_count - 1)
-            self._data_row_count -= row_count
+        self._remove_data_rows(row_positions)
+        self._remove_data_columns(column_positions)
+        self._emit_all_data_changed()
+
+    def _insert_data_rows(self, positions):
+        """Notifies views about rows that have been inserted to the pivot model.
+
+        Rows beyond the already collected rows are left for :meth:`_collect_more_rows`.
+
+        Args:
+            positions (list of int): positions of inserted rows in ascending order
+        """
+        for first, last in _consecutive_ranges(positions):
+            if first > self._data_row_count:
+                break
+            offset = self.headerRowCount()
+            self.beginInsertRows(QModelIndex(), offset + first, offset + last)
+            self._data_row_count += last - first + 1
+            self.endInsertRows()
+
+    def _insert_data_columns(self, positions):
+        """Notifies views about columns that have been inserted to the pivot model.
+
+        Columns beyond the already collected columns are left for :meth:`_collect_more_columns`.
+
+        Args:
+            positions (list of int): positions of inserted columns in ascending order
+        """
+        for first, last in _consecutive_ranges(positions):
+            if first > self._data_column_count:
+                break
+            offset = self.headerColumnCount()
+            self.beginInsertColumns(QModelIndex(), offset + first, offset + last)
+            self._data_column_count += last - first + 1
+            self.endInsertColumns()
+
+    def _remove_data_rows(self, positions):
+        """Notifies views about rows that have been removed from the pivot model.
+
+        Args:
+            positions (list of int): positions of removed rows in ascending order
+        """
+        for first, last in reversed(_consecutive_ranges(positions)):
+            if first >= self._data_row_count:
+                continue
+            last = min(last, self._data_row_count - 1)
+            offset = self.headerRowCount()
+            self.beginRemoveRows(QModelIndex(), offset + first, offset + last)
+            self._data_row_count -= last - first + 1
             self.endRemoveRows()
-        if column_count > 0:
-            first = self.headerColumnCount()
-            self.beginRemoveColumns(QModelIndex(), first, first + column_count - 1)
-            self._data_column_count -= column_count
+
+    def _remove_data_columns(self, positions):
+        """Notifies views about columns that have been removed from the pivot model.
+
+        Args:
+            positions (list of int): positions of removed columns in ascending order
+        """
+        for first, last in reversed(_consecutive_ranges(positions)):
+            if first >= self._data_column_count:
+                continue
+            last = min(last, self._data_column_count - 1)
+            offset = self.headerColumnCount()
+            self.beginRemoveColumns(QModelIndex(), offset + first, offset + last)
+            self._data_column_count -= last - first + 1
             self.endRemoveColumns()
-        self._emit_all_data_changed()
 
     def _emit_all_data_changed(self):
         top_left = self.index(self.headerRowCount(), self.headerColumnCount())
@@ -954,6 +1078,10 @@ class PivotTableModelBase(QAbstractTableModel):
 class ParameterValuePivotTableModel(PivotTableModelBase):
     """A model for the pivot table in parameter_value input type."""
 
+    COLUMNAR_MODEL_THRESHOLD = 1000000
+    """Number of entity-parameter-alternative combinations above which the pivot table switches to a columnar model.
+    None disables the columnar model."""
+
     def __init__(self, parent):
         """
         Args:
@@ -967,22 +1095,25 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
             handle_items_updated=lambda _: self._parent.refresh_views(),
             accepts_item=self._parent.accepts_entity_class_item,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
         self._entity_fetch_parent = FlexibleFetchParent(
             "entity",
             handle_items_added=self._handle_entities_added,
             handle_items_removed=self._handle_entities_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             accepts_item=self._parent.accepts_entity_item,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
         self._parameter_definition_fetch_parent = FlexibleFetchParent(
             "parameter_definition",
             handle_items_added=self._handle_parameter_definitions_added,
             handle_items_removed=self._handle_parameter_definitions_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             accepts_item=self._parent.accepts_parameter_item,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
         self._parameter_value_fetch_parent = FlexibleFetchParent(
             "parameter_value",
@@ -992,14 +1123,17 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
             accepts_item=self._parent.accepts_parameter_item,
             owner=self,
             chunk_size=None,
+            priority=FetchPriority.PIVOT,
         )
         self._alternative_fetch_parent = FlexibleFetchParent(
             "alternative",
             handle_items_added=self._handle_alternatives_added,
             handle_items_removed=self._handle_alternatives_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
+        self._columnar_model_switch_pending = False
 
     def _handle_entity_classes_added(self, db_map_data):
         pass
@@ -1013,26 +1147,22 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
                         return
 
     def _handle_entities_added(self, db_map_data):
-        data = self._load_empty_parameter_value_data(db_map_entities=db_map_data)
-        self.add_to_model(data)
+        self._add_empty_parameter_values(db_map_entities=db_map_data)
 
     def _handle_entities_removed(self, db_map_data):
-        data = self._load_empty_parameter_value_data(db_map_entities=db_map_data)
-        self.remove_from_model(data)
+        self._remove_empty_parameter_values(db_map_entities=db_map_data)
 
     def _handle_parameter_definitions_added(self, db_map_data):
         db_map_parameter_ids = {
             db_map: {(db_map, x["id"]) for x in parameters} for db_map, parameters in db_map_data.items()
         }
-        data = self._load_empty_parameter_value_data(db_map_parameter_ids=db_map_parameter_ids)
-        self.add_to_model(data)
+        self._add_empty_parameter_values(db_map_parameter_ids=db_map_parameter_ids)
 
     def _handle_parameter_definitions_removed(self, db_map_data):
         db_map_parameter_ids = {
             db_map: {(db_map, x["id"]) for x in parameters} for db_map, parameters in db_map_data.items()
         }
-        data = self._load_empty_parameter_value_data(db_map_parameter_ids=db_map_parameter_ids)
-        self.remove_from_model(data)
+        self._remove_empty_parameter_values(db_map_parameter_ids=db_map_parameter_ids)
 
     def _handle_parameter_values_added(self, db_map_data):
         data = self._load_full_parameter_value_data(db_map_parameter_values=db_map_data, action="add")
@@ -1040,17 +1170,61 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
 
     def _handle_parameter_values_removed(self, db_map_data):
         data = self._load_full_parameter_value_data(db_map_parameter_values=db_map_data, action="remove")
-        self.update_model(data)
+        if isinstance(self.model, ColumnarPivotModel):
+            # Empty cells are part of the product space so removed values can be dropped entirely.
+            self.remove_from_model(data)
+        else:
+            self.update_model(data)
 
     def _handle_alternatives_added(self, db_map_data):
         db_map_alternative_ids = {db_map: [(db_map, a["id"]) for a in items] for db_map, items in db_map_data.items()}
-        data = self._load_empty_parameter_value_data(db_map_alternative_ids=db_map_alternative_ids)
-        self.add_to_model(data)
+        self._add_empty_parameter_values(db_map_alternative_ids=db_map_alternative_ids)
 
     def _handle_alternatives_removed(self, db_map_data):
         db_map_alternative_ids = {db_map: [(db_map, a["id"]) for a in items] for db_map, items in db_map_data.items()}
-        data = self._load_empty_parameter_value_data(db_map_alternative_ids=db_map_alternative_ids)
-        self.remove_from_model(data)
+        self._remove_empty_parameter_values(db_map_alternative_ids=db_map_alternative_ids)
+
+    def _add_empty_parameter_values(self, **kwargs):
+        """Adds combinations of entities, parameters and alternatives that have no value to the model.
+
+        Args:
+            **kwargs: keyword arguments to :meth:`_load_empty_parameter_value_data`
+        """
+        if isinstance(self.model, ColumnarPivotModel):
+            self.add_product_to_model(self._empty_parameter_value_products(**kwargs))
+        else:
+            self.add_to_model(self._load_empty_parameter_value_data(**kwargs))
+            self._schedule_columnar_model_switch()
+
+    def _schedule_columnar_model_switch(self):
+        """Schedules a switch to the columnar model if fetched combinations have exceeded the threshold."""
+        threshold = self.COLUMNAR_MODEL_THRESHOLD
+        if threshold is None or self._columnar_model_switch_pending or len(self.model._data) <= threshold:
+            return
+        self._columnar_model_switch_pending = True
+        QTimer.singleShot(0, self._switch_to_columnar_model)
+
+    @Slot()
+    def _switch_to_columnar_model(self):
+        """Resets the model keeping the current pivot; fetch parents then deliver fetched items to the new model."""
+        self._columnar_model_switch_pending = False
+        if not self._active or isinstance(self.model, ColumnarPivotModel):
+            return
+        if self._estimated_combination_count() <= self.COLUMNAR_MODEL_THRESHOLD:
+            return
+        pivot = self.model.pivot_rows, self.model.pivot_columns, self.model.pivot_frozen, self.model.frozen_value
+        self.reset_model({}, self.top_left_headers, *pivot)
+
+    def _remove_empty_parameter_values(self, **kwargs):
+        """Removes combinations of entities, parameters and alternatives from the model.
+
+        Args:
+            **kwargs: keyword arguments to :meth:`_load_empty_parameter_value_data`
+        """
+        if isinstance(self.model, ColumnarPivotModel):
+            self.remove_product_from_model(self._empty_parameter_value_products(**kwargs))
+        else:
+            self.remove_from_model(self._load_empty_parameter_value_data(**kwargs))
 
     def _load_empty_parameter_value_data(
         self, db_map_entities=None, db_map_parameter_ids=None, db_map_alternative_ids=None
@@ -1081,6 +1255,65 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
             for alt_id in db_map_alternative_ids.get(db_map, [])
         }
 
+    def _empty_parameter_value_products(
+        self, db_map_entities=None, db_map_parameter_ids=None, db_map_alternative_ids=None
+    ):
+        """Returns the combinations of entities and parameters for the current class
+        as product space factors of a columnar pivot model.
+
+        Args:
+            db_map_entities (dict, optional): if given, only load data for these db maps and entities
+            db_map_parameter_ids (dict, optional): if given, only load data for these db maps and parameter definitions
+            db_map_alternative_ids (dict, optional): if given, only load data for these db maps and alternatives
+
+        Returns:
+            dict: mapping from db_map to list of entity, parameter, alternative and database factors
+        """
+        (
+            db_map_entity_ids,
+            db_map_parameter_ids,
+            db_map_alternative_ids,
+        ) = self._all_combination_for_empty_parameter_value(
+            db_map_entities, db_map_parameter_ids, db_map_alternative_ids
+        )
+        products = {}
+        for db_map in self.db_maps:
+            factors = [
+                db_map_entity_ids.get(db_map, []),
+                [(parameter_id,) for parameter_id in db_map_parameter_ids.get(db_map, [])],
+                [(alt_id,) for alt_id in db_map_alternative_ids.get(db_map, [])],
+                [(db_map,)],
+            ]
+            if any(factors[:-1]):
+                products[db_map] = factors
+        return products
+
+    def _estimated_combination_count(self):
+        """Estimates the number of entity-parameter-alternative combinations in the current class
+        from the items that have been fetched so far.
+
+        Classes that have not been fetched yet start with the dictionary based model
+        which is swapped for the columnar one once the fetched combinations cross the threshold.
+
+        Returns:
+            int: combination count
+        """
+        count = 0
+        for db_map, class_id in self._parent.current_class_id.items():
+            entity_count = len(db_map.get_items("entity", fetch=False, class_id=class_id))
+            definition_count = len(db_map.get_items("parameter_definition", fetch=False, entity_class_id=class_id))
+            alternative_count = len(db_map.get_items("alternative", fetch=False))
+            count += entity_count * max(1, definition_count) * max(1, alternative_count)
+        return count
+
+    def _make_pivot_model(self):
+        """See base class."""
+        threshold = self.COLUMNAR_MODEL_THRESHOLD
+        if threshold is not None and self._estimated_combination_count() > threshold:
+            dimension_count = len(self._parent.current_dimension_ids)
+            return ColumnarPivotModel(factor_sizes=(dimension_count, 1, 1, 1))
+        return self.model if type(self.model) is PivotModel else PivotModel()
+
     def _all_combination_for_empty_parameter_value(self, db_map_entities, db_map_parameter_ids, db_map_alternative_ids):
         if db_map_entities is None:
             db_map_entities = self.get_db_map_entities()
@@ -1426,6 +1659,7 @@ class IndexExpansionPivotTableModel(ParameterValuePivotTableModel):
     """A model for the pivot table in parameter index expansion input type."""
 
     INDEX_INSERTION_POINT = -3
+    COLUMNAR_MODEL_THRESHOLD = None
 
     def __init__(self, parent):
         """
@@ -1584,18 +1818,20 @@ class ElementPivotTableModel(PivotTableModelBase):
             "entity",
             handle_items_added=self._handle_entities_added,
             handle_items_removed=self._handle_entities_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             accepts_item=self._parent.accepts_entity_item,
             owner=self,
             chunk_size=None,
+            priority=FetchPriority.PIVOT,
         )
         self._element_fetch_parent = FlexibleFetchParent(
             "entity",
             handle_items_added=self._handle_elements_added,
             handle_items_removed=self._handle_elements_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             accepts_item=self._parent.accepts_element_item,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
 
     def _handle_entities_added(self, db_map_data):
@@ -1750,15 +1986,17 @@ class ScenarioAlternativePivotTableModel(PivotTableModelBase):
             "scenario",
             handle_items_added=self._handle_scenarios_added,
             handle_items_removed=self._handle_scenarios_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
         self._alternative_fetch_parent = FlexibleFetchParent(
             "alternative",
             handle_items_added=self._handle_alternatives_added,
             handle_items_removed=self._handle_alternatives_removed,
-            handle_items_updated=lambda _: self._parent.refresh_views(),
+            handle_items_updated=self._handle_header_items_updated,
             owner=self,
+            priority=FetchPriority.PIVOT,
         )
         self._scenario_alternative_fetch_parent = FlexibleFetchParent(
             "scenario_alternative",
@@ -1766,6 +2004,7 @@ class ScenarioAlternativePivotTableModel(PivotTableModelBase):
             handle_items_removed=self._handle_scenario_alternatives_changed,
             owner=self,
             chunk_size=None,
+            priority=FetchPriority.PIVOT,
         )
 
     def _handle_scenarios_added(self, db_map_data):
@@ -1982,3 +2221,21 @@ def _make_get_id(action):
         Callable: function to compute db_map-id tuples
     """
     return {"add": lambda db_map, x: (db_map, x["id"]), "remove": lambda db_map, x: None}[action]
+
+
+def _consecutive_ranges(positions):
+    """Groups sorted positions into ranges of consecutive positions.
+
+    Args:
+        positions (list of int): positions in ascending order
+
+    Returns:
+        list of tuple: first and last position of each range
+    """
+    ranges = []
+    for position in positions:
+        if ranges and ranges[-1][1] == position - 1:
+            ranges[-1][1] = position
+        else:
+            ranges.append([position, position])
+    return [tuple(range_) for range_ in ranges]
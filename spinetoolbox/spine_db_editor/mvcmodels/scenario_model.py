@@ -213,9 +213,8 @@ class ScenarioModel(TreeModelBase):
         name = unique_name(scenario_item.item_data["name"], existing_names)
         self.db_mngr.add_scenarios({db_map: [{"name": name, "description": scenario_item.item_data["description"]}]})
         alternative_id_list = self.db_mngr.get_scenario_alternative_id_list(db_map, scenario_item.id)
-        for item in self.db_mngr.get_items(db_map, "scenario"):
-            if item["name"] == name:
-                self.db_mngr.set_scenario_alternatives(
-                    {db_map: [{"id": item["id"], "alternative_id_list": alternative_id_list}]}
-                )
-                break
+        item = self.db_mngr.get_item_by_field(db_map, "scenario", "name", name)
+        if item:
+            self.db_mngr.set_scenario_alternatives(
+                {db_map: [{"id": item["id"], "alternative_id_list": alternative_id_list}]}
+            )
@@ -11,6 +11,7 @@
 ######################################################################################################################
 
 """Single models for parameter definitions and values (as 'for a single entity')."""
+import numpy as np
 from PySide6.QtCore import Qt
 from spinetoolbox.helpers import DB_ITEM_SEPARATOR, plain_to_rich
 from ...mvcmodels.minimal_table_model import MinimalTableModel
@@ -41,6 +42,59 @@ class HalfSortedTableModel(MinimalTableModel):
         return element
 
 
+class _FilterColumns:
+    """Caches item field values of a single model as integer coded columns
+    so filters can be evaluated for all rows at once."""
+
+    def __init__(self, items):
+        """
+        Args:
+            items (Callable): function that returns model's items in row order
+        """
+        self._items = items
+        self._columns = {}
+
+    def clear(self):
+        """Drops cached columns."""
+        self._columns.clear()
+
+    def mask(self, key, get_value, accepts):
+        """Evaluates a filter for all rows.
+
+        Args:
+            key (Hashable): column identifier
+            get_value (Callable): function that returns column value for given item
+            accepts (Callable): function that returns True if given column value passes the filter
+
+        Returns:
+            numpy.ndarray: boolean mask of accepted rows
+        """
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = self._make_column(get_value)
+        codes, unique_values = column
+        accepted_codes = np.fromiter(map(accepts, unique_values), dtype=bool, count=len(unique_values))
+        return accepted_codes[codes]
+
+    def _make_column(self, get_value):
+        """Codes the values of a column.
+
+        Args:
+            get_value (Callable): function that returns column value for given item
+
+        Returns:
+            tuple: codes as integer array and unique values as list
+        """
+        items = self._items()
+        codes_by_value = {}
+        codes = np.fromiter(
+            (codes_by_value.setdefault(get_value(item), len(codes_by_value)) for item in items),
+            dtype=np.int64,
+            count=len(items),
+        )
+        return codes, list(codes_by_value)
+
+
 class SingleModelBase(HalfSortedTableModel):
     """Base class for all single models that go in a CompoundModelBase subclass."""
 
@@ -59,6 +113,11 @@ class SingleModelBase(HalfSortedTableModel):
         self.entity_class_id = entity_class_id
         self._auto_filter = {}  # Maps field to accepted ids for that field
         self.committed = committed
+        self._filter_columns = _FilterColumns(self.db_items)
+        self._accepted_rows = None
+        self.modelReset.connect(self.clear_filter_cache)
+        self.rowsInserted.connect(lambda *_: self.clear_filter_cache())
+        self.rowsRemoved.connect(lambda *_: self.clear_filter_cache())
 
     def __lt__(self, other):
         if self.entity_class_name == other.entity_class_name:
@@ -155,10 +214,6 @@ class SingleModelBase(HalfSortedTableModel):
             return flags & ~Qt.ItemIsEditable
         return flags
 
-    def _filter_accepts_row(self, row):
-        item = self.db_mngr.get_item(self.db_map, self.item_type, self._main_data[row])
-        return self.filter_accepts_item(item)
-
     def filter_accepts_item(self, item):
         return self._auto_filter_accepts_item(item)
 
@@ -166,6 +221,7 @@ class SingleModelBase(HalfSortedTableModel):
         if values == self._auto_filter.get(field, set()):
             return False
         self._auto_filter[field] = values
+        self._accepted_rows = None
         return True
 
     def _auto_filter_accepts_item(self, item):
@@ -178,10 +234,33 @@ class SingleModelBase(HalfSortedTableModel):
         return True
 
     def accepted_rows(self):
-        """Yields accepted rows, for convenience."""
-        for row in range(self.rowCount()):
-            if self._filter_accepts_row(row):
-                yield row
+        """Returns accepted rows.
+
+        Returns:
+            numpy.ndarray: accepted rows in ascending order
+        """
+        if self._accepted_rows is None:
+            self._accepted_rows = np.flatnonzero(self._filter_mask())
+        return self._accepted_rows
+
+    def clear_filter_cache(self):
+        """Drops cached filter results; must be called when model's items change."""
+        self._filter_columns.clear()
+        self._accepted_rows = None
+
+    def _filter_mask(self):
+        """Evaluates filters for all rows.
+
+        Returns:
+            numpy.ndarray: boolean mask of accepted rows
+        """
+        if self._auto_filter is None:
+            return np.zeros(self.rowCount(), dtype=bool)
+        mask = np.ones(self.rowCount(), dtype=bool)
+        for field, values in self._auto_filter.items():
+            if values:
+                mask &= self._filter_columns.mask(field, lambda item, field=field: item.get(field), values.__contains__)
+        return mask
 
     def _get_ref(self, db_item, field):
         """Returns the item referred by the given field."""
@@ -216,6 +295,37 @@ class SingleModelBase(HalfSortedTableModel):
             return self.db_map
         return super().data(index, role)
 
+    def bulk_data(self, rows, columns, role=Qt.ItemDataRole.EditRole):
+        """Returns the data of a block of cells column by column looking up each row's item only once."""
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return super().bulk_data(rows, columns, role)
+        ids = [self._main_data[row] for row in rows]
+        items = [self.db_mngr.get_item(self.db_map, self.item_type, id_) for id_ in ids]
+        return [self._field_data(self.header[column], ids, items, role) for column in columns]
+
+    def _field_data(self, field, ids, items, role):
+        """Returns display or edit data of given field for given items.
+
+        Args:
+            field (str): header field
+            ids (list of int): item ids
+            items (list of dict): items
+            role (int): data role
+
+        Returns:
+            list: field's data for each item
+        """
+        if field == "database":
+            return len(items) * [self.db_map.codename]
+        mapped_field = self._mapped_field(field)
+        if field not in self.group_fields:
+            return [item.get(mapped_field) for item in items]
+        data = []
+        for item in items:
+            value = item.get(mapped_field)
+            data.append(DB_ITEM_SEPARATOR.join(value) if value else value)
+        return data
+
     def batch_set_data(self, indexes, data):
         """Sets data for indexes in batch.
         Sets data directly in database using db mngr. If successful, updated data will be
@@ -257,6 +367,7 @@ class FilterEntityAlternativeMixin:
         if self._filter_entity_ids == filter_entity_ids:
             return False
         self._filter_entity_ids = filter_entity_ids
+        self._accepted_rows = None
         return True
 
     def set_filter_alternative_ids(self, db_map_alternative_ids):
@@ -264,6 +375,7 @@ class FilterEntityAlternativeMixin:
         if self._filter_alternative_ids == alternative_ids:
             return False
         self._filter_alternative_ids = alternative_ids
+        self._accepted_rows = None
         return True
 
     def filter_accepts_item(self, item):
@@ -274,6 +386,29 @@ class FilterEntityAlternativeMixin:
             and self._alternative_filter_accepts_item(item)
         )
 
+    def _filter_mask(self):
+        """Reimplemented to also account for the entity and alternative filter."""
+        mask = super()._filter_mask()
+        if self._filter_entity_ids:
+            entity_id_field = self._mapped_field("entity_id")
+            mask &= self._filter_columns.mask(
+                (entity_id_field, "element_id_list"),
+                lambda item: (item[entity_id_field], tuple(item["element_id_list"])),
+                self._entity_filter_accepts_ids,
+            )
+        if self._filter_alternative_ids:
+            mask &= self._filter_columns.mask(
+                "alternative_id",
+                lambda item: item.get("alternative_id"),
+                lambda alternative_id: alternative_id is None or alternative_id in self._filter_alternative_ids,
+            )
+        return mask
+
+    def _entity_filter_accepts_ids(self, entity_and_element_ids):
+        """Returns the result of the entity filter for given entity id and element ids."""
+        entity_id, element_id_list = entity_and_element_ids
+        return entity_id in self._filter_entity_ids or bool(set(element_id_list) & self._filter_entity_ids)
+
     def _entity_filter_accepts_item(self, item):
         """Returns the result of the entity filter."""
         if not self._filter_entity_ids:  # If no entities are selected, only entity classes
@@ -332,6 +467,13 @@ class ParameterMixin:
             return self.db_mngr.get_value(self.db_map, self.item_type, id_, role)
         return super().data(index, role)
 
+    def _field_data(self, field, ids, items, role):
+        """Reads values through the db manager like ``data()``."""
+        if field == self.value_field:
+            get_value = self.db_mngr.get_value
+            return [get_value(self.db_map, self.item_type, id_, role) for id_ in ids]
+        return super()._field_data(field, ids, items, role)
+
 
 class EntityMixin:
     def update_items_in_db(self, items):
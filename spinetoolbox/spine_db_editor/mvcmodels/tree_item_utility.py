@@ -15,7 +15,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QBrush, QFont, QIcon, QGuiApplication
 from spinetoolbox.mvcmodels.minimal_tree_model import TreeItem
 from spinetoolbox.helpers import CharIconEngine, bisect_chunks, plain_to_tool_tip
-from spinetoolbox.fetch_parent import FlexibleFetchParent
+from spinetoolbox.fetch_parent import FetchPriority, FlexibleFetchParent
 
 
 class StandardTreeItem(TreeItem):
@@ -141,6 +141,7 @@ class FetchMoreMixin:
             handle_items_removed=self.handle_items_removed,
             handle_items_updated=self.handle_items_updated,
             accepts_item=self.accepts_item,
+            priority=FetchPriority.TREE,
         )
 
     def tear_down(self):
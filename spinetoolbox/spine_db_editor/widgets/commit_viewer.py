@@ -16,24 +16,28 @@ from PySide6.QtWidgets import (
     QTabWidget,
     QWidget,
     QVBoxLayout,
-    QGridLayout,
+    QTreeView,
     QTreeWidget,
     QTreeWidgetItem,
     QSplitter,
-    QLabel,
 )
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import QModelIndex, Qt, Signal, Slot
 from spinetoolbox.helpers import restore_ui, save_ui, busy_effect, DB_ITEM_SEPARATOR
+from ..mvcmodels.commit_list_model import CommitListModel
 
 
 class _DBCommitViewer(QWidget):
+    _commit_items_received = Signal(int, object)
+
     def __init__(self, db_mngr, db_map, parent=None):
         super().__init__(parent=parent)
         self._db_mngr = db_mngr
         self._db_map = db_map
-        self._commit_list = QTreeWidget(self)
-        self._commit_list.setHeaderLabel("Commits")
-        self._commit_list.setIndentation(0)
+        self._commit_model = CommitListModel(db_mngr, db_map, parent=self)
+        self._commit_list = QTreeView(self)
+        self._commit_list.setRootIsDecorated(False)
+        self._commit_list.setUniformRowHeights(True)
+        self._commit_list.setModel(self._commit_model)
         self.splitter = QSplitter(self)
         self.splitter.setChildrenCollapsible(False)
         self.splitter.setSizes([0.3, 0.7])
@@ -49,27 +53,41 @@ class _DBCommitViewer(QWidget):
         layout.addWidget(self.splitter)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
-        for commit in reversed(db_map.get_items("commit")):
-            tree_item = QTreeWidgetItem(self._commit_list)
-            tree_item.setData(0, Qt.ItemDataRole.UserRole + 1, commit["id"])
-            self._commit_list.addTopLevelItem(tree_item)
-            index = self._commit_list.indexFromItem(tree_item)
-            widget = _CommitItem(commit)
-            self._commit_list.setIndexWidget(index, widget)
-        self._commit_list.currentItemChanged.connect(self._select_commit)
-
-    @Slot(QTreeWidgetItem, QTreeWidgetItem)
+        self._selected_commit_id = None
+        self._commit_list.selectionModel().currentRowChanged.connect(self._select_commit)
+        self._commit_items_received.connect(self._show_affected_items)
+
+    @property
+    def commit_model(self):
+        return self._commit_model
+
+    @Slot(QModelIndex, QModelIndex)
     def _select_commit(self, current, previous):
-        self._commit_list.setDisabled(True)
-        self._do_select_commit(current)
-        self._commit_list.setEnabled(True)
+        self._affected_items.clear()
+        if not current.isValid():
+            self._selected_commit_id = None
+            return
+        commit_id = self._commit_model.commit_id(current.row())
+        self._selected_commit_id = commit_id
+        self._affected_items.addTopLevelItem(QTreeWidgetItem(["Loading..."]))
+        future = self._db_mngr.get_items_for_commit(self._db_map, commit_id)
+        future.add_done_callback(lambda future: self._commit_items_received.emit(commit_id, future))
+
+    @Slot(int, object)
+    def _show_affected_items(self, commit_id, future):
+        if commit_id != self._selected_commit_id or future.cancelled():
+            return
+        self._affected_items.clear()
+        error = future.exception()
+        if error is not None:
+            self._affected_items.addTopLevelItem(QTreeWidgetItem([f"Failed to query commit: {error}"]))
+            return
+        self._do_show_affected_items(future.result())
 
     @busy_effect
-    def _do_select_commit(self, current):
-        commit_id = current.data(0, Qt.ItemDataRole.UserRole + 1)
-        self._affected_items.clear()
+    def _do_show_affected_items(self, item_ids):
         # TODO: If no items, show message that data was overwritten by a further commit
-        for item_type, ids in self._db_mngr.get_items_for_commit(self._db_map, commit_id).items():
+        for item_type, ids in item_ids.items():
             top_level_item = QTreeWidgetItem([item_type])
             self._affected_items.addTopLevelItem(top_level_item)
             bottom_level_item = QTreeWidgetItem(top_level_item)
@@ -81,24 +99,6 @@ class _DBCommitViewer(QWidget):
             top_level_item.setExpanded(True)
 
 
-class _CommitItem(QWidget):
-    """A widget to show commit message, author and data on a QTreeWidget."""
-
-    def __init__(self, commit, parent=None):
-        super().__init__(parent=parent)
-        comment = QLabel(str(commit["comment"]) or "<no comment>")
-        user = QLabel(str(commit["user"]))
-        date = QLabel(str(commit["date"]))
-        layout = QGridLayout()
-        self.setLayout(layout)
-        ss = "QLabel{color:gray; font: italic;}"
-        user.setStyleSheet(ss)
-        date.setStyleSheet(ss)
-        layout.addWidget(comment, 0, 0, 1, -1)
-        layout.addWidget(user, 1, 0)
-        layout.addWidget(date, 1, 1)
-
-
 class _AffectedItemsFromOneTable(QTreeWidget):
     """A widget to show all the items from one table that are affected by a commit."""
 
@@ -600,11 +600,17 @@ class EntityQGraphicsView(CustomQGraphicsView):
             rect = self._bg_item.scene_rect()
             return rect.x(), rect.y(), rect.width(), rect.height()
 
-    def clear_scene(self):
+    def clear_scene(self, keep=()):
+        """Removes items from the scene.
+
+        Args:
+            keep (Iterable of QGraphicsItem): top-level items to keep in addition to the background
+        """
+        keep = set(keep)
         for item in self.scene().items():
             if item.topLevelItem() is not item:
                 continue
-            if item is not self._bg_item:
+            if item is not self._bg_item and item not in keep:
                 self.scene().removeItem(item)
 
     @contextmanager
@@ -29,7 +29,7 @@ from PySide6.QtWidgets import (
     QDateTimeEdit,
     QSpinBox,
 )
-from PySide6.QtGui import QPainter, QColor, QIcon, QBrush, QPainterPath, QPalette
+from PySide6.QtGui import QAction, QPainter, QColor, QIcon, QBrush, QPainterPath, QPalette
 from PySide6.QtCore import (
     Signal,
     Slot,
@@ -69,6 +69,10 @@ class OpenFileButton(QWidget):
         self._progress_bar.setFormat(self.file_name + padding)
         self._progress_bar.setRange(1, 10)
         self._progress_bar.setValue(1)
+        self._progress_bar.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+        cancel_export_action = QAction("Cancel export", self._progress_bar)
+        cancel_export_action.triggered.connect(self.cancel_export)
+        self._progress_bar.addAction(cancel_export_action)
         self._button.hide()
         self._button.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
         self._button.setText(self.file_name)
@@ -122,7 +126,7 @@ class OpenFileButton(QWidget):
         progress_bar_value = self._progress_bar.minimum() + self.progress * (
             self._progress_bar.maximum() - self._progress_bar.minimum()
         )
-        self._progress_bar.setValue(progress_bar_value)
+        self._progress_bar.setValue(round(progress_bar_value))
         if progress_bar_value == self._progress_bar.maximum():
 
             def _show_button():
@@ -131,6 +135,10 @@ class OpenFileButton(QWidget):
 
             QTimer.singleShot(100, _show_button)
 
+    @Slot(bool)
+    def cancel_export(self, checked=False):
+        self.db_editor.db_mngr.cancel_export(self.file_path)
+
     @Slot(bool)
     def open_file(self, checked=False):
         open_url("file:///" + os.path.join(self.dir_name, self.file_path))
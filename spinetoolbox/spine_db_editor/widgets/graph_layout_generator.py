@@ -11,9 +11,22 @@
 ######################################################################################################################
 
 """Contains the GraphLayoutGeneratorRunnable class."""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import shortest_path
 from PySide6.QtCore import Signal, Slot, QObject, QRunnable
 from spinedb_api.graph_layout_generator import GraphLayoutGenerator
 
+GRID_LAYOUT_VERTEX_COUNT = 1000
+"""Graphs with at least this many vertices are laid out by :class:`GridForceLayoutGenerator`."""
+_STEPS_PER_ITERATION = 10
+_MAX_GRID_DEPTH = 16
+_MAX_MEAN_CELL_CROWDING = 16
+_GRAVITY = 0.1
+_REPULSION = 0.05
+_PIVOT_COUNT = 50
+_FAR_CELL_OFFSETS = np.array([(dx, dy) for dx in range(-3, 4) for dy in range(-3, 4) if abs(dx) > 1 or abs(dy) > 1])
+
 
 class GraphLayoutGeneratorRunnable(QRunnable):
     """Computes the layout for the Entity Graph View."""
@@ -35,19 +48,33 @@ class GraphLayoutGeneratorRunnable(QRunnable):
         weight_exp=-2,
     ):
         super().__init__()
-        self._generator = GraphLayoutGenerator(
-            vertex_count,
-            src_inds=src_inds,
-            dst_inds=dst_inds,
-            spread=spread,
-            heavy_positions=heavy_positions,
-            max_iters=max_iters,
-            weight_exp=weight_exp,
-            is_stopped=self._is_stopped,
-            preview_available=self._preview_available,
-            layout_available=self._layout_available,
-            layout_progressed=self._layout_progressed,
-        )
+        callbacks = {
+            "is_stopped": self._is_stopped,
+            "preview_available": self._preview_available,
+            "layout_available": self._layout_available,
+            "layout_progressed": self._layout_progressed,
+        }
+        if vertex_count < GRID_LAYOUT_VERTEX_COUNT:
+            self._generator = GraphLayoutGenerator(
+                vertex_count,
+                src_inds=src_inds,
+                dst_inds=dst_inds,
+                spread=spread,
+                heavy_positions=heavy_positions,
+                max_iters=max_iters,
+                weight_exp=weight_exp,
+                **callbacks,
+            )
+        else:
+            self._generator = GridForceLayoutGenerator(
+                vertex_count,
+                src_inds=src_inds,
+                dst_inds=dst_inds,
+                spread=spread,
+                heavy_positions=heavy_positions,
+                max_iters=max_iters,
+                **callbacks,
+            )
         self.vertex_count = vertex_count
         self.max_iters = max_iters
         self._id = identifier
@@ -82,3 +109,315 @@ class GraphLayoutGeneratorRunnable(QRunnable):
     def run(self):
         self._generator.compute_layout()
         self.finished.emit(self._id)
+
+
+class GridForceLayoutGenerator:
+    """Builds a force-directed layout for large undirected graphs.
+
+    Repulsion between distant vertices is approximated on a hierarchy of grids
+    which keeps the cost of an iteration close to linear in the number of vertices
+    whereas :class:`spinedb_api.graph_layout_generator.GraphLayoutGenerator` needs a dense distance matrix.
+    """
+
+    def __init__(
+        self,
+        vertex_count,
+        src_inds=(),
+        dst_inds=(),
+        spread=0,
+        heavy_positions=None,
+        max_iters=12,
+        is_stopped=lambda: False,
+        preview_available=lambda x, y: None,
+        layout_available=lambda x, y: None,
+        layout_progressed=lambda iter: None,
+    ):
+        """
+        Args:
+            vertex_count (int): number of vertices
+            src_inds (Sequence of int): indices of the source vertices of each edge
+            dst_inds (Sequence of int): indices of the destination vertices of each edge
+            spread (float): ideal edge length
+            heavy_positions (dict, optional): mapping from vertex index to a dict with "x" and "y" keys;
+                these vertices stay in place and the rest of the layout is built around them
+            max_iters (int): maximum number of iterations
+            is_stopped (Callable): returns True if layout generation should stop
+            preview_available (Callable): called with x and y coordinates after each iteration
+            layout_available (Callable): called with final x and y coordinates
+            layout_progressed (Callable): called with iteration number
+        """
+        if heavy_positions is None:
+            heavy_positions = {}
+        self.vertex_count = vertex_count
+        self.src_inds = np.asarray(src_inds, dtype=np.int64)
+        self.dst_inds = np.asarray(dst_inds, dtype=np.int64)
+        self.spread = spread if spread > 0 else 1.0
+        self.heavy_positions = heavy_positions
+        free_share = 1 - len(heavy_positions) / vertex_count if vertex_count else 0
+        self.max_iters = max(3, round(max_iters * free_share))
+        self._gravity = _GRAVITY if not heavy_positions else 0.0
+        self._is_stopped = is_stopped
+        self._preview_available = preview_available
+        self._layout_available = layout_available
+        self._layout_progressed = layout_progressed
+
+    def compute_layout(self):
+        """Computes the layout and returns x and y coordinates for each vertex in the graph.
+
+        Returns:
+            tuple(ndarray,ndarray): x and y coordinates
+        """
+        rng = np.random.default_rng(0)
+        layout, pinned, scattered_count = self._initial_layout(rng)
+        movable = np.flatnonzero(~pinned)
+        if movable.size == 0:
+            x, y = layout[:, 0], layout[:, 1]
+            self._layout_available(x, y)
+            return x, y
+        temperature = self.spread * max(1.0, np.sqrt(scattered_count) / 10)
+        step_count = self.max_iters * _STEPS_PER_ITERATION
+        cooling = (0.01 * self.spread / temperature) ** (1 / step_count)
+        self._layout_progressed(1)
+        for iteration in range(self.max_iters):
+            if self._is_stopped():
+                break
+            self._preview_available(layout[:, 0], layout[:, 1])
+            self._layout_progressed(2 + iteration)
+            for _ in range(_STEPS_PER_ITERATION):
+                displacement = self._displacement(layout, movable)
+                length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 1e-9 * self.spread)
+                layout[movable] += displacement * np.minimum(1.0, temperature / length)[:, None]
+                temperature *= cooling
+        x, y = layout[:, 0], layout[:, 1]
+        self._layout_available(x, y)
+        return x, y
+
+    def _initial_layout(self, rng):
+        """Places vertices at their starting positions.
+
+        Heavy vertices go to their given positions and vertices connected to them next to the heavy neighbors.
+        Without heavy vertices, the starting layout comes from Pivot MDS. Remaining vertices are scattered randomly.
+
+        Args:
+            rng (Generator): random number generator
+
+        Returns:
+            tuple: vertex coordinates as vertex count x 2 array, a boolean array marking heavy vertices
+                and the number of randomly scattered vertices
+        """
+        layout = np.empty((self.vertex_count, 2))
+        pinned = np.zeros(self.vertex_count, dtype=bool)
+        for ind, pos in self.heavy_positions.items():
+            layout[ind] = pos["x"], pos["y"]
+            pinned[ind] = True
+        if not pinned.any() and self.src_inds.size:
+            layout = _pivot_mds(self.vertex_count, self.src_inds, self.dst_inds, self.spread)
+            # Vertices with equal distances to all pivots, e.g. sibling leaves, coincide; scatter them around.
+            _, groups, group_sizes = np.unique(
+                np.round(layout / self.spread, 1), axis=0, return_inverse=True, return_counts=True
+            )
+            radii = 0.5 * self.spread * np.sqrt(group_sizes[groups.ravel()] * rng.uniform(size=self.vertex_count))
+            angles = rng.uniform(0.0, 2 * np.pi, self.vertex_count)
+            layout += np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))
+            return layout, pinned, 0
+        center = layout[pinned].mean(axis=0) if pinned.any() else np.zeros(2)
+        half_width = self.spread * np.sqrt(self.vertex_count) / 2
+        scattered = ~pinned
+        if pinned.any() and self.src_inds.size:
+            position_sums = np.zeros((self.vertex_count, 2))
+            neighbor_counts = np.zeros(self.vertex_count)
+            for vertices, neighbors in ((self.src_inds, self.dst_inds), (self.dst_inds, self.src_inds)):
+                with_heavy_neighbor = ~pinned[vertices] & pinned[neighbors]
+                vertices = vertices[with_heavy_neighbor]
+                neighbors = neighbors[with_heavy_neighbor]
+                for axis in range(2):
+                    position_sums[:, axis] += np.bincount(
+                        vertices, weights=layout[neighbors, axis], minlength=self.vertex_count
+                    )
+                neighbor_counts += np.bincount(vertices, minlength=self.vertex_count)
+            nearby = neighbor_counts > 0
+            layout[nearby] = position_sums[nearby] / neighbor_counts[nearby, None] + rng.uniform(
+                -self.spread, self.spread, (nearby.sum(), 2)
+            )
+            scattered &= ~nearby
+        scattered_count = scattered.sum()
+        layout[scattered] = center + rng.uniform(-half_width, half_width, (scattered_count, 2))
+        return layout, pinned, scattered_count
+
+    def _displacement(self, layout, movable):
+        """Calculates the displacement of movable vertices due to repulsion, edge attraction and gravity.
+
+        Gravity pulls vertices towards the center when there are no heavy vertices to anchor the layout.
+
+        Args:
+            layout (ndarray): vertex coordinates
+            movable (ndarray): indexes of vertices that are free to move
+
+        Returns:
+            ndarray: displacement of movable vertices
+        """
+        forces = _repulsion(layout, movable, self.spread)
+        if self._gravity:
+            forces -= self._gravity * (layout[movable] - layout.mean(axis=0))
+        if self.src_inds.size:
+            delta = layout[self.dst_inds] - layout[self.src_inds]
+            attraction = np.hypot(delta[:, 0], delta[:, 1]) / self.spread
+            for axis in range(2):
+                pull = delta[:, axis] * attraction
+                edge_forces = np.bincount(self.src_inds, weights=pull, minlength=self.vertex_count)
+                edge_forces -= np.bincount(self.dst_inds, weights=pull, minlength=self.vertex_count)
+                forces[:, axis] += edge_forces[movable]
+        return forces
+
+
+def _pivot_mds(vertex_count, src_inds, dst_inds, spread):
+    """Computes a layout that approximates graph distances using Pivot MDS.
+
+    Only the distances to a few pivot vertices are computed which keeps the cost linear in the size of the graph.
+
+    Args:
+        vertex_count (int): number of vertices
+        src_inds (ndarray): indices of the source vertices of each edge
+        dst_inds (ndarray): indices of the destination vertices of each edge
+        spread (float): ideal edge length
+
+    Returns:
+        ndarray: vertex coordinates as vertex count x 2 array
+    """
+    graph = csr_matrix((np.ones(len(src_inds)), (src_inds, dst_inds)), shape=(vertex_count, vertex_count))
+    pivot_count = min(_PIVOT_COUNT, vertex_count)
+    distances = np.empty((vertex_count, pivot_count))
+    nearest_pivot_distances = np.full(vertex_count, np.inf)
+    pivot = 0
+    for pivot_number in range(pivot_count):
+        distances[:, pivot_number] = shortest_path(graph, directed=False, unweighted=True, indices=pivot)
+        nearest_pivot_distances = np.minimum(nearest_pivot_distances, distances[:, pivot_number])
+        pivot = np.argmax(nearest_pivot_distances)
+    unreachable = np.isinf(distances)
+    distances[unreachable] = distances[~unreachable].max() + 1.0
+    squared = distances**2
+    centered = -0.5 * (squared - squared.mean(axis=0) - squared.mean(axis=1)[:, None] + squared.mean())
+    _, _, components = np.linalg.svd(centered, full_matrices=False)
+    layout = centered @ components[:2].T
+    edge_lengths = np.hypot(*(layout[src_inds] - layout[dst_inds]).T)
+    scale = np.median(edge_lengths)
+    return layout * (spread / scale) if scale > 0 else layout
+
+
+def _repulsion(layout, movable, spread):
+    """Approximates the repulsive forces that act on movable vertices.
+
+    Vertices in the same or adjacent cells of the finest grid repel each other directly.
+    Farther vertices are lumped together into the cells of a grid hierarchy where each level halves the cell size
+    of the previous one. A cell interacts with the cells that are children of its parent's neighbors
+    but not its own neighbors, similar to the Barnes-Hut approximation.
+
+    Args:
+        layout (ndarray): vertex coordinates as vertex count x 2 array
+        movable (ndarray): indexes of vertices whose forces to calculate
+        spread (float): ideal edge length
+
+    Returns:
+        ndarray: forces as movable vertex count x 2 array
+    """
+    vertex_count = len(layout)
+    low = layout.min(axis=0)
+    size = max(np.ptp(layout, axis=0).max(), spread) * (1 + 1e-9)
+    depth = min(max(2, int(np.ceil(np.log2(size / spread)))), int(np.ceil(np.log2(vertex_count) / 2)))
+    while True:
+        side = 2**depth
+        cells = np.minimum(((layout - low) * (side / size)).astype(np.int64), side - 1)
+        if depth >= _MAX_GRID_DEPTH:
+            break
+        _, cell_sizes = np.unique(cells[:, 0] * side + cells[:, 1], return_counts=True)
+        if np.sum(cell_sizes.astype(float) ** 2) <= _MAX_MEAN_CELL_CROWDING * vertex_count:
+            break
+        depth += 1
+    vertices, neighbors = _grid_neighbors(cells, movable)
+    delta = layout[vertices] - layout[neighbors]
+    distance_squared = np.maximum(np.einsum("ij,ij->i", delta, delta), (0.01 * spread) ** 2)
+    repulsion = _REPULSION * spread * spread / distance_squared
+    forces = np.empty((len(movable), 2))
+    for axis in range(2):
+        forces[:, axis] = np.bincount(vertices, weights=delta[:, axis] * repulsion, minlength=vertex_count)[movable]
+    for level in range(2, depth + 1):
+        level_cells = cells >> (depth - level)
+        forces += _cell_repulsion(layout, level_cells, 2**level, movable, spread)
+    return forces
+
+
+def _cell_repulsion(layout, cells, side, movable, spread):
+    """Calculates repulsive forces between the cells of one level of the grid hierarchy.
+
+    Args:
+        layout (ndarray): vertex coordinates as vertex count x 2 array
+        cells (ndarray): cell coordinates of each vertex as vertex count x 2 array
+        side (int): number of cells per grid side
+        movable (ndarray): indexes of vertices whose forces to calculate
+        spread (float): ideal edge length
+
+    Returns:
+        ndarray: forces as movable vertex count x 2 array
+    """
+    keys = cells[:, 0] * side + cells[:, 1]
+    cell_keys, vertex_cells, masses = np.unique(keys, return_inverse=True, return_counts=True)
+    centroids = np.column_stack([np.bincount(vertex_cells, weights=layout[:, axis]) / masses for axis in range(2)])
+    targets, movable_targets = np.unique(vertex_cells[movable], return_inverse=True)
+    target_inds = np.repeat(np.arange(len(targets)), len(_FAR_CELL_OFFSETS))
+    target_x = cell_keys[targets][target_inds] // side
+    target_y = cell_keys[targets][target_inds] % side
+    source_x = target_x + np.tile(_FAR_CELL_OFFSETS[:, 0], len(targets))
+    source_y = target_y + np.tile(_FAR_CELL_OFFSETS[:, 1], len(targets))
+    valid = (
+        (source_x >= 0)
+        & (source_x < side)
+        & (source_y >= 0)
+        & (source_y < side)
+        & (np.abs((source_x >> 1) - (target_x >> 1)) <= 1)
+        & (np.abs((source_y >> 1) - (target_y >> 1)) <= 1)
+    )
+    target_inds = target_inds[valid]
+    source_keys = source_x[valid] * side + source_y[valid]
+    sources = np.minimum(np.searchsorted(cell_keys, source_keys), len(cell_keys) - 1)
+    found = cell_keys[sources] == source_keys
+    target_inds = target_inds[found]
+    sources = sources[found]
+    delta = centroids[targets[target_inds]] - centroids[sources]
+    distance_squared = np.maximum(np.einsum("ij,ij->i", delta, delta), (0.01 * spread) ** 2)
+    repulsion = _REPULSION * masses[sources] * spread * spread / distance_squared
+    cell_forces = np.column_stack(
+        [np.bincount(target_inds, weights=delta[:, axis] * repulsion, minlength=len(targets)) for axis in range(2)]
+    )
+    return cell_forces[movable_targets]
+
+
+def _grid_neighbors(cells, indexes):
+    """Finds vertices that lie in the same or adjacent grid cells as given vertices.
+
+    Args:
+        cells (ndarray): non-negative cell coordinates of each vertex as vertex count x 2 array
+        indexes (ndarray): indexes of vertices whose neighbors to find
+
+    Returns:
+        tuple: two arrays of equal length with indexes from ``indexes`` and indexes of their neighbors
+    """
+    row_length = cells[:, 1].max() + 3
+    keys = (cells[:, 0] + 1) * row_length + cells[:, 1] + 1
+    order = np.argsort(keys, kind="stable")
+    cell_keys, cell_starts, cell_sizes = np.unique(keys[order], return_index=True, return_counts=True)
+    vertices = []
+    neighbors = []
+    for row_offset in (-row_length, 0, row_length):
+        for offset in (row_offset - 1, row_offset, row_offset + 1):
+            neighbor_keys = keys[indexes] + offset
+            cell_inds = np.minimum(np.searchsorted(cell_keys, neighbor_keys), len(cell_keys) - 1)
+            found = cell_keys[cell_inds] == neighbor_keys
+            cell_inds = cell_inds[found]
+            counts = cell_sizes[cell_inds]
+            ramp = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            vertices.append(np.repeat(indexes[found], counts))
+            neighbors.append(order[np.repeat(cell_starts[cell_inds], counts) + ramp])
+    vertices = np.concatenate(vertices)
+    neighbors = np.concatenate(neighbors)
+    distinct = vertices != neighbors
+    return vertices[distinct], neighbors[distinct]
@@ -326,7 +326,7 @@ class GraphViewMixin:
     def _handle_entity_tree_selection_changed_in_graph(self, selected):
         """Stores the given selection of entity tree indexes and builds graph."""
         self._update_selected_item_type_db_map_ids(selected)
-        self.build_graph()
+        self.build_graph(persistent=True)
 
     def expand_graph(self, db_map_entity_ids):
         self.expanded_db_map_entity_ids.update(db_map_entity_ids)
@@ -340,17 +340,17 @@ class GraphViewMixin:
 
     def prune_graph(self, key, db_map_entity_ids):
         self.pruned_db_map_entity_ids[key] = db_map_entity_ids
-        self.build_graph()
+        self.build_graph(persistent=True)
 
     def restore_graph(self, key=None):
         if not self.pruned_db_map_entity_ids:
             return
         if key is None:
             self.pruned_db_map_entity_ids.clear()
-            self.build_graph()
+            self.build_graph(persistent=True)
             return
         if self.pruned_db_map_entity_ids.pop(key, None) is not None:
-            self.build_graph()
+            self.build_graph(persistent=True)
 
     def _get_db_map_graph_data(self):
         db_map_graph_data = {}
@@ -451,8 +451,8 @@ class GraphViewMixin:
     def remove_graph_data(self, name):
         db_map_typed_ids = {}
         for db_map in self.db_maps:
-            metadata_item = next((x for x in self.db_mngr.get_items(db_map, "metadata") if x["name"] == name), None)
-            if metadata_item is None:
+            metadata_item = self.db_mngr.get_item_by_field(db_map, "metadata", "name", name)
+            if not metadata_item:
                 continue
             db_map_typed_ids[db_map] = {"metadata": {metadata_item["id"]}}
         self.db_mngr.remove_items(db_map_typed_ids)
@@ -467,6 +467,8 @@ class GraphViewMixin:
     def build_graph(self, persistent=False):
         """Builds graph from current selection of items.
 
+        Items already in the scene are kept and only the difference to the new graph gets added or removed.
+
         Args:
             persistent (bool, optional): If True, elements in the current graph (if any) retain their position
                 in the new one.
@@ -480,10 +482,9 @@ class GraphViewMixin:
             self._owes_graph = True
             return
         self._owes_graph = False
-        self.ui.graphicsView.clear_scene()
         self._entity_fetch_parent.reset()
         self._parameter_value_fetch_parent.reset()
-        self._graph_fetch_more_later()
+        self._refresh_graph()
 
     def _refresh_graph(self):
         self._update_graph_data()
@@ -512,12 +513,12 @@ class GraphViewMixin:
         # Ignore layouts from obsolete generators
         if layout_gen_id != self._layout_gen_id:
             return
+        self.scene.clearSelection()
         self.ui.graphicsView.selected_items.clear()
         self.ui.graphicsView.hidden_items.clear()
-        self.ui.graphicsView.clear_scene()
-        if self._make_new_items(x, y):
-            self._add_new_items()
-        if not self._persisted_positions:
+        items_kept = self._update_items(x, y)
+        self._add_new_items()
+        if not self._persisted_positions or not items_kept:
             self.ui.graphicsView.reset_zoom()
         else:
             self.ui.graphicsView.apply_zoom()
@@ -711,35 +712,62 @@ class GraphViewMixin:
         offsets.append(offset)
         return offset
 
-    def _make_new_items(self, x, y):
-        """Makes new items for the graph.
+    def _update_items(self, x, y):
+        """Updates the items of the graph to match current graph data.
+
+        Items that are already in the scene are reused and moved to their new positions;
+        only items for new entities and arcs get created.
 
         Args:
             x (list)
             y (list)
 
         Returns:
-            bool: True if graph contains any items after the operation, False otherwise
+            bool: True if any entity items of the previous graph were kept, False otherwise
         """
-        self.entity_items = [
-            EntityItem(
-                self,
-                *self.convert_position(x[i], y[i]),
-                self._VERTEX_EXTENT,
-                tuple(db_map_entity_ids),
-                offset=self._get_entity_offset(db_map_entity_ids),
-            )
-            for i, db_map_entity_ids in enumerate(self.db_map_entity_id_sets)
-        ]
-        self.arc_items = [
-            ArcItem(self.entity_items[ent_id], self.entity_items[el_ind], self._ARC_WIDTH)
-            for ent_id, el_ind in zip(self.entity_inds, self.element_inds)
-        ]
-        return any(self.entity_items)
+        old_entity_items = {}
+        old_arc_items = {}
+        for item in self.scene.items():
+            if type(item) is EntityItem:  # pylint: disable=unidiomatic-typecheck
+                old_entity_items[frozenset(item.original_db_map_ids)] = item
+            elif type(item) is ArcItem:  # pylint: disable=unidiomatic-typecheck
+                old_arc_items[item.ent_item, item.el_item] = item
+        self.entity_items = []
+        reused_entity_items = []
+        for i, db_map_entity_ids in enumerate(self.db_map_entity_id_sets):
+            pos_x, pos_y = self.convert_position(x[i], y[i])
+            offset = self._get_entity_offset(db_map_entity_ids)
+            item = old_entity_items.pop(frozenset(db_map_entity_ids), None)
+            if item is None:
+                item = EntityItem(self, pos_x, pos_y, self._VERTEX_EXTENT, tuple(db_map_entity_ids), offset=offset)
+            else:
+                item.set_offset(offset)
+                item.set_pos(pos_x, pos_y)
+                item.setVisible(True)
+                item.set_up()
+                reused_entity_items.append(item)
+            self.entity_items.append(item)
+        self.arc_items = []
+        for ent_ind, el_ind in zip(self.entity_inds, self.element_inds):
+            ent_item = self.entity_items[ent_ind]
+            el_item = self.entity_items[el_ind]
+            arc_item = old_arc_items.pop((ent_item, el_item), None)
+            if arc_item is None:
+                arc_item = ArcItem(ent_item, el_item, self._ARC_WIDTH)
+            self.arc_items.append(arc_item)
+        for arc_item in old_arc_items.values():
+            for item in (arc_item.ent_item, arc_item.el_item):
+                if arc_item in item.arc_items:
+                    item.remove_arc_item(arc_item)
+        for item in reused_entity_items:
+            item.do_update_entity_pos()
+        self.ui.graphicsView.clear_scene(keep=self.entity_items + self.arc_items)
+        return bool(reused_entity_items)
 
     def _add_new_items(self):
         for item in self.entity_items + self.arc_items:
-            self.scene.addItem(item)
+            if item.scene() is None:
+                self.scene.addItem(item)
 
     def start_connecting_entities(self, db_map, entity_class, ent_item):
         """Starts connecting entites with the given entity item.
@@ -62,6 +62,7 @@ class MultiSpineDBEditor(MultiTabWindow):
         if not super()._connect_tab_signals(tab):
             return False
         tab.file_exported.connect(self.insert_open_file_button)
+        tab.file_export_aborted.connect(self.remove_open_file_button)
         tab.ui.actionUser_guide.triggered.connect(self.show_user_guide)
         tab.ui.actionSettings.triggered.connect(self.settings_form.show)
         tab.ui.actionClose.triggered.connect(self.handle_close_request_from_tab)
@@ -80,6 +81,7 @@ class MultiSpineDBEditor(MultiTabWindow):
             return False
         tab = self.tab_widget.widget(index)
         tab.file_exported.disconnect(self.insert_open_file_button)
+        tab.file_export_aborted.disconnect(self.remove_open_file_button)
         tab.ui.actionUser_guide.triggered.disconnect(self.show_user_guide)
         tab.ui.actionSettings.triggered.disconnect(self.settings_form.show)
         tab.ui.actionClose.triggered.disconnect(self.handle_close_request_from_tab)
@@ -147,19 +149,39 @@ class MultiSpineDBEditor(MultiTabWindow):
 
     @Slot(str, float, bool)
     def insert_open_file_button(self, file_path, progress, is_sqlite):
-        button = next(
+        button = self._find_unfinished_open_file_button(file_path)
+        if button is not None:
+            button.set_progress(progress)
+            return
+        button = (OpenSQLiteFileButton if is_sqlite else OpenFileButton)(file_path, progress, self)
+        self._insert_statusbar_button(button)
+
+    @Slot(str)
+    def remove_open_file_button(self, file_path):
+        """Removes the button of an export that did not finish."""
+        button = self._find_unfinished_open_file_button(file_path)
+        if button is None:
+            return
+        self.statusBar().removeWidget(button)
+        button.deleteLater()
+
+    def _find_unfinished_open_file_button(self, file_path):
+        """Returns the button of an export in progress.
+
+        Args:
+            file_path (str): path to exported file
+
+        Returns:
+            OpenFileButton: button or None if not found
+        """
+        return next(
             (
                 x
                 for x in self.statusBar().findChildren(OpenFileButton)
-                if os.path.samefile(x.file_path, file_path) and x.progress != 1.0
+                if x.progress != 1.0 and _is_same_file(x.file_path, file_path)
             ),
             None,
         )
-        if button is not None:
-            button.set_progress(progress)
-            return
-        button = (OpenSQLiteFileButton if is_sqlite else OpenFileButton)(file_path, progress, self)
-        self._insert_statusbar_button(button)
 
     def _open_sqlite_url(self, url, codename):
         """Opens sqlite url."""
@@ -199,3 +221,19 @@ class _CustomStatusBar(QStatusBar):
         self.insertPermanentWidget(0, self._hide_button)
         self.setSizeGripEnabled(False)
         self._hide_button.clicked.connect(self.hide)
+
+
+def _is_same_file(path1, path2):
+    """Checks if two paths point to the same file; works for files that do not exist.
+
+    Args:
+        path1 (str): file path
+        path2 (str): file path
+
+    Returns:
+        bool: True if paths point to the same file, False otherwise
+    """
+    try:
+        return os.path.samefile(path1, path2)
+    except OSError:
+        return os.path.normcase(os.path.abspath(path1)) == os.path.normcase(os.path.abspath(path2))
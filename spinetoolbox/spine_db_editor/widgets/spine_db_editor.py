@@ -65,6 +65,7 @@ class SpineDBEditorBase(QMainWindow):
     msg = Signal(str)
     msg_error = Signal(str)
     file_exported = Signal(str, float, bool)
+    file_export_aborted = Signal(str)
     """filepath, progress between 0 and 1, True if sqlite file"""
 
     def __init__(self, db_mngr):
@@ -108,6 +109,7 @@ class SpineDBEditorBase(QMainWindow):
         self.setContextMenuPolicy(Qt.NoContextMenu)
         self._torn_down = False
         self._purge_items_dialog = None
+        self._commit_action_text = self.ui.actionCommit.text()
         self._purge_items_dialog_state = None
         self._export_items_dialog = None
         self._export_items_dialog_state = None
@@ -352,6 +354,8 @@ class SpineDBEditorBase(QMainWindow):
         self.db_mngr.items_added.connect(self._handle_items_added)
         self.db_mngr.items_updated.connect(self._handle_items_updated)
         self.db_mngr.items_removed.connect(self._handle_items_removed)
+        self.db_mngr.session_lock_changed.connect(self._handle_session_lock_changed)
+        self.db_mngr.commit_progress.connect(self._update_commit_progress)
         # Menu actions
         self.ui.actionCommit.triggered.connect(self.commit_session)
         self.ui.actionRollback.triggered.connect(self.rollback_session)
@@ -399,20 +403,58 @@ class SpineDBEditorBase(QMainWindow):
 
     @Slot()
     def _refresh_undo_redo_actions(self):
-        self.ui.actionUndo.setEnabled(self.undo_action.isEnabled())
+        locked = self._is_read_only()
+        self.ui.actionUndo.setEnabled(self.undo_action.isEnabled() and not locked)
         self.ui.actionUndo.setToolTip(f"<p>{self.undo_action.text()}</p><p>Ctrl+Z</p>")
-        self.ui.actionRedo.setEnabled(self.redo_action.isEnabled())
+        self.ui.actionRedo.setEnabled(self.redo_action.isEnabled() and not locked)
         self.ui.actionRedo.setToolTip(f"<p>{self.redo_action.text()}</p><p>Ctrl+Y</p>")
 
     @Slot(bool)
     def update_commit_enabled(self, _clean=False):
         dirty = any(self.db_mngr.is_dirty(db_map) for db_map in self.db_maps)
-        self.ui.actionExport_session.setEnabled(dirty)
-        self.ui.actionCommit.setEnabled(dirty)
-        self.ui.actionRollback.setEnabled(dirty)
+        locked = self._is_session_locked()
+        read_only = locked or self._is_read_only()
+        self.ui.actionExport_session.setEnabled(dirty and not read_only)
+        self.ui.actionCommit.setEnabled(dirty and not read_only or locked)
+        self.ui.actionRollback.setEnabled(dirty and not read_only)
+        if not locked:
+            self.ui.actionCommit.setText(self._commit_action_text)
         self.setWindowModified(dirty)
         self.windowTitleChanged.emit(self.windowTitle())
 
+    def _is_session_locked(self):
+        """Checks if a commit or rollback is running on any of editor's database mappings.
+
+        Returns:
+            bool: True if a commit or rollback is running, False otherwise
+        """
+        return any(self.db_mngr.is_session_locked(db_map) for db_map in self.db_maps)
+
+    def _is_read_only(self):
+        """Checks if a commit, rollback or export is running on any of editor's database mappings.
+
+        Returns:
+            bool: True if editor's data cannot be modified, False otherwise
+        """
+        return any(self.db_mngr.is_read_only(db_map) for db_map in self.db_maps)
+
+    @Slot(object, bool)
+    def _handle_session_lock_changed(self, db_map, locked):
+        if db_map not in self.db_maps:
+            return
+        if locked and self._is_session_locked():
+            self.ui.actionCommit.setText("Cancel commit")
+        self.update_commit_enabled()
+        if self.undo_action is not None and self.redo_action is not None:
+            self._refresh_undo_redo_actions()
+
+    @Slot(object, int, int)
+    def _update_commit_progress(self, db_map, written, total):
+        if db_map not in self.db_maps or not self._is_session_locked():
+            return
+        percentage = 100 * written // total if total else 0
+        self.ui.actionCommit.setText(f"Cancel commit ({percentage} %)")
+
     def init_models(self):
         """Initializes models."""
 
@@ -646,7 +688,11 @@ class SpineDBEditorBase(QMainWindow):
 
     @Slot(bool)
     def commit_session(self, checked=False):
-        """Commits dirty database maps."""
+        """Commits dirty database maps or cancels running commits."""
+        if self._is_session_locked():
+            for db_map in self.db_maps:
+                self.db_mngr.cancel_commit(db_map)
+            return
         dirty_db_maps = self.db_mngr.dirty(*self.db_maps)
         if not dirty_db_maps:
             return
@@ -584,7 +584,7 @@ class TabularViewMixin:
         Returns:
             list: frozen value
         """
-        return list(dict.fromkeys(zip(*[self.pivot_table_model.model.index_values.get(k, []) for k in frozen])).keys())
+        return self.pivot_table_model.model.index_value_combinations(frozen)
 
     @Slot()
     def _change_frozen_value(self):
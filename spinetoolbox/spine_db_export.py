@@ -0,0 +1,311 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains functions that export database items to files type by type."""
+from contextlib import nullcontext
+import json
+import os
+from tempfile import TemporaryDirectory
+from sqlalchemy.engine.url import URL
+from spinedb_api import create_new_spine_database, DatabaseMapping, import_data
+from spinedb_api import export_functions
+from spinedb_api.parameter_value import dump_db_value
+from spinedb_api.spine_io.exporters.excel import (
+    ExcelWriterWithPreamble,
+    _make_alternative_mapping,
+    _make_object_group_mappings,
+    _make_parameter_value_mappings,
+    _make_scenario_alternative_mapping,
+    _make_scenario_mapping,
+)
+from spinedb_api.spine_io.exporters.writer import write
+from spinedb_api.export_mapping.group_functions import GroupOneOrNone
+
+EXPORT_ORDER = (
+    "entity_classes",
+    "superclass_subclasses",
+    "entities",
+    "entity_alternatives",
+    "entity_groups",
+    "parameter_value_lists",
+    "parameter_definitions",
+    "parameter_values",
+    "alternatives",
+    "scenarios",
+    "scenario_alternatives",
+)
+"""Order of item types in exported data; same as in ``spinedb_api.export_data()``."""
+IMPORT_ORDER = (
+    "alternatives",
+    "scenarios",
+    "scenario_alternatives",
+    "entity_classes",
+    "superclass_subclasses",
+    "entities",
+    "entity_alternatives",
+    "entity_groups",
+    "parameter_value_lists",
+    "parameter_definitions",
+    "parameter_values",
+)
+"""Order in which item types must be imported so that referenced items exist."""
+_EXPORT_FUNCTIONS = {
+    "entity_classes": (export_functions.export_entity_classes, "entity_class_ids", False),
+    "superclass_subclasses": (export_functions.export_superclass_subclasses, "superclass_subclass_ids", False),
+    "entities": (export_functions.export_entities, "entity_ids", False),
+    "entity_alternatives": (export_functions.export_entity_alternatives, "entity_alternative_ids", False),
+    "entity_groups": (export_functions.export_entity_groups, "entity_group_ids", False),
+    "parameter_value_lists": (export_functions.export_parameter_value_lists, "parameter_value_list_ids", True),
+    "parameter_definitions": (export_functions.export_parameter_definitions, "parameter_definition_ids", True),
+    "parameter_values": (export_functions.export_parameter_values, "parameter_value_ids", True),
+    "alternatives": (export_functions.export_alternatives, "alternative_ids", False),
+    "scenarios": (export_functions.export_scenarios, "scenario_ids", False),
+    "scenario_alternatives": (export_functions.export_scenario_alternatives, "scenario_alternative_ids", False),
+}
+_IMPORT_CHUNK_SIZE = 10000
+_EXCEL_CANCEL_CHECK_INTERVAL = 1000
+_EXCEL_IMPORT_SHARE = 0.8
+
+
+class ExportCancelled(Exception):
+    """Raised when an export has been cancelled."""
+
+
+class ExportMonitor:
+    """Reports export progress and tells exporters to stop when the export has been cancelled."""
+
+    def __init__(self, report=None):
+        """
+        Args:
+            report (Callable, optional): called with progress between 0.0 and 1.0; may be called from a non-GUI thread
+        """
+        self._report = report
+        self._cancelled = False
+
+    def cancel(self):
+        """Cancels the export."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def check_cancelled(self):
+        """Raises if export has been cancelled.
+
+        Raises:
+            ExportCancelled: raised if export has been cancelled
+        """
+        if self._cancelled:
+            raise ExportCancelled()
+
+    def advance(self, progress):
+        """Reports progress.
+
+        Args:
+            progress (float): progress between 0.0 and 1.0
+
+        Raises:
+            ExportCancelled: raised if export has been cancelled
+        """
+        self.check_cancelled()
+        if self._report is not None:
+            self._report(progress)
+
+
+def typed_items_from_db_maps(db_map_item_ids, parse_value, query_hold=None):
+    """Returns lazy item sources for each item type.
+
+    Items are read from the databases only when the source is called, one type at a time.
+
+    Args:
+        db_map_item_ids (dict): mapping from database map to keyword arguments of ``spinedb_api.export_data()``
+        parse_value (Callable): function to parse values
+        query_hold (Callable, optional): called with database map; returns a context manager
+            that keeps other queries off the database while items are being read
+
+    Returns:
+        list of tuple: item type key and a callable that returns the items in export order
+    """
+
+    def get_items(key):
+        export_function, ids_key, parses_values = _EXPORT_FUNCTIONS[key]
+        items = []
+        for db_map, item_ids in db_map_item_ids.items():
+            ids = item_ids.get(ids_key, export_functions.Asterisk)
+            kwargs = {"parse_value": parse_value} if parses_values else {}
+            with query_hold(db_map) if query_hold is not None else nullcontext():
+                items += export_function(db_map, ids, **kwargs)
+        return items
+
+    return [(key, lambda key=key: get_items(key)) for key in EXPORT_ORDER]
+
+
+def typed_items_from_data(data):
+    """Wraps already exported data into item sources.
+
+    Args:
+        data (dict): exported data
+
+    Returns:
+        list of tuple: item type key and a callable that returns the items
+    """
+    return [(key, lambda items=items: items) for key, items in data.items()]
+
+
+def write_json(file_path, typed_items, monitor):
+    """Writes items into a JSON file one item type at a time.
+
+    The output is identical to ``json.dumps(data, indent=4)`` where data maps non-empty item types to item lists.
+
+    Args:
+        file_path (str): path to output file
+        typed_items (list of tuple): item sources
+        monitor (ExportMonitor): progress monitor
+    """
+    type_count = len(typed_items)
+    with open(file_path, "w", encoding="utf-8") as json_file:
+        first_type = True
+        json_file.write("{")
+        for type_number, (key, get_items) in enumerate(typed_items):
+            items = get_items()
+            if items:
+                json_file.write("\n" if first_type else ",\n")
+                first_type = False
+                json_file.write(f"    {json.dumps(key)}: [")
+                for item_number, item in enumerate(items):
+                    json_file.write("\n" if item_number == 0 else ",\n")
+                    json_file.write(_indent(json.dumps(item, indent=4), 8))
+                json_file.write("\n    ]")
+            monitor.advance((type_number + 1) / type_count)
+        json_file.write("\n}" if not first_type else "}")
+
+
+def _indent(text, width):
+    """Indents every line of text.
+
+    Args:
+        text (str): text to indent
+        width (int): indentation width
+
+    Returns:
+        str: indented text
+    """
+    padding = width * " "
+    return padding + text.replace("\n", "\n" + padding)
+
+
+def import_into_db_map(db_map, typed_items, monitor, progress_share=1.0, **kwargs):
+    """Imports items into given database mapping type by type committing in chunks.
+
+    Cached items are dropped from the mapping after each item type.
+
+    Args:
+        db_map (DatabaseMapping): target database mapping
+        typed_items (list of tuple): item sources
+        monitor (ExportMonitor): progress monitor
+        progress_share (float): fraction of total progress import accounts for
+        **kwargs: keyword arguments passed to ``spinedb_api.import_data()``
+
+    Returns:
+        list of str: import errors
+    """
+    import_rank = {key: rank for rank, key in enumerate(IMPORT_ORDER)}
+    typed_items = sorted(typed_items, key=lambda typed: import_rank.get(typed[0], len(import_rank)))
+    type_count = len(typed_items)
+    errors = []
+    for type_number, (key, get_items) in enumerate(typed_items):
+        items = get_items()
+        for chunk_start in range(0, len(items), _IMPORT_CHUNK_SIZE):
+            monitor.check_cancelled()
+            count, chunk_errors = import_data(
+                db_map, **{key: items[chunk_start : chunk_start + _IMPORT_CHUNK_SIZE]}, **kwargs
+            )
+            errors += chunk_errors
+            if count > 0:
+                db_map.commit_session("Export data from Spine Toolbox.")
+        del items
+        db_map.reset()
+        monitor.advance(progress_share * (type_number + 1) / type_count)
+    return errors
+
+
+def write_sqlite(file_path, typed_items, monitor):
+    """Writes items into a new Spine database.
+
+    Args:
+        file_path (str): path to output file
+        typed_items (list of tuple): item sources
+        monitor (ExportMonitor): progress monitor
+
+    Returns:
+        list of str: import errors
+    """
+    url = URL("sqlite", database=file_path)
+    create_new_spine_database(url)
+    db_map = DatabaseMapping(url)
+    try:
+        return import_into_db_map(db_map, typed_items, monitor)
+    finally:
+        db_map.close()
+
+
+def write_excel(file_path, typed_items, monitor):
+    """Writes items into an Excel file.
+
+    Items are first imported into a temporary Spine database on disk
+    from where the export mappings read them row by row into the workbook.
+
+    Args:
+        file_path (str): path to output file
+        typed_items (list of tuple): item sources
+        monitor (ExportMonitor): progress monitor
+
+    Returns:
+        list of str: errors from copying the data to temporary database; nothing is written if there are errors
+    """
+    with TemporaryDirectory() as temp_dir:
+        url = URL("sqlite", database=os.path.join(temp_dir, "export.sqlite"))
+        with DatabaseMapping(url, create=True) as db_map:
+            errors = import_into_db_map(
+                db_map, typed_items, monitor, progress_share=_EXCEL_IMPORT_SHARE, unparse_value=dump_db_value
+            )
+            if errors:
+                return errors
+            mappings = [_make_alternative_mapping(), _make_scenario_mapping(), _make_scenario_alternative_mapping()]
+            mappings.extend(_make_object_group_mappings(db_map))
+            mappings.extend(_make_parameter_value_mappings(db_map))
+            writer = _CancellableExcelWriter(file_path, monitor)
+            write(db_map, writer, *mappings, empty_data_header=False, group_fns=GroupOneOrNone.NAME)
+    monitor.advance(1.0)
+    return []
+
+
+class _CancellableExcelWriter(ExcelWriterWithPreamble):
+    """An Excel writer that stops when the export gets cancelled."""
+
+    def __init__(self, file_path, monitor):
+        """
+        Args:
+            file_path (str): path to output file
+            monitor (ExportMonitor): progress monitor
+        """
+        super().__init__(file_path)
+        self._monitor = monitor
+        self._row_count = 0
+
+    def write_row(self, row):
+        """See base class."""
+        self._row_count += 1
+        if self._row_count % _EXCEL_CANCEL_CHECK_INTERVAL == 0:
+            self._monitor.check_cancelled()
+        return super().write_row(row)
@@ -0,0 +1,201 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains secondary indexes that speed up looking items up by field value."""
+from itertools import islice
+
+
+class FieldIndex:
+    """Maps the values of a single field to the items of a single item type in a database mapping.
+
+    The index is built from the in-memory mapping on first lookup.
+    Items that enter the mapping afterwards are indexed on the next lookup,
+    while changes to already indexed items must be reported through :meth:`update_items`.
+    Removed items are kept in the index but skipped by :meth:`find` so restoring them needs no bookkeeping.
+    """
+
+    def __init__(self, db_map, item_type, field):
+        """
+        Args:
+            db_map (DatabaseMapping): database mapping
+            item_type (str): item type
+            field (str): indexed field
+        """
+        self._db_map = db_map
+        self._item_type = item_type
+        self._field = field
+        self._mapped_table = None
+        self._indexed_count = 0
+        self._items_by_id = {}
+        self._positions = {}
+        self._values = {}
+        self._ids_by_value = {}
+        self._unsorted_values = set()
+
+    def find(self, value):
+        """Returns valid items that have given value in the indexed field.
+
+        Args:
+            value (Any): field value
+
+        Returns:
+            list of PublicItem: matching items in mapping order
+        """
+        self._sync()
+        ids = self._ids_by_value.get(value)
+        if not ids:
+            return []
+        if value in self._unsorted_values:
+            self._ids_by_value[value] = ids = dict.fromkeys(sorted(ids, key=self._positions.__getitem__))
+            self._unsorted_values.discard(value)
+        items = self._items_by_id
+        return [items[id_] for id_ in ids if items[id_].is_valid()]
+
+    def update_items(self, items):
+        """Re-indexes given items after their field values may have changed.
+
+        Args:
+            items (Iterable of PublicItem): added or updated items
+        """
+        if self._mapped_table is None:
+            return
+        self._sync()
+        for item in items:
+            id_ = item["id"]
+            indexed_item = self._items_by_id.get(id_)
+            if indexed_item is None:
+                continue
+            new_value = indexed_item.get(self._field)
+            old_value = self._values[id_]
+            if new_value == old_value:
+                continue
+            old_ids = self._ids_by_value[old_value]
+            del old_ids[id_]
+            if not old_ids:
+                del self._ids_by_value[old_value]
+                self._unsorted_values.discard(old_value)
+            self._values[id_] = new_value
+            self._ids_by_value.setdefault(new_value, {})[id_] = None
+            self._unsorted_values.add(new_value)
+
+    def _sync(self):
+        """Indexes items that have been added to the mapping since last sync
+        and rebuilds the index if the mapped table has been replaced."""
+        mapped_table = self._db_map.mapped_table(self._item_type)
+        if mapped_table is not self._mapped_table:
+            self._db_map.fetch_all(self._item_type)
+            self._clear()
+            self._mapped_table = mapped_table
+        if len(mapped_table) == self._indexed_count:
+            return
+        for mapped_item in islice(mapped_table.values(), self._indexed_count, None):
+            self._index_item(mapped_item.public_item)
+        self._indexed_count = len(mapped_table)
+
+    def _index_item(self, item):
+        id_ = item["id"]
+        value = item.get(self._field)
+        self._items_by_id[id_] = item
+        self._positions[id_] = len(self._positions)
+        self._values[id_] = value
+        self._ids_by_value.setdefault(value, {})[id_] = None
+
+    def _clear(self):
+        self._indexed_count = 0
+        self._items_by_id.clear()
+        self._positions.clear()
+        self._values.clear()
+        self._ids_by_value.clear()
+        self._unsorted_values.clear()
+
+
+class FieldIndexes:
+    """Holds the field indexes of all database mappings."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._referring_types = {}
+
+    def find(self, db_map, item_type, field, value):
+        """Returns valid items of given type that have given value in given field.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+            item_type (str): item type
+            field (str): field name
+            value (Any): field value
+
+        Returns:
+            list of PublicItem: matching items
+        """
+        key = (item_type, field)
+        indexes = self._indexes.setdefault(db_map, {})
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = FieldIndex(db_map, item_type, field)
+        return index.find(value)
+
+    def handle_items_changed(self, item_type, db_map_data):
+        """Keeps indexes current after items have been added, updated or removed.
+
+        Indexes of the changed item type are updated in place unless the type refers to itself.
+        Indexes of types that refer to the changed type directly or indirectly are dropped
+        because their fields may be derived from the changed items. Other indexes are left untouched.
+
+        Args:
+            item_type (str): changed item type
+            db_map_data (dict): mapping from database mapping to list of changed items
+        """
+        for db_map, items in db_map_data.items():
+            indexes = self._indexes.get(db_map)
+            if not indexes:
+                continue
+            referring_types = self._types_referring_to(db_map, item_type)
+            for key in list(indexes):
+                if key[0] in referring_types:
+                    del indexes[key]
+                elif key[0] == item_type:
+                    indexes[key].update_items(items)
+
+    def _types_referring_to(self, db_map, item_type):
+        """Collects item types that refer to given type directly or through other types.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+            item_type (str): referred item type
+
+        Returns:
+            set of str: referring item types; includes ``item_type`` if it refers to itself
+        """
+        cache_key = (type(db_map), item_type)
+        referring_types = self._referring_types.get(cache_key)
+        if referring_types is not None:
+            return referring_types
+        ref_types = {type_: db_map.item_factory(type_).ref_types() for type_ in db_map.item_types()}
+        referring_types = set()
+        referred_types = [item_type]
+        while referred_types:
+            referred_type = referred_types.pop()
+            for type_, refs in ref_types.items():
+                if referred_type in refs and type_ not in referring_types:
+                    referring_types.add(type_)
+                    referred_types.append(type_)
+        self._referring_types[cache_key] = referring_types
+        return referring_types
+
+    def invalidate(self, db_map):
+        """Drops all indexes of given database mapping.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+        """
+        self._indexes.pop(db_map, None)
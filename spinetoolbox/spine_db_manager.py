@@ -11,8 +11,8 @@
 ######################################################################################################################
 
 """The SpineDBManager class."""
+from contextlib import contextmanager
 import os
-import json
 from PySide6.QtCore import Qt, QObject, Signal, Slot
 from PySide6.QtWidgets import QApplication, QMessageBox, QWidget
 from PySide6.QtGui import QWindow
@@ -22,11 +22,9 @@ from spinedb_api import (
     Asterisk,
     create_new_spine_database,
     DatabaseMapping,
-    export_data,
     from_database,
     get_data_for_import,
     IndexedValue,
-    import_data,
     is_empty,
     Map,
     ParameterValueFormatError,
@@ -38,12 +36,23 @@ from spinedb_api import (
     TimeSeriesVariableResolution,
     to_database,
 )
-from spinedb_api.parameter_value import deep_copy_value, load_db_value, dump_db_value
+from spinedb_api.parameter_value import deep_copy_value, load_db_value
 from spinedb_api.parameter_value import join_value_and_type, split_value_and_type
 from spinedb_api.helpers import remove_credentials_from_url
-from spinedb_api.spine_io.exporters.excel import export_spine_database_to_xlsx
 from .spine_db_icon_manager import SpineDBIconManager
-from .spine_db_worker import SpineDBWorker
+from .spine_db_worker import FetchSettings, SpineDBWorker
+from .spine_db_export import (
+    ExportCancelled,
+    ExportMonitor,
+    typed_items_from_data,
+    typed_items_from_db_maps,
+    write_excel,
+    write_json,
+    write_sqlite,
+)
+from .qthread_pool_executor import CancelledError, QtBasedThreadPoolExecutor, SynchronousExecutor
+from .spine_db_field_index import FieldIndexes
+from .spine_db_value_cache import MISSING, ValueCache
 from .spine_db_commands import (
     AgedUndoStack,
     AddItemsCommand,
@@ -63,6 +72,14 @@ def do_create_new_spine_database(url):
     create_new_spine_database(url)
 
 
+_VALUE_FIELDS = {
+    "parameter_value": ("value", "type"),
+    "list_value": ("value", "type"),
+    "parameter_definition": ("default_value", "default_type"),
+}
+_COMPLEX_TYPES = {"array": "Array", "time_series": "Time series", "time_pattern": "Time pattern", "map": "Map"}
+
+
 class SpineDBManager(QObject):
     """Class to manage DBs within a project."""
 
@@ -89,6 +106,25 @@ class SpineDBManager(QObject):
         str: item type, such as "object_class"
         dict: mapping DiffDatabaseMapping to list of updated dict-items.
     """
+    commit_progress = Signal(object, int, int)
+    """Emitted while a commit runs.
+
+    Args:
+        DatabaseMapping: mapping being committed
+        int: number of items written
+        int: total number of items to write
+    """
+    session_lock_changed = Signal(object, bool)
+    """Emitted when a database mapping becomes read-only for the duration of a commit, rollback or export
+    or writable again.
+
+    Args:
+        DatabaseMapping: database mapping
+        bool: True if mapping is read-only, False otherwise
+    """
+    _session_task_done = Signal(object, object)
+    _export_progressed = Signal(str, float)
+    _export_done = Signal(str, object)
 
     def __init__(self, settings, parent, synchronous=False):
         """Initializes the instance.
@@ -106,12 +142,28 @@ class SpineDBManager(QObject):
         self.undo_action = {}
         self.redo_action = {}
         self._icon_mngr = {}
+        self._field_indexes = FieldIndexes()
+        self._value_cache = ValueCache(self._value_cache_size())
         self._connect_signals()
         self._cmd_id = 0
+        self._grouped_cmd_id = None
         self._synchronous = synchronous
+        self._session_tasks = {}
+        self._exports = {}
+        self._export_locks = {}  # Maps db_map to the number of exports reading it
+        self._export_db_maps = {}  # Maps export file path to the db_maps the export reads
+        self._export_executor = SynchronousExecutor() if synchronous else QtBasedThreadPoolExecutor(max_workers=1)
 
     def _connect_signals(self):
         self.error_msg.connect(self.receive_error_msg)
+        self.items_added.connect(self._field_indexes.handle_items_changed)
+        self.items_updated.connect(self._field_indexes.handle_items_changed)
+        self.items_removed.connect(self._field_indexes.handle_items_changed)
+        self.items_updated.connect(self._value_cache.invalidate_items)
+        self.items_removed.connect(self._value_cache.invalidate_items)
+        self._session_task_done.connect(self._handle_session_task_done)
+        self._export_progressed.connect(self._report_export_progress)
+        self._export_done.connect(self._finish_export)
         qApp.aboutToQuit.connect(self.clean_up)  # pylint: disable=undefined-variable
 
     @Slot(object)
@@ -301,9 +353,13 @@ class SpineDBManager(QObject):
         Args:
             url (str)
         """
-        db_map = self._db_maps.pop(url, None)
+        db_map = self._db_maps.get(url)
         if db_map is None:
             return
+        self.wait_for_session_tasks(db_map)
+        del self._db_maps[url]
+        self._field_indexes.invalidate(db_map)
+        self._value_cache.invalidate_db_map(db_map)
         worker = self._workers.pop(db_map, None)
         if worker is not None:
             worker.close_db_map()  # NOTE: This calls ThreadPoolExecutor.shutdown() which waits for Futures to finish
@@ -375,7 +431,8 @@ class SpineDBManager(QObject):
         Returns:
             DiffDatabaseMapping
         """
-        worker = SpineDBWorker(self, url, synchronous=self._synchronous)
+        fetch_settings = self._fetch_settings()
+        worker = SpineDBWorker(self, url, synchronous=self._synchronous, fetch_settings=fetch_settings)
         try:
             db_map = worker.get_db_map(**kwargs)
         except Exception as error:
@@ -447,9 +504,11 @@ class SpineDBManager(QObject):
                 pass
         if dirty_db_maps:
             if commit_dirty:
-                failed_db_maps += self.commit_session(commit_msg, *dirty_db_maps)
+                self.commit_session(commit_msg, *dirty_db_maps)
+                failed_db_maps += self.wait_for_session_tasks(*dirty_db_maps)
             else:
                 self.rollback_session(*dirty_db_maps)
+                self.wait_for_session_tasks(*dirty_db_maps)
         # If some db maps failed to commit, reinstate their listeners
         for db_map in failed_db_maps:
             self.add_db_map_listener(db_map, listener)
@@ -506,11 +565,45 @@ class SpineDBManager(QObject):
         return [db_map for db_map in self.dirty(*db_maps) if not has_editors(db_map)]
 
     def clean_up(self):
+        for _, monitor, _ in self._exports.values():
+            monitor.cancel()
+        self._export_executor.shutdown()
         while self._workers:
             _, worker = self._workers.popitem()
             worker.clean_up()
         self.deleteLater()
 
+    def _fetch_settings(self):
+        """Returns fetch settings from app settings.
+
+        Returns:
+            FetchSettings: fetch settings
+        """
+        if self.qsettings is None:
+            return FetchSettings()
+        return FetchSettings.from_qsettings(self.qsettings)
+
+    def update_fetch_settings(self):
+        """Applies fetch settings from app settings to all open databases."""
+        fetch_settings = self._fetch_settings()
+        for worker in self._workers.values():
+            worker.set_fetch_settings(fetch_settings)
+
+    def _value_cache_size(self):
+        """Returns the memory budget of parsed value cache from app settings.
+
+        Returns:
+            int: budget in bytes
+        """
+        if self.qsettings is None:
+            return ValueCache().max_bytes
+        megabytes = int(self.qsettings.value("appSettings/valueCacheSize", defaultValue="256"))
+        return megabytes * 1024 * 1024
+
+    def update_value_cache_size(self):
+        """Applies parsed value cache budget from app settings."""
+        self._value_cache.set_max_bytes(self._value_cache_size())
+
     def refresh_session(self, *db_maps):
         refreshed_db_maps = set()
         for db_map in db_maps:
@@ -519,6 +612,8 @@ class SpineDBManager(QObject):
             except KeyError:
                 continue
             worker.refresh_session()
+            self._field_indexes.invalidate(db_map)
+            self._value_cache.invalidate_db_map(db_map)
             refreshed_db_maps.add(db_map)
         self.receive_session_refreshed(refreshed_db_maps)
 
@@ -529,61 +624,93 @@ class SpineDBManager(QObject):
             except KeyError:
                 continue
             worker.reset_session()
+            self._field_indexes.invalidate(db_map)
+            self._value_cache.invalidate_db_map(db_map)
             self.undo_stack[db_map].clear()
 
     def commit_session(self, commit_msg, *dirty_db_maps, cookie=None):
         """
-        Commits the current session.
+        Commits the current session in the background.
+
+        The database mappings are read-only until the commit finishes.
 
         Args:
             commit_msg (str): commit message for all database maps
             *dirty_db_maps: dirty database maps to commit
             cookie (object, optional): a free form identifier which will be forwarded to ``SpineDBWorker.commit_session``
+
+        Returns:
+            dict: mapping from database map to commit's future
         """
-        failed_db_maps = []
+        futures = {}
         for db_map in dirty_db_maps:
-            success = self._do_commit_session(db_map, commit_msg, cookie)
-            if not success:
-                failed_db_maps.append(db_map)
+            if not self._check_session_unlocked(db_map):
                 continue
-        return failed_db_maps
+            worker = self._get_worker(db_map)
+            future = worker.commit_session(
+                commit_msg, lambda written, total, db_map=db_map: self.commit_progress.emit(db_map, written, total)
+            )
+            futures[db_map] = future
+            self._start_session_task(
+                db_map, future, lambda future, db_map=db_map: self._finish_commit(db_map, future, cookie)
+            )
+        return futures
 
-    def _do_commit_session(self, db_map, commit_msg, cookie=None):
-        """Commits session for given db.
+    def _finish_commit(self, db_map, future, cookie):
+        """Finalizes a commit after the background thread is done.
 
         Args:
             db_map (DatabaseMapping): db map
-            commit_msg (str): commit message
+            future (QtBasedFuture): commit's future
             cookie (Any): a cookie to include in receive_session_committed call
 
         Returns:
-            bool
+            bool: True if commit was successful, False otherwise
         """
-        try:
-            transformations, info = db_map.commit_session(commit_msg, apply_compatibility_transforms=False)
-            self.undo_stack[db_map].setClean()
-            if info:
-                info = "".join(f"- {x}\n" for x in info)
-                QMessageBox.warning(
-                    QApplication.activeWindow(),
-                    "Your data needs to be refitted",
-                    f"Some of the data committed to the DB at '{db_map.db_url}' "
-                    "uses an old format and needs to be refitted. "
-                    f"The following transformations will be applied:\n\n{info}\n"
-                    "Afterwards, you can review the changes "
-                    "and either commit or rollback.",
-                    buttons=QMessageBox.StandardButton.Apply,
-                )
-                identifier = self.get_command_identifier()
-                for tablename, (items_to_add, items_to_update, ids_to_remove) in transformations:
-                    self.remove_items({db_map: {tablename: ids_to_remove}}, identifier=identifier)
-                    self.update_items(tablename, {db_map: items_to_update}, identifier=identifier)
-                    self.add_items(tablename, {db_map: items_to_add}, identifier=identifier)
-            self.receive_session_committed({db_map}, cookie)
-            return True
-        except SpineDBAPIError as err:
-            self.error_msg.emit({db_map: [err.msg]})
+        if future.cancelled():
+            return False
+        error = future.exception()
+        if isinstance(error, CancelledError):
+            return False
+        if isinstance(error, SpineDBAPIError):
+            self.error_msg.emit({db_map: [error.msg]})
+            return False
+        if error is not None:
+            raise error
+        transformations, info = future.result()
+        self.undo_stack[db_map].setClean()
+        if info:
+            info = "".join(f"- {x}\n" for x in info)
+            QMessageBox.warning(
+                QApplication.activeWindow(),
+                "Your data needs to be refitted",
+                f"Some of the data committed to the DB at '{db_map.db_url}' "
+                "uses an old format and needs to be refitted. "
+                f"The following transformations will be applied:\n\n{info}\n"
+                "Afterwards, you can review the changes "
+                "and either commit or rollback.",
+                buttons=QMessageBox.StandardButton.Apply,
+            )
+            identifier = self.get_command_identifier()
+            for tablename, (items_to_add, items_to_update, ids_to_remove) in transformations:
+                self.remove_items({db_map: {tablename: ids_to_remove}}, identifier=identifier)
+                self.update_items(tablename, {db_map: items_to_update}, identifier=identifier)
+                self.add_items(tablename, {db_map: items_to_add}, identifier=identifier)
+        self.receive_session_committed({db_map}, cookie)
+        return True
+
+    def cancel_commit(self, db_map):
+        """Cancels a running commit unless it has started writing to the database already.
+
+        Args:
+            db_map (DatabaseMapping): db map
+
+        Returns:
+            bool: True if commit was or will be cancelled, False otherwise
+        """
+        if db_map not in self._session_tasks:
             return False
+        return self._get_worker(db_map).cancel_commit()
 
     def notify_session_committed(self, cookie, *db_maps):
         """Notifies manager and listeners when a commit has taken place by a third party.
@@ -596,26 +723,150 @@ class SpineDBManager(QObject):
         self.receive_session_committed(set(db_maps), cookie)
 
     def rollback_session(self, *dirty_db_maps):
-        """Rolls back the current session.
+        """Rolls back the current session in the background.
+
+        The database mappings are read-only until the rollback finishes.
 
         Args:
             *dirty_db_maps: dirty database maps to commit
+
+        Returns:
+            dict: mapping from database map to rollback's future
         """
+        futures = {}
         for db_map in dirty_db_maps:
-            self._do_rollback_session(db_map)
+            if not self._check_session_unlocked(db_map):
+                continue
+            future = self._get_worker(db_map).rollback_session()
+            futures[db_map] = future
+            self._start_session_task(
+                db_map, future, lambda future, db_map=db_map: self._finish_rollback(db_map, future)
+            )
+        return futures
 
-    def _do_rollback_session(self, db_map):
-        """Rolls back session for given db.
+    def _finish_rollback(self, db_map, future):
+        """Finalizes a rollback after the background thread is done.
 
         Args:
             db_map (DatabaseMapping): db map
+            future (QtBasedFuture): rollback's future
+
+        Returns:
+            bool: True if rollback was successful, False otherwise
         """
+        error = future.exception()
+        if isinstance(error, SpineDBAPIError):
+            self.error_msg.emit({db_map: [error.msg]})
+            return False
+        if error is not None:
+            raise error
+        self._field_indexes.invalidate(db_map)
+        self._value_cache.invalidate_db_map(db_map)
+        self.undo_stack[db_map].clear()
+        self.receive_session_rolled_back({db_map})
+        return True
+
+    def is_session_locked(self, db_map):
+        """Checks if a commit or rollback is running on given database mapping.
+
+        Args:
+            db_map (DatabaseMapping): db map
+
+        Returns:
+            bool: True if mapping is read-only, False otherwise
+        """
+        return db_map in self._session_tasks
+
+    def is_read_only(self, db_map):
+        """Checks if database mapping cannot be modified because a commit, rollback or export is running.
+
+        Args:
+            db_map (DatabaseMapping): db map
+
+        Returns:
+            bool: True if mapping is read-only, False otherwise
+        """
+        return db_map in self._session_tasks or db_map in self._export_locks
+
+    def _check_session_unlocked(self, db_map):
+        """Emits an error message if database mapping is read-only.
+
+        Args:
+            db_map (DatabaseMapping): db map
+
+        Returns:
+            bool: True if mapping can be modified, False otherwise
+        """
+        if db_map in self._session_tasks:
+            message = "Database is read-only while a commit or rollback is in progress."
+        elif db_map in self._export_locks:
+            message = "Database is read-only while it is being exported."
+        else:
+            return True
+        self.error_msg.emit({db_map: [message]})
+        return False
+
+    def _start_session_task(self, db_map, future, finish):
+        """Locks database mapping until given commit or rollback has finished.
+
+        Args:
+            db_map (DatabaseMapping): db map
+            future (QtBasedFuture): task's future
+            finish (Callable): function to call with the future in the GUI thread once the task is done
+        """
+        self._session_tasks[db_map] = (future, finish)
+        self.session_lock_changed.emit(db_map, True)
+        future.add_done_callback(lambda future: self._session_task_done.emit(db_map, future))
+
+    @Slot(object, object)
+    def _handle_session_task_done(self, db_map, future):
+        """Finishes commit or rollback unless that has been done already by :meth:`wait_for_session_tasks`.
+
+        Args:
+            db_map (DatabaseMapping): db map
+            future (QtBasedFuture): task's future
+        """
+        task = self._session_tasks.get(db_map)
+        if task is None or task[0] is not future:
+            return
+        self._end_session_task(db_map)
+
+    def _end_session_task(self, db_map):
+        """Unlocks database mapping and finalizes the task.
+
+        Args:
+            db_map (DatabaseMapping): db map
+
+        Returns:
+            bool: True if task was successful, False otherwise
+        """
+        future, finish = self._session_tasks.pop(db_map)
         try:
-            db_map.rollback_session()
-            self.undo_stack[db_map].clear()
-            self.receive_session_rolled_back({db_map})
-        except SpineDBAPIError as err:
-            self.error_msg.emit({db_map: [err.msg]})
+            return finish(future)
+        finally:
+            self.session_lock_changed.emit(db_map, False)
+
+    def wait_for_session_tasks(self, *db_maps):
+        """Blocks until commits and rollbacks on given database mappings have finished.
+
+        Args:
+            *db_maps: database maps to wait for
+
+        Returns:
+            list of DatabaseMapping: mappings whose commit or rollback failed
+        """
+        failed_db_maps = []
+        for db_map in db_maps:
+            task = self._session_tasks.get(db_map)
+            if task is None:
+                continue
+            try:
+                task[0].exception()
+            except CancelledError:
+                pass
+            if not self._end_session_task(db_map):
+                failed_db_maps.append(db_map)
+        return failed_db_maps
 
     def entity_class_renderer(self, db_map, entity_class_id, for_group=False, color=None):
         """Returns an icon renderer for a given entity class.
@@ -696,7 +947,7 @@ class SpineDBManager(QObject):
         Returns:
             list
         """
-        return [x for x in self.get_items(db_map, item_type) if x.get(field) == value]
+        return self._field_indexes.find(db_map, item_type, field, value)
 
     def get_item_by_field(self, db_map, item_type, field, value):
         """Returns the first item of the given type in the given db map
@@ -778,18 +1029,41 @@ class SpineDBManager(QObject):
         item = self.get_item(db_map, item_type, id_)
         if not item:
             return None
-        value_field, type_field = {
-            "parameter_value": ("value", "type"),
-            "list_value": ("value", "type"),
-            "parameter_definition": ("default_value", "default_type"),
-        }[item_type]
-        list_value_id = id_ if item_type == "list_value" else item["list_value_id"]
-        complex_types = {"array": "Array", "time_series": "Time series", "time_pattern": "Time pattern", "map": "Map"}
-        if role == Qt.ItemDataRole.DisplayRole and item[type_field] in complex_types:
-            return self._format_list_value(db_map, item_type, complex_types[item[type_field]], list_value_id)
-        if role == Qt.ItemDataRole.EditRole:
-            return join_value_and_type(item[value_field], item[type_field])
-        return self._format_value(item["parsed_value"], role=role)
+        value_field, type_field = _VALUE_FIELDS[item_type]
+        type_ = item[type_field]
+        if role == Qt.ItemDataRole.DisplayRole and type_ in _COMPLEX_TYPES:
+            list_value_id = id_ if item_type == "list_value" else item["list_value_id"]
+            return self._format_list_value(db_map, item_type, _COMPLEX_TYPES[type_], list_value_id)
+        db_value = item[value_field]
+        item_key = (db_map, item_type, id_)
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.EditRole):
+            formatted = self._value_cache.get(item_key, (role, type_), db_value)
+            if formatted is not MISSING:
+                return formatted
+            if role == Qt.ItemDataRole.EditRole:
+                formatted = join_value_and_type(db_value, type_)
+            else:
+                formatted = self._format_value(self._cached_parsed_value(item_key, db_value, type_), role=role)
+            self._value_cache.put(item_key, (role, type_), db_value, formatted)
+            return formatted
+        return self._format_value(self._cached_parsed_value(item_key, db_value, type_), role=role)
+
+    def _cached_parsed_value(self, item_key, db_value, type_):
+        """Returns parsed value from cache parsing it if necessary.
+
+        Args:
+            item_key (tuple): db_map, item type and id of value's item
+            db_value (bytes): value's database representation
+            type_ (str): value's type
+
+        Returns:
+            Any: parsed value
+        """
+        parsed_value = self._value_cache.get(item_key, ("parsed", type_), db_value)
+        if parsed_value is MISSING:
+            parsed_value = self._parse_value(db_value, type_)
+            self._value_cache.put(item_key, ("parsed", type_), db_value, parsed_value)
+        return parsed_value
 
     def get_value_from_data(self, data, role=Qt.ItemDataRole.DisplayRole):
         """Returns the value or default value of a parameter directly from data.
@@ -856,18 +1130,40 @@ class SpineDBManager(QObject):
             index: The index to retrieve
             role (int, optional)
         """
-        parsed_value = self.get_value(db_map, item_type, id_, role=PARSED_ROLE)
-        if isinstance(parsed_value, IndexedValue):
-            parsed_value = parsed_value.get_value(index)
-        if role == Qt.ItemDataRole.EditRole:
-            return join_value_and_type(*to_database(parsed_value))
-        if role == Qt.ItemDataRole.DisplayRole:
-            return self.display_data_from_parsed(parsed_value)
-        if role == Qt.ItemDataRole.ToolTipRole:
-            return self.tool_tip_data_from_parsed(parsed_value)
+        if role not in (
+            Qt.ItemDataRole.EditRole,
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.ToolTipRole,
+            PARSED_ROLE,
+        ):
+            return None
+        item = self.get_item(db_map, item_type, id_)
+        if not item:
+            parsed_value = None
+        else:
+            value_field, type_field = _VALUE_FIELDS[item_type]
+            db_value = item[value_field]
+            type_ = item[type_field]
+            item_key = (db_map, item_type, id_)
+            if role != PARSED_ROLE:
+                formatted = self._value_cache.get(item_key, (index, role, type_), db_value)
+                if formatted is not MISSING:
+                    return formatted
+            parsed_value = self._cached_parsed_value(item_key, db_value, type_)
+            if isinstance(parsed_value, IndexedValue):
+                # IndexedValue keeps an index-to-position lookup table which lives as long as the cached value.
+                parsed_value = parsed_value.get_value(index)
         if role == PARSED_ROLE:
             return parsed_value
-        return None
+        if role == Qt.ItemDataRole.EditRole:
+            formatted = join_value_and_type(*to_database(parsed_value))
+        elif role == Qt.ItemDataRole.DisplayRole:
+            formatted = self.display_data_from_parsed(parsed_value)
+        else:
+            formatted = self.tool_tip_data_from_parsed(parsed_value)
+        if item:
+            self._value_cache.put(item_key, (index, role, type_), db_value, formatted)
+        return formatted
 
     def get_value_list_item(self, db_map, id_, index, role=Qt.ItemDataRole.DisplayRole):
         """Returns one value item of a parameter_value_list.
@@ -1286,6 +1582,8 @@ class SpineDBManager(QObject):
         if identifier is None:
             identifier = self.get_command_identifier()
         for db_map, data in db_map_data.items():
+            if not self._check_session_unlocked(db_map):
+                continue
             self.undo_stack[db_map].push(
                 AddItemsCommand(self, db_map, item_type, data, identifier=identifier, **kwargs)
             )
@@ -1295,6 +1593,8 @@ class SpineDBManager(QObject):
         if identifier is None:
             identifier = self.get_command_identifier()
         for db_map, data in db_map_data.items():
+            if not self._check_session_unlocked(db_map):
+                continue
             self.undo_stack[db_map].push(
                 UpdateItemsCommand(self, db_map, item_type, data, identifier=identifier, **kwargs)
             )
@@ -1304,6 +1604,8 @@ class SpineDBManager(QObject):
         if identifier is None:
             identifier = self.get_command_identifier()
         for db_map, data in db_map_data.items():
+            if not self._check_session_unlocked(db_map):
+                continue
             self.undo_stack[db_map].push(
                 AddUpdateItemsCommand(self, db_map, item_type, data, identifier=identifier, **kwargs)
             )
@@ -1313,17 +1615,38 @@ class SpineDBManager(QObject):
         if identifier is None:
             identifier = self.get_command_identifier()
         for db_map, ids_per_type in db_map_typed_ids.items():
+            if not self._check_session_unlocked(db_map):
+                continue
             for item_type, ids in ids_per_type.items():
                 self.undo_stack[db_map].push(
                     RemoveItemsCommand(self, db_map, item_type, ids, identifier=identifier, **kwargs)
                 )
 
     def get_command_identifier(self):
+        if self._grouped_cmd_id is not None:
+            return self._grouped_cmd_id
         try:
             return self._cmd_id
         finally:
             self._cmd_id += 1
 
+    @contextmanager
+    def command_group(self):
+        """Returns a context manager that gives all commands pushed within it the same identifier
+        so they merge into a single undo step on each database's undo stack.
+
+        Returns:
+            ContextManager: command group
+        """
+        if self._grouped_cmd_id is not None:
+            yield
+            return
+        self._grouped_cmd_id = self.get_command_identifier()
+        try:
+            yield
+        finally:
+            self._grouped_cmd_id = None
+
     @busy_effect
     def do_add_items(self, db_map, item_type, data, check=True):
         try:
@@ -1416,45 +1739,50 @@ class SpineDBManager(QObject):
         """Finds and returns cascading parameter definitions or values for the given entity_class ids."""
         db_map_cascading_data = dict()
         for db_map, entity_class_ids in db_map_ids.items():
-            for item in self.get_items(db_map, item_type):
-                if item["entity_class_id"] in entity_class_ids:
-                    db_map_cascading_data.setdefault(db_map, []).append(item)
+            for entity_class_id in entity_class_ids:
+                items = self.get_items_by_field(db_map, item_type, "entity_class_id", entity_class_id)
+                if items:
+                    db_map_cascading_data.setdefault(db_map, []).extend(items)
         return db_map_cascading_data
 
     def find_cascading_parameter_values_by_entity(self, db_map_ids):
         """Finds and returns cascading parameter values for the given entity ids."""
         db_map_cascading_data = dict()
         for db_map, entity_ids in db_map_ids.items():
-            for item in self.get_items(db_map, "parameter_value"):
-                if item["entity_id"] in entity_ids:
-                    db_map_cascading_data.setdefault(db_map, []).append(item)
+            for entity_id in entity_ids:
+                items = self.get_items_by_field(db_map, "parameter_value", "entity_id", entity_id)
+                if items:
+                    db_map_cascading_data.setdefault(db_map, []).extend(items)
         return db_map_cascading_data
 
     def find_cascading_parameter_values_by_definition(self, db_map_ids):
         """Finds and returns cascading parameter values for the given parameter_definition ids."""
         db_map_cascading_data = dict()
         for db_map, param_def_ids in db_map_ids.items():
-            for item in self.get_items(db_map, "parameter_value"):
-                if item["parameter_id"] in param_def_ids:
-                    db_map_cascading_data.setdefault(db_map, []).append(item)
+            for param_def_id in param_def_ids:
+                items = self.get_items_by_field(db_map, "parameter_value", "parameter_id", param_def_id)
+                if items:
+                    db_map_cascading_data.setdefault(db_map, []).extend(items)
         return db_map_cascading_data
 
     def find_cascading_scenario_alternatives_by_scenario(self, db_map_ids):
         """Finds and returns cascading scenario alternatives for the given scenario ids."""
         db_map_cascading_data = dict()
         for db_map, ids in db_map_ids.items():
-            for item in self.get_items(db_map, "scenario_alternative"):
-                if item["scenario_id"] in ids:
-                    db_map_cascading_data.setdefault(db_map, []).append(item)
+            for id_ in ids:
+                items = self.get_items_by_field(db_map, "scenario_alternative", "scenario_id", id_)
+                if items:
+                    db_map_cascading_data.setdefault(db_map, []).extend(items)
         return db_map_cascading_data
 
     def find_groups_by_entity(self, db_map_ids):
         """Finds and returns groups for the given entity ids."""
         db_map_group_data = dict()
         for db_map, entity_ids in db_map_ids.items():
-            for item in self.get_items(db_map, "entity_group"):
-                if item["entity_id"] in entity_ids:
-                    db_map_group_data.setdefault(db_map, []).append(item)
+            for entity_id in entity_ids:
+                items = self.get_items_by_field(db_map, "entity_group", "entity_id", entity_id)
+                if items:
+                    db_map_group_data.setdefault(db_map, []).extend(items)
         return db_map_group_data
 
     def duplicate_scenario(self, scen_data, dup_name, db_map):
@@ -1516,23 +1844,42 @@ class SpineDBManager(QObject):
             dup_import_data[db_map]["entity_alternatives"] = dup_entity_alternative_import_data
         self.import_data(dup_import_data, command_text="Duplicate entity")
 
-    def _get_data_for_export(self, db_map_item_ids):
-        data = {}
-        for db_map, item_ids in db_map_item_ids.items():
-            for key, items in export_data(db_map, parse_value=load_db_value, **item_ids).items():
-                data.setdefault(key, []).extend(items)
-        return data
-
     def export_data(self, caller, db_map_item_ids, file_path, file_filter):
-        data = self._get_data_for_export(db_map_item_ids)
+        """Exports items into a file in the background.
+
+        Items are read and written one item type at a time.
+        The database mappings are read-only until the export finishes.
+        Progress is reported through caller's ``file_exported`` signal.
+
+        Args:
+            caller (SpineDBEditor): export's initiator
+            db_map_item_ids (dict): mapping from database map to keyword arguments for ``spinedb_api.export_data()``
+            file_path (str): path to output file
+            file_filter (str): file filter selected in the file dialog
+
+        Returns:
+            QtBasedFuture: export's future or None if export could not be started
+        """
         if file_filter.startswith("JSON"):
-            self.export_to_json(file_path, data, caller)
+            write_file, is_sqlite = write_json, False
         elif file_filter.startswith("SQLite"):
-            self.export_to_sqlite(file_path, data, caller)
+            write_file, is_sqlite = write_sqlite, True
         elif file_filter.startswith("Excel"):
-            self.export_to_excel(file_path, data, caller)
+            write_file, is_sqlite = write_excel, False
         else:
             raise ValueError()
+        if any(db_map in self._session_tasks for db_map in db_map_item_ids):
+            file_name = os.path.split(file_path)[1]
+            caller.msg_error.emit(
+                f"Unable to export file <b>{file_name}</b>: a commit or rollback is in progress. Try again later."
+            )
+            return None
+        typed_items = typed_items_from_db_maps(
+            db_map_item_ids, load_db_value, query_hold=lambda db_map: self._get_worker(db_map).queries_on_hold()
+        )
+        return self._start_export(
+            caller, file_path, write_file, typed_items, is_sqlite, self._export_executor, list(db_map_item_ids)
+        )
 
     def _is_url_available(self, url, logger):
         if str(url) in self.db_urls:
@@ -1543,67 +1890,191 @@ class SpineDBManager(QObject):
 
     def export_to_sqlite(self, file_path, data_for_export, caller):
         """Exports given data into SQLite file."""
-        url = URL("sqlite", database=file_path)
-        if not self._is_url_available(url, caller):
-            return
-        create_new_spine_database(url)
-        db_map = DatabaseMapping(url)
-        import_data(db_map, **data_for_export)
-        try:
-            db_map.commit_session("Export data from Spine Toolbox.")
-        except SpineDBAPIError as err:
-            error_msg = f"[SpineDBAPIError] Unable to export file <b>{db_map.codename}</b>: {err.msg}"
-            caller.msg_error.emit(error_msg)
-        else:
-            caller.file_exported.emit(file_path, 1.0, True)
-        finally:
-            db_map.close()
+        self._start_export(caller, file_path, write_sqlite, typed_items_from_data(data_for_export), True)
 
-    @staticmethod
-    def export_to_json(file_path, data_for_export, caller):
+    def export_to_json(self, file_path, data_for_export, caller):
         """Exports given data into JSON file."""
-        json_data = json.dumps(data_for_export, indent=4)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(json_data)
-        caller.file_exported.emit(file_path, 1.0, False)
+        self._start_export(caller, file_path, write_json, typed_items_from_data(data_for_export), False)
 
-    @staticmethod
-    def export_to_excel(file_path, data_for_export, caller):
+    def export_to_excel(self, file_path, data_for_export, caller):
         """Exports given data into Excel file."""
-        # NOTE: We import data into an in-memory Spine db and then export that to excel.
-        url = URL("sqlite", database="")
-        with DatabaseMapping(url, create=True) as db_map:
-            count, errors = import_data(db_map, **data_for_export, unparse_value=dump_db_value)
-            file_name = os.path.split(file_path)[1]
-            if errors:
-                error_msg = (
-                    f"Unable to export file <b>{file_name}</b>."
-                    f"Failed to copy the data to temporary database: <p>{errors}</p>"
-                )
-                caller.msg_error.emit(error_msg)
-                return
-            if count > 0:
-                db_map.commit_session("Added data for exporting.")
+        self._start_export(caller, file_path, write_excel, typed_items_from_data(data_for_export), False)
+
+    def _start_export(self, caller, file_path, write_file, typed_items, is_sqlite, executor=None, read_db_maps=()):
+        """Starts writing items into a file.
+
+        Args:
+            caller (SpineDBEditor): export's initiator
+            file_path (str): path to output file
+            write_file (Callable): writer function from :mod:`spine_db_export`
+            typed_items (list of tuple): item sources
+            is_sqlite (bool): True if output file is a Spine database
+            executor (QtBasedThreadPoolExecutor or SynchronousExecutor, optional): executor to run the export;
+                if None, the export runs synchronously
+            read_db_maps (Iterable of DatabaseMapping): mappings that the export reads; they are locked until
+                the export finishes
+
+        Returns:
+            QtBasedFuture: export's future or None if export could not be started
+        """
+        file_name = os.path.split(file_path)[1]
+        if file_path in self._exports:
+            caller.msg_error.emit(f"Unable to export file <b>{file_name}</b>: the file is being exported already.")
+            return None
+        if is_sqlite and not self._is_url_available(URL("sqlite", database=file_path), caller):
+            return None
+        try:
             if os.path.exists(file_path):
                 os.remove(file_path)
-            try:
-                export_spine_database_to_xlsx(db_map, file_path)
-            except PermissionError:
-                error_msg = f"Unable to export file <b>{file_name}</b>.<br/>Close the file in Excel and try again."
-                caller.msg_error.emit(error_msg)
-            except OSError:
-                error_msg = f"[OSError] Unable to export file <b>{file_name}</b>."
-                caller.msg_error.emit(error_msg)
-            else:
-                caller.file_exported.emit(file_path, 1.0, False)
+        except PermissionError:
+            caller.msg_error.emit(f"Unable to export file <b>{file_name}</b>.<br/>Close the file and try again.")
+            return None
+        except OSError:
+            caller.msg_error.emit(f"[OSError] Unable to export file <b>{file_name}</b>.")
+            return None
+        monitor = ExportMonitor(lambda progress: self._export_progressed.emit(file_path, progress))
+        self._exports[file_path] = (caller, monitor, is_sqlite)
+        caller.file_exported.emit(file_path, 0.0, is_sqlite)
+        if executor is None:
+            executor = SynchronousExecutor()
+        self._lock_for_export(file_path, read_db_maps)
+        future = executor.submit(write_file, file_path, typed_items, monitor)
+        future.add_done_callback(lambda future: self._export_done.emit(file_path, future))
+        return future
+
+    def _lock_for_export(self, file_path, db_maps):
+        """Makes database mappings read-only while an export reads them.
+
+        Args:
+            file_path (str): path to output file
+            db_maps (Iterable of DatabaseMapping): mappings to lock
+        """
+        db_maps = list(db_maps)
+        self._export_db_maps[file_path] = db_maps
+        for db_map in db_maps:
+            count = self._export_locks.get(db_map, 0)
+            self._export_locks[db_map] = count + 1
+            if count == 0:
+                self.session_lock_changed.emit(db_map, True)
+
+    def _unlock_after_export(self, file_path):
+        """Makes database mappings that an export has read writable again.
+
+        Args:
+            file_path (str): path to output file
+        """
+        for db_map in self._export_db_maps.pop(file_path, ()):
+            count = self._export_locks[db_map] - 1
+            if count:
+                self._export_locks[db_map] = count
+                continue
+            del self._export_locks[db_map]
+            self.session_lock_changed.emit(db_map, False)
+
+    def cancel_export(self, file_path):
+        """Cancels an export.
+
+        Args:
+            file_path (str): path to output file
+
+        Returns:
+            bool: True if an export was running, False otherwise
+        """
+        export = self._exports.get(file_path)
+        if export is None:
+            return False
+        export[1].cancel()
+        return True
+
+    def is_exporting(self, file_path):
+        """Checks if a file is being exported.
+
+        Args:
+            file_path (str): path to output file
+
+        Returns:
+            bool: True if the file is being exported, False otherwise
+        """
+        return file_path in self._exports
+
+    @Slot(str, float)
+    def _report_export_progress(self, file_path, progress):
+        export = self._exports.get(file_path)
+        if export is None or progress == 1.0:
+            return
+        caller, _, is_sqlite = export
+        caller.file_exported.emit(file_path, progress, is_sqlite)
+
+    @Slot(str, object)
+    def _finish_export(self, file_path, future):
+        """Reports the outcome of an export and removes the file if export failed or was cancelled.
+
+        Args:
+            file_path (str): path to output file
+            future (QtBasedFuture): export's future
+        """
+        caller, _, is_sqlite = self._exports.pop(file_path)
+        self._unlock_after_export(file_path)
+        file_name = os.path.split(file_path)[1]
+        error_msg = None
+        try:
+            errors = future.result()
+        except (ExportCancelled, CancelledError):
+            caller.msg.emit(f"Export of file <b>{file_name}</b> cancelled.")
+        except SpineDBAPIError as err:
+            error_msg = f"[SpineDBAPIError] Unable to export file <b>{file_name}</b>: {err.msg}"
+        except PermissionError:
+            error_msg = f"Unable to export file <b>{file_name}</b>.<br/>Close the file in Excel and try again."
+        except OSError:
+            error_msg = f"[OSError] Unable to export file <b>{file_name}</b>."
+        else:
+            if not errors or is_sqlite:
+                caller.file_exported.emit(file_path, 1.0, is_sqlite)
+                return
+            error_msg = (
+                f"Unable to export file <b>{file_name}</b>."
+                f"Failed to copy the data to temporary database: <p>{errors}</p>"
+            )
+        if error_msg is not None:
+            caller.msg_error.emit(error_msg)
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        caller.file_export_aborted.emit(file_path)
+
+    def fetch_commits(self, db_map, before_id, limit):
+        """Queries a page of commits from given database in the background.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+            before_id (int, optional): query commits older than the commit with this id; None starts from the newest
+            limit (int): maximum number of commits to query
+
+        Returns:
+            QtBasedFuture: future that resolves to a list of commit dicts, newest first
+        """
+        try:
+            worker = self._get_worker(db_map)
+        except KeyError:
+            return SynchronousExecutor().submit(list)
+        return worker.fetch_commits(before_id, limit)
 
     def get_items_for_commit(self, db_map, commit_id):
+        """Resolves the items that were last modified by given commit in the background.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+            commit_id (int): commit id
+
+        Returns:
+            QtBasedFuture: future that resolves to a dict mapping item type to list of item ids
+        """
         try:
             worker = self._get_worker(db_map)
         except KeyError:
-            return {}
-        worker.fetch_all()
-        return worker.commit_cache.get(commit_id, {})
+            return SynchronousExecutor().submit(dict)
+        return worker.get_items_for_commit(commit_id)
 
     @staticmethod
     def get_all_multi_spine_db_editors():
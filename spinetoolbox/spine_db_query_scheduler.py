@@ -0,0 +1,173 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""The QueryScheduler class."""
+from contextlib import contextmanager
+import heapq
+import itertools
+from PySide6.QtCore import QMutex, QMutexLocker, QWaitCondition
+from .qthread_pool_executor import QtBasedFuture
+
+
+class QueryScheduler:
+    """Runs queries against a single database on an executor in priority order.
+
+    At most a given number of queries run at the same time; the rest wait in a priority queue.
+    A query can be given a key, e.g. its item type, which allows raising the priority of the query
+    while it is still waiting. Cancelling the future of a waiting query removes the query from the queue.
+    """
+
+    def __init__(self, executor, max_concurrent):
+        """
+        Args:
+            executor (QtBasedThreadPoolExecutor or SynchronousExecutor): executor that runs the queries
+            max_concurrent (int): maximum number of queries to run simultaneously
+        """
+        self._executor = executor
+        self._max_concurrent = max(1, max_concurrent)
+        self._mutex = QMutex()
+        self._idle = QWaitCondition()
+        self._queue = []
+        self._waiting_by_key = {}
+        self._counter = itertools.count()
+        self._running = 0
+        self._hold_count = 0
+
+    @property
+    def max_concurrent(self):
+        return self._max_concurrent
+
+    def set_max_concurrent(self, max_concurrent):
+        """Sets the maximum number of simultaneous queries.
+
+        Args:
+            max_concurrent (int): maximum number of queries to run simultaneously
+        """
+        with QMutexLocker(self._mutex):
+            self._max_concurrent = max(1, max_concurrent)
+        self._dispatch()
+
+    def submit(self, priority, key, fn, *args, **kwargs):
+        """Schedules a query.
+
+        Args:
+            priority (int): query priority; queries with smaller values run first
+            key (Hashable, optional): key that identifies the query for :meth:`raise_priority`
+            fn (Callable): function that runs the query
+            *args: positional arguments to ``fn``
+            **kwargs: keyword arguments to ``fn``
+
+        Returns:
+            QtBasedFuture: future that resolves to the result of ``fn``
+        """
+        future = QtBasedFuture()
+        with QMutexLocker(self._mutex):
+            entry = [priority, next(self._counter), key, (future, fn, args, kwargs)]
+            heapq.heappush(self._queue, entry)
+            if key is not None:
+                self._waiting_by_key[key] = entry
+        self._dispatch()
+        return future
+
+    def raise_priority(self, key, priority):
+        """Raises the priority of a waiting query. Does nothing if the query has started already
+        or has a higher priority than the given one.
+
+        Args:
+            key (Hashable): query key
+            priority (int): new priority
+        """
+        with QMutexLocker(self._mutex):
+            entry = self._waiting_by_key.get(key)
+            if entry is None or entry[0] <= priority:
+                return
+            task = entry[-1]
+            entry[-1] = None
+            new_entry = [priority, next(self._counter), key, task]
+            heapq.heappush(self._queue, new_entry)
+            self._waiting_by_key[key] = new_entry
+
+    def is_waiting(self, key):
+        """Checks if query with given key is waiting to be run.
+
+        Args:
+            key (Hashable): query key
+
+        Returns:
+            bool: True if query is in the queue, False otherwise
+        """
+        with QMutexLocker(self._mutex):
+            entry = self._waiting_by_key.get(key)
+            return entry is not None and not entry[-1][0].cancelled()
+
+    @contextmanager
+    def hold(self):
+        """A context manager that keeps waiting queries from starting and blocks until running queries have finished.
+
+        Useful for operations that need to lock the database, such as commits.
+        """
+        with QMutexLocker(self._mutex):
+            self._hold_count += 1
+            while self._running > 0:
+                self._idle.wait(self._mutex)
+        try:
+            yield
+        finally:
+            with QMutexLocker(self._mutex):
+                self._hold_count -= 1
+            self._dispatch()
+
+    def _take_ready_tasks(self):
+        """Pops as many tasks from the queue as are allowed to run.
+
+        Returns:
+            list of tuple: tasks to run
+        """
+        ready = []
+        with QMutexLocker(self._mutex):
+            while self._hold_count == 0 and self._running < self._max_concurrent and self._queue:
+                entry = heapq.heappop(self._queue)
+                task = entry[-1]
+                if task is None:
+                    continue
+                key = entry[2]
+                if key is not None and self._waiting_by_key.get(key) is entry:
+                    del self._waiting_by_key[key]
+                if task[0].cancelled():
+                    continue
+                self._running += 1
+                ready.append(task)
+        return ready
+
+    def _dispatch(self):
+        for task in self._take_ready_tasks():
+            self._executor.submit(self._run, *task)
+
+    def _run(self, future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            self._finish()
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            self._finish()
+            future.set_exception(error)
+            return
+        self._finish()
+        future.set_result(result)
+
+    def _finish(self):
+        with QMutexLocker(self._mutex):
+            self._running -= 1
+            if self._running == 0:
+                self._idle.wakeAll()
+        self._dispatch()
@@ -0,0 +1,178 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a memory limited cache for parsed parameter values and their formatted representations."""
+from collections import OrderedDict
+import sys
+import numpy as np
+from spinedb_api.parameter_value import IndexedValue
+
+VALUE_ITEM_TYPES = ("parameter_value", "parameter_definition", "list_value")
+MISSING = object()
+"""Returned by :meth:`ValueCache.get` when the cache has no valid entry for a key."""
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value):
+    """Estimates the memory footprint of a parsed value or its formatted representation.
+
+    Args:
+        value (Any): value
+
+    Returns:
+        int: approximate size in bytes
+    """
+    if isinstance(value, IndexedValue):
+        return sys.getsizeof(value) + estimate_size(value.indexes) + estimate_size(value.values)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + sum(estimate_size(x) for x in value)
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(x) for x in value)
+    return sys.getsizeof(value)
+
+
+class ValueCache:
+    """A least-recently-used cache with a memory budget.
+
+    Entries are grouped by the database item they were computed from,
+    keyed by ``(db_map, item_type, id)`` plus a subkey that tells the entries of a single item apart.
+    Each entry also records a version, e.g. the raw database value it was computed from;
+    a lookup with a different version is a miss.
+    """
+
+    def __init__(self, max_bytes=_DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes (int): memory budget in bytes; 0 disables caching
+        """
+        self._max_bytes = max(0, max_bytes)
+        self._entries = OrderedDict()
+        self._subkeys_by_item = {}
+        self._total_bytes = 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set_max_bytes(self, max_bytes):
+        """Sets the memory budget evicting entries if necessary.
+
+        Args:
+            max_bytes (int): memory budget in bytes; 0 disables caching
+        """
+        self._max_bytes = max(0, max_bytes)
+        self._evict()
+
+    def get(self, item_key, subkey, version):
+        """Returns a cached value.
+
+        Args:
+            item_key (tuple): (db_map, item_type, id)
+            subkey (Hashable): entry's key within the item
+            version (Any): expected version; compared by identity
+
+        Returns:
+            Any: cached value or :data:`MISSING`
+        """
+        key = (item_key, subkey)
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry[0] is not version:
+            self._remove(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, item_key, subkey, version, value, size=None):
+        """Stores a value in the cache.
+
+        Args:
+            item_key (tuple): (db_map, item_type, id)
+            subkey (Hashable): entry's key within the item
+            version (Any): version of the item the value was computed from
+            value (Any): value to cache
+            size (int, optional): value's size in bytes; estimated if not given
+        """
+        if self._max_bytes == 0:
+            return
+        if size is None:
+            size = estimate_size(value)
+        if size > self._max_bytes:
+            return
+        key = (item_key, subkey)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (version, value, size)
+        self._subkeys_by_item.setdefault(item_key, set()).add(subkey)
+        self._total_bytes += size
+        self._evict()
+
+    def invalidate_item(self, item_key):
+        """Drops all entries of given item.
+
+        Args:
+            item_key (tuple): (db_map, item_type, id)
+        """
+        for subkey in self._subkeys_by_item.pop(item_key, ()):
+            _, _, size = self._entries.pop((item_key, subkey))
+            self._total_bytes -= size
+
+    def invalidate_items(self, item_type, db_map_data):
+        """Drops entries of updated or removed items.
+
+        Args:
+            item_type (str): item type
+            db_map_data (dict): mapping from database mapping to list of items
+        """
+        if item_type not in VALUE_ITEM_TYPES:
+            return
+        for db_map, items in db_map_data.items():
+            for item in items:
+                self.invalidate_item((db_map, item_type, item["id"]))
+
+    def invalidate_db_map(self, db_map):
+        """Drops all entries of given database mapping.
+
+        Args:
+            db_map (DatabaseMapping): database mapping
+        """
+        for item_key in [key for key in self._subkeys_by_item if key[0] is db_map]:
+            self.invalidate_item(item_key)
+
+    def clear(self):
+        """Drops all entries."""
+        self._entries.clear()
+        self._subkeys_by_item.clear()
+        self._total_bytes = 0
+
+    def _remove(self, key):
+        item_key, subkey = key
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+        subkeys = self._subkeys_by_item[item_key]
+        subkeys.discard(subkey)
+        if not subkeys:
+            del self._subkeys_by_item[item_key]
+
+    def _evict(self):
+        while self._total_bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
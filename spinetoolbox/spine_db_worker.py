@@ -11,33 +11,319 @@
 ######################################################################################################################
 
 """The SpineDBWorker class."""
-from PySide6.QtCore import QObject, Signal, Slot
+import sys
+import time
+from PySide6.QtCore import QMutex, QMutexLocker, QObject, Signal, Slot
 from PySide6.QtCore import QTimer
+from sqlalchemy.exc import OperationalError
 from spinedb_api import Asterisk, DatabaseMapping
-from .qthread_pool_executor import QtBasedThreadPoolExecutor, SynchronousExecutor
+from spinedb_api.temp_id import resolve
+from .fetch_parent import FetchPriority
+from .qthread_pool_executor import CancelledError, QtBasedThreadPoolExecutor, SynchronousExecutor
+from .spine_db_query_scheduler import QueryScheduler
 from .helpers import busy_effect
 
+_INITIAL_CHUNK_SIZE = 10000
+_MAX_CHUNK_BYTES = 64 * 1024 * 1024
+_MAX_CHUNK_GROWTH = 4.0
+_RATE_SMOOTHING = 0.5
+_ROW_WIDTH_SAMPLE_SIZE = 16
+_SQLITE_TIMEOUT = 2
+_SQLITE_QUERY_TIME_LIMIT = _SQLITE_TIMEOUT / 4
+_LOCKED_QUERY_RETRIES = 5
+
+
+class FetchSettings:
+    """Tuning knobs for fetching items from the DB in chunks."""
+
+    def __init__(
+        self,
+        target_time=0.2,
+        min_chunk_size=1000,
+        max_chunk_size=200000,
+        prefetch=True,
+        initial_chunk_size=_INITIAL_CHUNK_SIZE,
+        max_concurrent_queries=4,
+    ):
+        """
+        Args:
+            target_time (float): how long a single chunk query should take, in seconds
+            min_chunk_size (int): minimum number of rows per chunk
+            max_chunk_size (int): maximum number of rows per chunk
+            prefetch (bool): if True, the next chunk is queried in the background while the current one is consumed
+            initial_chunk_size (int): number of rows in the first chunk before anything has been measured
+            max_concurrent_queries (int): maximum number of item types to query simultaneously
+        """
+        self.target_time = target_time
+        self.min_chunk_size = max(1, min_chunk_size)
+        self.max_chunk_size = max(self.min_chunk_size, max_chunk_size)
+        self.prefetch = prefetch
+        self.initial_chunk_size = max(1, initial_chunk_size)
+        self.max_concurrent_queries = max(1, max_concurrent_queries)
+
+    @classmethod
+    def from_qsettings(cls, qsettings):
+        """Reads fetch settings from app settings.
+
+        Args:
+            qsettings (QSettings): Toolbox settings
+
+        Returns:
+            FetchSettings: fetch settings
+        """
+        target_time = int(qsettings.value("appSettings/dbFetchTargetTime", defaultValue="200")) / 1000
+        min_chunk_size = int(qsettings.value("appSettings/dbFetchMinChunkSize", defaultValue="1000"))
+        max_chunk_size = int(qsettings.value("appSettings/dbFetchMaxChunkSize", defaultValue="200000"))
+        prefetch = qsettings.value("appSettings/dbFetchPrefetch", defaultValue="true") == "true"
+        max_concurrent_queries = int(qsettings.value("appSettings/dbMaxConcurrentQueries", defaultValue="4"))
+        return cls(target_time, min_chunk_size, max_chunk_size, prefetch, max_concurrent_queries=max_concurrent_queries)
 
-_CHUNK_SIZE = 10000
+
+class ChunkSizer:
+    """Computes the size of the next chunk to query for an item type
+    from the measured query throughput and row width of earlier chunks."""
+
+    def __init__(self, settings, time_limit=None):
+        """
+        Args:
+            settings (FetchSettings): fetch settings
+            time_limit (float, optional): upper limit for target query duration in seconds
+        """
+        self.settings = settings
+        self._time_limit = time_limit
+        self._size = settings.initial_chunk_size
+        self._rows_per_second = None
+        self._bytes_per_row = None
+
+    @property
+    def size(self):
+        """Number of rows to query in the next chunk."""
+        return self._size
+
+    def update(self, row_count, elapsed, bytes_per_row):
+        """Updates chunk size from the measurements of the latest query.
+
+        Args:
+            row_count (int): number of rows the query returned
+            elapsed (float): query duration in seconds
+            bytes_per_row (float): estimated memory footprint of a row in bytes
+        """
+        if row_count == 0 or elapsed <= 0.0:
+            return
+        rows_per_second = row_count / elapsed
+        if self._rows_per_second is None:
+            self._rows_per_second = rows_per_second
+        else:
+            self._rows_per_second += _RATE_SMOOTHING * (rows_per_second - self._rows_per_second)
+        if bytes_per_row > 0:
+            self._bytes_per_row = bytes_per_row
+        target_time = self.settings.target_time
+        if self._time_limit is not None:
+            target_time = min(target_time, self._time_limit)
+        size = target_time * self._rows_per_second
+        if self._bytes_per_row is not None:
+            size = min(size, _MAX_CHUNK_BYTES / self._bytes_per_row)
+        size = min(size, _MAX_CHUNK_GROWTH * self._size)
+        self._size = int(min(max(size, self.settings.min_chunk_size), self.settings.max_chunk_size))
+
+
+def _estimate_row_width(items):
+    """Estimates the memory footprint of fetched items from a sample.
+
+    Args:
+        items (list of PublicItem): fetched items
+
+    Returns:
+        float: average bytes per item
+    """
+    if not items:
+        return 0.0
+    step = max(1, len(items) // _ROW_WIDTH_SAMPLE_SIZE)
+    sample = items[::step]
+    total = 0
+    for item in sample:
+        total += sum(sys.getsizeof(value) for value in item._asdict().values())
+    return total / len(sample)
+
+
+class CommitProgress:
+    """Tracks a commit running in a worker thread and allows cancelling it until writing begins."""
+
+    def __init__(self, report=None):
+        """
+        Args:
+            report (Callable, optional): called with the number of written items and the total number of items;
+                may be called from a non-GUI thread
+        """
+        self._mutex = QMutex()
+        self._report = report
+        self._cancel_requested = False
+        self._writing = False
+        self._table_sizes = {}
+        self._written = 0
+        self._total = 0
+
+    def request_cancel(self):
+        """Requests the commit to be cancelled.
+
+        Returns:
+            bool: True if commit will be cancelled, False if it is too late
+        """
+        with QMutexLocker(self._mutex):
+            if self._writing:
+                return False
+            self._cancel_requested = True
+            return True
+
+    def begin_writing(self, dirty_items):
+        """Marks the point after which the commit cannot be cancelled.
+
+        Args:
+            dirty_items (list of tuple): dirty items as returned by ``DatabaseMapping._dirty_items()``
+
+        Raises:
+            CancelledError: raised if cancel has been requested
+        """
+        with QMutexLocker(self._mutex):
+            if self._cancel_requested:
+                raise CancelledError()
+            self._writing = True
+        self._table_sizes = {
+            item_type: len(to_add) + len(to_update) + len(to_remove)
+            for item_type, (to_add, to_update, to_remove) in dirty_items
+        }
+        self._total = sum(self._table_sizes.values())
+        self._notify()
+
+    def table_written(self, item_type):
+        """Records that all items of given type have been written.
+
+        Args:
+            item_type (str): item type
+        """
+        self._written += self._table_sizes.pop(item_type, 0)
+        self._notify()
+
+    def _notify(self):
+        if self._report is not None:
+            self._report(self._written, self._total)
+
+
+class _KeysetDatabaseMapping(DatabaseMapping):
+    """A database mapping that can page through tables by id instead of by row offset.
+
+    Offset pagination makes the DB skip over all preceding rows for every chunk
+    so late chunks get progressively slower; filtering by id does not.
+
+    The mapping can also report commit progress.
+    """
+
+    _commit_progress = None
+
+    def commit_session_with_progress(self, comment, progress):
+        """Commits session reporting progress to given tracker.
+
+        Args:
+            comment (str): commit message
+            progress (CommitProgress): progress tracker
+
+        Returns:
+            tuple(list, list): compatibility transformations
+        """
+        self._commit_progress = progress
+        try:
+            return self.commit_session(comment, apply_compatibility_transforms=False)
+        finally:
+            self._commit_progress = None
+
+    def _dirty_items(self):
+        dirty_items = super()._dirty_items()
+        if self._commit_progress is not None and dirty_items:
+            self._commit_progress.begin_writing(dirty_items)
+        return dirty_items
+
+    def _do_add_items(self, connection, tablename, *items_to_add):
+        super()._do_add_items(connection, tablename, *items_to_add)
+        if self._commit_progress is not None:
+            self._commit_progress.table_written(tablename)
+
+    def _get_next_chunk(self, item_type, offset, limit, after_id=None, **kwargs):
+        if after_id is None or not limit:
+            return super()._get_next_chunk(item_type, offset, limit, **kwargs)
+        qry = self._make_query(item_type, **kwargs)
+        if not qry:
+            return []
+        id_column = self._make_sq(item_type).c.id
+        return [dict(x) for x in qry.filter(id_column > after_id).order_by(id_column).limit(limit)]
+
+    def get_commit_page(self, before_id, limit):
+        """Queries commits from the DB newest first.
+
+        Args:
+            before_id (int, optional): query commits with ids less than this; if None, start from the newest commit
+            limit (int): maximum number of commits to query
+
+        Returns:
+            list of dict: commits
+        """
+        if self.closed:
+            return []
+        id_column = self._make_sq("commit").c.id
+        qry = self.query(self._make_sq("commit"))
+        if before_id is not None:
+            qry = qry.filter(id_column < before_id)
+        return [dict(x) for x in qry.order_by(id_column.desc()).limit(limit)]
+
+    def fetch_items_for_commit(self, commit_id):
+        """Fetches the items that were last modified by given commit into the mapping.
+
+        Only the rows with matching ``commit_id`` are queried.
+
+        Args:
+            commit_id (int): commit id
+
+        Returns:
+            dict: mapping from item type to list of item ids
+        """
+        items_by_type = {}
+        for item_type in self.item_types():
+            if self.closed:
+                break
+            if "commit_id" not in self._make_sq(item_type).c:
+                continue
+            items = self.do_fetch_more(item_type, offset=0, limit=None, commit_id=commit_id)
+            if items:
+                items_by_type[item_type] = [item["id"] for item in items]
+        return items_by_type
 
 
 class SpineDBWorker(QObject):
     """Does all the communication with a certain DB for SpineDBManager, in a non-GUI thread."""
 
     _query_advanced = Signal(object)
+    _query_failed = Signal(object)
 
-    def __init__(self, db_mngr, db_url, synchronous=False):
+    def __init__(self, db_mngr, db_url, synchronous=False, fetch_settings=None):
         super().__init__()
         self._db_mngr = db_mngr
         self._db_url = db_url
         self._db_map = None
         self._executor = (SynchronousExecutor if synchronous else QtBasedThreadPoolExecutor)()
         self._parents_by_type = {}
-        self.commit_cache = {}
+        self._commit_items = {}
         self._parents_fetching = {}
-        self._offsets = {}
+        self._query_futures = {}
+        self._fetch_settings = fetch_settings if fetch_settings is not None else FetchSettings()
+        self._scheduler = QueryScheduler(self._executor, self._fetch_settings.max_concurrent_queries)
+        self._chunk_sizers = {}
+        self._last_fetched_ids = {}
+        self._fetched_row_counts = {}
+        self._last_chunk_sizes = {}
         self._fetched_item_types = set()
+        self._commit_future = None
+        self._commit_progress = None
         self._query_advanced.connect(self._fetch_more_later)
+        self._query_failed.connect(self._release_parents)
 
     def _get_parents(self, item_type):
         parents = self._parents_by_type.get(item_type, set())
@@ -51,9 +337,31 @@ class SpineDBWorker(QObject):
         self.deleteLater()
 
     def get_db_map(self, *args, **kwargs):
-        self._db_map = DatabaseMapping(self._db_url, *args, sqlite_timeout=2, **kwargs)
+        self._db_map = _KeysetDatabaseMapping(self._db_url, *args, sqlite_timeout=_SQLITE_TIMEOUT, **kwargs)
         return self._db_map
 
+    def _is_sqlite(self):
+        return self._db_map.sa_url.drivername.startswith("sqlite")
+
+    def set_fetch_settings(self, fetch_settings):
+        """Sets new fetch settings. Chunk sizing starts over with the next query.
+
+        Args:
+            fetch_settings (FetchSettings): fetch settings
+        """
+        self._fetch_settings = fetch_settings
+        self._chunk_sizers.clear()
+        self._scheduler.set_max_concurrent(fetch_settings.max_concurrent_queries)
+
+    def queries_on_hold(self):
+        """Returns a context manager that keeps new queries from starting
+        and waits for the running ones to finish.
+
+        Returns:
+            ContextManager: query hold
+        """
+        return self._scheduler.hold()
+
     def register_fetch_parent(self, parent):
         """Registers the given parent.
 
@@ -61,7 +369,10 @@ class SpineDBWorker(QObject):
             parent (FetchParent): parent to add
         """
         parents = self._parents_by_type.setdefault(parent.fetch_item_type, set())
+        if parent in parents:
+            return
         parents.add(parent)
+        parent.obsoleted.connect(self._cancel_obsolete_queries)
 
     @busy_effect
     def _iterate_mapping(self, parent):
@@ -141,6 +452,7 @@ class SpineDBWorker(QObject):
         if not self._db_map.has_external_commits() or fully_fetched:
             if self._iterate_mapping(parent):
                 # Something fetched from mapping
+                self._prefetch_if_needed(parent)
                 return
         if fully_fetched:
             # Nothing left in the DB
@@ -149,10 +461,52 @@ class SpineDBWorker(QObject):
         # Query the DB
         if item_type in self._parents_fetching:
             self._parents_fetching[item_type].add(parent)
+            self._scheduler.raise_priority(item_type, parent.priority)
             return
         self._parents_fetching[item_type] = {parent}
-        callback = lambda future: self._handle_query_advanced(item_type, future.result())
-        self._executor.submit(self._busy_db_map_fetch_more, item_type).add_done_callback(callback)
+        self._submit_query(item_type, parent.priority)
+
+    def _submit_query(self, item_type, priority):
+        """Queries the next chunk of given item type in the background.
+
+        Args:
+            item_type (str): item type to query
+            priority (FetchPriority): query priority
+        """
+        future = self._scheduler.submit(priority, item_type, self._busy_db_map_fetch_more, item_type)
+        self._query_futures[item_type] = future
+        future.add_done_callback(lambda future: self._handle_query_done(item_type, future))
+
+    @Slot()
+    def _cancel_obsolete_queries(self):
+        """Cancels waiting queries that have been made on behalf of obsolete parents only."""
+        for item_type, parents in list(self._parents_fetching.items()):
+            if not parents or not all(parent.is_obsolete for parent in parents):
+                continue
+            future = self._query_futures.get(item_type)
+            if future is not None:
+                future.cancel()
+
+    def _prefetch_if_needed(self, parent):
+        """Starts querying the next chunk if parent has started consuming the last chunk in the mapping.
+
+        Args:
+            parent (FetchParent): fetch parent
+        """
+        item_type = parent.fetch_item_type
+        if (
+            not self._fetch_settings.prefetch
+            or item_type in self._fetched_item_types
+            or item_type in self._parents_fetching
+            or item_type not in self._fetched_row_counts
+        ):
+            return
+        consumer = parent.index if parent.index is not None else parent
+        last_chunk_start = self._fetched_row_counts[item_type] - self._last_chunk_sizes[item_type]
+        if consumer.position(self._db_map) < last_chunk_start:
+            return
+        self._parents_fetching[item_type] = set()
+        self._submit_query(item_type, FetchPriority.PREFETCH)
 
     @Slot(object)
     def _fetch_more_later(self, parents):
@@ -161,30 +515,115 @@ class SpineDBWorker(QObject):
 
     @busy_effect
     def _busy_db_map_fetch_more(self, item_type):
-        offset = self._offsets.setdefault(item_type, 0)
-        chunk = self._db_map.fetch_more(item_type, limit=_CHUNK_SIZE, offset=offset)
-        if len(chunk) < _CHUNK_SIZE:
+        sizer = self._chunk_sizers.get(item_type)
+        if sizer is None:
+            time_limit = _SQLITE_QUERY_TIME_LIMIT if self._is_sqlite() else None
+            sizer = self._chunk_sizers[item_type] = ChunkSizer(self._fetch_settings, time_limit)
+        chunk_size = sizer.size
+        after_id = self._last_fetched_ids.get(item_type, 0)
+        start = time.perf_counter()
+        chunk = self._fetch_chunk(item_type, chunk_size, after_id)
+        elapsed = time.perf_counter() - start
+        if len(chunk) < chunk_size:
             self._fetched_item_types.add(item_type)
-        self._offsets[item_type] += len(chunk)
+        last_id = resolve(chunk[-1]["id"]) if chunk else None
+        if last_id is not None:
+            self._last_fetched_ids[item_type] = last_id
+        sizer.update(len(chunk), elapsed, _estimate_row_width(chunk))
+        self._fetched_row_counts[item_type] = self._fetched_row_counts.get(item_type, 0) + len(chunk)
+        self._last_chunk_sizes[item_type] = len(chunk)
         return chunk
 
+    def _fetch_chunk(self, item_type, chunk_size, after_id):
+        """Fetches a chunk of items from the DB.
+        Retries if an SQLite database is locked by another connection longer than the lock timeout.
+
+        Args:
+            item_type (str): item type to fetch
+            chunk_size (int): maximum number of items to fetch
+            after_id (int): fetch items with ids greater than this
+
+        Returns:
+            list of PublicItem: fetched items
+        """
+        for retry in range(_LOCKED_QUERY_RETRIES + 1):
+            try:
+                return self._db_map.fetch_more(item_type, limit=chunk_size, after_id=after_id)
+            except OperationalError as error:
+                if retry == _LOCKED_QUERY_RETRIES or not self._is_sqlite() or "locked" not in str(error):
+                    raise
+        return []
+
+    def _handle_query_done(self, item_type, future):
+        """Handles a finished or cancelled query.
+
+        Args:
+            item_type (str): queried item type
+            future (QtBasedFuture): query's future
+        """
+        if self._query_futures.get(item_type) is future:
+            del self._query_futures[item_type]
+        if future.cancelled():
+            self._parents_fetching.pop(item_type, None)
+            return
+        error = future.exception()
+        if error is not None:
+            parents = self._parents_fetching.pop(item_type, ())
+            self._db_mngr.error_msg.emit({self._db_map: [f"Failed to fetch {item_type} items: {error}"]})
+            if parents:
+                self._query_failed.emit(parents)
+            return
+        self._handle_query_advanced(item_type, future.result())
+
+    @Slot(object)
+    def _release_parents(self, parents):
+        for parent in parents:
+            parent.set_busy(False)
+
     def _handle_query_advanced(self, item_type, chunk):
-        self._populate_commit_cache(item_type, chunk)
         self._db_mngr.update_icons(self._db_map, item_type, chunk)
         parents = self._parents_fetching.pop(item_type, ())
         if parents and not self._db_map.closed:
             self._query_advanced.emit(parents)
 
-    def _populate_commit_cache(self, item_type, items):
-        if item_type == "commit":
-            return
-        for item in items:
-            commit_id = item.get("commit_id")
-            if commit_id is not None:
-                self.commit_cache.setdefault(commit_id, {}).setdefault(item_type, []).append(item["id"])
+    def fetch_commits(self, before_id, limit):
+        """Queries a page of commits in a background thread.
+
+        Args:
+            before_id (int, optional): query commits older than the commit with this id
+            limit (int): maximum number of commits to query
+
+        Returns:
+            QtBasedFuture: future that resolves to a list of commits, newest first
+        """
+        return self._executor.submit(self._db_map.get_commit_page, before_id, limit)
+
+    def get_items_for_commit(self, commit_id):
+        """Resolves the items last modified by given commit in a background thread.
+
+        Results are cached until the session is committed or refreshed.
+
+        Args:
+            commit_id (int): commit id
 
-    def fetch_all(self):
-        self._db_map.fetch_all()
+        Returns:
+            QtBasedFuture: future that resolves to a dict mapping item type to list of item ids
+        """
+        item_ids = self._commit_items.get(commit_id)
+        if item_ids is not None:
+            return SynchronousExecutor().submit(lambda: item_ids)
+        return self._executor.submit(self._do_get_items_for_commit, commit_id)
+
+    def _do_get_items_for_commit(self, commit_id):
+        for retry in range(_LOCKED_QUERY_RETRIES + 1):
+            try:
+                item_ids = self._db_map.fetch_items_for_commit(commit_id)
+                break
+            except OperationalError as error:
+                if retry == _LOCKED_QUERY_RETRIES or not self._is_sqlite() or "locked" not in str(error):
+                    raise
+        self._commit_items[commit_id] = item_ids
+        return item_ids
 
     def close_db_map(self):
         # FIXME: maybe check if self._db_map.closed is True in self._do_fetch_more instead?
@@ -288,11 +727,60 @@ class SpineDBWorker(QObject):
         for parent_type in self._parents_by_type:
             for parent in self._get_parents(parent_type):
                 parent.reset()
-        self._offsets.clear()
+        self._chunk_sizers.clear()
+        self._commit_items.clear()
+        self._last_fetched_ids.clear()
+        self._fetched_row_counts.clear()
+        self._last_chunk_sizes.clear()
         self._fetched_item_types.clear()
         self._parents_fetching.clear()
+        self._query_futures.clear()
 
     def reset_session(self):
         """Resets session."""
         self._db_map.reset()
         self.refresh_session()
+
+    def commit_session(self, commit_msg, report_progress=None):
+        """Commits session in a background thread.
+
+        Args:
+            commit_msg (str): commit message
+            report_progress (Callable, optional): called with the number of written items and the total number
+                of items; called from the background thread
+
+        Returns:
+            QtBasedFuture: future that resolves to compatibility transformations
+        """
+        self._commit_progress = CommitProgress(report_progress)
+        self._commit_future = self._executor.submit(self._do_commit_session, commit_msg, self._commit_progress)
+        return self._commit_future
+
+    def _do_commit_session(self, commit_msg, progress):
+        with self.queries_on_hold():
+            transformations = self._db_map.commit_session_with_progress(commit_msg, progress)
+        # Committed items now belong to the new commit.
+        self._commit_items.clear()
+        return transformations
+
+    def cancel_commit(self):
+        """Cancels a running commit unless it has started writing to the database already.
+
+        Returns:
+            bool: True if commit was or will be cancelled, False otherwise
+        """
+        if self._commit_future is None or self._commit_future.done():
+            return False
+        return self._commit_future.cancel() or self._commit_progress.request_cancel()
+
+    def rollback_session(self):
+        """Rolls back session in a background thread.
+
+        Returns:
+            QtBasedFuture: future that resolves when rollback has finished
+        """
+        return self._executor.submit(self._do_rollback_session)
+
+    def _do_rollback_session(self):
+        with self.queries_on_hold():
+            self._db_map.rollback_session()
@@ -12,10 +12,11 @@
 
 """Contains SpineEngineWorker."""
 import copy
-from PySide6.QtCore import Signal, Slot, QObject, QThread
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QThread
 from spine_engine.exception import EngineInitFailed, RemoteEngineInitFailed
 from spine_engine.spine_engine import ItemExecutionFinishState, SpineEngineState
 from .widgets.options_dialog import OptionsDialog
+from .helpers import format_log_message
 from .spine_engine_manager import make_engine_manager, LocalSpineEngineManager
 
 
@@ -98,7 +99,7 @@ class SpineEngineWorker(QObject):
     _flash_arrived = Signal(object)
     _all_items_failed = Signal(list)
 
-    def __init__(self, engine_data, dag, dag_identifier, project_items, connections, logger, job_id):
+    def __init__(self, engine_data, dag, dag_identifier, project_items, connections, logger, job_id, log_batcher=None):
         """
         Args:
             engine_data (dict): engine data
@@ -108,6 +109,7 @@ class SpineEngineWorker(QObject):
             connections (dict): mapping from jump name to :class:`LoggingConnection` or :class:`LoggingJump`
             logger (LoggerInterface): a logger
             job_id (str): Job id for remote execution
+            log_batcher (LogMessageBatcher, optional): if given, log messages are sent to items in batches
         """
         super().__init__()
         self._engine_data = engine_data
@@ -121,6 +123,7 @@ class SpineEngineWorker(QObject):
         self._project_items = project_items
         self._connections = connections
         self._logger = logger
+        self._log_batcher = log_batcher
         self.event_messages = {}
         self.process_messages = {}
         self.successful_executions = []
@@ -162,9 +165,24 @@ class SpineEngineWorker(QObject):
     def _handle_process_message_arrived_silent(self, item, filter_id, msg_type, msg_text):
         self.process_messages.setdefault(msg_type, []).append(msg_text)
 
+    @Slot(object, str, str, str)
+    def _queue_event_message(self, item, filter_id, msg_type, msg_text):
+        self._log_batcher.put(item, filter_id, format_log_message(msg_type, msg_text), msg_type, msg_text)
+
+    @Slot(object, str, str, str)
+    def _queue_process_message(self, item, filter_id, msg_type, msg_text):
+        self._log_batcher.put(
+            item, filter_id, format_log_message(msg_type, msg_text, show_datetime=False), msg_type, msg_text
+        )
+
     def stop_engine(self):
         self._engine_mngr.stop_engine()
 
+    def cancel(self):
+        """Finishes a worker that was never started as if it was stopped by the user."""
+        self._engine_final_state = str(SpineEngineState.USER_STOPPED)
+        self.finished.emit()
+
     def engine_final_state(self):
         return self._engine_final_state
 
@@ -180,8 +198,13 @@ class SpineEngineWorker(QObject):
         self._dag_execution_started.connect(_handle_dag_execution_started)
         self._node_execution_started.connect(_handle_node_execution_started)
         self._node_execution_finished.connect(_handle_node_execution_finished)
-        self._event_message_arrived.connect(_handle_event_message_arrived)
-        self._process_message_arrived.connect(_handle_process_message_arrived)
+        if self._log_batcher is not None:
+            # Messages are formatted in the worker thread and rendered by the batcher in time slices.
+            self._event_message_arrived.connect(self._queue_event_message, Qt.ConnectionType.DirectConnection)
+            self._process_message_arrived.connect(self._queue_process_message, Qt.ConnectionType.DirectConnection)
+        else:
+            self._event_message_arrived.connect(_handle_event_message_arrived)
+            self._process_message_arrived.connect(_handle_process_message_arrived)
         self._prompt_arrived.connect(_handle_prompt_arrived)
         self._flash_arrived.connect(_handle_flash_arrived)
 
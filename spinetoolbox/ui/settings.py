@@ -751,6 +751,98 @@ class Ui_SettingsForm(object):
 
         self.verticalLayout_9.addWidget(self.groupBox_entity_graph)
 
+        self.groupBox_db_fetching = QGroupBox(self.SpineDBEditor)
+        self.groupBox_db_fetching.setObjectName(u"groupBox_db_fetching")
+        self.gridLayout_db_fetching = QGridLayout(self.groupBox_db_fetching)
+        self.gridLayout_db_fetching.setObjectName(u"gridLayout_db_fetching")
+        self.checkBox_fetch_prefetch = QCheckBox(self.groupBox_db_fetching)
+        self.checkBox_fetch_prefetch.setObjectName(u"checkBox_fetch_prefetch")
+
+        self.gridLayout_db_fetching.addWidget(self.checkBox_fetch_prefetch, 0, 0, 1, 2)
+
+        self.label_fetch_target_time = QLabel(self.groupBox_db_fetching)
+        self.label_fetch_target_time.setObjectName(u"label_fetch_target_time")
+        sizePolicy8.setHeightForWidth(self.label_fetch_target_time.sizePolicy().hasHeightForWidth())
+        self.label_fetch_target_time.setSizePolicy(sizePolicy8)
+
+        self.gridLayout_db_fetching.addWidget(self.label_fetch_target_time, 1, 0, 1, 1)
+
+        self.spinBox_fetch_target_time = QSpinBox(self.groupBox_db_fetching)
+        self.spinBox_fetch_target_time.setObjectName(u"spinBox_fetch_target_time")
+        self.spinBox_fetch_target_time.setMinimum(10)
+        self.spinBox_fetch_target_time.setMaximum(10000)
+        self.spinBox_fetch_target_time.setSingleStep(10)
+        self.spinBox_fetch_target_time.setValue(200)
+
+        self.gridLayout_db_fetching.addWidget(self.spinBox_fetch_target_time, 1, 1, 1, 1)
+
+        self.label_fetch_min_chunk_size = QLabel(self.groupBox_db_fetching)
+        self.label_fetch_min_chunk_size.setObjectName(u"label_fetch_min_chunk_size")
+
+        self.gridLayout_db_fetching.addWidget(self.label_fetch_min_chunk_size, 2, 0, 1, 1)
+
+        self.spinBox_fetch_min_chunk_size = QSpinBox(self.groupBox_db_fetching)
+        self.spinBox_fetch_min_chunk_size.setObjectName(u"spinBox_fetch_min_chunk_size")
+        self.spinBox_fetch_min_chunk_size.setMinimum(100)
+        self.spinBox_fetch_min_chunk_size.setMaximum(1000000)
+        self.spinBox_fetch_min_chunk_size.setSingleStep(100)
+        self.spinBox_fetch_min_chunk_size.setValue(1000)
+
+        self.gridLayout_db_fetching.addWidget(self.spinBox_fetch_min_chunk_size, 2, 1, 1, 1)
+
+        self.label_fetch_max_chunk_size = QLabel(self.groupBox_db_fetching)
+        self.label_fetch_max_chunk_size.setObjectName(u"label_fetch_max_chunk_size")
+
+        self.gridLayout_db_fetching.addWidget(self.label_fetch_max_chunk_size, 3, 0, 1, 1)
+
+        self.spinBox_fetch_max_chunk_size = QSpinBox(self.groupBox_db_fetching)
+        self.spinBox_fetch_max_chunk_size.setObjectName(u"spinBox_fetch_max_chunk_size")
+        self.spinBox_fetch_max_chunk_size.setMinimum(100)
+        self.spinBox_fetch_max_chunk_size.setMaximum(10000000)
+        self.spinBox_fetch_max_chunk_size.setSingleStep(1000)
+        self.spinBox_fetch_max_chunk_size.setValue(200000)
+
+        self.gridLayout_db_fetching.addWidget(self.spinBox_fetch_max_chunk_size, 3, 1, 1, 1)
+
+        self.label_fetch_max_concurrent_queries = QLabel(self.groupBox_db_fetching)
+        self.label_fetch_max_concurrent_queries.setObjectName(u"label_fetch_max_concurrent_queries")
+
+        self.gridLayout_db_fetching.addWidget(self.label_fetch_max_concurrent_queries, 4, 0, 1, 1)
+
+        self.spinBox_fetch_max_concurrent_queries = QSpinBox(self.groupBox_db_fetching)
+        self.spinBox_fetch_max_concurrent_queries.setObjectName(u"spinBox_fetch_max_concurrent_queries")
+        self.spinBox_fetch_max_concurrent_queries.setMinimum(1)
+        self.spinBox_fetch_max_concurrent_queries.setMaximum(32)
+        self.spinBox_fetch_max_concurrent_queries.setValue(4)
+
+        self.gridLayout_db_fetching.addWidget(self.spinBox_fetch_max_concurrent_queries, 4, 1, 1, 1)
+
+
+        self.verticalLayout_9.addWidget(self.groupBox_db_fetching)
+
+        self.groupBox_db_value_cache = QGroupBox(self.SpineDBEditor)
+        self.groupBox_db_value_cache.setObjectName(u"groupBox_db_value_cache")
+        self.gridLayout_db_value_cache = QGridLayout(self.groupBox_db_value_cache)
+        self.gridLayout_db_value_cache.setObjectName(u"gridLayout_db_value_cache")
+        self.label_value_cache_size = QLabel(self.groupBox_db_value_cache)
+        self.label_value_cache_size.setObjectName(u"label_value_cache_size")
+        sizePolicy8.setHeightForWidth(self.label_value_cache_size.sizePolicy().hasHeightForWidth())
+        self.label_value_cache_size.setSizePolicy(sizePolicy8)
+
+        self.gridLayout_db_value_cache.addWidget(self.label_value_cache_size, 0, 0, 1, 1)
+
+        self.spinBox_value_cache_size = QSpinBox(self.groupBox_db_value_cache)
+        self.spinBox_value_cache_size.setObjectName(u"spinBox_value_cache_size")
+        self.spinBox_value_cache_size.setMinimum(0)
+        self.spinBox_value_cache_size.setMaximum(65536)
+        self.spinBox_value_cache_size.setSingleStep(64)
+        self.spinBox_value_cache_size.setValue(256)
+
+        self.gridLayout_db_value_cache.addWidget(self.spinBox_value_cache_size, 0, 1, 1, 1)
+
+
+        self.verticalLayout_9.addWidget(self.groupBox_db_value_cache)
+
         self.verticalSpacer_9 = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
 
         self.verticalLayout_9.addItem(self.verticalSpacer_9)
@@ -873,6 +965,28 @@ class Ui_SettingsForm(object):
 
         self.verticalLayout_19.addWidget(self.persistent_process_limits_group_box)
 
+        self.concurrent_dags_group_box = QGroupBox(self.Engine)
+        self.concurrent_dags_group_box.setObjectName(u"concurrent_dags_group_box")
+        self.horizontalLayout_concurrent_dags = QHBoxLayout(self.concurrent_dags_group_box)
+        self.horizontalLayout_concurrent_dags.setObjectName(u"horizontalLayout_concurrent_dags")
+        self.max_concurrent_dags_label = QLabel(self.concurrent_dags_group_box)
+        self.max_concurrent_dags_label.setObjectName(u"max_concurrent_dags_label")
+
+        self.horizontalLayout_concurrent_dags.addWidget(self.max_concurrent_dags_label)
+
+        self.max_concurrent_dags_spin_box = QSpinBox(self.concurrent_dags_group_box)
+        self.max_concurrent_dags_spin_box.setObjectName(u"max_concurrent_dags_spin_box")
+        self.max_concurrent_dags_spin_box.setMaximum(1024)
+
+        self.horizontalLayout_concurrent_dags.addWidget(self.max_concurrent_dags_spin_box)
+
+        self.horizontalSpacer_concurrent_dags = QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum)
+
+        self.horizontalLayout_concurrent_dags.addItem(self.horizontalSpacer_concurrent_dags)
+
+
+        self.verticalLayout_19.addWidget(self.concurrent_dags_group_box)
+
         self.groupBox_4 = QGroupBox(self.Engine)
         self.groupBox_4.setObjectName(u"groupBox_4")
         self.verticalLayout_18 = QVBoxLayout(self.groupBox_4)
@@ -1028,7 +1142,8 @@ class Ui_SettingsForm(object):
         QWidget.setTabOrder(self.unlimited_persistent_process_radio_button, self.automatic_persistent_process_limit_radio_button)
         QWidget.setTabOrder(self.automatic_persistent_process_limit_radio_button, self.user_defined_persistent_process_limit_radio_button)
         QWidget.setTabOrder(self.user_defined_persistent_process_limit_radio_button, self.persistent_process_limit_spin_box)
-        QWidget.setTabOrder(self.persistent_process_limit_spin_box, self.checkBox_enable_remote_exec)
+        QWidget.setTabOrder(self.persistent_process_limit_spin_box, self.max_concurrent_dags_spin_box)
+        QWidget.setTabOrder(self.max_concurrent_dags_spin_box, self.checkBox_enable_remote_exec)
         QWidget.setTabOrder(self.checkBox_enable_remote_exec, self.lineEdit_host)
         QWidget.setTabOrder(self.lineEdit_host, self.spinBox_port)
         QWidget.setTabOrder(self.spinBox_port, self.comboBox_security)
@@ -1245,6 +1360,28 @@ class Ui_SettingsForm(object):
         self.checkBox_snap_entities.setText(QCoreApplication.translate("SettingsForm", u"Snap entities to grid", None))
         self.checkBox_merge_dbs.setText(QCoreApplication.translate("SettingsForm", u"Merge databases", None))
         self.label_3.setText(QCoreApplication.translate("SettingsForm", u"Max. entity dimension count", None))
+        self.groupBox_db_fetching.setTitle(QCoreApplication.translate("SettingsForm", u"Fetching", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_fetch_prefetch.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>When checked, the next chunk of items is queried from the database in the background while the current one is being shown.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_fetch_prefetch.setText(QCoreApplication.translate("SettingsForm", u"Prefetch in background", None))
+        self.label_fetch_target_time.setText(QCoreApplication.translate("SettingsForm", u"Target query duration", None))
+#if QT_CONFIG(tooltip)
+        self.spinBox_fetch_target_time.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Chunk sizes are adjusted so that querying a single chunk takes roughly this long.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.spinBox_fetch_target_time.setSuffix(QCoreApplication.translate("SettingsForm", u" ms", None))
+        self.label_fetch_min_chunk_size.setText(QCoreApplication.translate("SettingsForm", u"Min. chunk size (rows)", None))
+        self.label_fetch_max_chunk_size.setText(QCoreApplication.translate("SettingsForm", u"Max. chunk size (rows)", None))
+        self.label_fetch_max_concurrent_queries.setText(QCoreApplication.translate("SettingsForm", u"Max. concurrent queries", None))
+#if QT_CONFIG(tooltip)
+        self.spinBox_fetch_max_concurrent_queries.setToolTip(QCoreApplication.translate("SettingsForm", u"Maximum number of item types fetched simultaneously from a single database", None))
+#endif // QT_CONFIG(tooltip)
+        self.groupBox_db_value_cache.setTitle(QCoreApplication.translate("SettingsForm", u"Value cache", None))
+        self.label_value_cache_size.setText(QCoreApplication.translate("SettingsForm", u"Memory limit", None))
+#if QT_CONFIG(tooltip)
+        self.spinBox_value_cache_size.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Maximum memory used to cache parsed parameter values and their formatted representations. Set to 0 to disable caching.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.spinBox_value_cache_size.setSuffix(QCoreApplication.translate("SettingsForm", u" MB", None))
         self.groupBox.setTitle(QCoreApplication.translate("SettingsForm", u"Specification editors", None))
 #if QT_CONFIG(tooltip)
         self.checkBox_save_spec_before_closing.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Unchecked: Don't save specification and don't show message box</p><p>Partially checked: Show message box (default)</p><p>Checked: Save specification and don't show message box</p></body></html>", None))
@@ -1265,6 +1402,12 @@ class Ui_SettingsForm(object):
         self.user_defined_persistent_process_limit_radio_button.setToolTip(QCoreApplication.translate("SettingsForm", u"Kills console processes randomly if limit is exceeded.", None))
 #endif // QT_CONFIG(tooltip)
         self.user_defined_persistent_process_limit_radio_button.setText(QCoreApplication.translate("SettingsForm", u"User defined limit:", None))
+        self.concurrent_dags_group_box.setTitle(QCoreApplication.translate("SettingsForm", u"Concurrent DAG executions", None))
+        self.max_concurrent_dags_label.setText(QCoreApplication.translate("SettingsForm", u"Maximum number of DAGs executing at once:", None))
+#if QT_CONFIG(tooltip)
+        self.max_concurrent_dags_spin_box.setToolTip(QCoreApplication.translate("SettingsForm", u"Independent DAGs beyond this number wait until a running DAG finishes.", None))
+#endif // QT_CONFIG(tooltip)
+        self.max_concurrent_dags_spin_box.setSpecialValueText(QCoreApplication.translate("SettingsForm", u"Unlimited", None))
         self.groupBox_4.setTitle(QCoreApplication.translate("SettingsForm", u"Remote execution", None))
         self.checkBox_enable_remote_exec.setText(QCoreApplication.translate("SettingsForm", u"Enabled", None))
         self.label_12.setText(QCoreApplication.translate("SettingsForm", u"Security", None))
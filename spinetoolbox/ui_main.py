@@ -12,6 +12,8 @@
 
 """Contains a class for the main window of Spine Toolbox."""
 import os
+import sqlite3
+import shutil
 import sys
 import locale
 import logging
@@ -77,10 +79,13 @@ from .widgets import toolbars
 from .widgets.open_project_dialog import OpenProjectDialog
 from .widgets.jump_properties_widget import JumpPropertiesWidget
 from .widgets.link_properties_widget import LinkPropertiesWidget
+from .widgets.execution_log_viewer import ExecutionLogViewer
 from .project import SpineToolboxProject
 from .spine_db_manager import SpineDBManager
 from .spine_db_editor.widgets.multi_spine_db_editor import MultiSpineDBEditor
 from .spine_engine_manager import make_engine_manager
+from .log_message_batcher import DEFAULT_MAX_MESSAGE_RATE, LogMessageBatcher
+from .execution_log_store import DEFAULT_RETAINED_RUNS, EXECUTION_LOG_FILENAME, ExecutionLogStore
 from .config import MAINWINDOW_SS, DEFAULT_WORK_DIR, ONLINE_DOCUMENTATION_URL
 from .helpers import (
     create_dir,
@@ -174,6 +179,12 @@ class ToolboxUI(QMainWindow):
         self.execution_in_progress = False
         self._anchor_callbacks = {}
         self.ui.textBrowser_eventlog.set_toolbox(self)
+        max_log_message_rate = int(
+            self._qsettings.value("appSettings/maxLogMessageRate", defaultValue=str(DEFAULT_MAX_MESSAGE_RATE))
+        )
+        self._log_message_batcher = LogMessageBatcher(max_message_rate=max_log_message_rate, parent=self)
+        self._execution_log_store = None
+        self._execution_log_viewer = None
         # DB manager
         self.db_mngr = SpineDBManager(self._qsettings, self)
         # Widget and form references
@@ -754,6 +765,7 @@ class ToolboxUI(QMainWindow):
         if not self.undo_critical_commands():
             return False
         self.clear_ui()
+        self._close_execution_log()
         self._project.tear_down()
         self._project = None
         self._disable_project_actions()
@@ -2185,6 +2197,7 @@ class ToolboxUI(QMainWindow):
 
     @Slot()
     def _unset_execution_in_progress(self):
+        self._log_message_batcher.flush()
         self.execution_in_progress = False
         self._update_execute_enabled()
         self._update_execute_selected_enabled()
@@ -2500,6 +2513,96 @@ class ToolboxUI(QMainWindow):
             timestamp (str): Time stamp
         """
         self.ui.textBrowser_eventlog.make_log_entry_point(timestamp)
+        store = self.execution_log_store()
+        if store is not None:
+            self._prune_execution_log(store)
+        self._log_message_batcher.set_spill_directory(self._execution_log_spill_dir(timestamp))
+        self._log_message_batcher.set_execution_log(store, timestamp)
+
+    def _execution_log_spill_dir(self, run):
+        """Returns the directory where messages of given run spill over.
+
+        Args:
+            run (str): run identifier i.e. execution time stamp
+
+        Returns:
+            str: path to spill directory
+        """
+        return os.path.join(self._project.config_dir, "logs", run.replace(":", "-"))
+
+    def _prune_execution_log(self, store):
+        """Deletes old runs from execution log so that there is room for a new one.
+
+        Args:
+            store (ExecutionLogStore): execution log store
+        """
+        retained_runs = int(
+            self._qsettings.value("appSettings/executionLogRetainedRuns", defaultValue=str(DEFAULT_RETAINED_RUNS))
+        )
+        if retained_runs <= 0:
+            return
+        try:
+            pruned_runs = store.prune(retained_runs - 1)
+        except sqlite3.Error as error:
+            self.msg_warning.emit(f"Failed to prune execution log: {error}")
+            return
+        if not pruned_runs:
+            return
+        for run in pruned_runs:
+            shutil.rmtree(self._execution_log_spill_dir(run), ignore_errors=True)
+        if self._execution_log_viewer is not None:
+            self._execution_log_viewer.reload()
+
+    def execution_log_store(self):
+        """Returns current project's execution log store opening it if needed.
+
+        Returns:
+            ExecutionLogStore: log store or None if there is no project or the store cannot be opened
+        """
+        if self._execution_log_store is None and self._project is not None:
+            path = os.path.join(self._project.config_dir, "logs", EXECUTION_LOG_FILENAME)
+            try:
+                self._execution_log_store = ExecutionLogStore(path)
+            except sqlite3.Error as error:
+                self.msg_warning.emit(f"Failed to open execution log <b>{path}</b>: {error}")
+        return self._execution_log_store
+
+    def _close_execution_log(self):
+        """Closes the execution log viewer and store."""
+        if self._execution_log_viewer is not None:
+            self._execution_log_viewer.close()
+        self._log_message_batcher.set_execution_log(None, None)
+        if self._execution_log_store is not None:
+            self._execution_log_store.close()
+            self._execution_log_store = None
+
+    @Slot(bool)
+    def show_execution_log_viewer(self, _=False):
+        """Opens a window that browses project's execution log history."""
+        if self._execution_log_viewer is not None:
+            self._execution_log_viewer.refresh()
+            self._execution_log_viewer.raise_()
+            self._execution_log_viewer.activateWindow()
+            return
+        store = self.execution_log_store()
+        if store is None:
+            return
+        self._execution_log_viewer = ExecutionLogViewer(store, self)
+        self._log_message_batcher.flushed.connect(self._execution_log_viewer.refresh)
+        self._execution_log_viewer.destroyed.connect(self._forget_execution_log_viewer)
+        self._execution_log_viewer.show()
+
+    @Slot()
+    def _forget_execution_log_viewer(self):
+        self._execution_log_viewer = None
+
+    def log_message_batcher(self):
+        """Returns the batcher that collects execution log messages from engine workers.
+
+        Returns:
+            LogMessageBatcher: log message batcher
+        """
+        return self._log_message_batcher
 
     def add_log_message(self, item_name, filter_id, message):
         """Adds a message to an item's execution log.
@@ -2510,3 +2613,13 @@ class ToolboxUI(QMainWindow):
             message (str): formatted message
         """
         self.ui.textBrowser_eventlog.add_log_message(item_name, filter_id, message)
+
+    def add_log_messages(self, item_name, filter_id, messages):
+        """Adds messages to an item's execution log.
+
+        Args:
+            item_name (str): item name
+            filter_id (str): filter identifier
+            messages (list of str): formatted messages
+        """
+        self.ui.textBrowser_eventlog.add_log_messages(item_name, filter_id, messages)
@@ -19,8 +19,17 @@ from contextlib import contextmanager
 from numbers import Number
 import re
 from operator import methodcaller
-from PySide6.QtWidgets import QTableView, QApplication
-from PySide6.QtCore import Qt, Slot, QItemSelection, QItemSelectionModel, QPoint
+from PySide6.QtWidgets import QTableView, QApplication, QProgressDialog
+from PySide6.QtCore import (
+    Qt,
+    Signal,
+    Slot,
+    QItemSelection,
+    QItemSelectionModel,
+    QObject,
+    QPersistentModelIndex,
+    QPoint,
+)
 from PySide6.QtGui import QKeySequence, QIcon, QAction
 from spinedb_api import (
     DateTime,
@@ -33,9 +42,16 @@ from spinedb_api import (
 )
 from spinedb_api.parameter_value import join_value_and_type, split_value_and_type
 from ..helpers import busy_effect
-
+from ..qthread_pool_executor import CancelledError, QtBasedThreadPoolExecutor
 
 _ = csv.field_size_limit(int(ctypes.c_ulong(-1).value // 2))
+_BULK_CELL_THRESHOLD = 50000
+"""Copying more cells than this is done in a worker thread."""
+_BULK_TEXT_THRESHOLD = 500000
+"""Pasting text longer than this is done in a worker thread."""
+_PROGRESS_INTERVAL = 1000
+_PARSE_PROGRESS_SHARE = 0.8
+_PROGRESS_DIALOG_DELAY = 500
 
 
 class CopyPasteTableView(QTableView):
@@ -49,6 +65,7 @@ class CopyPasteTableView(QTableView):
         self._delete_action.setShortcut(QKeySequence.Delete)
         self.addAction(self._delete_action)
         self._pasted_data_converters = {}
+        self._clipboard_task = None
         self._delete_action.triggered.connect(self.delete_content)
 
     def init_copy_and_paste_actions(self):
@@ -101,46 +118,45 @@ class CopyPasteTableView(QTableView):
     def can_copy(self):
         return not self.selectionModel().selection().isEmpty()
 
+    def clipboard_task_running(self):
+        """Checks if a copy or paste is running in the background.
+
+        Returns:
+            bool: True if copy or paste is in progress, False otherwise
+        """
+        return self._clipboard_task is not None
+
     @busy_effect
     @Slot(bool)
     def copy(self, _=False):
-        """Copies current selection to clipboard in excel format."""
+        """Copies current selection to clipboard in excel format.
+
+        Large selections are formatted in a worker thread.
+        """
+        if self._clipboard_task is not None:
+            return False
         selection = self.selectionModel().selection()
         if not selection:
             return False
         v_header = self.verticalHeader()
         h_header = self.horizontalHeader()
-        row_dict = {}
-        with system_lc_numeric():
-            for rng in sorted(selection, key=lambda x: h_header.visualIndex(x.left())):
-                for i in range(rng.top(), rng.bottom() + 1):
-                    if v_header.isSectionHidden(i):
-                        continue
-                    row = row_dict.setdefault(i, [])
-                    for j in range(rng.left(), rng.right() + 1):
-                        if h_header.isSectionHidden(j):
-                            continue
-                        data = self.model().index(i, j).data(Qt.ItemDataRole.EditRole)
-                        if data is not None:
-                            if isinstance(data, bool):
-                                str_data = "true" if data else "false"
-                            else:
-                                if isinstance(data, int):
-                                    str_data = str(data)
-                                else:
-                                    try:
-                                        number = float(data)
-                                        str_data = locale.str(number)
-                                    except ValueError:
-                                        str_data = str(data)
-                        else:
-                            str_data = ""
-                        row.append(str_data)
-        with io.StringIO() as output:
-            writer = csv.writer(output, delimiter="\t", quotechar="'")
-            for key in sorted(row_dict):
-                writer.writerow(row_dict[key])
-            QApplication.clipboard().setText(output.getvalue())
+        model = self.model()
+        blocks = []
+        cell_count = 0
+        for rng in sorted(selection, key=lambda x: h_header.visualIndex(x.left())):
+            rows = [i for i in range(rng.top(), rng.bottom() + 1) if not v_header.isSectionHidden(i)]
+            columns = [j for j in range(rng.left(), rng.right() + 1) if not h_header.isSectionHidden(j)]
+            blocks.append((rows, _bulk_data(model, rows, columns)))
+            cell_count += len(rows) * len(columns)
+        number_format = _SystemNumberFormat()
+        if cell_count <= _BULK_CELL_THRESHOLD:
+            QApplication.clipboard().setText(_copied_blocks_to_text(blocks, number_format))
+            return True
+        self._start_clipboard_task(
+            "Copying...",
+            lambda progress: _copied_blocks_to_text(blocks, number_format, progress),
+            QApplication.clipboard().setText,
+        )
         return True
 
     def can_paste(self):
@@ -152,6 +168,8 @@ class CopyPasteTableView(QTableView):
     @Slot(bool)
     def paste(self, _=False):
         """Paste data from clipboard."""
+        if self._clipboard_task is not None:
+            return False
         selection = self.selectionModel().selection()
         if len(selection.indexes()) > 1:
             return self.paste_on_selection()
@@ -167,28 +185,7 @@ class CopyPasteTableView(QTableView):
         Returns:
             list: a list of rows
         """
-
-        def _process_value(value):
-            """Delocalizes value, except when it's one of our 'complex' value types.
-            We need this exception because our complex values are json strings, so they have commas,
-            and ``locale.delocalize`` might remove those commas.
-
-            We identify our complex values by checking if the word "type" is in them.
-            See ``spinedb_api.helpers.join_value_and_type`` for the reason why this works.
-            """
-            new_value = locale.delocalize(value)
-            try:
-                float(new_value)
-                return new_value
-            except ValueError:
-                # The new delocalized value is not even a number, so ignore it
-                # This prevents comma separated strings to become dot separated strings
-                return value
-
-        with io.StringIO(text) as input_stream:
-            reader = csv.reader(input_stream, delimiter="\t", quotechar="'")
-            with system_lc_numeric():
-                return [[_process_value(element) for element in row] for row in reader]
+        return _parse_pasted_text(text, _SystemNumberFormat())
 
     def paste_on_selection(self):
         """Pastes clipboard data on selection, but not beyond.
@@ -196,14 +193,11 @@ class CopyPasteTableView(QTableView):
         text = QApplication.clipboard().text()
         if not text:
             return False
-        data = self._read_pasted_text(text)
-        if not data:
-            return False
         selection = self.selectionModel().selection()
         if selection.isEmpty():
             return False
         indexes = list()
-        values = list()
+        cells = list()
         is_row_hidden = self.verticalHeader().isSectionHidden
         rows = [x for r in selection for x in range(r.top(), r.bottom() + 1) if not is_row_hidden(x)]
         is_column_hidden = self.horizontalHeader().isSectionHidden
@@ -214,33 +208,63 @@ class CopyPasteTableView(QTableView):
             for column in columns:
                 index = model_index(row, column)
                 if index.flags() & Qt.ItemIsEditable:
-                    i = (row - rows[0]) % len(data)
-                    j = (column - columns[0]) % len(data[i])
-                    value = data[i][j]
                     indexes.append(index)
-                    if converters:
-                        convert = converters.get(column)
-                        if convert is not None:
-                            values.append(convert(value))
-                            continue
-                    values.append(value)
-        self.model().batch_set_data(indexes, values)
-        return True
+                    cells.append((row - rows[0], column - columns[0], converters.get(column)))
+        indexes = [QPersistentModelIndex(index) for index in indexes]
+        return self._paste_text(
+            text,
+            lambda data, progress: _values_for_cells(data, cells, progress),
+            lambda values: self._set_pasted_values(indexes, values),
+        )
+
+    def _set_pasted_values(self, indexes, values):
+        """Sets pasted values to cells that still exist.
+
+        Args:
+            indexes (list of QPersistentModelIndex): target cells
+            values (list): values for each cell
+        """
+        model = self.model()
+        model_indexes = []
+        valid_values = []
+        for index, value in zip(indexes, values):
+            if index.isValid():
+                model_indexes.append(model.index(index.row(), index.column()))
+                valid_values.append(value)
+        if model_indexes:
+            model.batch_set_data(model_indexes, valid_values)
 
     def paste_normal(self):
         """Pastes clipboard data, overwriting cells if needed."""
         text = QApplication.clipboard().text().strip()
         if not text:
             return False
-        data = self._read_pasted_text(text)
-        if not data:
-            return False
         current = self.currentIndex()
         if not current.isValid():
             return False
+        column = current.column()
+        h = self.horizontalHeader()
+        visible_columns = (h.logicalIndex(x) for x in range(h.visualIndex(column), h.count()))
+        converters = self._converters() if self._pasted_data_converters else {}
+        column_converters = [converters.get(column) for column in visible_columns if not h.isSectionHidden(column)]
+        current = QPersistentModelIndex(current)
+
+        def apply(data):
+            if current.isValid():
+                self._set_pasted_data_at(current.row(), current.column(), data)
+
+        return self._paste_text(text, lambda data, progress: _convert_columns(data, column_converters, progress), apply)
+
+    def _set_pasted_data_at(self, row, column, data):
+        """Sets converted pasted data starting from given cell inserting rows and columns if needed.
+
+        Args:
+            row (int): top row
+            column (int): left column
+            data (list of list): pasted data
+        """
         indexes = list()
         values = list()
-        row = current.row()
         rows = []
         rows_append = rows.append
         is_row_hidden = self.verticalHeader().isSectionHidden
@@ -249,7 +273,6 @@ class CopyPasteTableView(QTableView):
                 row += 1
             rows_append(row)
             row += 1
-        column = current.column()
         visual_column = self.horizontalHeader().visualIndex(column)
         columns = []
         columns_append = columns.append
@@ -271,7 +294,6 @@ class CopyPasteTableView(QTableView):
         column_count = model.columnCount()
         if last_column >= column_count:
             model.insertColumns(column_count, last_column - column_count + 1)
-        converters = self._converters() if self._pasted_data_converters else {}
         model_index = model.index
         for i, row in enumerate(rows):
             try:
@@ -286,15 +308,68 @@ class CopyPasteTableView(QTableView):
                 index = model_index(row, column)
                 if index.flags() & Qt.ItemIsEditable:
                     indexes.append(index)
-                    if converters:
-                        convert = converters.get(column)
-                        if convert is not None:
-                            values.append(convert(value))
-                            continue
                     values.append(value)
         model.batch_set_data(indexes, values)
+
+    def _paste_text(self, text, convert, apply):
+        """Parses and converts pasted text and applies the result to the model.
+
+        Long texts are parsed and converted in a worker thread.
+
+        Args:
+            text (str): pasted text
+            convert (Callable): function that takes parsed data and a progress callable, and returns converted data
+            apply (Callable): function that takes converted data and sets it to the model
+
+        Returns:
+            bool: True if something was or will be pasted, False otherwise
+        """
+
+        number_format = _SystemNumberFormat()
+
+        def parse_and_convert(progress):
+            data = _parse_pasted_text(text, number_format, progress)
+            if not data:
+                return None
+            return convert(data, progress)
+
+        if len(text) <= _BULK_TEXT_THRESHOLD:
+            converted = parse_and_convert(None)
+            if converted is None:
+                return False
+            apply(converted)
+            return True
+
+        def apply_if_any(converted):
+            if converted is not None:
+                apply(converted)
+
+        self._start_clipboard_task("Pasting...", parse_and_convert, apply_if_any)
         return True
 
+    def _start_clipboard_task(self, label, work, on_done):
+        """Runs a copy or paste job in a worker thread.
+
+        Args:
+            label (str): progress dialog label
+            work (Callable): job function that takes a progress callable
+            on_done (Callable): called with the job's result in the GUI thread unless the job was cancelled
+        """
+        task = _ClipboardTask(label, self)
+        self._clipboard_task = task
+
+        def finish(result):
+            self._clipboard_task = None
+            on_done(result)
+
+        task.finished_with_result.connect(finish)
+        task.aborted.connect(self._forget_clipboard_task)
+        task.start(work)
+
+    @Slot()
+    def _forget_clipboard_task(self):
+        self._clipboard_task = None
+
     def set_column_converter_for_pasting(self, header, converter):
         self._pasted_data_converters[header] = converter
 
@@ -926,3 +1001,285 @@ def system_lc_numeric():
         yield None
     finally:
         locale.setlocale(locale.LC_NUMERIC, toolbox_lc_numeric)
+
+
+class _SystemNumberFormat:
+    """Formats and delocalizes numbers according to system's numeric locale.
+
+    The locale conventions are captured at construction so that the instance can be used
+    in worker threads without touching the process-wide locale.
+    """
+
+    def __init__(self):
+        with system_lc_numeric():
+            conventions = locale.localeconv()
+        self._decimal_point = conventions["decimal_point"]
+        self._thousands_separator = conventions["thousands_sep"]
+
+    def str(self, number):
+        """Converts float to string like ``locale.str()``.
+
+        Args:
+            number (float): number to convert
+
+        Returns:
+            str: localized number
+        """
+        string = "%.12g" % number
+        if self._decimal_point != ".":
+            string = string.replace(".", self._decimal_point)
+        return string
+
+    def delocalize(self, string):
+        """Converts localized number string to normalized form like ``locale.delocalize()``.
+
+        Args:
+            string (str): localized number
+
+        Returns:
+            str: delocalized string
+        """
+        if self._thousands_separator:
+            string = string.replace(self._thousands_separator, "")
+        if self._decimal_point:
+            string = string.replace(self._decimal_point, ".")
+        return string
+
+
+def _bulk_data(model, rows, columns):
+    """Returns edit role data of given cells column by column.
+
+    Uses the model's ``bulk_data()`` if it has one and falls back to querying indexes one by one.
+
+    Args:
+        model (QAbstractItemModel): model
+        rows (list of int): rows
+        columns (list of int): columns
+
+    Returns:
+        list of list: data for each column
+    """
+    bulk_data = getattr(model, "bulk_data", None)
+    if bulk_data is not None:
+        return bulk_data(rows, columns)
+    index = model.index
+    return [[index(row, column).data(Qt.ItemDataRole.EditRole) for row in rows] for column in columns]
+
+
+def _copied_value_to_str(data, number_format):
+    """Converts copied data to clipboard string.
+
+    Args:
+        data (Any): copied data
+        number_format (_SystemNumberFormat): number format
+
+    Returns:
+        str: clipboard string
+    """
+    if data is None:
+        return ""
+    if isinstance(data, bool):
+        return "true" if data else "false"
+    if isinstance(data, int):
+        return str(data)
+    try:
+        number = float(data)
+        return number_format.str(number)
+    except ValueError:
+        return str(data)
+
+
+def _copied_blocks_to_text(blocks, number_format, progress=None):
+    """Formats copied selection ranges as tab separated CSV.
+
+    Args:
+        blocks (list of tuple): visible rows and column data of each selection range in visual column order
+        number_format (_SystemNumberFormat): number format
+        progress (Callable, optional): called with progress between 0.0 and 1.0; may raise to cancel
+
+    Returns:
+        str: clipboard text
+    """
+    row_dict = {}
+    column_count = sum(len(column_data) for _, column_data in blocks)
+    columns_done = 0
+    for rows, column_data in blocks:
+        for column in column_data:
+            strings = [_copied_value_to_str(data, number_format) for data in column]
+            for row, string in zip(rows, strings):
+                row_dict.setdefault(row, []).append(string)
+            columns_done += 1
+            if progress is not None:
+                progress(columns_done / column_count)
+    with io.StringIO() as output:
+        writer = csv.writer(output, delimiter="\t", quotechar="'")
+        for key in sorted(row_dict):
+            writer.writerow(row_dict[key])
+        return output.getvalue()
+
+
+def _parse_pasted_text(text, number_format, progress=None):
+    """Parses a tab separated CSV text table.
+
+    Args:
+        text (str): a CSV formatted table
+        number_format (_SystemNumberFormat): number format
+        progress (Callable, optional): called with progress between 0.0 and 1.0; may raise to cancel
+
+    Returns:
+        list: a list of rows
+    """
+
+    def _process_value(value):
+        """Delocalizes value, except when it's one of our 'complex' value types.
+        We need this exception because our complex values are json strings, so they have commas,
+        and delocalizing might remove those commas.
+
+        We identify our complex values by checking if the word "type" is in them.
+        See ``spinedb_api.helpers.join_value_and_type`` for the reason why this works.
+        """
+        new_value = number_format.delocalize(value)
+        try:
+            float(new_value)
+            return new_value
+        except ValueError:
+            # The new delocalized value is not even a number, so ignore it
+            # This prevents comma separated strings to become dot separated strings
+            return value
+
+    if progress is None:
+        with io.StringIO(text) as input_stream:
+            reader = csv.reader(input_stream, delimiter="\t", quotechar="'")
+            return [[_process_value(element) for element in row] for row in reader]
+    line_count = text.count("\n") + 1
+    rows = []
+    with io.StringIO(text) as input_stream:
+        reader = csv.reader(input_stream, delimiter="\t", quotechar="'")
+        for row in reader:
+            rows.append([_process_value(element) for element in row])
+            if len(rows) % _PROGRESS_INTERVAL == 0:
+                progress(_PARSE_PROGRESS_SHARE * min(1.0, reader.line_num / line_count))
+    return rows
+
+
+def _values_for_cells(data, cells, progress=None):
+    """Picks and converts pasted values for selected cells repeating data to fill the selection.
+
+    Args:
+        data (list of list): parsed data
+        cells (list of tuple): row offset, column offset and converter or None for each target cell
+        progress (Callable, optional): called with progress between 0.0 and 1.0; may raise to cancel
+
+    Returns:
+        list: values
+    """
+    values = []
+    row_count = len(data)
+    for cell_number, (row_offset, column_offset, convert) in enumerate(cells):
+        line = data[row_offset % row_count]
+        value = line[column_offset % len(line)]
+        values.append(convert(value) if convert is not None else value)
+        if progress is not None and cell_number % _PROGRESS_INTERVAL == 0:
+            progress(_PARSE_PROGRESS_SHARE + (1.0 - _PARSE_PROGRESS_SHARE) * cell_number / len(cells))
+    return values
+
+
+def _convert_columns(data, column_converters, progress=None):
+    """Converts pasted data in place with column specific converters.
+
+    Args:
+        data (list of list): parsed data
+        column_converters (list): converter or None for each column
+        progress (Callable, optional): called with progress between 0.0 and 1.0; may raise to cancel
+
+    Returns:
+        list of list: converted data
+    """
+    converters = [(j, convert) for j, convert in enumerate(column_converters) if convert is not None]
+    if not converters:
+        return data
+    for row_number, line in enumerate(data):
+        for j, convert in converters:
+            if j < len(line):
+                line[j] = convert(line[j])
+        if progress is not None and row_number % _PROGRESS_INTERVAL == 0:
+            progress(_PARSE_PROGRESS_SHARE + (1.0 - _PARSE_PROGRESS_SHARE) * row_number / len(data))
+    return data
+
+
+class _ClipboardTask(QObject):
+    """Runs a copy or paste job in a worker thread and shows its progress in a cancellable dialog."""
+
+    finished_with_result = Signal(object)
+    """Emitted with job's result unless the job was cancelled."""
+    aborted = Signal()
+    """Emitted when job was cancelled or failed."""
+    _progressed = Signal(float)
+    _done = Signal(object)
+
+    def __init__(self, label, parent):
+        """
+        Args:
+            label (str): progress dialog label
+            parent (QWidget): parent widget
+        """
+        super().__init__(parent)
+        self._cancelled = False
+        self._executor = QtBasedThreadPoolExecutor(max_workers=1)
+        self._dialog = QProgressDialog(label, "Cancel", 0, 100, parent)
+        self._dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self._dialog.setMinimumDuration(_PROGRESS_DIALOG_DELAY)
+        self._dialog.canceled.connect(self._cancel)
+        self._progressed.connect(self._update_progress)
+        self._done.connect(self._finish)
+
+    def start(self, work):
+        """Starts the job.
+
+        Args:
+            work (Callable): job function that takes a progress callable
+        """
+        future = self._executor.submit(work, self._advance)
+        future.add_done_callback(self._done.emit)
+
+    def _advance(self, progress):
+        """Reports progress from the worker thread.
+
+        Args:
+            progress (float): progress between 0.0 and 1.0
+
+        Raises:
+            CancelledError: raised if the job has been cancelled
+        """
+        if self._cancelled:
+            raise CancelledError()
+        self._progressed.emit(progress)
+
+    @Slot()
+    def _cancel(self):
+        self._cancelled = True
+
+    @Slot(float)
+    def _update_progress(self, progress):
+        if not self._cancelled:
+            self._dialog.setValue(round(100 * progress))
+
+    @Slot(object)
+    def _finish(self, future):
+        self._dialog.canceled.disconnect(self._cancel)
+        self._dialog.reset()
+        self._dialog.deleteLater()
+        self._executor.shutdown()
+        self.deleteLater()
+        try:
+            result = future.result()
+        except CancelledError:
+            self.aborted.emit()
+            return
+        except Exception:
+            self.aborted.emit()
+            raise
+        if self._cancelled:
+            self.aborted.emit()
+            return
+        self.finished_with_result.emit(result)
@@ -76,7 +76,7 @@ class CustomQTextBrowser(QTextBrowser):
             cursor.insertHtml(text)
 
     def contextMenuEvent(self, event):
-        """Reimplemented method to add a clear action into the default context menu.
+        """Reimplemented method to add clear and execution log history actions into the default context menu.
 
         Args:
             event (QContextMenuEvent): Received event
@@ -87,6 +87,8 @@ class CustomQTextBrowser(QTextBrowser):
         menu = self.createStandardContextMenu()
         menu.addSeparator()
         menu.addAction(clear_action)
+        if self._toolbox is not None and self._toolbox.project() is not None:
+            menu.addAction("Execution log history...", self._toolbox.show_execution_log_viewer)
         menu.exec(event.globalPos())
 
     def clear(self):
@@ -142,6 +144,16 @@ class CustomQTextBrowser(QTextBrowser):
             filter_id (str): filter identifier
             message (str): formatted message
         """
+        self.add_log_messages(item_name, filter_id, [message])
+
+    def add_log_messages(self, item_name, filter_id, messages):
+        """Adds messages to an item's execution log in a single document edit.
+
+        Args:
+            item_name (str): item name
+            filter_id (str): filter identifier
+            messages (list of str): formatted messages
+        """
         item_blocks = self._execution_blocks.setdefault(self._executing_timestamp, {})
         if item_name not in item_blocks:
             cursor = self.textCursor()
@@ -171,9 +183,12 @@ class CustomQTextBrowser(QTextBrowser):
                     cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
                     blocks.append(cursor.block())
                 cursor = filter_cursors[filter_id]
-            cursor.insertBlock()
-            cursor.insertHtml(message)
-            blocks.append(cursor.block())
+            cursor.beginEditBlock()
+            for message in messages:
+                cursor.insertBlock()
+                cursor.insertHtml(message)
+                blocks.append(cursor.block())
+            cursor.endEditBlock()
         self.set_item_log_selected(True)
 
     def execution_timestamps(self):
@@ -0,0 +1,164 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a window that browses the execution log history of a project."""
+from PySide6.QtCore import Qt, QTimer, Slot
+from PySide6.QtWidgets import QAbstractItemView, QComboBox, QHBoxLayout, QHeaderView, QLineEdit, QTableView
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+from ..mvcmodels.execution_log_model import ExecutionLogModel
+
+
+class ExecutionLogViewer(QWidget):
+    """A window that shows execution log records filtered by run, item and filter id, and searched by text."""
+
+    _ALL = "All"
+
+    def __init__(self, store, parent=None):
+        """
+        Args:
+            store (ExecutionLogStore): execution log store
+            parent (QWidget, optional): parent widget
+        """
+        super().__init__(parent, f=Qt.WindowType.Window)
+        self.setWindowTitle("Execution log history")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self._store = store
+        layout = QVBoxLayout(self)
+        filter_layout = QHBoxLayout()
+        self._run_combo_box = QComboBox(self)
+        self._run_combo_box.setToolTip("Execution")
+        self._item_combo_box = QComboBox(self)
+        self._item_combo_box.setToolTip("Project item")
+        self._filter_combo_box = QComboBox(self)
+        self._filter_combo_box.setToolTip("Filter")
+        self._search_line_edit = QLineEdit(self)
+        self._search_line_edit.setPlaceholderText("Search messages...")
+        self._search_line_edit.setClearButtonEnabled(True)
+        for widget in (self._run_combo_box, self._item_combo_box, self._filter_combo_box):
+            widget.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+            filter_layout.addWidget(widget)
+        filter_layout.addWidget(self._search_line_edit, 1)
+        layout.addLayout(filter_layout)
+        self._model = ExecutionLogModel(self)
+        self._model.set_store(store)
+        self._table_view = QTableView(self)
+        self._table_view.setModel(self._model)
+        self._table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table_view.setWordWrap(False)
+        self._table_view.verticalHeader().setVisible(False)
+        self._table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self._table_view.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 4)
+        self._table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self._table_view)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._populate_runs()
+        self._apply_filter()
+        self._table_view.resizeColumnsToContents()
+        self.resize(900, 500)
+        self._run_combo_box.currentIndexChanged.connect(self._handle_run_changed)
+        self._item_combo_box.currentIndexChanged.connect(self._handle_item_changed)
+        self._filter_combo_box.currentIndexChanged.connect(self._apply_filter)
+        self._search_line_edit.textEdited.connect(self._search_timer.start)
+        self._search_timer.timeout.connect(self._apply_filter)
+
+    def _selected(self, combo_box):
+        """Returns combo box's current value or None if 'All' is selected.
+
+        Args:
+            combo_box (QComboBox): combo box
+
+        Returns:
+            str: current value
+        """
+        if combo_box.currentIndex() <= 0:
+            return None
+        return combo_box.currentData()
+
+    @staticmethod
+    def _populate(combo_box, values, labels=None):
+        """Replaces combo box contents keeping current value if possible.
+
+        Args:
+            combo_box (QComboBox): combo box
+            values (list of str): values
+            labels (list of str, optional): display texts for values
+        """
+        current = combo_box.currentData() if combo_box.currentIndex() > 0 else None
+        combo_box.blockSignals(True)
+        combo_box.clear()
+        combo_box.addItem(ExecutionLogViewer._ALL)
+        for value, label in zip(values, labels if labels is not None else values):
+            combo_box.addItem(label, value)
+        combo_box.setCurrentIndex(max(0, combo_box.findData(current)) if current is not None else 0)
+        combo_box.blockSignals(False)
+
+    def _populate_runs(self):
+        """Populates run combo box and the ones depending on it."""
+        runs = self._store.runs()
+        self._populate(self._run_combo_box, runs)
+        self._populate_items()
+
+    def _populate_items(self):
+        """Populates item combo box and the filter combo box."""
+        self._populate(self._item_combo_box, self._store.items(self._selected(self._run_combo_box)))
+        self._populate_filters()
+
+    def _populate_filters(self):
+        """Populates filter combo box."""
+        filter_ids = self._store.filter_ids(self._selected(self._run_combo_box), self._selected(self._item_combo_box))
+        self._populate(self._filter_combo_box, filter_ids, [f if f else "<unfiltered>" for f in filter_ids])
+
+    @Slot(int)
+    def _handle_run_changed(self, _):
+        self._populate_items()
+        self._apply_filter()
+
+    @Slot(int)
+    def _handle_item_changed(self, _):
+        self._populate_filters()
+        self._apply_filter()
+
+    @Slot()
+    def _apply_filter(self, _=None):
+        """Updates the model to match current selections and search text."""
+        self._search_timer.stop()
+        self._model.set_filter(
+            self._selected(self._run_combo_box),
+            self._selected(self._item_combo_box),
+            self._selected(self._filter_combo_box),
+            self._search_line_edit.text(),
+        )
+
+    @Slot()
+    def refresh(self):
+        """Shows records that have been added to the store."""
+        self._populate_runs()
+        at_bottom = self._table_view.verticalScrollBar().value() == self._table_view.verticalScrollBar().maximum()
+        self._model.refresh()
+        if at_bottom:
+            self._table_view.scrollToBottom()
+
+    @Slot()
+    def reload(self):
+        """Rebuilds selections and rows after records have been deleted from the store."""
+        self._populate_runs()
+        self._apply_filter()
+
+    def model(self):
+        """Returns the viewer's model.
+
+        Returns:
+            ExecutionLogModel: model
+        """
+        return self._model
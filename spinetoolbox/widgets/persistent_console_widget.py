@@ -12,6 +12,7 @@
 
 """Contains a widget acting as a console for Julia & Python REPL's."""
 import os
+import time
 import uuid
 from pygments.styles import get_style_by_name
 from pygments.lexers import get_lexer_by_name
@@ -32,6 +33,7 @@ from PySide6.QtGui import (
 from spinetoolbox.helpers import CustomSyntaxHighlighter
 from spinetoolbox.spine_engine_manager import make_engine_manager
 from spinetoolbox.qthread_pool_executor import QtBasedThreadPoolExecutor
+from spinetoolbox.console_output_buffer import ConsoleOutputBuffer, next_batch_size
 from spine_engine.exception import RemoteEngineInitFailed
 
 
@@ -162,9 +164,11 @@ class PersistentConsoleWidget(QPlainTextEdit):
     _killed = Signal(bool)
     _flush_needed = Signal()
     _FLUSH_INTERVAL = 200
-    _MAX_LINES_PER_SECOND = 2000
-    _MAX_LINES_PER_CYCLE = _MAX_LINES_PER_SECOND * 1000 / _FLUSH_INTERVAL
+    _FRAME_BUDGET = 16
+    _MIN_LINES_PER_CYCLE = 50
+    _MAX_LINES_PER_CYCLE = 10000
     _MAX_LINES_COUNT = 2000
+    _BUFFER_CAPACITY = _MAX_LINES_COUNT // 2  # Must stay below the block limit so overflow links don't get trimmed
 
     def __init__(self, toolbox, key, language, owner=None):
         """
@@ -188,8 +192,9 @@ class PersistentConsoleWidget(QPlainTextEdit):
         self._prompt, self._prompt_format = self._make_prompt()
         self._prefix = None
         self._pending_command_count = 0
-        self._text_buffer = []
-        self._skipped = {}
+        self._output_buffer = ConsoleOutputBuffer(self._BUFFER_CAPACITY)
+        self._lines_per_cycle = self._MIN_LINES_PER_CYCLE
+        self._skipped = {}  # Maps link address to overflowed output and a cursor that follows the link
         self._anchor = None
         self._style = get_style_by_name("monokai")
         background_color = self._style.background_color
@@ -240,6 +245,7 @@ class PersistentConsoleWidget(QPlainTextEdit):
     def closeEvent(self, ev):
         super().closeEvent(ev)
         self._executor.shutdown()
+        self._output_buffer.close()
 
     def name(self):
         """Returns console name for display purposes."""
@@ -275,15 +281,16 @@ class PersistentConsoleWidget(QPlainTextEdit):
         super().mouseReleaseEvent(ev)
         if self._anchor is None:
             return
-        text_buffer = self._skipped.pop(self._anchor, None)
-        if text_buffer is None:
+        link = self._skipped.pop(self._anchor, None)
+        if link is None:
             return
+        spilled, _ = link
+        chunks = self._output_buffer.read_spilled(spilled, self._MAX_LINES_COUNT)
         cursor = self.cursorForPosition(ev.position().toPoint())
+        cursor.beginEditBlock()
         cursor.select(cursor.BlockUnderCursor)
         cursor.removeSelectedText()
-        cursor.beginEditBlock()
-        while text_buffer:
-            text, with_prompt = text_buffer.pop(0)
+        for text, with_prompt in chunks:
             self._insert_text(cursor, text, with_prompt)
         cursor.endEditBlock()
         self._anchor = None
@@ -371,30 +378,63 @@ class PersistentConsoleWidget(QPlainTextEdit):
 
     @Slot()
     def _flush_text_buffer(self):
-        """Inserts all text from buffer."""
+        """Inserts text from buffer.
+
+        The number of lines inserted per cycle adapts so that a cycle fits into the frame budget;
+        if lines remain, the next cycle is scheduled right after the event loop has had its turn.
+        Output that overflowed the buffer is collapsed into a link that expands it from the spill file.
+        """
+        start = time.perf_counter()
+        line_count = self._lines_per_cycle
+        spilled, chunks = self._output_buffer.take(line_count)
         cursor = self.textCursor()
         cursor.beginEditBlock()
-        k = 0
-        while self._text_buffer and k < self._MAX_LINES_PER_CYCLE:
-            cursor.setPosition(self._prompt_block.position() - 1)
-            text, with_prompt = self._text_buffer.pop(0)
+        cursor.setPosition(self._prompt_block.position() - 1)
+        if spilled is not None:
+            self._insert_skipped_link(cursor, spilled)
+        for text, with_prompt in chunks:
             self._insert_text(cursor, text, with_prompt)
-            k += 1
-        if self._text_buffer:
-            address = uuid.uuid4().hex
-            char_format = cursor.charFormat()
-            char_format.setBackground(QColor("white"))
-            char_format.setForeground(QColor("blue"))
-            char_format.setAnchor(True)
-            char_format.setAnchorHref(address)
-            self._skipped[address] = self._text_buffer[-self._MAX_LINES_COUNT :]
-            cursor.setPosition(self._prompt_block.position() - 1)
-            cursor.insertBlock(QTextBlockFormat())
-            cursor.insertText(f"<--- {len(self._text_buffer)} more lines --->", char_format)
-            self._text_buffer.clear()
         cursor.endEditBlock()
+        self._forget_trimmed_links()
+        elapsed = 1000.0 * (time.perf_counter() - start)
+        self._lines_per_cycle = next_batch_size(
+            line_count, elapsed, self._FRAME_BUDGET, self._MIN_LINES_PER_CYCLE, self._MAX_LINES_PER_CYCLE
+        )
+        if self._output_buffer.has_pending():
+            self._flush_timer.start(0)
+            return
+        self._flush_timer.setInterval(self._FLUSH_INTERVAL)
         self._flush_in_progress = False
 
+    def _insert_skipped_link(self, cursor, spilled):
+        """Inserts a link that expands output which overflowed the buffer.
+
+        Args:
+            cursor (QTextCursor): cursor
+            spilled (SpilledOutput): overflowed output
+        """
+        address = uuid.uuid4().hex
+        char_format = cursor.charFormat()
+        char_format.setBackground(QColor("white"))
+        char_format.setForeground(QColor("blue"))
+        char_format.setAnchor(True)
+        char_format.setAnchorHref(address)
+        cursor.insertBlock(QTextBlockFormat())
+        link_cursor = QTextCursor(cursor)
+        link_cursor.setKeepPositionOnInsert(True)
+        self._skipped[address] = (spilled, link_cursor)
+        cursor.insertText(f"<--- {spilled.count} more lines --->", char_format)
+        cursor.setCharFormat(QTextCharFormat())
+
+    def _forget_trimmed_links(self):
+        """Forgets overflow links that have been trimmed from the top of the console."""
+        for address, (_, link_cursor) in list(self._skipped.items()):
+            cursor = QTextCursor(link_cursor.block())
+            cursor.movePosition(QTextCursor.MoveOperation.NextCharacter)
+            if cursor.charFormat().anchorHref() == address:
+                break
+            del self._skipped[address]
+
     def _make_prompt(self):
         text_format = QTextCharFormat()
         if self._language == "julia":
@@ -461,7 +501,7 @@ class PersistentConsoleWidget(QPlainTextEdit):
         Args:
             text (str)
         """
-        self._text_buffer.append((text, with_prompt))
+        self._output_buffer.put(text, with_prompt)
         if not self._flush_in_progress:
             self._flush_in_progress = True
             self._flush_needed.emit()
@@ -707,7 +747,8 @@ class PersistentConsoleWidget(QPlainTextEdit):
         self.clear()
         self._make_prompt_block("")
         self._updating = False
-        self._text_buffer.clear()
+        self._output_buffer.clear()
+        self._skipped.clear()
         self._executor.submit(self._do_restart_persistent)
 
     def _do_restart_persistent(self):
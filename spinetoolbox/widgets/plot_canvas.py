@@ -15,6 +15,7 @@ from enum import auto, Enum, unique
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 from PySide6 import QtWidgets
+from ..plot_decimation import LineDecimator
 
 
 @unique
@@ -50,6 +51,8 @@ class PlotCanvas(FigureCanvasQTAgg):
         self.setParent(parent)
         super().setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         super().updateGeometry()
+        self._decimators = {}
+        self.mpl_connect("resize_event", self._update_decimated_lines)
 
     @property
     def axes(self):
@@ -80,3 +83,29 @@ class PlotCanvas(FigureCanvasQTAgg):
         """
         siblings = self._axes.get_shared_x_axes().get_siblings(self._axes)
         return [ax for ax in siblings if ax is not self._axes and ax.bbox.bounds == self._axes.bbox.bounds]
+
+    def decimate_line(self, axes, line):
+        """Shows a decimated version of line's data that follows the pixel resolution of the axes.
+
+        Args:
+            axes (Axes): axes that contain the line
+            line (Line2D): line to decimate
+
+        Returns:
+            bool: True if line is decimated, False if it is too small or unsuitable for decimation
+        """
+        decimator = self._decimators.get(axes)
+        if decimator is None or not decimator.is_connected():
+            decimator = self._decimators[axes] = LineDecimator(axes)
+        return decimator.add_line(line)
+
+    def clear_decimated_lines(self):
+        """Stops decimating lines."""
+        for decimator in self._decimators.values():
+            decimator.disconnect()
+        self._decimators.clear()
+
+    def _update_decimated_lines(self, _=None):
+        """Re-decimates lines after the canvas has been resized."""
+        for decimator in self._decimators.values():
+            decimator.update()
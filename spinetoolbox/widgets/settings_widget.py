@@ -176,6 +176,12 @@ class SpineDBEditorSettingsMixin:
         build_iters = int(self.qsettings.value("appSettings/layoutAlgoBuildIterations", defaultValue="12"))
         spread_factor = int(self.qsettings.value("appSettings/layoutAlgoSpreadFactor", defaultValue="100"))
         neg_weight_exp = int(self.qsettings.value("appSettings/layoutAlgoNegWeightExp", defaultValue="2"))
+        fetch_prefetch = self._qsettings.value("appSettings/dbFetchPrefetch", defaultValue="true")
+        fetch_target_time = int(self._qsettings.value("appSettings/dbFetchTargetTime", defaultValue="200"))
+        fetch_min_chunk_size = int(self._qsettings.value("appSettings/dbFetchMinChunkSize", defaultValue="1000"))
+        fetch_max_chunk_size = int(self._qsettings.value("appSettings/dbFetchMaxChunkSize", defaultValue="200000"))
+        max_concurrent_queries = int(self._qsettings.value("appSettings/dbMaxConcurrentQueries", defaultValue="4"))
+        value_cache_size = int(self._qsettings.value("appSettings/valueCacheSize", defaultValue="256"))
         if commit_at_exit == 0:  # Not needed but makes the code more readable.
             self.ui.checkBox_commit_at_exit.setCheckState(Qt.CheckState.Unchecked)
         elif commit_at_exit == 1:
@@ -195,6 +201,12 @@ class SpineDBEditorSettingsMixin:
         self.ui.spinBox_layout_algo_max_iterations.setValue(build_iters)
         self.ui.spinBox_layout_algo_spread_factor.setValue(spread_factor)
         self.ui.spinBox_layout_algo_neg_weight_exp.setValue(neg_weight_exp)
+        self.ui.checkBox_fetch_prefetch.setChecked(fetch_prefetch == "true")
+        self.ui.spinBox_fetch_target_time.setValue(fetch_target_time)
+        self.ui.spinBox_fetch_min_chunk_size.setValue(fetch_min_chunk_size)
+        self.ui.spinBox_fetch_max_chunk_size.setValue(fetch_max_chunk_size)
+        self.ui.spinBox_fetch_max_concurrent_queries.setValue(max_concurrent_queries)
+        self.ui.spinBox_value_cache_size.setValue(value_cache_size)
 
     def save_settings(self):
         """Get selections and save them to persistent memory."""
@@ -226,6 +238,20 @@ class SpineDBEditorSettingsMixin:
         self._qsettings.setValue("appSettings/layoutAlgoSpreadFactor", spread_factor)
         neg_weight_exp = str(self.ui.spinBox_layout_algo_neg_weight_exp.value())
         self._qsettings.setValue("appSettings/layoutAlgoNegWeightExp", neg_weight_exp)
+        fetch_prefetch = "true" if self.ui.checkBox_fetch_prefetch.checkState().value else "false"
+        self._qsettings.setValue("appSettings/dbFetchPrefetch", fetch_prefetch)
+        fetch_target_time = str(self.ui.spinBox_fetch_target_time.value())
+        self._qsettings.setValue("appSettings/dbFetchTargetTime", fetch_target_time)
+        fetch_min_chunk_size = str(self.ui.spinBox_fetch_min_chunk_size.value())
+        self._qsettings.setValue("appSettings/dbFetchMinChunkSize", fetch_min_chunk_size)
+        fetch_max_chunk_size = str(self.ui.spinBox_fetch_max_chunk_size.value())
+        self._qsettings.setValue("appSettings/dbFetchMaxChunkSize", fetch_max_chunk_size)
+        max_concurrent_queries = str(self.ui.spinBox_fetch_max_concurrent_queries.value())
+        self._qsettings.setValue("appSettings/dbMaxConcurrentQueries", max_concurrent_queries)
+        value_cache_size = str(self.ui.spinBox_value_cache_size.value())
+        self._qsettings.setValue("appSettings/valueCacheSize", value_cache_size)
+        self.db_mngr.update_fetch_settings()
+        self.db_mngr.update_value_cache_size()
         return True
 
     def update_ui(self):
@@ -828,6 +854,8 @@ class SettingsWidget(SpineDBEditorSettingsMixin, SettingsWidgetBase):
             self._qsettings.value("engineSettings/maxPersistentProcesses", defaultValue=os.cpu_count())
         )
         self.ui.persistent_process_limit_spin_box.setValue(persistent_process_limit)
+        max_concurrent_dags = int(self._qsettings.value("engineSettings/maxConcurrentDags", defaultValue="0"))
+        self.ui.max_concurrent_dags_spin_box.setValue(max_concurrent_dags)
 
     @Slot()
     def save_settings(self):
@@ -985,6 +1013,7 @@ class SettingsWidget(SpineDBEditorSettingsMixin, SettingsWidgetBase):
         self._qsettings.setValue(
             "engineSettings/maxPersistentProcesses", str(self.ui.persistent_process_limit_spin_box.value())
         )
+        self._qsettings.setValue("engineSettings/maxConcurrentDags", str(self.ui.max_concurrent_dags_spin_box.value()))
         return True
 
     def _get_julia_settings(self):
@@ -0,0 +1,100 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the CompoundTableModel class."""
+import unittest
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.mvcmodels.compound_table_model import CompoundTableModel
+from spinetoolbox.mvcmodels.minimal_table_model import MinimalTableModel
+
+
+class _FilteredCompoundModel(CompoundTableModel):
+    def __init__(self):
+        super().__init__(header=["number"])
+        self.rejected_models = set()
+        self.accepted_sub_rows_calls = []
+
+    def filter_accepts_model(self, model):
+        return model not in self.rejected_models
+
+    def _accepted_sub_rows(self, model):
+        self.accepted_sub_rows_calls.append(model)
+        return (row for row in range(model.rowCount()) if model._main_data[row][0] % 2 == 0)
+
+
+class TestCompoundTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._sub_models = []
+        for rows in ([[0], [1], [2]], [], [[3], [4]]):
+            sub_model = MinimalTableModel(header=["number"], lazy=False)
+            sub_model.reset_model(rows)
+            self._sub_models.append(sub_model)
+
+    def test_maps_rows_to_and_from_sub_models(self):
+        model = CompoundTableModel(header=["number"])
+        model.sub_models = list(self._sub_models)
+        model.refresh()
+        self.assertEqual(model.rowCount(), 5)
+        self.assertEqual([model.index(row, 0).data() for row in range(5)], [0, 1, 2, 3, 4])
+        first, _, last = self._sub_models
+        self.assertIs(model.sub_model_at_row(3), last)
+        self.assertEqual(model.sub_model_row(3), 0)
+        self.assertEqual(model.item_at_row(4), [4])
+        self.assertEqual(model.map_from_sub(last, last.index(1, 0)).row(), 4)
+        self.assertEqual(model.map_from_sub(first, first.index(2, 0)).row(), 2)
+        self.assertFalse(model.map_to_sub(model.index(5, 0)).isValid())
+
+    def test_filtered_rows(self):
+        model = _FilteredCompoundModel()
+        model.sub_models = list(self._sub_models)
+        model.refresh()
+        self.assertEqual(model.rowCount(), 3)
+        self.assertEqual([model.index(row, 0).data() for row in range(3)], [0, 2, 4])
+        first, _, last = self._sub_models
+        self.assertFalse(model.map_from_sub(first, first.index(1, 0)).isValid())
+        self.assertEqual(model.map_from_sub(first, first.index(2, 0)).row(), 1)
+        self.assertEqual(model.map_from_sub(last, last.index(1, 0)).row(), 2)
+
+    def test_refresh_reuses_accepted_rows_of_unchanged_sub_models(self):
+        model = _FilteredCompoundModel()
+        model.sub_models = list(self._sub_models)
+        model.refresh()
+        first, _, last = self._sub_models
+        model.accepted_sub_rows_calls.clear()
+        model.rejected_models.add(first)
+        model.refresh()
+        self.assertEqual(model.accepted_sub_rows_calls, [])
+        self.assertEqual([model.index(row, 0).data() for row in range(model.rowCount())], [4])
+        model.rejected_models.clear()
+        model._invalidate_sub_model_rows(last)
+        model.refresh()
+        self.assertEqual(model.accepted_sub_rows_calls, [last])
+        self.assertEqual([model.index(row, 0).data() for row in range(model.rowCount())], [0, 2, 4])
+
+    def test_refresh_recomputes_rows_when_sub_model_row_count_changes(self):
+        model = CompoundTableModel(header=["number"])
+        model.sub_models = list(self._sub_models)
+        model.refresh()
+        middle = self._sub_models[1]
+        middle.insertRows(0, 1)
+        middle._main_data[0] = [23]
+        model.refresh()
+        self.assertEqual([model.index(row, 0).data() for row in range(model.rowCount())], [0, 1, 2, 23, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``execution_log_model`` module."""
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.execution_log_store import ExecutionLogStore
+from spinetoolbox.mvcmodels import execution_log_model
+from spinetoolbox.mvcmodels.execution_log_model import ExecutionLogModel
+
+
+class TestExecutionLogModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._store = ExecutionLogStore(os.path.join(self._temp_dir.name, "log.sqlite"))
+        self._store.append([("run", float(i), "item", "", "msg", f"message {i}") for i in range(1200)])
+        self._model = ExecutionLogModel()
+        self._model.set_store(self._store)
+
+    def tearDown(self):
+        self._model.deleteLater()
+        self._store.close()
+        self._temp_dir.cleanup()
+
+    def test_rows_are_fetched_in_pages(self):
+        self.assertEqual(self._model.rowCount(), 1200)
+        self.assertEqual(self._model.columnCount(), 5)
+        self.assertEqual(self._model.index(1100, 4).data(), "message 1100")
+        self.assertEqual(self._model.index(3, 1).data(), "item")
+        self.assertEqual(len(self._model._pages), 2)
+
+    def test_page_cache_is_bounded(self):
+        self._store.append([("run", 0.0, "item", "", "msg", "x")] * 20 * execution_log_model.PAGE_SIZE)
+        self._model.refresh()
+        for row in range(0, self._model.rowCount(), execution_log_model.PAGE_SIZE):
+            self._model.index(row, 4).data()
+        self.assertEqual(len(self._model._pages), execution_log_model.MAX_CACHED_PAGES)
+
+    def test_set_filter(self):
+        self._store.append([("run", 0.0, "item", "", "msg_error", "failure")])
+        self._model.set_filter(search="failure")
+        self.assertEqual(self._model.rowCount(), 1)
+        self.assertIsNotNone(self._model.index(0, 4).data(Qt.ItemDataRole.ForegroundRole))
+
+    def test_refresh_appends_new_records(self):
+        self._model.index(1199, 4).data()
+        self._store.append([("run", 0.0, "item", "", "msg", "new message")])
+        self._model.refresh()
+        self.assertEqual(self._model.rowCount(), 1201)
+        self.assertEqual(self._model.index(1200, 4).data(), "new message")
+
+    def test_pages_are_fetched_by_record_id(self):
+        with mock.patch.object(self._store, "fetch", wraps=self._store.fetch) as fetch, mock.patch.object(
+            self._store, "skip", wraps=self._store.skip
+        ) as skip:
+            page_size = execution_log_model.PAGE_SIZE
+            self.assertEqual(self._model.index(0, 4).data(), "message 0")
+            self.assertEqual(self._model.index(page_size, 4).data(), f"message {page_size}")
+            skip.assert_not_called()
+            self.assertEqual(fetch.call_args_list[0].args[0], 0)
+            self.assertEqual(fetch.call_args_list[1].args[0], page_size)
+
+    def test_jumping_to_unvisited_page_skips_from_nearest_known_page(self):
+        page_size = execution_log_model.PAGE_SIZE
+        self.assertEqual(self._model.index(0, 4).data(), "message 0")
+        with mock.patch.object(self._store, "skip", wraps=self._store.skip) as skip:
+            self.assertEqual(self._model.index(2 * page_size + 1, 4).data(), f"message {2 * page_size + 1}")
+            skip.assert_called_once_with(page_size, page_size, run=None, item=None, filter_id=None, search="")
+            self.assertEqual(self._model.index(page_size + 1, 4).data(), f"message {page_size + 1}")
+            skip.assert_called_once()
+
+    def test_refresh_counts_only_new_records(self):
+        self._store.append([("run", 0.0, "item", "", "msg", "new message")])
+        with mock.patch.object(self._store, "count", wraps=self._store.count) as count:
+            self._model.refresh()
+            count.assert_called_once_with(run=None, item=None, filter_id=None, search="", after_id=1200)
+            self._model.refresh()
+            count.assert_called_once()
+        self.assertEqual(self._model.rowCount(), 1201)
+
+
+if __name__ == "__main__":
+    unittest.main()
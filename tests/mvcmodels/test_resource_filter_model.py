@@ -91,6 +91,37 @@ class TestResourceFilterModel(unittest.TestCase):
                 model.data(base_alternative_index, Qt.ItemDataRole.CheckStateRole), Qt.CheckState.Checked.value
             )
 
+    def test_update_filter_names_inserts_and_removes_items_in_order(self):
+        connection = mock.MagicMock()
+        resource = database_resource("Data Store", "sqlite:///db.sqlite", filterable=True)
+        connection.database_resources = [resource]
+        project = mock.MagicMock()
+        names = {SCENARIO_FILTER_TYPE: ["a", "c"], ALTERNATIVE_FILTER_TYPE: ["Base"]}
+        connection.online_filters.side_effect = lambda resource_label, filter_type: {"c": False}
+        connection.get_filter_item_names.side_effect = lambda filter_type, url: names[filter_type]
+        connection.is_filter_online_by_default = True
+        with resource_filter_model(connection, project, self._undo_stack, self._logger) as model:
+            connection.resource_filter_model = model
+            model.build_tree()
+            scenario_root_index = model.index(0, 0, model.index(0, 0))
+            model.update_filter_names(resource.label, SCENARIO_FILTER_TYPE, {"b", "d"}, {"a"})
+            self.assertEqual(
+                [model.index(row, 0, scenario_root_index).data() for row in range(model.rowCount(scenario_root_index))],
+                ["Select all", "b", "c", "d"],
+            )
+            self.assertEqual(
+                model.index(1, 0, scenario_root_index).data(Qt.ItemDataRole.CheckStateRole), Qt.CheckState.Checked.value
+            )
+            self.assertEqual(
+                model.index(2, 0, scenario_root_index).data(Qt.ItemDataRole.CheckStateRole),
+                Qt.CheckState.Unchecked.value,
+            )
+            names[SCENARIO_FILTER_TYPE] = []
+            model.update_filter_names(resource.label, SCENARIO_FILTER_TYPE, set(), {"b", "c", "d"})
+            scenario_root_index = model.index(0, 0, model.index(0, 0))
+            self.assertEqual(model.rowCount(scenario_root_index), 1)
+            self.assertEqual(model.index(0, 0, scenario_root_index).data(), "None available")
+
 
 @contextmanager
 def resource_filter_model(connection, project, undo_stack, logger):
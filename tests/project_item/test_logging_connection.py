@@ -122,10 +122,16 @@ class TestLoggingConnectionWithDatabaseManager(unittest.TestCase):
         clean_up_toolbox(self._toolbox)
         self._temp_dir.cleanup()
 
-    def test_has_filters_when_database_has_an_unknown_scenario(self):
-        with signal_waiter(self._toolbox.db_mngr.items_added) as waiter:
-            self._toolbox.db_mngr.add_scenarios({self._db_map: [{"name": "Base", "id": 1}]})
+    def _add_committed_scenario(self, name):
+        db_mngr = self._toolbox.db_mngr
+        with signal_waiter(db_mngr.items_added) as waiter:
+            db_mngr.add_scenarios({self._db_map: [{"name": name, "id": 1}]})
             waiter.wait()
+        db_mngr.commit_session("Add test data.", self._db_map)
+        self.assertEqual(db_mngr.wait_for_session_tasks(self._db_map), [])
+
+    def test_has_filters_when_database_has_an_unknown_scenario(self):
+        self._add_committed_scenario("Base")
         connection = LoggingConnection("Store 1", "right", "Store 2", "left", toolbox=self._toolbox)
         connection.link = MagicMock()
         connection.receive_resources_from_source(
@@ -135,9 +141,7 @@ class TestLoggingConnectionWithDatabaseManager(unittest.TestCase):
         connection.tear_down()
 
     def test_set_online(self):
-        with signal_waiter(self._toolbox.db_mngr.items_added) as waiter:
-            self._toolbox.db_mngr.add_scenarios({self._db_map: [{"name": "Base", "id": 1}]})
-            waiter.wait()
+        self._add_committed_scenario("Base")
         filter_settings = FilterSettings({"database@Store 1": {"scenario_filter": {"Base": False}}})
         connection = LoggingConnection(
             "Store 1", "bottom", "Store 2", "top", toolbox=self._toolbox, filter_settings=filter_settings
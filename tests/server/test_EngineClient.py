@@ -12,19 +12,25 @@
 
 """Contains tests for the EngineClient class."""
 import unittest
+import io
+import json
 import os
+import queue
+import threading
+import zlib
 from unittest import mock
 from tempfile import TemporaryDirectory
 from pathlib import Path
+from zipfile import ZipFile
 import zmq
 from PySide6.QtWidgets import QApplication
-from spinetoolbox.server.engine_client import EngineClient, ClientSecurityModel
+from spine_engine.server.util.server_message import ServerMessage
+from spinetoolbox.server.engine_client import EngineClient, ClientSecurityModel, iter_zipped_directory
 from spine_engine.server.engine_server import EngineServer, ServerSecurityModel
 from spine_engine.execution_managers.persistent_execution_manager import PythonPersistentExecutionManager
 from spine_engine.exception import RemoteEngineInitFailed
 from tests.mock_helpers import create_toolboxui_with_project, clean_up_toolbox
 
-
 client_sec_dir = os.path.join(str(Path(__file__).parent), "client_secfolder")
 server_sec_dir = os.path.join(str(Path(__file__).parent), "server_secfolder")
 
@@ -170,6 +176,169 @@ class TestEngineClient(unittest.TestCase):
         client.remove_project_from_server(job_id)
         client.close()
 
+    @mock.patch(
+        "spine_engine.server.project_extractor_service.ProjectExtractorService.INTERNAL_PROJECT_DIR",
+        new_callable=mock.PropertyMock,
+    )
+    def test_upload_project_dir_falls_back_to_single_frame_when_server_does_not_stream(self, mock_proj_dir):
+        mock_proj_dir.return_value = self._temp_dir.name
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        job_id, size = client.upload_project_dir("Hello World", self.project.project_dir)
+        self.assertTrue(isinstance(job_id, str))
+        self.assertTrue(len(job_id) == 32)
+        self.assertGreater(size, 0)
+        client.close()
+
+    def test_upload_project_dir_does_not_request_streaming_unless_server_advertises_it(self):
+        received = {}
+        server_thread = threading.Thread(target=_single_frame_server, args=(self.context, 5604, received))
+        server_thread.start()
+        client = EngineClient("localhost", 5604, ClientSecurityModel.NONE, "")
+        job_id, size = client.upload_project_dir("Hello World", self.project.project_dir)
+        client.close()
+        server_thread.join()
+        self.assertEqual(job_id, "single_frame_job")
+        self.assertEqual(received["commands"], ["ping", "prepare_execution"])
+        self.assertEqual(size, len(received["zip"]))
+        with ZipFile(io.BytesIO(received["zip"])) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+
+    def test_upload_project_dir_streams_chunks(self):
+        with open(os.path.join(self.project.project_dir, "data.bin"), "wb") as data_file:
+            data_file.write(os.urandom(20000))
+        received = {}
+        server_thread = threading.Thread(target=_streaming_server, args=(self.context, 5603, received))
+        server_thread.start()
+        client = EngineClient("localhost", 5603, ClientSecurityModel.NONE, "", ping=False)
+        job_id, size = client.upload_project_dir("Hello World", self.project.project_dir, chunk_size=1024, window=4)
+        client.close()
+        server_thread.join()
+        self.assertEqual(job_id, "streamed_job")
+        self.assertEqual(received["project_dir_name"], "Hello World")
+        self.assertEqual(received["resent"], 1)
+        self.assertLessEqual(received["max_in_flight"], 2)
+        data = b"".join(received["chunks"])
+        self.assertEqual(size, len(data))
+        self.assertEqual(received["end"], {"chunks": len(received["chunks"]), "size": size, "crc32": zlib.crc32(data)})
+        with ZipFile(io.BytesIO(data)) as zip_file:
+            self.assertEqual(len(zip_file.read("data.bin")), 20000)
+
+    def test_download_files_writes_chunks_to_disk(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "", ping=False)
+        client.client_project_dir = self._temp_dir.name
+        good_chunks = [b"first ", b"second"]
+        messages = [[b"incoming_file", b"good.txt [12 B]"]]
+        for seq, chunk in enumerate(good_chunks):
+            header = json.dumps({"seq": seq, "crc32": zlib.crc32(chunk)}).encode("utf-8")
+            messages.append([b"file_chunk", b"output/good.txt", header, chunk])
+        messages.append([b"file_chunk", b"bad.txt", json.dumps({"seq": 0, "crc32": 0}).encode("utf-8"), b"data"])
+        end_header = {"size": 12, "crc32": zlib.crc32(b"".join(good_chunks))}
+        messages.append([b"file_end", b"output/good.txt", json.dumps(end_header).encode("utf-8")])
+        messages.append([b"file_end", b"bad.txt", json.dumps({"size": 4, "crc32": 0}).encode("utf-8")])
+        messages.append([b"END", b""])
+        q = queue.Queue()
+        with mock.patch.object(client, "rcv_next", side_effect=messages):
+            client.download_files(q)
+        client.close()
+        with open(os.path.join(self._temp_dir.name, "output", "good.txt"), "rb") as good_file:
+            self.assertEqual(good_file.read(), b"first second")
+        self.assertFalse(os.path.exists(os.path.join(self._temp_dir.name, "bad.txt")))
+        statuses = [q.get_nowait()[1]["msg_type"] for _ in range(q.qsize())]
+        self.assertEqual(statuses, ["warning", "neutral", "fail", "neutral"])
+
+
+class TestIterZippedDirectory(unittest.TestCase):
+    def test_chunks_form_zip_archive(self):
+        with TemporaryDirectory() as temp_dir:
+            os.makedirs(os.path.join(temp_dir, "sub", "empty"))
+            with open(os.path.join(temp_dir, "sub", "data.bin"), "wb") as data_file:
+                data_file.write(os.urandom(5000))
+            with open(os.path.join(temp_dir, "readme.txt"), "w") as text_file:
+                text_file.write("hello")
+            chunks = list(iter_zipped_directory(temp_dir, chunk_size=512))
+            self.assertTrue(all(len(chunk) == 512 for chunk in chunks[:-1]))
+            self.assertLessEqual(len(chunks[-1]), 512)
+            with ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                self.assertEqual(zip_file.read("readme.txt"), b"hello")
+                with open(os.path.join(temp_dir, "sub", "data.bin"), "rb") as data_file:
+                    self.assertEqual(zip_file.read("sub/data.bin"), data_file.read())
+                self.assertIn("sub/empty/", zip_file.namelist())
+
+
+def _streaming_server(context, port, received):
+    """Serves a single streamed upload, rejecting chunk 1 once and acknowledging chunks only when client waits."""
+    socket = context.socket(zmq.ROUTER)
+    socket.bind(f"tcp://*:{port}")
+    received.update(chunks={}, resent=0, max_in_flight=0)
+    pending = []
+    try:
+        while True:
+            if pending and not socket.poll(100):
+                for ack in pending:
+                    socket.send_multipart(
+                        [identity, b"", ServerMessage("upload_chunk", "t", json.dumps(ack)).to_bytes()]
+                    )
+                pending.clear()
+                continue
+            identity, *frames = socket.recv_multipart()
+            request = ServerMessage.parse(frames[0])
+            if request.getCommand() == "ping":
+                capabilities = json.dumps({"capabilities": ["prepare_execution_stream"]})
+                socket.send_multipart([identity, b"", ServerMessage("ping", request.getId(), capabilities).to_bytes()])
+            elif request.getCommand() == "prepare_execution_stream":
+                received["project_dir_name"] = request.getData()
+                settings = json.dumps({"chunk_size": 4096, "window": 2})
+                socket.send_multipart(
+                    [identity, b"", ServerMessage("prepare_execution_stream", "t", settings).to_bytes()]
+                )
+            elif request.getCommand() == "upload_chunk":
+                header = request.getData()
+                seq = header["seq"]
+                if seq == 1 and not received["resent"]:
+                    received["resent"] = 1
+                    pending.append({"seq": seq, "status": "checksum_mismatch"})
+                else:
+                    assert zlib.crc32(frames[1]) == header["crc32"]
+                    received["chunks"][seq] = frames[1]
+                    pending.append({"seq": seq, "status": "ok"})
+                received["max_in_flight"] = max(received["max_in_flight"], len(pending))
+            elif request.getCommand() == "upload_end":
+                received["end"] = request.getData()
+                received["chunks"] = [received["chunks"][seq] for seq in sorted(received["chunks"])]
+                socket.send_multipart(
+                    [identity, b"", ServerMessage("prepare_execution", "streamed_job", "").to_bytes()]
+                )
+                break
+    finally:
+        socket.close()
+
+
+def _single_frame_server(context, port, received):
+    """Serves a ping and a single frame upload like servers that do not support streaming."""
+    socket = context.socket(zmq.ROUTER)
+    socket.bind(f"tcp://*:{port}")
+    received["commands"] = []
+    try:
+        while True:
+            identity, *frames = socket.recv_multipart()
+            request = ServerMessage.parse(frames[0])
+            received["commands"].append(request.getCommand())
+            if request.getCommand() == "ping":
+                socket.send_multipart([identity, b"", ServerMessage("ping", request.getId(), "").to_bytes()])
+            elif request.getCommand() == "prepare_execution":
+                received["zip"] = frames[1]
+                socket.send_multipart(
+                    [identity, b"", ServerMessage("prepare_execution", "single_frame_job", "").to_bytes()]
+                )
+                break
+            else:
+                socket.send_multipart(
+                    [identity, b"", ServerMessage("", "", json.dumps(("server_init_failed", "unknown"))).to_bytes()]
+                )
+    finally:
+        socket.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,155 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ColumnarPivotModel class."""
+import unittest
+from spinetoolbox.spine_db_editor.mvcmodels.columnar_pivot_model import ColumnarPivotModel
+from spinetoolbox.spine_db_editor.mvcmodels.pivot_model import PivotModel
+
+
+class _Header:
+    @staticmethod
+    def accepts(header_id):
+        return True
+
+    def header_data(self, header_id):
+        return header_id
+
+
+INDEX_IDS = {"test1": _Header(), "test2": _Header(), "test3": _Header()}
+DATA = {
+    ("a", "aa", 1): "value_a_aa_1",
+    ("a", "bb", 2): "value_a_bb_2",
+    ("b", "cc", 3): "value_b_cc_3",
+    ("c", "cc", 4): "value_c_cc_4",
+    ("d", "dd", 5): "value_d_dd_5",
+    ("e", "ee", 5): "value_e_ee_5",
+}
+
+
+class TestColumnarPivotModel(unittest.TestCase):
+    def _make_models(self, data, rows, columns, frozen=None, frozen_value=()):
+        frozen = frozen if frozen is not None else []
+        models = []
+        for model in (PivotModel(), ColumnarPivotModel(factor_sizes=(1, 1, 1))):
+            model.reset_model(data, INDEX_IDS, rows, columns, frozen, frozen_value)
+            models.append(model)
+        return models
+
+    def test_reset_model_matches_pivot_model(self):
+        expected, model = self._make_models(DATA, ["test1", "test2"], ["test3"])
+        self.assertEqual(model.rows, expected.rows)
+        self.assertEqual(model.columns, expected.columns)
+        row_mask = range(len(model.rows))
+        column_mask = range(len(model.columns))
+        self.assertEqual(
+            model.get_pivoted_data(row_mask, column_mask), expected.get_pivoted_data(row_mask, column_mask)
+        )
+
+    def test_frozen_index_filters_rows(self):
+        expected, model = self._make_models(DATA, ["test1"], ["test3"], ["test2"], ("cc",))
+        self.assertEqual(model.rows, [("b",), ("c",)])
+        self.assertEqual(model.rows, expected.rows)
+        self.assertEqual(model.columns, expected.columns)
+        self.assertEqual(model.get_pivoted_data(range(2), range(2)), [["value_b_cc_3", None], [None, "value_c_cc_4"]])
+
+    def test_add_to_model_returns_inserted_positions(self):
+        expected, model = self._make_models(DATA, ["test1", "test2"], ["test3"])
+        new_data = {("bb", "xx", 6): "value_bb_xx_6"}
+        self.assertEqual(model.add_to_model(new_data), expected.add_to_model(new_data))
+        self.assertEqual(model.rows, expected.rows)
+        self.assertEqual(model.columns, expected.columns)
+
+    def test_remove_from_model_returns_removed_positions(self):
+        expected, model = self._make_models(DATA, ["test1", "test2"], ["test3"])
+        removed = {("b", "cc", 3): None}
+        self.assertEqual(model.remove_from_model(removed), expected.remove_from_model(removed))
+        self.assertEqual(model.rows, expected.rows)
+        self.assertEqual(model.columns, expected.columns)
+
+    def test_product_spans_all_combinations(self):
+        model = ColumnarPivotModel(factor_sizes=(1, 1, 1))
+        model.reset_model({}, INDEX_IDS, ["test1"], ["test2"], ["test3"], (1,))
+        model.add_product({"part": [[("a",), ("b",)], [("x",), ("y",), ("z",)], [(1,)]]})
+        self.assertEqual(model.frozen_value, (1,))
+        self.assertEqual(model.rows, [("a",), ("b",)])
+        self.assertEqual(model.columns, [("x",), ("y",), ("z",)])
+        self.assertEqual(model.get_pivoted_data(range(2), range(3)), [[None, None, None], [None, None, None]])
+        model.update_model({("b", "y", 1): 2.3})
+        self.assertEqual(model.get_pivoted_data([1], [1]), [[2.3]])
+        self.assertTrue(model.has_frozen_value((1,)))
+        self.assertFalse(model.has_frozen_value((2,)))
+
+    def test_remove_product_removes_rows(self):
+        model = ColumnarPivotModel(factor_sizes=(1, 1, 1))
+        model.reset_model({}, INDEX_IDS, ["test1"], ["test2"], ["test3"], (1,))
+        model.add_product({"part": [[("a",), ("b",), ("c",)], [("x",)], [(1,)]]})
+        self.assertEqual(model.remove_product({"part": [[("b",)], [], []]}), ([1], []))
+        self.assertEqual(model.rows, [("a",), ("c",)])
+        self.assertEqual(model.product_frozen_values({"part": [[("a",)], [], []]}), {(1,)})
+
+    def test_adding_data_in_batches_matches_pivot_model(self):
+        expected, model = self._make_models({}, ["test1"], ["test2"], ["test3"], (5,))
+        for batch in ({("d", "dd", 5): "value_d_dd_5"}, {("b", "ee", 5): "value_b_ee_5"}, DATA):
+            self.assertEqual(model.add_to_model(batch), expected.add_to_model(batch))
+            self.assertEqual(model.rows, expected.rows)
+            self.assertEqual(model.columns, expected.columns)
+            row_mask = range(len(model.rows))
+            column_mask = range(len(model.columns))
+            self.assertEqual(
+                model.get_pivoted_data(row_mask, column_mask), expected.get_pivoted_data(row_mask, column_mask)
+            )
+
+    def test_product_added_in_batches_matches_rebuilt_headers(self):
+        model = ColumnarPivotModel(factor_sizes=(1, 1, 1))
+        model.reset_model({}, INDEX_IDS, ["test1"], ["test2"], ["test3"], (1,))
+        self.assertEqual(model.add_product({"part": [[("c",)], [("y",)], [(1,)]]}), ([0], [0]))
+        self.assertEqual(model.add_product({"part": [[("a",), ("d",)], [], []]}), ([0, 2], []))
+        self.assertEqual(model.add_to_model({("b", "x", 1): 2.3, ("b", "x", 2): 5.0}), ([1], [0]))
+        self.assertEqual(model.add_product({"part": [[], [("z",)], []]}), ([], [2]))
+        self.assertEqual(model.rows, [("a",), ("b",), ("c",), ("d",)])
+        self.assertEqual(model.columns, [("x",), ("y",), ("z",)])
+        data = model.get_pivoted_data(range(4), range(3))
+        model._reset_headers()
+        self.assertEqual(model.rows, [("a",), ("b",), ("c",), ("d",)])
+        self.assertEqual(model.columns, [("x",), ("y",), ("z",)])
+        self.assertEqual(model.get_pivoted_data(range(4), range(3)), data)
+        self.assertEqual(data[1], [2.3, None, None])
+
+    def test_reset_model_rejects_keys_not_matching_factor_sizes(self):
+        model = ColumnarPivotModel(factor_sizes=(2, 2))
+        with self.assertRaises(ValueError):
+            model.reset_model(DATA, INDEX_IDS, ["test1", "test2"], ["test3"])
+
+    def test_rekey_headers_restores_order_after_rename(self):
+        names = {"a": "alpha", "b": "beta", "c": "gamma"}
+        header = _Header()
+        header.header_data = names.get
+        model = ColumnarPivotModel(factor_sizes=(1, 1, 1))
+        model.reset_model(
+            {("a", "x", 1): 1.0, ("b", "x", 1): 2.0, ("c", "y", 1): 3.0},
+            {"test1": header, "test2": _Header(), "test3": _Header()},
+            ["test1"],
+            ["test2"],
+            ["test3"],
+            (1,),
+        )
+        self.assertEqual(model.rows, [("a",), ("b",), ("c",)])
+        names["a"] = "omega"
+        self.assertTrue(model.rekey_headers({"a"}))
+        self.assertEqual(model.rows, [("b",), ("c",), ("a",)])
+        self.assertEqual(model.get_pivoted_data([0, 2], [0]), [[2.0], [1.0]])
+        self.assertFalse(model.rekey_headers({"a"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
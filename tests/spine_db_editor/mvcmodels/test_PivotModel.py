@@ -286,6 +286,76 @@ class TestPivotModel(unittest.TestCase):
         self.assertEqual(model._row_data_header, [("a",), ("b",), ("c",)])
         self.assertEqual(model._column_data_header, [("aa",), ("cc",)])
 
+    def test_add_to_model_returns_positions_of_new_headers(self):
+        data = {("b", "bb", 1): 1.0, ("d", "dd", 1): 2.0}
+        model = PivotModel()
+        model.reset_model(data, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], [1])
+        rows, columns = model.add_to_model(
+            {("a", "bb", 1): 3.0, ("c", "cc", 1): 4.0, ("e", "bb", 1): 5.0, ("a", "xx", 2): 6.0}
+        )
+        self.assertEqual(rows, [0, 2, 4])
+        self.assertEqual(columns, [1])
+        self.assertEqual(model.rows, [("a",), ("b",), ("c",), ("d",), ("e",)])
+        self.assertEqual(model.columns, [("bb",), ("cc",), ("dd",)])
+        self.assertEqual(model.add_to_model({("b", "bb", 1): 7.0}), ([], []))
+
+    def test_remove_from_model_returns_positions_of_removed_headers(self):
+        data = {("a", "aa", 1): 1.0, ("b", "aa", 1): 2.0, ("c", "bb", 1): 3.0, ("d", "aa", 1): 4.0}
+        model = PivotModel()
+        model.reset_model(data, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], [1])
+        rows, columns = model.remove_from_model({("b", "aa", 1): None, ("c", "bb", 1): None, ("x", "xx", 1): None})
+        self.assertEqual(rows, [1, 2])
+        self.assertEqual(columns, [1])
+        self.assertEqual(model.rows, [("a",), ("d",)])
+        self.assertEqual(model.columns, [("aa",)])
+
+    def test_index_values_count_keys(self):
+        model = PivotModel()
+        model.reset_model(dict(DATA), INDEX_IDS)
+        self.assertEqual(model.index_values["test1"], {"a": 2, "b": 1, "c": 1, "d": 1, "e": 1})
+        model.remove_from_model({("a", "aa", 1): None, ("b", "cc", 3): None})
+        self.assertEqual(model.index_values["test1"], {"a": 1, "c": 1, "d": 1, "e": 1})
+        self.assertEqual(model.index_values["test2"], {"bb": 1, "cc": 1, "dd": 1, "ee": 1})
+        model.add_to_model({("f", "cc", 3): None})
+        self.assertEqual(model.index_values["test2"], {"bb": 1, "cc": 2, "dd": 1, "ee": 1})
+
+    def test_large_batches_keep_headers_sorted(self):
+        model = PivotModel()
+        model.reset_model({}, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], [1])
+        model.add_to_model({(str(i).zfill(3), "aa", 1): float(i) for i in range(0, 200, 2)})
+        rows, _ = model.add_to_model({(str(i).zfill(3), "aa", 1): float(i) for i in range(1, 200, 2)})
+        self.assertEqual(rows, list(range(1, 200, 2)))
+        self.assertEqual(model.rows, [(str(i).zfill(3),) for i in range(200)])
+        rows, _ = model.remove_from_model({(str(i).zfill(3), "aa", 1): None for i in range(0, 200, 2)})
+        self.assertEqual(rows, list(range(0, 200, 2)))
+        self.assertEqual(model.rows, [(str(i).zfill(3),) for i in range(1, 200, 2)])
+
+    def test_frozen_value_exists_while_data_has_it(self):
+        model = PivotModel()
+        model.reset_model(dict(DATA), INDEX_IDS, ("test1",), ("test2",), ("test3",), (5,))
+        self.assertTrue(model.has_frozen_value((5,)))
+        model.remove_from_model({("d", "dd", 5): None})
+        self.assertTrue(model.has_frozen_value((5,)))
+        model.remove_from_model({("e", "ee", 5): None})
+        self.assertFalse(model.has_frozen_value((5,)))
+
+    def test_rekey_headers_restores_order_after_rename(self):
+        names = {"a": "alpha", "b": "beta", "c": "gamma"}
+        headers = {"test1": _HeaderWithData(names), "test2": _Header(), "test3": _Header()}
+        model = PivotModel()
+        model.reset_model({("a", "aa", 1): 1.0, ("b", "aa", 1): 2.0, ("c", "bb", 1): 3.0}, headers)
+        model.set_pivot(["test1"], ["test2"], ["test3"], [1])
+        self.assertEqual(model.rows, [("a",), ("b",), ("c",)])
+        names["a"] = "omega"
+        self.assertTrue(model.rekey_headers({"a"}))
+        self.assertEqual(model.rows, [("b",), ("c",), ("a",)])
+        self.assertEqual(model.get_pivoted_data([0, 2], [0]), [[2.0], [1.0]])
+        self.assertFalse(model.rekey_headers({"a"}))
+        self.assertFalse(model.rekey_headers({"x"}))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,8 @@ import unittest
 from unittest.mock import patch
 from PySide6.QtWidgets import QApplication
 from spinedb_api import Map
+from spinetoolbox.spine_db_editor.mvcmodels.columnar_pivot_model import ColumnarPivotModel
+from spinetoolbox.spine_db_editor.mvcmodels.pivot_table_models import ParameterValuePivotTableModel
 from tests.mock_helpers import fetch_model
 from tests.spine_db_editor.helpers import TestBase
 
@@ -190,6 +192,50 @@ class TestParameterValuePivotTableModel(TestBase):
         data = self._model_data()
         self.assertEqual(data, expected)
 
+    def test_new_entity_is_inserted_to_its_sorted_position(self):
+        self._fill_model_with_data()
+        self._start()
+        inserted_rows = []
+        self._model.rowsInserted.connect(lambda parent, first, last: inserted_rows.append((first, last)))
+        self._model.modelReset.connect(lambda: self.fail("model was reset"))
+        self._db_mngr.import_data({self._db_map: {"entities": (("class1", "object0"),)}})
+        while not inserted_rows:
+            QApplication.processEvents()
+        self.assertEqual(inserted_rows, [(2, 2)])
+        self.assertEqual(self._model.rowCount(), 6)
+        self.assertEqual([self._model.index(row, 0).data() for row in range(2, 5)], ["object0", "object1", "object2"])
+        self.assertEqual(self._model.index(3, 1).data(), str(1.0))
+
+    def test_removed_entity_removes_only_its_row(self):
+        self._fill_model_with_data()
+        self._start()
+        removed_rows = []
+        self._model.rowsRemoved.connect(lambda parent, first, last: removed_rows.append((first, last)))
+        self._model.modelReset.connect(lambda: self.fail("model was reset"))
+        entity = self._db_map.get_entity_item(entity_class_name="class1", name="object2")
+        self._db_mngr.remove_items({self._db_map: {"entity": [entity["id"]]}})
+        while not removed_rows:
+            QApplication.processEvents()
+        self.assertEqual(removed_rows, [(3, 3)])
+        self.assertEqual(self._model.rowCount(), 4)
+        self.assertEqual(self._model.index(2, 0).data(), "object1")
+        self.assertEqual(self._model.index(2, 1).data(), str(1.0))
+
+    def test_renamed_entity_moves_to_its_sorted_position(self):
+        self._fill_model_with_data()
+        self._start()
+        layout_changes = []
+        self._model.layoutChanged.connect(lambda *args: layout_changes.append(args))
+        self._model.modelReset.connect(lambda: self.fail("model was reset"))
+        entity = self._db_map.get_entity_item(entity_class_name="class1", name="object1")
+        self._db_mngr.update_items("entity", {self._db_map: [{"id": entity["id"], "name": "object3"}]})
+        while not layout_changes:
+            QApplication.processEvents()
+        self.assertEqual(self._model.rowCount(), 5)
+        self.assertEqual([self._model.index(row, 0).data() for row in range(2, 4)], ["object2", "object3"])
+        self.assertEqual(self._model.index(2, 1).data(), str(3.0))
+        self.assertEqual(self._model.index(3, 1).data(), str(1.0))
+
     def test_drag_and_drop_database_from_frozen_table(self):
         self._fill_model_with_data()
         self._start()
@@ -227,6 +273,41 @@ class TestParameterValuePivotTableModel(TestBase):
                 self.assertEqual(self._model.index(row, column).data(), expected[row][column])
 
 
+class TestParameterValuePivotTableModelWithColumnarModel(TestParameterValuePivotTableModel):
+    def setUp(self):
+        threshold_patcher = patch.object(ParameterValuePivotTableModel, "COLUMNAR_MODEL_THRESHOLD", -1)
+        threshold_patcher.start()
+        self.addCleanup(threshold_patcher.stop)
+        super().setUp()
+
+    def test_model_is_columnar(self):
+        self._fill_model_with_data()
+        self._start()
+        self.assertIsInstance(self._model.model, ColumnarPivotModel)
+
+    def test_model_switches_to_columnar_when_fetched_combinations_exceed_threshold(self):
+        self._fill_model_with_data()
+        with patch.object(ParameterValuePivotTableModel, "COLUMNAR_MODEL_THRESHOLD", 4):
+            self._start()
+            self.assertNotIsInstance(self._model.model, ColumnarPivotModel)
+            self._db_mngr.import_data({self._db_map: {"entities": (("class1", "object0"),)}})
+            while not isinstance(self._model.model, ColumnarPivotModel):
+                QApplication.processEvents()
+            while self._model.rowCount() < 6:
+                QApplication.processEvents()
+        self.assertEqual(
+            self._model_data(),
+            [
+                ["parameter", "parameter1", "parameter2", None],
+                ["class1", None, None, None],
+                ["object0", None, None, None],
+                ["object1", str(1.0), str(5.0), None],
+                ["object2", str(3.0), str(7.0), None],
+                [None, None, None, None],
+            ],
+        )
+
+
 class TestIndexExpansionPivotTableModel(TestBase):
     def _start(self, initial_data):
         self._db_mngr.import_data({self._db_map: initial_data})
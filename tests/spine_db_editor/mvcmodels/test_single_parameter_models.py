@@ -122,6 +122,54 @@ class TestSingleObjectParameterValueModel(unittest.TestCase):
             model.add_rows([1])
             self.assertEqual(model.index(0, 0).data(DB_MAP_ROLE), self._db_map)
 
+    def test_accepted_rows_follow_filters(self):
+        self._db_mngr.add_entity_classes({self._db_map: [{"name": "my_class", "id": 1}]})
+        self._db_mngr.add_parameter_definitions(
+            {
+                self._db_map: [
+                    {"entity_class_id": 1, "name": "my_parameter", "id": 1},
+                    {"entity_class_id": 1, "name": "other_parameter", "id": 2},
+                ]
+            }
+        )
+        self._db_mngr.add_entities(
+            {self._db_map: [{"class_id": 1, "name": "object_1", "id": 1}, {"class_id": 1, "name": "object_2", "id": 2}]}
+        )
+        self._db_mngr.add_alternatives({self._db_map: [{"name": "alternative"}]})
+        entity_id = self._db_map.get_item("entity", class_id=1, name="object_1")["id"]
+        base_id = self._db_map.get_item("alternative", name="Base")["id"]
+        alternative_id = self._db_map.get_item("alternative", name="alternative")["id"]
+        value, type_ = to_database(2.3)
+        values = [
+            {
+                "entity_class_id": 1,
+                "entity_id": entity_id,
+                "parameter_definition_id": 1,
+                "value": value,
+                "type": type_,
+                "alternative_id": alternative_id,
+                "id": value_id,
+            }
+            for value_id, (entity_id, alternative_id) in enumerate(
+                ((1, base_id), (1, alternative_id), (2, base_id), (2, alternative_id)), start=1
+            )
+        ]
+        self._db_mngr.add_parameter_values({self._db_map: values})
+        with q_object(TestSingleParameterValueModel(self._db_mngr, self._db_map, 1, True)) as model:
+            fetch_model(model)
+            model.add_rows([1, 2, 3, 4])
+            self.assertEqual(list(model.accepted_rows()), [0, 1, 2, 3])
+            self.assertTrue(model.set_auto_filter("entity_byname", {("object_2",)}))
+            self.assertEqual(list(model.accepted_rows()), [2, 3])
+            self.assertTrue(model.set_filter_alternative_ids({self._db_map: {alternative_id}}))
+            self.assertEqual(list(model.accepted_rows()), [3])
+            self.assertTrue(model.set_auto_filter("entity_byname", set()))
+            self.assertTrue(model.set_filter_entity_ids({(self._db_map, 1): {entity_id}}))
+            self.assertEqual(list(model.accepted_rows()), [1])
+            self._db_mngr.add_parameter_values({self._db_map: [dict(values[1], id=5, parameter_definition_id=2)]})
+            model.add_rows([5])
+            self.assertEqual(list(model.accepted_rows()), [1, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
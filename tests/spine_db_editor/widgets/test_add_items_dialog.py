@@ -137,6 +137,7 @@ class TestAddItemsDialog(unittest.TestCase):
         with mock.patch.object(self._db_editor, "_get_commit_msg") as commit_msg:
             commit_msg.return_value = commit_message
             self._db_editor.ui.actionCommit.trigger()
+        self._db_mngr.wait_for_session_tasks(self._db_map)
 
 
 class TestManageElementsDialog(TestBase):
@@ -11,12 +11,16 @@
 ######################################################################################################################
 
 """Unit tests for ``commit_viewer`` module."""
+import time
 import unittest
 from unittest import mock
 from tempfile import TemporaryDirectory
+from PySide6.QtCore import QModelIndex
 from PySide6.QtWidgets import QApplication
+from spinedb_api import DatabaseMapping
 import spinetoolbox.resources_icons_rc  # pylint: disable=unused-import
 from spinetoolbox.spine_db_manager import SpineDBManager
+from spinetoolbox.spine_db_editor.mvcmodels.commit_list_model import CommitListModel
 from spinetoolbox.spine_db_editor.widgets.commit_viewer import CommitViewer, QSplitter
 
 
@@ -31,11 +35,12 @@ class TestCommitViewer(unittest.TestCase):
         with mock.patch("spinetoolbox.spine_db_editor.widgets.spine_db_editor.SpineDBEditor.restore_ui"):
             mock_settings = mock.Mock()
             mock_settings.value.side_effect = lambda *args, **kwargs: 0
+            self._settings = mock_settings
             self._db_mngr = SpineDBManager(mock_settings, None)
             logger = mock.MagicMock()
             self._temp_dir = TemporaryDirectory()
-            url = "sqlite:///" + self._temp_dir.name + "/db.sqlite"
-            self._db_map = self._db_mngr.get_db_map(url, logger, codename="mock_db", create=True)
+            self._url = "sqlite:///" + self._temp_dir.name + "/db.sqlite"
+            self._db_map = self._db_mngr.get_db_map(self._url, logger, codename="mock_db", create=True)
             with mock.patch.object(QSplitter, "restoreState"):
                 self._commit_viewer = CommitViewer(mock_settings, self._db_mngr, self._db_map)
 
@@ -58,6 +63,57 @@ class TestCommitViewer(unittest.TestCase):
     def test_tab_count(self):
         self.assertEqual(self._commit_viewer.centralWidget().count(), 1)
 
+    def test_commits_are_listed_newest_first_in_pages(self):
+        with DatabaseMapping(self._url) as db_map:
+            for name in ("alt1", "alt2", "alt3"):
+                db_map.add_alternative_item(name=name)
+                db_map.commit_session(f"Add {name}.")
+        model = CommitListModel(self._db_mngr, self._db_map, page_size=2)
+        self.assertTrue(model.canFetchMore(QModelIndex()))
+        model.fetchMore(QModelIndex())
+        _wait_for_fetch(model)
+        self.assertEqual([model.index(row, 0).data() for row in range(model.rowCount())], ["Add alt3.", "Add alt2."])
+        model.fetchMore(QModelIndex())
+        _wait_for_fetch(model)
+        model.fetchMore(QModelIndex())
+        _wait_for_fetch(model)
+        self.assertFalse(model.canFetchMore(QModelIndex()))
+        self.assertEqual(
+            [model.index(row, 0).data() for row in range(model.rowCount())],
+            ["Add alt3.", "Add alt2.", "Add alt1.", "Create the database"],
+        )
+        self.assertEqual(model.index(0, 1).data(), "anon")
+
+    def test_selecting_commit_shows_its_items(self):
+        with DatabaseMapping(self._url) as db_map:
+            db_map.add_alternative_item(name="alt1")
+            db_map.commit_session("Add alt1.")
+            db_map.add_scenario_item(name="scen1")
+            db_map.commit_session("Add scen1.")
+        with mock.patch.object(QSplitter, "restoreState"):
+            viewer = CommitViewer(self._settings, self._db_mngr, self._db_map)
+        db_viewer = viewer.centralWidget().widget(0)
+        model = db_viewer.commit_model
+        model.fetchMore(QModelIndex())
+        _wait_for_fetch(model)
+        db_viewer._commit_list.setCurrentIndex(model.index(1, 0))
+        affected_items = db_viewer._affected_items
+        deadline = time.monotonic() + 5.0
+        while affected_items.topLevelItem(0).text(0) == "Loading..." and time.monotonic() < deadline:
+            QApplication.processEvents()
+        self.assertEqual(affected_items.topLevelItemCount(), 1)
+        self.assertEqual(affected_items.topLevelItem(0).text(0), "alternative")
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt1")["name"], "alt1")
+        viewer.deleteLater()
+
+
+def _wait_for_fetch(model):
+    deadline = time.monotonic() + 5.0
+    while model.is_fetching() and time.monotonic() < deadline:
+        QApplication.processEvents()
+    if model.is_fetching():
+        raise RuntimeError("timeout while waiting for commits")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -19,6 +19,7 @@ from unittest import mock
 from PySide6.QtCore import QItemSelectionModel, QModelIndex
 from PySide6.QtWidgets import QApplication, QMessageBox
 from spinedb_api import Array, DatabaseMapping, import_functions, to_database
+from spinetoolbox.spine_db_worker import FetchSettings
 from tests.mock_helpers import fetch_model
 from tests.spine_db_editor.helpers import TestBase
 from tests.spine_db_editor.widgets.helpers import (
@@ -193,8 +194,8 @@ class TestParameterValueTableView(TestBase):
         for row, column in itertools.product(range(model.rowCount()), range(model.columnCount())):
             self.assertEqual(model.index(row, column).data(), expected[row][column])
 
-    @mock.patch("spinetoolbox.spine_db_worker._CHUNK_SIZE", new=1)
     def test_incremental_fetching_groups_values_by_entity_class(self):
+        self._db_mngr._get_worker(self._db_map).set_fetch_settings(_fixed_chunk_size_settings(1))
         tree_view = self._db_editor.ui.treeView_entity
         add_zero_dimension_entity_class(tree_view, "object_1_class")
         add_entity(tree_view, "an_object_1")
@@ -286,7 +287,10 @@ class TestParameterValueTableView(TestBase):
 class TestParameterValueTableWithExistingData(TestBase):
     _CHUNK_SIZE = 100  # This has to be large enough, so the chunk won't 'fit' into the table view.
 
-    @mock.patch("spinetoolbox.spine_db_worker._CHUNK_SIZE", new=_CHUNK_SIZE)
+    @mock.patch(
+        "spinetoolbox.spine_db_manager.FetchSettings.from_qsettings",
+        new=lambda qsettings: _fixed_chunk_size_settings(TestParameterValueTableWithExistingData._CHUNK_SIZE),
+    )
     def setUp(self):
         self._temp_dir = TemporaryDirectory()
         url = "sqlite:///" + os.path.join(self._temp_dir.name, "test_database.sqlite")
@@ -430,5 +434,11 @@ def _set_row_data(view, model, row, data, delegate_mock):
         delegate_mock.write_to_index(view, model.index(row, column), cell_data)
 
 
+def _fixed_chunk_size_settings(chunk_size):
+    return FetchSettings(
+        min_chunk_size=chunk_size, max_chunk_size=chunk_size, prefetch=False, initial_chunk_size=chunk_size
+    )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``graph_layout_generator`` module."""
+import unittest
+import numpy as np
+from spinedb_api.graph_layout_generator import GraphLayoutGenerator
+from spinetoolbox.spine_db_editor.widgets.graph_layout_generator import (
+    GRID_LAYOUT_VERTEX_COUNT,
+    GraphLayoutGeneratorRunnable,
+    GridForceLayoutGenerator,
+    _grid_neighbors,
+    _repulsion,
+    _REPULSION,
+)
+
+
+class TestGraphLayoutGeneratorRunnable(unittest.TestCase):
+    def test_large_graphs_use_grid_force_layout(self):
+        runnable = GraphLayoutGeneratorRunnable(None, GRID_LAYOUT_VERTEX_COUNT - 1)
+        self.assertIsInstance(runnable._generator, GraphLayoutGenerator)
+        runnable = GraphLayoutGeneratorRunnable(None, GRID_LAYOUT_VERTEX_COUNT)
+        self.assertIsInstance(runnable._generator, GridForceLayoutGenerator)
+
+
+class TestGridForceLayoutGenerator(unittest.TestCase):
+    def test_edges_get_close_to_spread(self):
+        side = 20
+        ids = np.arange(side * side).reshape(side, side)
+        src_inds = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+        dst_inds = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+        layouts = []
+        generator = GridForceLayoutGenerator(
+            side * side, src_inds, dst_inds, spread=10.0, layout_available=lambda x, y: layouts.append((x, y))
+        )
+        x, y = generator.compute_layout()
+        self.assertEqual(len(layouts), 1)
+        edge_lengths = np.hypot(x[src_inds] - x[dst_inds], y[src_inds] - y[dst_inds])
+        self.assertLess(np.median(edge_lengths), 20.0)
+        self.assertGreater(np.median(edge_lengths), 5.0)
+
+    def test_heavy_vertices_stay_in_place(self):
+        heavy_positions = {0: {"x": 0.0, "y": 0.0}, 1: {"x": 100.0, "y": 0.0}}
+        generator = GridForceLayoutGenerator(3, [0, 1], [2, 2], spread=10.0, heavy_positions=heavy_positions)
+        x, y = generator.compute_layout()
+        self.assertEqual((x[0], y[0]), (0.0, 0.0))
+        self.assertEqual((x[1], y[1]), (100.0, 0.0))
+        self.assertLess(abs(x[2] - 50.0), 20.0)
+        self.assertLess(abs(y[2]), 20.0)
+
+    def test_all_heavy_vertices_return_given_positions_immediately(self):
+        heavy_positions = {0: {"x": 1.0, "y": 2.0}, 1: {"x": 3.0, "y": 4.0}}
+        progress = []
+        generator = GridForceLayoutGenerator(
+            2, [0], [1], spread=10.0, heavy_positions=heavy_positions, layout_progressed=progress.append
+        )
+        x, y = generator.compute_layout()
+        self.assertEqual(list(x), [1.0, 3.0])
+        self.assertEqual(list(y), [2.0, 4.0])
+        self.assertEqual(progress, [])
+
+    def test_stopping_emits_current_layout(self):
+        layouts = []
+        generator = GridForceLayoutGenerator(
+            10,
+            list(range(9)),
+            list(range(1, 10)),
+            is_stopped=lambda: True,
+            layout_available=lambda x, y: layouts.append(x),
+        )
+        generator.compute_layout()
+        self.assertEqual(len(layouts), 1)
+        self.assertEqual(len(layouts[0]), 10)
+
+
+class TestGridNeighbors(unittest.TestCase):
+    def test_finds_vertices_in_adjacent_cells(self):
+        cells = np.array([[0, 0], [1, 1], [2, 2], [0, 2], [5, 5]])
+        vertices, neighbors = _grid_neighbors(cells, np.array([0, 1]))
+        pairs = set(zip(vertices.tolist(), neighbors.tolist()))
+        self.assertEqual(pairs, {(0, 1), (1, 0), (1, 2), (1, 3)})
+
+
+class TestRepulsion(unittest.TestCase):
+    def test_approximates_exact_forces(self):
+        rng = np.random.default_rng(0)
+        layout = rng.normal(0.0, 500.0, (1000, 2))
+        movable = np.arange(0, 1000, 10)
+        forces = _repulsion(layout, movable, 64.0)
+        delta = layout[movable, None, :] - layout[None, :, :]
+        distance_squared = np.sum(delta**2, axis=-1)
+        distance_squared[np.arange(len(movable)), movable] = np.inf
+        exact = _REPULSION * np.sum(delta * (64.0**2 / distance_squared)[..., None], axis=1)
+        errors = np.linalg.norm(forces - exact, axis=1) / np.linalg.norm(exact, axis=1)
+        self.assertLess(np.median(errors), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
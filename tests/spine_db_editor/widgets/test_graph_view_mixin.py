@@ -0,0 +1,88 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``graph_view_mixin`` module."""
+from spinetoolbox.spine_db_editor.graphics_items import ArcItem, EntityItem
+from .spine_db_editor_test_base import DBEditorTestBase
+
+
+class TestIncrementalGraphUpdate(DBEditorTestBase):
+    def setUp(self):
+        super().setUp()
+        self.put_mock_object_classes_in_db_mngr()
+        self.put_mock_objects_in_db_mngr()
+        self.put_mock_relationship_classes_in_db_mngr()
+        self.put_mock_relationships_in_db_mngr()
+        self.spine_db_editor.ui.graphicsView.set_property("max_entity_dimension_count", 2)
+
+    def _select_classes(self, *class_names):
+        class_ids = {self.mock_db_map.get_item("entity_class", name=name)["id"] for name in class_names}
+        self.spine_db_editor._selected_item_type_db_map_ids = {"entity_class": {self.mock_db_map: class_ids}}
+
+    def _complete_graph(self):
+        editor = self.spine_db_editor
+        editor._update_graph_data()
+        editor._layout_gen_id = object()
+        vertex_count = len(editor.db_map_entity_id_sets)
+        editor._complete_graph(editor._layout_gen_id, [100.0 * i for i in range(vertex_count)], vertex_count * [0.0])
+
+    def _scene_entity_items(self):
+        items = {}
+        for item in self.spine_db_editor.scene.items():
+            if type(item) is EntityItem:  # pylint: disable=unidiomatic-typecheck
+                items[item.name] = item
+        return items
+
+    def _scene_arc_items(self):
+        return [item for item in self.spine_db_editor.scene.items() if isinstance(item, ArcItem)]
+
+    def test_existing_items_are_kept_when_graph_grows(self):
+        self._select_classes("fish")
+        self._complete_graph()
+        items = self._scene_entity_items()
+        self.assertEqual(list(items), ["nemo"])
+        nemo_item = items["nemo"]
+        self._select_classes("fish", "dog", "fish__dog")
+        self._complete_graph()
+        items = self._scene_entity_items()
+        self.assertEqual(
+            set(items),
+            {"nemo", "pluto", "scooby", "fish__dog_nemo__pluto", "fish__dog_nemo__scooby", "dog__fish_pluto__nemo"},
+        )
+        self.assertIs(items["nemo"], nemo_item)
+        self.assertEqual(len(self._scene_arc_items()), 6)
+        self.assertEqual(len(self.spine_db_editor.arc_items), 6)
+
+    def test_items_of_deselected_entities_are_removed(self):
+        self._select_classes("fish", "dog", "fish__dog")
+        self._complete_graph()
+        items = self._scene_entity_items()
+        pluto_item = items["pluto"]
+        self.assertEqual(len(pluto_item.arc_items), 2)
+        self._select_classes("dog")
+        self._complete_graph()
+        items = self._scene_entity_items()
+        self.assertEqual(set(items), {"pluto", "scooby"})
+        self.assertIs(items["pluto"], pluto_item)
+        self.assertEqual(self._scene_arc_items(), [])
+        self.assertEqual(pluto_item.arc_items, [])
+
+    def test_kept_items_move_to_new_layout_positions(self):
+        self._select_classes("dog")
+        self._complete_graph()
+        editor = self.spine_db_editor
+        editor._update_graph_data()
+        editor._layout_gen_id = object()
+        editor._complete_graph(editor._layout_gen_id, [-50.0, 50.0], [20.0, 20.0])
+        positions = {(item.pos().x(), item.pos().y()) for item in self._scene_entity_items().values()}
+        self.assertEqual(positions, {(-50.0, -20.0), (50.0, -20.0)})
@@ -11,9 +11,11 @@
 ######################################################################################################################
 
 """Unit tests for SpineDBEditor classes."""
+from pathlib import Path
 from tempfile import TemporaryDirectory
 from PySide6.QtCore import QPoint
 from spinetoolbox.spine_db_editor.widgets.multi_spine_db_editor import MultiSpineDBEditor
+from spinetoolbox.spine_db_editor.widgets.custom_qwidgets import OpenFileButton
 from .spine_db_editor_test_base import DBEditorTestBase
 from tests.mock_helpers import create_toolboxui_with_project, clean_up_toolbox, FakeDataStore
 
@@ -40,3 +42,17 @@ class TestMultiSpineDBEditor(DBEditorTestBase):
         self._toolbox.project()._project_items = {"a": FakeDataStore("a")}
         multieditor.show_plus_button_context_menu(QPoint(0, 0))
         multieditor._take_tab(0)
+
+    def test_aborted_export_removes_open_file_button(self):
+        self.db_mngr.setParent(self._toolbox)
+        multieditor = MultiSpineDBEditor(self.db_mngr)
+        multieditor.add_new_tab()
+        file_path = str(Path(self._temp_dir.name, "export.json"))
+        tab = multieditor.tab_widget.widget(0)
+        tab.file_exported.emit(file_path, 0.0, False)
+        buttons = multieditor.statusBar().findChildren(OpenFileButton)
+        self.assertEqual(len(buttons), 1)
+        tab.file_export_aborted.emit(file_path)
+        self.assertTrue(buttons[0].isHidden())
+        multieditor._take_tab(0)
+
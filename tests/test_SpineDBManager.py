@@ -11,6 +11,7 @@
 ######################################################################################################################
 
 """Unit tests for the spine_db_manager module."""
+import json
 import time
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -19,6 +20,7 @@ from unittest.mock import MagicMock
 from PySide6.QtCore import Qt, QSettings
 from PySide6.QtWidgets import QApplication
 from spinedb_api import (
+    DatabaseMapping,
     to_database,
     DateTime,
     Duration,
@@ -30,6 +32,7 @@ from spinedb_api.parameter_value import join_value_and_type, from_database, Map,
 from spinedb_api import import_functions
 from spinedb_api.spine_io.importers.excel_reader import get_mapped_data_from_xlsx
 from spinetoolbox.fetch_parent import FlexibleFetchParent
+from spinetoolbox.mvcmodels.shared import PARSED_ROLE
 
 from spinetoolbox.spine_db_manager import SpineDBManager
 from spinetoolbox.helpers import signal_waiter
@@ -238,6 +241,122 @@ class TestAddItems(unittest.TestCase):
         )
 
 
+class TestGetItemsByField(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_mngr = SpineDBManager(None, None)
+        self._db_map = self._db_mngr.get_db_map("sqlite://", MagicMock(), create=True)
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+
+    def test_lookups_follow_added_updated_and_removed_items(self):
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt"), {})
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt", "description": "old"}]})
+        alternative = self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt")
+        self.assertEqual(alternative["description"], "old")
+        self._db_mngr.update_items("alternative", {self._db_map: [{"id": alternative["id"], "description": "new"}]})
+        self.assertEqual(self._db_mngr.get_items_by_field(self._db_map, "alternative", "description", "old"), [])
+        self.assertEqual(
+            [x["name"] for x in self._db_mngr.get_items_by_field(self._db_map, "alternative", "description", "new")],
+            ["alt"],
+        )
+        self._db_mngr.remove_items({self._db_map: {"alternative": {alternative["id"]}}})
+        self.assertEqual(self._db_mngr.get_items_by_field(self._db_map, "alternative", "name", "alt"), [])
+        self._db_mngr.undo_stack[self._db_map].undo()
+        restored = self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt")
+        self.assertEqual(restored["id"], alternative["id"])
+
+
+class TestCommandGroup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_mngr = SpineDBManager(None, None)
+        self._db_map = self._db_mngr.get_db_map("sqlite://", MagicMock(), create=True)
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+
+    def test_commands_within_group_undo_as_one(self):
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt", "description": "old"}]})
+        alternative_id = self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt")["id"]
+        undo_stack = self._db_mngr.undo_stack[self._db_map]
+        command_count = undo_stack.count()
+        with self._db_mngr.command_group():
+            self._db_mngr.update_items("alternative", {self._db_map: [{"id": alternative_id, "description": "new"}]})
+            with self._db_mngr.command_group():
+                self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt2"}]})
+        self.assertEqual(undo_stack.count(), command_count + 1)
+        undo_stack.undo()
+        self.assertEqual(self._db_mngr.get_item(self._db_map, "alternative", alternative_id)["description"], "old")
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "alternative", "name", "alt2"), {})
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt3"}]})
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt4"}]})
+        self.assertEqual(undo_stack.count(), command_count + 2)
+
+
+class TestValueCaching(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_mngr = SpineDBManager(None, None)
+        self._db_map = self._db_mngr.get_db_map("sqlite://", MagicMock(), create=True)
+        import_functions.import_data(
+            self._db_map,
+            entity_classes=(("Widget",),),
+            entities=(("Widget", "gadget"),),
+            parameter_definitions=(("Widget", "weight"),),
+            parameter_values=(("Widget", "gadget", "weight", Map(["a", "b"], [2.3, 5.0])),),
+        )
+        self._value_id = self._db_map.get_item(
+            "parameter_value",
+            entity_class_name="Widget",
+            entity_byname=("gadget",),
+            parameter_definition_name="weight",
+            alternative_name="Base",
+        )["id"]
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+
+    def test_parsed_value_is_reused_until_value_is_updated(self):
+        parsed = self._db_mngr.get_value(self._db_map, "parameter_value", self._value_id, PARSED_ROLE)
+        self.assertIs(self._db_mngr.get_value(self._db_map, "parameter_value", self._value_id, PARSED_ROLE), parsed)
+        self.assertEqual(
+            self._db_mngr.get_value_index(
+                self._db_map, "parameter_value", self._value_id, "b", Qt.ItemDataRole.DisplayRole
+            ),
+            "5.0",
+        )
+        value, type_ = to_database(Map(["b"], [-1.0]))
+        self._db_mngr.update_items(
+            "parameter_value", {self._db_map: [{"id": self._value_id, "value": value, "type": type_}]}
+        )
+        self.assertEqual(
+            self._db_mngr.get_value(self._db_map, "parameter_value", self._value_id, PARSED_ROLE), Map(["b"], [-1.0])
+        )
+        self.assertEqual(
+            self._db_mngr.get_value_index(
+                self._db_map, "parameter_value", self._value_id, "b", Qt.ItemDataRole.DisplayRole
+            ),
+            "-1.0",
+        )
+
+
 class TestImportExportData(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -509,5 +628,168 @@ class TestUpdateExpandedParameterValues(unittest.TestCase):
         self.assertEqual(update_value, Map(["a"], ["c"]))
 
 
+class TestAsynchronousCommitAndRollback(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._db_url = "sqlite:///" + str(Path(self._temp_dir.name, "db.sqlite"))
+        self._db_mngr = SpineDBManager(QSettings(), None)
+        self._logger = MagicMock()
+        self._db_map = self._db_mngr.get_db_map(self._db_url, self._logger, codename="database", create=True)
+        self._listener = MagicMock()
+        self._db_mngr.register_listener(self._listener, self._db_map)
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        while not self._db_map.closed:
+            QApplication.processEvents()
+        self._db_mngr.clean_up()
+        self._temp_dir.cleanup()
+
+    def _wait_until_unlocked(self):
+        start = time.monotonic()
+        while self._db_mngr.is_session_locked(self._db_map):
+            QApplication.processEvents()
+            if time.monotonic() - start > 10.0:
+                self.fail("Session never got unlocked.")
+
+    def test_commit_returns_future_and_notifies_listeners_when_done(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "Widget"}]})
+        progress = []
+        self._db_mngr.commit_progress.connect(lambda db_map, written, total: progress.append((written, total)))
+        futures = self._db_mngr.commit_session("Add class.", self._db_map, cookie="cookie")
+        self.assertEqual(list(futures), [self._db_map])
+        self.assertTrue(self._db_mngr.is_session_locked(self._db_map))
+        self._wait_until_unlocked()
+        self.assertTrue(futures[self._db_map].done())
+        self._listener.receive_session_committed.assert_called_once_with([self._db_map], "cookie")
+        self.assertFalse(self._db_mngr.is_dirty(self._db_map))
+        self.assertEqual(progress[-1], (1, 1))
+        db_map = DatabaseMapping(self._db_url)
+        self.assertEqual([item["name"] for item in db_map.get_entity_class_items()], ["Widget"])
+        db_map.close()
+
+    def test_database_is_read_only_while_committing(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "Widget"}]})
+        error_messages = []
+        self._db_mngr.error_msg.connect(error_messages.append)
+        self._db_mngr.commit_session("Add class.", self._db_map)
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "Gadget"}]})
+        self.assertEqual(
+            error_messages, [{self._db_map: ["Database is read-only while a commit or rollback is in progress."]}]
+        )
+        self._wait_until_unlocked()
+        self.assertEqual([item["name"] for item in self._db_map.get_entity_class_items()], ["Widget"])
+
+    def test_rollback_returns_future_and_notifies_listeners_when_done(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "Widget"}]})
+        futures = self._db_mngr.rollback_session(self._db_map)
+        self.assertEqual(list(futures), [self._db_map])
+        self._wait_until_unlocked()
+        self._listener.receive_session_rolled_back.assert_called_once_with([self._db_map])
+        self.assertFalse(self._db_mngr.is_dirty(self._db_map))
+        self.assertEqual(self._db_map.get_entity_class_items(), [])
+
+    def test_wait_for_session_tasks_finishes_commit_synchronously(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "Widget"}]})
+        self._db_mngr.commit_session("Add class.", self._db_map)
+        self.assertEqual(self._db_mngr.wait_for_session_tasks(self._db_map), [])
+        self.assertFalse(self._db_mngr.is_session_locked(self._db_map))
+        self._listener.receive_session_committed.assert_called_once()
+        QApplication.processEvents()
+        self._listener.receive_session_committed.assert_called_once()
+
+
+class TestBackgroundExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._db_mngr = SpineDBManager(QSettings(), None)
+        self._logger = MagicMock()
+        db_url = "sqlite:///" + str(Path(self._temp_dir.name, "db.sqlite"))
+        self._db_map = self._db_mngr.get_db_map(db_url, self._logger, codename="database", create=True)
+        self._db_map.add_entity_class_item(name="Widget")
+        self._db_map.add_entity_item(entity_class_name="Widget", name="clock")
+        self._editor = MagicMock()
+        self._file_path = str(Path(self._temp_dir.name, "export.json"))
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        while not self._db_map.closed:
+            QApplication.processEvents()
+        self._db_mngr.clean_up()
+        self._temp_dir.cleanup()
+
+    def _wait_for_export(self):
+        start = time.monotonic()
+        while self._db_mngr.is_exporting(self._file_path):
+            QApplication.processEvents()
+            if time.monotonic() - start > 10.0:
+                self.fail("Export never finished.")
+
+    def test_export_json_in_background(self):
+        future = self._db_mngr.export_data(self._editor, {self._db_map: {}}, self._file_path, "JSON file (*.json)")
+        self.assertIsNotNone(future)
+        self._wait_for_export()
+        self._editor.file_exported.emit.assert_called_with(self._file_path, 1.0, False)
+        self._editor.file_export_aborted.emit.assert_not_called()
+        with open(self._file_path, encoding="utf-8") as json_file:
+            data = json.load(json_file)
+        self.assertEqual(data["entity_classes"], [["Widget", [], None, None, False]])
+        self.assertEqual(data["entities"], [["Widget", "clock", None]])
+
+    def test_cancelled_export_removes_file(self):
+        self._editor.file_exported.emit.side_effect = lambda *args: self._db_mngr.cancel_export(self._file_path)
+        self._db_mngr.export_data(self._editor, {self._db_map: {}}, self._file_path, "JSON file (*.json)")
+        self._wait_for_export()
+        self._editor.file_export_aborted.emit.assert_called_once_with(self._file_path)
+        self._editor.msg_error.emit.assert_not_called()
+        self.assertFalse(Path(self._file_path).exists())
+
+    def test_database_is_read_only_while_exporting(self):
+        error_messages = []
+        self._db_mngr.error_msg.connect(error_messages.append)
+        lock_changes = []
+        self._db_mngr.session_lock_changed.connect(lambda db_map, locked: lock_changes.append(locked))
+        self._db_mngr.export_data(self._editor, {self._db_map: {}}, self._file_path, "JSON file (*.json)")
+        self.assertTrue(self._db_mngr.is_read_only(self._db_map))
+        self.assertFalse(self._db_mngr.is_session_locked(self._db_map))
+        self._db_mngr.add_items("entity", {self._db_map: [{"entity_class_name": "Widget", "name": "fork"}]})
+        self.assertEqual(error_messages, [{self._db_map: ["Database is read-only while it is being exported."]}])
+        self._wait_for_export()
+        self.assertEqual(lock_changes, [True, False])
+        self.assertFalse(self._db_mngr.is_read_only(self._db_map))
+        with open(self._file_path, encoding="utf-8") as json_file:
+            data = json.load(json_file)
+        self.assertEqual(data["entities"], [["Widget", "clock", None]])
+        self._db_mngr.add_items("entity", {self._db_map: [{"entity_class_name": "Widget", "name": "fork"}]})
+        self.assertEqual(len(error_messages), 1)
+        self.assertEqual(sorted(item["name"] for item in self._db_map.get_entity_items()), ["clock", "fork"])
+
+    def test_cannot_export_while_committing(self):
+        self._db_mngr.add_items("entity", {self._db_map: [{"entity_class_name": "Widget", "name": "fork"}]})
+        self._db_mngr.commit_session("Add entity.", self._db_map)
+        future = self._db_mngr.export_data(self._editor, {self._db_map: {}}, self._file_path, "JSON file (*.json)")
+        self.assertIsNone(future)
+        self._editor.msg_error.emit.assert_called_once()
+        self.assertFalse(self._db_mngr.is_exporting(self._file_path))
+        self._db_mngr.wait_for_session_tasks(self._db_map)
+
+    def test_cannot_export_same_file_twice_simultaneously(self):
+        self._db_mngr._exports[self._file_path] = (self._editor, None, False)
+        future = self._db_mngr.export_data(self._editor, {self._db_map: {}}, self._file_path, "JSON file (*.json)")
+        self.assertIsNone(future)
+        self._editor.msg_error.emit.assert_called_once()
+        del self._db_mngr._exports[self._file_path]
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -811,6 +811,23 @@ class TestToolboxUIWithTestSettings(unittest.TestCase):
             settings = toolbox.qsettings()
             self.assertEqual(settings.value("appSettings/saveAtExit"), "automatic")
 
+    def test_new_run_prunes_old_runs_from_execution_log(self):
+        settings_dict = {"appSettings/executionLogRetainedRuns": "2"}
+        with toolbox_with_settings(settings_dict) as toolbox, TemporaryDirectory() as project_dir:
+            create_project(toolbox, project_dir)
+            store = toolbox.execution_log_store()
+            logs_dir = os.path.join(toolbox.project().config_dir, "logs")
+            for run in ("run:1", "run:2"):
+                store.append([(run, 0.0, "Tool", "", "msg", "hello")])
+                os.makedirs(os.path.join(logs_dir, run.replace(":", "-")))
+            toolbox.make_execution_timestamp("run:3")
+            self.assertEqual(store.runs(), ["run:2"])
+            self.assertFalse(os.path.exists(os.path.join(logs_dir, "run-1")))
+            self.assertTrue(os.path.exists(os.path.join(logs_dir, "run-2")))
+            with mock.patch("spinetoolbox.ui_main.QSettings.value") as mock_qsettings_value:
+                mock_qsettings_value.side_effect = qsettings_value_side_effect
+                toolbox.close_project(ask_confirmation=False)
+
 
 @contextmanager
 def toolbox_with_settings(settings_dict):
@@ -0,0 +1,93 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``console_output_buffer`` module."""
+import unittest
+from spinetoolbox.console_output_buffer import ConsoleOutputBuffer, next_batch_size, SpilledOutput
+
+
+class TestConsoleOutputBuffer(unittest.TestCase):
+    def setUp(self):
+        self._buffer = ConsoleOutputBuffer(3)
+
+    def tearDown(self):
+        self._buffer.close()
+
+    def test_put_tells_if_buffer_was_empty(self):
+        self.assertTrue(self._buffer.put("first"))
+        self.assertFalse(self._buffer.put("second"))
+
+    def test_take_merges_consecutive_output(self):
+        self._buffer.put("out 1")
+        self._buffer.put("out 2")
+        self._buffer.put("x = 1", with_prompt=True)
+        spilled, chunks = self._buffer.take(10)
+        self.assertIsNone(spilled)
+        self.assertEqual(chunks, [("out 1\nout 2", False), ("x = 1", True)])
+        self.assertFalse(self._buffer.has_pending())
+
+    def test_take_respects_maximum_chunk_count(self):
+        for text in ("a", "b", "c"):
+            self._buffer.put(text)
+        _, chunks = self._buffer.take(2)
+        self.assertEqual(chunks, [("a\nb", False)])
+        self.assertEqual(len(self._buffer), 1)
+        _, chunks = self._buffer.take(2)
+        self.assertEqual(chunks, [("c", False)])
+
+    def test_overflow_is_spilled_and_can_be_read_back(self):
+        for text in ("a", "b", "c", "d"):
+            self._buffer.put(text)
+        self._buffer.put("e\nf", with_prompt=True)
+        spilled, chunks = self._buffer.take(10)
+        self.assertEqual(spilled, SpilledOutput(0, 2))
+        self.assertEqual(chunks, [("c\nd", False), ("e\nf", True)])
+        self.assertEqual(self._buffer.read_spilled(spilled, 10), [("a", False), ("b", False)])
+        self.assertEqual(self._buffer.read_spilled(spilled, 1), [("b", False)])
+
+    def test_spilled_output_is_reported_once(self):
+        for text in ("a", "b", "c", "d"):
+            self._buffer.put(text)
+        spilled, _ = self._buffer.take(10)
+        self.assertEqual(spilled.count, 1)
+        for text in ("e", "f", "g", "h", "i"):
+            self._buffer.put(text)
+        second_spill, chunks = self._buffer.take(10)
+        self.assertEqual(second_spill.count, 2)
+        self.assertEqual(chunks, [("g\nh\ni", False)])
+        self.assertEqual(self._buffer.read_spilled(spilled, 10), [("a", False)])
+        self.assertEqual(self._buffer.read_spilled(second_spill, 10), [("e", False), ("f", False)])
+
+    def test_clear_drops_everything(self):
+        for text in ("a", "b", "c", "d"):
+            self._buffer.put(text)
+        self._buffer.clear()
+        self.assertFalse(self._buffer.has_pending())
+        self.assertEqual(self._buffer.take(10), (None, []))
+
+
+class TestNextBatchSize(unittest.TestCase):
+    def test_shrinks_when_flush_exceeds_budget(self):
+        self.assertEqual(next_batch_size(1000, 32.0, 16.0, 10, 10000), 500)
+
+    def test_grows_at_most_twofold(self):
+        self.assertEqual(next_batch_size(1000, 1.0, 16.0, 10, 10000), 2000)
+        self.assertEqual(next_batch_size(1000, 0.0, 16.0, 10, 10000), 2000)
+
+    def test_stays_within_limits(self):
+        self.assertEqual(next_batch_size(20, 1000.0, 16.0, 10, 10000), 10)
+        self.assertEqual(next_batch_size(8000, 1.0, 16.0, 10, 10000), 10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
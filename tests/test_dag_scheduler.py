@@ -0,0 +1,115 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``dag_scheduler`` module."""
+import unittest
+from spinetoolbox.dag_scheduler import (
+    DagScheduler,
+    FailurePolicy,
+    ITEM_MEMORY_ESTIMATE,
+    estimate_dag_memory,
+    parse_memory_size,
+)
+
+
+class TestDagScheduler(unittest.TestCase):
+    def test_starts_jobs_up_to_max_jobs(self):
+        scheduler = DagScheduler(max_jobs=2)
+        for job in ("a", "b", "c"):
+            scheduler.add(job)
+        self.assertEqual(scheduler.start_ready(), ["a", "b"])
+        self.assertEqual(scheduler.start_ready(), [])
+        self.assertEqual(scheduler.finish("a"), ["c"])
+        self.assertEqual(scheduler.finish("b"), [])
+        self.assertFalse(scheduler.is_done)
+        self.assertEqual(scheduler.finish("c"), [])
+        self.assertTrue(scheduler.is_done)
+        self.assertFalse(scheduler.has_failed)
+
+    def test_higher_priority_jobs_start_first(self):
+        scheduler = DagScheduler(max_jobs=1)
+        scheduler.add("low", priority=1)
+        scheduler.add("high", priority=5)
+        scheduler.add("also low", priority=1)
+        self.assertEqual(scheduler.start_ready(), ["high"])
+        self.assertEqual(scheduler.finish("high"), ["low"])
+        self.assertEqual(scheduler.finish("low"), ["also low"])
+
+    def test_memory_budget_limits_concurrency(self):
+        scheduler = DagScheduler(max_jobs=4, max_memory=100)
+        scheduler.add("a", memory=60)
+        scheduler.add("b", memory=60)
+        scheduler.add("c", memory=30)
+        self.assertEqual(scheduler.start_ready(), ["a"])
+        self.assertEqual(scheduler.finish("a"), ["b", "c"])
+
+    def test_job_larger_than_memory_budget_runs_alone(self):
+        scheduler = DagScheduler(max_jobs=4, max_memory=100)
+        scheduler.add("huge", memory=500)
+        scheduler.add("small", memory=10)
+        self.assertEqual(scheduler.start_ready(), ["huge"])
+        self.assertEqual(scheduler.finish("huge"), ["small"])
+
+    def test_fail_fast_discards_pending_jobs(self):
+        scheduler = DagScheduler(max_jobs=1, failure_policy=FailurePolicy.FAIL_FAST)
+        scheduler.add("a")
+        scheduler.add("b")
+        self.assertEqual(scheduler.start_ready(), ["a"])
+        self.assertEqual(scheduler.finish("a", failed=True), [])
+        self.assertTrue(scheduler.is_done)
+        self.assertTrue(scheduler.has_failed)
+
+    def test_continue_policy_runs_remaining_jobs_after_failure(self):
+        scheduler = DagScheduler(max_jobs=1, failure_policy=FailurePolicy.CONTINUE)
+        scheduler.add("a")
+        scheduler.add("b")
+        scheduler.start_ready()
+        self.assertEqual(scheduler.finish("a", failed=True), ["b"])
+        self.assertEqual(scheduler.finish("b"), [])
+        self.assertTrue(scheduler.has_failed)
+
+    def test_cancel_pending_returns_jobs_in_priority_order(self):
+        scheduler = DagScheduler(max_jobs=1)
+        scheduler.add("a")
+        scheduler.add("b", priority=1)
+        scheduler.add("c", priority=2)
+        self.assertEqual(scheduler.start_ready(), ["c"])
+        self.assertTrue(scheduler.is_running("c"))
+        self.assertEqual(scheduler.cancel_pending(), ["b", "a"])
+        self.assertEqual(scheduler.pending_count(), 0)
+        self.assertEqual(scheduler.running_count(), 1)
+
+    def test_max_jobs_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            DagScheduler(max_jobs=0)
+
+
+class TestParseMemorySize(unittest.TestCase):
+    def test_sizes_with_units(self):
+        self.assertEqual(parse_memory_size("1024"), 1024)
+        self.assertEqual(parse_memory_size("2K"), 2048)
+        self.assertEqual(parse_memory_size("512M"), 512 * 2**20)
+        self.assertEqual(parse_memory_size("4g"), 4 * 2**30)
+        self.assertEqual(parse_memory_size("1.5GiB"), int(1.5 * 2**30))
+
+    def test_invalid_size_raises(self):
+        with self.assertRaises(ValueError):
+            parse_memory_size("lots")
+
+
+class TestEstimateDagMemory(unittest.TestCase):
+    def test_counts_only_permitted_items(self):
+        self.assertEqual(estimate_dag_memory({"a": True, "b": False, "c": True}), 2 * ITEM_MEMORY_ESTIMATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``execution_cache`` module."""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+import networkx as nx
+from spinetoolbox.execution_cache import ExecutionCache, item_keys
+
+
+class TestExecutionCache(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._config_dir = Path(self._temp_dir.name, ".spinetoolbox")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_stored_key_makes_item_up_to_date(self):
+        cache = ExecutionCache(self._config_dir)
+        cache.load()
+        self.assertFalse(cache.is_up_to_date("item", "key"))
+        cache.store("item", "key")
+        self.assertTrue(cache.is_up_to_date("item", "key"))
+        self.assertFalse(cache.is_up_to_date("item", "other key"))
+        self.assertFalse(cache.is_up_to_date("item", None))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_save_and_load(self):
+        cache = ExecutionCache(self._config_dir)
+        cache.store("item", "key")
+        cache.store("discarded", "key")
+        cache.discard("discarded")
+        cache.save()
+        loaded = ExecutionCache(self._config_dir)
+        loaded.load()
+        self.assertTrue(loaded.is_up_to_date("item", "key"))
+        self.assertFalse(loaded.is_up_to_date("discarded", "key"))
+
+    def test_corrupted_cache_file_gives_empty_cache(self):
+        cache_path = self._config_dir / "local" / "execution_cache.json"
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text("{not json")
+        cache = ExecutionCache(self._config_dir)
+        cache.load()
+        self.assertFalse(cache.is_up_to_date("item", "key"))
+
+
+class TestItemKeys(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._project_dir = Path(self._temp_dir.name)
+        self._input_file = self._project_dir / "input.csv"
+        self._input_file.write_text("a,b\n")
+        self._dag = nx.DiGraph()
+        self._dag.add_edge("Input", "Importer")
+        self._dag.add_edge("Importer", "Store")
+        self._database_file = self._project_dir / "db.sqlite"
+        self._database_file.write_bytes(b"first")
+        self._item_dicts = {
+            "Input": {
+                "type": "Data Connection",
+                "x": 0.0,
+                "y": 0.0,
+                "file_references": [{"type": "path", "relative": True, "path": "input.csv"}],
+            },
+            "Importer": {"type": "Importer", "x": 1.0, "y": 0.0, "specification": "mapping"},
+            "Store": {
+                "type": "Data Store",
+                "x": 2.0,
+                "y": 0.0,
+                "url": {
+                    "dialect": "sqlite",
+                    "database": {"type": "path", "relative": True, "path": "db.sqlite"},
+                },
+            },
+        }
+        self._specification_dicts = {"Importer": [{"name": "mapping", "mapping": {"table": "data"}}]}
+        self._connection_dicts = [
+            {"from": ["Input", "right"], "to": ["Importer", "left"]},
+            {"from": ["Importer", "right"], "to": ["Store", "left"]},
+        ]
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _keys(self):
+        return item_keys(
+            self._dag, self._item_dicts, self._specification_dicts, self._connection_dicts, self._project_dir
+        )
+
+    def test_keys_are_stable(self):
+        keys = self._keys()
+        self.assertEqual(set(keys), {"Input", "Importer", "Store"})
+        self.assertTrue(all(key is not None for key in keys.values()))
+        self.assertEqual(self._keys(), keys)
+
+    def test_moving_item_on_scene_does_not_change_key(self):
+        keys = self._keys()
+        self._item_dicts["Importer"]["x"] = 100.0
+        self.assertEqual(self._keys(), keys)
+
+    def test_changed_input_file_propagates_to_successors(self):
+        keys = self._keys()
+        stat = self._input_file.stat()
+        os.utime(self._input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        new_keys = self._keys()
+        self.assertNotEqual(new_keys["Input"], keys["Input"])
+        self.assertNotEqual(new_keys["Importer"], keys["Importer"])
+        self.assertNotEqual(new_keys["Store"], keys["Store"])
+
+    def test_changed_specification_does_not_affect_predecessors(self):
+        keys = self._keys()
+        self._specification_dicts["Importer"][0]["mapping"] = {"table": "other"}
+        new_keys = self._keys()
+        self.assertEqual(new_keys["Input"], keys["Input"])
+        self.assertNotEqual(new_keys["Importer"], keys["Importer"])
+        self.assertNotEqual(new_keys["Store"], keys["Store"])
+
+    def test_changed_filter_settings_change_destination_key(self):
+        keys = self._keys()
+        self._connection_dicts[1]["resource_filters"] = {"db_url@Importer": {"scenario_filter": [1]}}
+        new_keys = self._keys()
+        self.assertEqual(new_keys["Importer"], keys["Importer"])
+        self.assertNotEqual(new_keys["Store"], keys["Store"])
+
+    def test_changed_output_database_invalidates_writing_item(self):
+        keys = self._keys()
+        self._database_file.write_bytes(b"second version")
+        new_keys = self._keys()
+        self.assertEqual(new_keys["Input"], keys["Input"])
+        self.assertNotEqual(new_keys["Importer"], keys["Importer"])
+
+    def test_run_generated_data_dir_contents_do_not_change_key(self):
+        keys = self._keys()
+        data_dir = self._project_dir / ".spinetoolbox" / "items" / "importer"
+        for run_dir in (data_dir / "logs", data_dir / "output" / "2022-01-01T00.00.00"):
+            run_dir.mkdir(parents=True)
+            (run_dir / "run.log").write_text("executed")
+        self.assertEqual(self._keys(), keys)
+
+    def test_other_data_dir_contents_change_key(self):
+        keys = self._keys()
+        data_dir = self._project_dir / ".spinetoolbox" / "items" / "importer"
+        data_dir.mkdir(parents=True)
+        (data_dir / "data.csv").write_text("a,b\n")
+        self.assertNotEqual(self._keys()["Importer"], keys["Importer"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``execution_log_store`` module."""
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from spinetoolbox.execution_log_store import ExecutionLogStore
+
+
+class TestExecutionLogStore(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._store = ExecutionLogStore(os.path.join(self._temp_dir.name, "logs", "log.sqlite"))
+        self._store.append(
+            [
+                ("run 1", 1.0, "Importer", "", "msg", "Importing data"),
+                ("run 1", 2.0, "Tool", "scenario_a", "stdout", "Solving model"),
+                ("run 1", 3.0, "Tool", "scenario_b", "msg_error", "Model infeasible"),
+                ("run 2", 4.0, "Tool", "scenario_a", "stdout", "Solving model again"),
+            ]
+        )
+
+    def tearDown(self):
+        self._store.close()
+        self._temp_dir.cleanup()
+
+    def test_runs_items_and_filter_ids(self):
+        self.assertEqual(self._store.runs(), ["run 1", "run 2"])
+        self.assertEqual(self._store.items(), ["Importer", "Tool"])
+        self.assertEqual(self._store.items("run 2"), ["Tool"])
+        self.assertEqual(self._store.filter_ids("run 1", "Tool"), ["scenario_a", "scenario_b"])
+
+    def test_count_and_fetch_with_criteria(self):
+        self.assertEqual(self._store.count(), 4)
+        self.assertEqual(self._store.count(item="Tool", filter_id="scenario_a"), 2)
+        records = self._store.fetch(0, 10, run="run 1")
+        self.assertEqual([record[6] for record in records], ["Importing data", "Solving model", "Model infeasible"])
+        records = self._store.fetch(records[0][0], 1, run="run 1")
+        self.assertEqual([record[6] for record in records], ["Solving model"])
+
+    def test_keyset_queries(self):
+        last_id = self._store.last_id()
+        self.assertEqual(self._store.count(after_id=last_id), 0)
+        self._store.append([("run 2", 5.0, "Tool", "", "msg", "Done")])
+        self.assertGreater(self._store.last_id(), last_id)
+        self.assertEqual(self._store.count(after_id=last_id), 1)
+        first_id = self._store.fetch(0, 1)[0][0]
+        third_id = self._store.skip(first_id, 2)
+        self.assertEqual(self._store.fetch(third_id - 1, 1)[0][6], "Model infeasible")
+        self.assertEqual(self._store.skip(0, 2, item="Tool"), third_id)
+        self.assertIsNone(self._store.skip(first_id, 10))
+
+    def test_search(self):
+        self.assertEqual(self._store.count(search="model"), 3)
+        self.assertEqual(self._store.count(search="solv aga"), 1)
+        self.assertEqual(self._store.count(run="run 1", search="infeasible"), 1)
+        self.assertEqual(self._store.count(search='"%_'), 0)
+
+    def test_delete_run(self):
+        self._store.delete_run("run 1")
+        self.assertEqual(self._store.runs(), ["run 2"])
+        self.assertEqual(self._store.count(search="model"), 1)
+
+    def test_prune_keeps_newest_runs(self):
+        self._store.append([("run 3", 5.0, "Tool", "", "msg", "Third run")])
+        self.assertEqual(self._store.prune(2), ["run 1"])
+        self.assertEqual(self._store.runs(), ["run 2", "run 3"])
+        self.assertEqual(self._store.count(search="model"), 1)
+        self.assertEqual(self._store.prune(2), [])
+        self.assertEqual(self._store.prune(0), ["run 2", "run 3"])
+        self.assertEqual(self._store.count(), 0)
+
+    def test_records_persist(self):
+        self._store.close()
+        self._store = ExecutionLogStore(os.path.join(self._temp_dir.name, "logs", "log.sqlite"))
+        self.assertEqual(self._store.count(), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``filter_catalog`` module."""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+import unittest
+from unittest.mock import MagicMock
+from PySide6.QtWidgets import QApplication
+from spinedb_api import DatabaseMapping
+from spinedb_api.filters.alternative_filter import ALTERNATIVE_FILTER_TYPE
+from spinedb_api.filters.scenario_filter import SCENARIO_FILTER_TYPE
+from spinetoolbox.filter_catalog import FilterCatalog
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+class TestFilterCatalog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._url = "sqlite:///" + str(Path(self._temp_dir.name, "db.sqlite"))
+        with DatabaseMapping(self._url, create=True) as db_map:
+            db_map.add_scenario_item(name="scen1")
+            db_map.add_alternative_item(name="alt1")
+            db_map.commit_session("Add test data.")
+        self._db_mngr = SpineDBManager(MagicMock(), None)
+        self._catalog = FilterCatalog(MagicMock(db_mngr=self._db_mngr))
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+        self._temp_dir.cleanup()
+
+    def _wait_until_complete(self):
+        deadline = time.monotonic() + 5.0
+        while not self._catalog.is_complete(self._url) and time.monotonic() < deadline:
+            QApplication.processEvents()
+        self.assertTrue(self._catalog.is_complete(self._url))
+        QApplication.processEvents()
+
+    def test_names_are_fetched_in_background_once_for_all_subscribers(self):
+        subscriber1 = MagicMock()
+        subscriber2 = MagicMock()
+        self.assertTrue(self._catalog.subscribe(subscriber1, self._url))
+        self.assertTrue(self._catalog.subscribe(subscriber2, self._url))
+        db_map = self._db_mngr.db_map(self._url)
+        self.assertEqual(self._db_mngr.listeners[db_map], {self._catalog})
+        self._wait_until_complete()
+        self.assertEqual(self._catalog.names(self._url, SCENARIO_FILTER_TYPE), {"scen1"})
+        self.assertEqual(self._catalog.names(self._url, ALTERNATIVE_FILTER_TYPE), {"Base", "alt1"})
+        for subscriber in (subscriber1, subscriber2):
+            subscriber.receive_filter_names_changed.assert_any_call(self._url, SCENARIO_FILTER_TYPE, {"scen1"}, set())
+
+    def test_committed_changes_are_pushed_as_deltas(self):
+        subscriber = MagicMock()
+        self._catalog.subscribe(subscriber, self._url)
+        self._wait_until_complete()
+        db_map = self._db_mngr.db_map(self._url)
+        subscriber.reset_mock()
+        self._db_mngr.add_scenarios({db_map: [{"name": "scen2"}]})
+        scenario = self._db_mngr.get_item_by_field(db_map, "scenario", "name", "scen1")
+        self._db_mngr.update_items("scenario", {db_map: [{"id": scenario["id"], "name": "renamed"}]})
+        alternative = self._db_mngr.get_item_by_field(db_map, "alternative", "name", "alt1")
+        self._db_mngr.remove_items({db_map: {"alternative": {alternative["id"]}}})
+        QApplication.processEvents()
+        subscriber.receive_filter_names_changed.assert_not_called()
+        self.assertEqual(self._catalog.names(self._url, SCENARIO_FILTER_TYPE), {"scen1"})
+        self.assertEqual(self._catalog.names(self._url, ALTERNATIVE_FILTER_TYPE), {"Base", "alt1"})
+        self._db_mngr.commit_session("Edit filter items.", db_map)
+        deadline = time.monotonic() + 5.0
+        while self._db_mngr.is_session_locked(db_map) and time.monotonic() < deadline:
+            QApplication.processEvents()
+        QApplication.processEvents()
+        subscriber.receive_filter_names_changed.assert_any_call(
+            self._url, SCENARIO_FILTER_TYPE, {"renamed", "scen2"}, {"scen1"}
+        )
+        subscriber.receive_filter_names_changed.assert_any_call(self._url, ALTERNATIVE_FILTER_TYPE, set(), {"alt1"})
+        self.assertEqual(self._catalog.names(self._url, SCENARIO_FILTER_TYPE), {"renamed", "scen2"})
+        self.assertEqual(self._catalog.names(self._url, ALTERNATIVE_FILTER_TYPE), {"Base"})
+
+    def test_complete_fetches_remaining_names_synchronously(self):
+        subscriber = MagicMock()
+        self._catalog.subscribe(subscriber, self._url)
+        self._catalog.complete(self._url)
+        self.assertEqual(self._catalog.names(self._url, SCENARIO_FILTER_TYPE), {"scen1"})
+        self._wait_until_complete()
+
+    def test_last_unsubscribe_releases_database(self):
+        subscriber1 = MagicMock()
+        subscriber2 = MagicMock()
+        self._catalog.subscribe(subscriber1, self._url)
+        self._catalog.subscribe(subscriber2, self._url)
+        db_map = self._db_mngr.db_map(self._url)
+        self._wait_until_complete()
+        self._catalog.unsubscribe(subscriber1, self._url)
+        self.assertEqual(self._db_mngr.listeners.get(db_map), {self._catalog})
+        self._catalog.unsubscribe(subscriber2, self._url)
+        self.assertIsNone(self._catalog.names(self._url, SCENARIO_FILTER_TYPE))
+        self.assertFalse(self._db_mngr.listeners.get(db_map))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``headless`` module."""
+from argparse import Namespace
+import threading
+import time
+import unittest
+from unittest import mock
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication
+from spine_engine import SpineEngineState
+from spinetoolbox.dag_scheduler import DagScheduler, FailurePolicy
+from spinetoolbox.headless import ActionsWithProject, Status
+
+
+class _FakeEngineManager:
+    """Engine manager that 'executes' a DAG by sleeping and records how many DAGs run at once."""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    started = []
+
+    def __init__(self, *args, **kwargs):
+        self._engine_data = None
+        self._stopped = False
+
+    def run_engine(self, engine_data):
+        self._engine_data = engine_data
+        with self.lock:
+            _FakeEngineManager.running += 1
+            _FakeEngineManager.peak = max(_FakeEngineManager.peak, _FakeEngineManager.running)
+            _FakeEngineManager.started.append(engine_data["name"])
+
+    def get_engine_event(self):
+        time.sleep(0.05)
+        with self.lock:
+            _FakeEngineManager.running -= 1
+        state = SpineEngineState.FAILED if self._engine_data["fails"] or self._stopped else SpineEngineState.COMPLETED
+        return "dag_exec_finished", str(state)
+
+    def stop_engine(self):
+        self._stopped = True
+
+
+class TestRunDags(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        _FakeEngineManager.running = 0
+        _FakeEngineManager.peak = 0
+        _FakeEngineManager.started = []
+        startup_event_type = QEvent.Type(QEvent.registerEventType())
+        self._actions = ActionsWithProject(Namespace(), startup_event_type, None)
+
+    def _run(self, engine_data_by_dag, scheduler):
+        for index in range(len(engine_data_by_dag)):
+            scheduler.add(index)
+        with mock.patch("spinetoolbox.headless.make_engine_manager", _FakeEngineManager), mock.patch("builtins.print"):
+            return self._actions._run_dags(engine_data_by_dag, scheduler, False, "")
+
+    def test_runs_dags_concurrently_up_to_job_limit(self):
+        engine_data_by_dag = [{"name": f"dag {i}", "fails": False} for i in range(5)]
+        status = self._run(engine_data_by_dag, DagScheduler(max_jobs=2))
+        self.assertEqual(status, Status.OK)
+        self.assertEqual(sorted(_FakeEngineManager.started), [f"dag {i}" for i in range(5)])
+        self.assertEqual(_FakeEngineManager.peak, 2)
+
+    def test_fail_fast_does_not_start_pending_dags(self):
+        engine_data_by_dag = [{"name": "failing", "fails": True}, {"name": "pending", "fails": False}]
+        status = self._run(engine_data_by_dag, DagScheduler(max_jobs=1, failure_policy=FailurePolicy.FAIL_FAST))
+        self.assertEqual(status, Status.ERROR)
+        self.assertEqual(_FakeEngineManager.started, ["failing"])
+
+    def test_continue_policy_runs_remaining_dags_after_failure(self):
+        engine_data_by_dag = [{"name": "failing", "fails": True}, {"name": "pending", "fails": False}]
+        status = self._run(engine_data_by_dag, DagScheduler(max_jobs=1, failure_policy=FailurePolicy.CONTINUE))
+        self.assertEqual(status, Status.ERROR)
+        self.assertEqual(_FakeEngineManager.started, ["failing", "pending"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``link_index`` module."""
+import time
+import unittest
+from spine_engine.project_item.connection import Connection
+from spinetoolbox.link_index import LinkIndex
+
+
+class TestLinkIndex(unittest.TestCase):
+    def setUp(self):
+        self._index = LinkIndex()
+        self._a_to_b = Connection("a", "right", "b", "left")
+        self._b_to_c = Connection("b", "bottom", "c", "top")
+        self._a_to_c = Connection("a", "bottom", "c", "left")
+        for connection in (self._a_to_b, self._b_to_c, self._a_to_c):
+            self._index.add(connection)
+
+    def test_queries(self):
+        self.assertEqual(self._index.outgoing("a"), [self._a_to_b, self._a_to_c])
+        self.assertEqual(self._index.incoming("c"), [self._b_to_c, self._a_to_c])
+        self.assertEqual(self._index.links_for_item("b"), [self._a_to_b, self._b_to_c])
+        self.assertIs(self._index.find("a", "c"), self._a_to_c)
+        self.assertIsNone(self._index.find("c", "a"))
+        self.assertEqual(self._index.outgoing("c"), [])
+
+    def test_contains_compares_links(self):
+        self.assertIn(Connection("a", "right", "b", "left"), self._index)
+        self.assertNotIn(Connection("a", "top", "b", "left"), self._index)
+
+    def test_remove(self):
+        self._index.remove(self._a_to_b)
+        self.assertEqual(self._index.outgoing("a"), [self._a_to_c])
+        self.assertEqual(self._index.incoming("b"), [])
+        self.assertIsNone(self._index.find("a", "b"))
+        with self.assertRaises(ValueError):
+            self._index.remove(self._a_to_b)
+
+    def test_rename_item_updates_links_and_keeps_order(self):
+        self._index.rename_item("b", "x")
+        self.assertEqual(self._a_to_b.destination, "x")
+        self.assertEqual(self._b_to_c.source, "x")
+        self.assertEqual(self._index.outgoing("a"), [self._a_to_b, self._a_to_c])
+        self.assertEqual(self._index.incoming("c"), [self._b_to_c, self._a_to_c])
+        self.assertIs(self._index.find("x", "c"), self._b_to_c)
+        self.assertEqual(self._index.links_for_item("b"), [])
+
+
+class TestLinkIndexScaling(unittest.TestCase):
+    """A micro-benchmark that catches lookups degrading to scans over all links."""
+
+    _ITEM_COUNT = 500
+    _FAN_OUT = 40
+    _TIME_BUDGET = 10.0
+    """Seconds; runs take a fraction of a second on a typical development machine."""
+
+    def test_dense_project(self):
+        names = [f"item {i}" for i in range(self._ITEM_COUNT)]
+        links = [
+            Connection(names[i], "right", names[j], "left")
+            for i in range(self._ITEM_COUNT)
+            for j in range(i + 1, min(i + 1 + self._FAN_OUT, self._ITEM_COUNT))
+        ]
+        index = LinkIndex()
+        start = time.perf_counter()
+        for link in links:
+            if link not in index:
+                index.add(link)
+        found = 0
+        for _ in range(10):
+            for i, name in enumerate(names):
+                found += len(index.outgoing(name)) + len(index.incoming(name))
+                found += index.find(name, names[(i + 1) % self._ITEM_COUNT]) is not None
+        for name in names[::10]:
+            index.rename_item(name, name + " renamed")
+        for link in links:
+            index.remove(link)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(found, 10 * (2 * len(links) + self._ITEM_COUNT - 1))
+        self.assertEqual(index.outgoing(names[1]), [])
+        self.assertLess(elapsed, self._TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``log_message_batcher`` module."""
+import os
+from tempfile import TemporaryDirectory
+import threading
+import time
+import unittest
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.execution_log_store import ExecutionLogStore
+from spinetoolbox.log_message_batcher import LogMessageBatcher
+
+
+class _Item:
+    def __init__(self, name):
+        self.name = name
+        self.batches = []
+
+    def add_log_messages(self, filter_id, messages):
+        self.batches.append((filter_id, messages))
+
+
+class TestLogMessageBatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_messages_are_grouped_by_item_and_filter(self):
+        batcher = LogMessageBatcher(max_message_rate=0)
+        item1 = _Item("item 1")
+        item2 = _Item("item 2")
+        batcher.put(item1, "", "a")
+        batcher.put(item2, "", "b")
+        batcher.put(item1, "filter", "c")
+        batcher.put(item1, "", "d")
+        batcher.flush()
+        self.assertEqual(item1.batches, [("", ["a", "d"]), ("filter", ["c"])])
+        self.assertEqual(item2.batches, [("", ["b"])])
+        batcher.deleteLater()
+
+    def test_messages_from_other_thread_get_flushed_by_timer(self):
+        batcher = LogMessageBatcher(flush_interval=10, max_message_rate=0)
+        item = _Item("item")
+        thread = threading.Thread(target=lambda: [batcher.put(item, "", str(i)) for i in range(100)])
+        thread.start()
+        thread.join()
+        start = time.monotonic()
+        while sum(len(messages) for _, messages in item.batches) < 100:
+            QApplication.processEvents()
+            if time.monotonic() - start > 5.0:
+                self.fail("Messages were never flushed.")
+        self.assertEqual([m for _, messages in item.batches for m in messages], [str(i) for i in range(100)])
+        batcher.deleteLater()
+
+    def test_overflow_is_written_to_file(self):
+        with TemporaryDirectory() as temp_dir:
+            batcher = LogMessageBatcher(flush_interval=100, max_message_rate=20)
+            batcher.set_spill_directory(temp_dir)
+            item = _Item("My item")
+            for i in range(5):
+                batcher.put(item, "", f"<b>{i}</b>")
+            batcher.flush()
+            self.assertEqual(len(item.batches), 1)
+            filter_id, messages = item.batches[0]
+            self.assertEqual(messages[:2], ["<b>0</b>", "<b>1</b>"])
+            self.assertEqual(len(messages), 3)
+            self.assertIn("my_item.log", messages[2])
+            with open(os.path.join(temp_dir, "my_item.log"), encoding="utf-8") as log_file:
+                self.assertEqual(log_file.read(), "2\n3\n4\n")
+            batcher.deleteLater()
+
+    def test_overflow_is_rendered_without_spill_directory(self):
+        batcher = LogMessageBatcher(flush_interval=100, max_message_rate=20)
+        item = _Item("item")
+        for i in range(5):
+            batcher.put(item, "", str(i))
+        batcher.flush()
+        self.assertEqual(item.batches, [("", ["0", "1", "2", "3", "4"])])
+        batcher.deleteLater()
+
+    def test_messages_are_recorded_in_execution_log(self):
+        with TemporaryDirectory() as temp_dir:
+            store = ExecutionLogStore(os.path.join(temp_dir, "log.sqlite"))
+            batcher = LogMessageBatcher(max_message_rate=0)
+            batcher.set_execution_log(store, "run")
+            item = _Item("item")
+            batcher.put(item, "filter", "<span>formatted</span>", "msg_warning", "<b>warning</b>")
+            batcher.put(item, "", "<i>plain</i>")
+            batcher.flush()
+            records = store.fetch(0, 10)
+            self.assertEqual(
+                [record[1:2] + record[3:] for record in records],
+                [("run", "item", "filter", "msg_warning", "warning"), ("run", "item", "", "msg", "plain")],
+            )
+            store.close()
+            batcher.deleteLater()
+
+
+if __name__ == "__main__":
+    unittest.main()
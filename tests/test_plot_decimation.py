@@ -0,0 +1,109 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``plot_decimation`` module."""
+import unittest
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.plot_decimation import min_max_decimate, POINTS_PER_BUCKET
+from spinetoolbox.widgets.plot_canvas import PlotCanvas
+
+
+class TestMinMaxDecimate(unittest.TestCase):
+    def test_small_data_is_not_decimated(self):
+        x = np.arange(8.0)
+        y = np.arange(8.0)
+        self.assertEqual(list(min_max_decimate(x, y, 2)), list(range(8)))
+
+    def test_first_last_minimum_and_maximum_of_each_bucket_are_selected(self):
+        x = np.arange(20.0)
+        y = np.zeros(20)
+        y[3] = 5.0
+        y[6] = -5.0
+        y[12] = 2.0
+        y[17] = -1.0
+        indexes = min_max_decimate(x, y, 2)
+        self.assertEqual(list(indexes), [0, 3, 6, 9, 10, 12, 17, 19])
+
+    def test_buckets_follow_x_range_not_point_count(self):
+        x = np.concatenate((np.linspace(0.0, 1.0, 100), [10.0]))
+        y = np.arange(101.0)
+        indexes = min_max_decimate(x, y, 10)
+        self.assertEqual(list(indexes), [0, 98, 99, 100])
+
+    def test_nans_are_ignored_when_finding_extremes(self):
+        x = np.arange(10.0)
+        y = np.array([1.0, np.nan, 3.0, -1.0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan])
+        indexes = min_max_decimate(x, y, 2)
+        self.assertEqual(list(indexes), [0, 2, 3, 4, 5, 9])
+
+    def test_extremes_of_large_data_survive(self):
+        generator = np.random.default_rng(23)
+        x = np.arange(100000.0)
+        y = generator.normal(size=x.size)
+        indexes = min_max_decimate(x, y, 500)
+        self.assertLessEqual(len(indexes), POINTS_PER_BUCKET * 500)
+        self.assertEqual(y[indexes].min(), y.min())
+        self.assertEqual(y[indexes].max(), y.max())
+        self.assertTrue(np.all(np.diff(indexes) > 0))
+
+
+class TestLineDecimator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._canvas = PlotCanvas()
+
+    def tearDown(self):
+        self._canvas.deleteLater()
+
+    def test_large_line_is_decimated_and_redecimated_when_zooming(self):
+        axes = self._canvas.axes
+        x = np.arange(100000.0)
+        y = np.sin(x / 1000.0)
+        (line,) = axes.plot(x, y)
+        self.assertTrue(self._canvas.decimate_line(axes, line))
+        self.assertLess(len(line.get_xdata()), len(x))
+        axes.set_xlim(1000.0, 1100.0)
+        self.assertEqual(list(line.get_xdata()), list(x[999:1102]))
+        axes.set_xlim(0.0, 99999.0)
+        self.assertLess(len(line.get_xdata()), len(x))
+        self.assertEqual(line.get_xdata()[0], 0.0)
+        self.assertEqual(line.get_xdata()[-1], 99999.0)
+
+    def test_small_and_unsorted_lines_are_not_decimated(self):
+        axes = self._canvas.axes
+        (small_line,) = axes.plot([0.0, 1.0], [2.0, 3.0])
+        self.assertFalse(self._canvas.decimate_line(axes, small_line))
+        x = np.arange(100000.0)[::-1]
+        (unsorted_line,) = axes.plot(x, x)
+        self.assertFalse(self._canvas.decimate_line(axes, unsorted_line))
+        self.assertEqual(len(unsorted_line.get_xdata()), len(x))
+
+    def test_clearing_axes_disconnects_decimator(self):
+        axes = self._canvas.axes
+        x = np.arange(100000.0)
+        (line,) = axes.plot(x, x)
+        self._canvas.decimate_line(axes, line)
+        axes.cla()
+        (new_line,) = axes.plot(x, x)
+        self.assertTrue(self._canvas.decimate_line(axes, new_line))
+        axes.set_xlim(10.0, 20.0)
+        self.assertEqual(list(new_line.get_xdata()), list(x[9:22]))
+
+
+if __name__ == "__main__":
+    unittest.main()
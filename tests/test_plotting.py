@@ -918,6 +918,29 @@ class TestPlotData(unittest.TestCase):
         plot_widget = plot_data(data)
         self.assertEqual(repr(plot_widget.canvas.legend_axes.get_gridspec()), repr(GridSpec(1, 2, width_ratios=[1, 0])))
 
+    def test_large_time_series_is_decimated_but_original_data_is_kept(self):
+        time_series = TimeSeriesFixedResolution(
+            "2023-01-01T00:00", "1h", numpy.sin(numpy.arange(50000.0)), False, False, index_name="t"
+        )
+        root_node = TreeNode("parameter_name")
+        root_node.content["series"] = convert_indexed_value_to_tree(time_series)
+        data_list = list(turn_node_to_xy_data(root_node, None))
+        self.assertIsInstance(data_list[0].x, numpy.ndarray)
+        self.assertEqual(data_list[0].x.dtype, time_series.indexes.dtype)
+        plot_widget = plot_data(data_list)
+        try:
+            lines = plot_widget.canvas.axes.lines
+            self.assertEqual(len(lines), 1)
+            self.assertLess(len(lines[0].get_xdata(orig=True)), 50000)
+            self.assertEqual(len(plot_widget.original_xy_data[0].x), 50000)
+            first_day = numpy.datetime64("2023-01-02T00:00")
+            last_day = numpy.datetime64("2023-01-03T00:00")
+            axes = plot_widget.canvas.axes
+            axes.set_xlim(axes.convert_xunits(first_day), axes.convert_xunits(last_day))
+            self.assertEqual(len(lines[0].get_xdata(orig=True)), 25 + 2)
+        finally:
+            plot_widget.deleteLater()
+
 
 class TestRaiseIfIncompatibleX(unittest.TestCase):
     def test_data_with_numeric_and_string_x_data_raises(self):
@@ -0,0 +1,172 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``project_topology`` module."""
+import random
+import time
+import unittest
+import networkx as nx
+from spinetoolbox.project_topology import kahn_ranks, ProjectTopology
+
+
+def _longest_path_ranks(graph):
+    ranks = {}
+    for node in nx.topological_sort(graph):
+        ranks[node] = max((ranks[predecessor] + 1 for predecessor in graph.predecessors(node)), default=0)
+    return ranks
+
+
+class TestKahnRanks(unittest.TestCase):
+    def test_ranks_are_longest_path_lengths(self):
+        graph = nx.DiGraph([("a", "b"), ("b", "c"), ("a", "c"), ("d", "c"), ("c", "e")])
+        order, ranks = kahn_ranks(graph)
+        self.assertEqual(ranks, {"a": 0, "d": 0, "b": 1, "c": 2, "e": 3})
+        self.assertEqual(order, ["a", "d", "b", "c", "e"])
+
+    def test_cycle_gives_none(self):
+        graph = nx.DiGraph([("a", "b"), ("b", "a"), ("b", "c")])
+        self.assertEqual(kahn_ranks(graph), (None, None))
+
+    def test_random_graphs_agree_with_longest_paths(self):
+        generator = random.Random(23)
+        for _ in range(20):
+            graph = nx.DiGraph()
+            graph.add_nodes_from(range(30))
+            graph.add_edges_from((u, v) for u in range(30) for v in range(u + 1, 30) if generator.random() < 0.1)
+            order, ranks = kahn_ranks(graph)
+            self.assertEqual(ranks, _longest_path_ranks(graph))
+            position = {node: i for i, node in enumerate(order)}
+            self.assertTrue(all(position[u] < position[v] for u, v in graph.edges))
+
+
+class TestProjectTopology(unittest.TestCase):
+    def setUp(self):
+        self._topology = ProjectTopology()
+        for name in ("a", "b", "c", "d"):
+            self._topology.add_node(name)
+
+    def test_isolated_nodes_are_separate_dags(self):
+        dags = self._topology.dags()
+        self.assertEqual(sorted(list(dag.nodes) for dag in dags), [["a"], ["b"], ["c"], ["d"]])
+        self.assertEqual(self._topology.ranks("a"), {"a": 0})
+
+    def test_adding_edges_merges_components(self):
+        self._topology.add_edge("a", "b")
+        self._topology.add_edge("c", "d")
+        self.assertEqual(self._topology.component_nodes("a"), {"a", "b"})
+        self._topology.add_edge("b", "c")
+        self.assertEqual(self._topology.component_nodes("d"), {"a", "b", "c", "d"})
+        self.assertEqual(self._topology.ranks("a"), {"a": 0, "b": 1, "c": 2, "d": 3})
+        self.assertEqual(self._topology.topological_order("a"), ["a", "b", "c", "d"])
+        self.assertEqual(len(self._topology.dags()), 1)
+
+    def test_removing_edge_splits_component(self):
+        self._topology.add_edge("a", "b")
+        self._topology.add_edge("b", "c")
+        self._topology.remove_edge("a", "b")
+        self.assertEqual(self._topology.component_nodes("a"), {"a"})
+        self.assertEqual(self._topology.component_nodes("c"), {"b", "c"})
+        self.assertEqual(self._topology.ranks("c"), {"b": 0, "c": 1})
+
+    def test_parallel_edges_are_counted(self):
+        self._topology.add_edge("a", "b")
+        self._topology.add_edge("a", "b")
+        self._topology.remove_edge("a", "b")
+        self.assertEqual(self._topology.component_nodes("a"), {"a", "b"})
+        self._topology.remove_edge("a", "b")
+        self.assertEqual(self._topology.component_nodes("a"), {"a"})
+
+    def test_removing_node_splits_component(self):
+        self._topology.add_edge("a", "b")
+        self._topology.add_edge("b", "c")
+        self._topology.remove_node("b")
+        self.assertEqual(sorted(sorted(dag.nodes) for dag in self._topology.dags()), [["a"], ["c"], ["d"]])
+        self.assertIsNone(self._topology.dag_with_node("b"))
+
+    def test_rename_node_keeps_edges_and_ranks(self):
+        self._topology.add_edge("a", "b")
+        self._topology.rename_node("b", "B")
+        self.assertEqual(self._topology.ranks("a"), {"a": 0, "B": 1})
+        self.assertEqual(list(self._topology.dag_with_node("B").edges), [("a", "B")])
+
+    def test_cycle_is_detected_and_cleared(self):
+        self._topology.add_edge("a", "b")
+        self._topology.add_edge("b", "c")
+        self.assertFalse(self._topology.has_cycle("a"))
+        self._topology.add_edge("c", "a")
+        self.assertTrue(self._topology.has_cycle("b"))
+        self.assertIsNone(self._topology.topological_order("b"))
+        self.assertFalse(self._topology.is_acyclic(self._topology.dag_with_node("a")))
+        self._topology.remove_edge("c", "a")
+        self.assertFalse(self._topology.has_cycle("a"))
+        self.assertEqual(self._topology.ranks("a"), {"a": 0, "b": 1, "c": 2})
+
+    def test_self_loop_is_a_cycle(self):
+        self._topology.add_edge("a", "a")
+        self.assertTrue(self._topology.has_cycle("a"))
+
+    def test_dag_is_cached_until_component_changes(self):
+        self._topology.add_edge("a", "b")
+        dag = self._topology.dag_with_node("a")
+        self.assertIs(self._topology.dag_with_node("b"), dag)
+        self.assertTrue(nx.is_frozen(dag))
+        self._topology.add_edge("c", "d")
+        self.assertIs(self._topology.dag_with_node("a"), dag)
+        self._topology.add_edge("b", "c")
+        self.assertIsNot(self._topology.dag_with_node("a"), dag)
+
+    def test_is_acyclic_works_with_foreign_graphs(self):
+        self.assertTrue(self._topology.is_acyclic(nx.DiGraph([("x", "y")])))
+        self.assertFalse(self._topology.is_acyclic(nx.DiGraph([("x", "y"), ("y", "x")])))
+
+    def test_incremental_ranks_agree_with_kahn_ranks(self):
+        generator = random.Random(5)
+        topology = ProjectTopology()
+        graph = nx.DiGraph()
+        nodes = list(range(40))
+        for node in nodes:
+            topology.add_node(node)
+            graph.add_node(node)
+        edges = [(u, v) for u in nodes for v in nodes if u != v and generator.random() < 0.05]
+        generator.shuffle(edges)
+        for u, v in edges:
+            topology.add_edge(u, v)
+            graph.add_edge(u, v)
+            expected = kahn_ranks(graph.subgraph(nx.node_connected_component(graph.to_undirected(), u)))[1]
+            self.assertEqual(topology.ranks(u), expected)
+
+
+class TestProjectTopologyScaling(unittest.TestCase):
+    """A micro-benchmark that catches gross regressions back to whole-graph recomputation."""
+
+    _TIME_BUDGET = 5.0
+
+    def test_building_large_dag_edge_by_edge_stays_fast(self):
+        topology = ProjectTopology()
+        node_count = 2000
+        for node in range(node_count):
+            topology.add_node(node)
+        start = time.monotonic()
+        for node in range(1, node_count):
+            topology.add_edge(node // 2, node)
+            topology.has_cycle(node)
+            topology.ranks(node)
+        for node in range(0, node_count - 1, 2):
+            topology.add_edge(node, node + 1)
+            topology.ranks(node)
+        self.assertLess(time.monotonic() - start, self._TIME_BUDGET)
+        self.assertEqual(topology.ranks(0), kahn_ranks(topology.dag_with_node(0))[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``qthread_pool_executor`` module."""
+import time
+import unittest
+from PySide6.QtCore import QSemaphore
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.qthread_pool_executor import (
+    CancelledError,
+    QtBasedFuture,
+    QtBasedQueue,
+    QtBasedThreadPoolExecutor,
+    SynchronousExecutor,
+    TimeOutError,
+)
+
+
+class TestQtBasedQueue(unittest.TestCase):
+    def test_items_come_out_in_insertion_order(self):
+        queue = QtBasedQueue()
+        for i in range(3):
+            queue.put(i)
+        self.assertEqual([queue.get() for _ in range(3)], [0, 1, 2])
+
+    def test_get_times_out_when_queue_is_empty(self):
+        queue = QtBasedQueue()
+        with self.assertRaises(TimeOutError):
+            queue.get(timeout=0.01)
+        with self.assertRaises(TimeOutError):
+            queue.get_nowait()
+
+
+class TestQtBasedFuture(unittest.TestCase):
+    def test_set_result_invokes_callbacks(self):
+        future = QtBasedFuture()
+        results = []
+        future.add_done_callback(lambda f: results.append(f.result()))
+        future.set_result(5)
+        self.assertTrue(future.done())
+        self.assertEqual(results, [5])
+
+    def test_set_exception_invokes_callbacks(self):
+        future = QtBasedFuture()
+        errors = []
+        future.add_done_callback(lambda f: errors.append(f.exception()))
+        error = RuntimeError("failed")
+        future.set_exception(error)
+        self.assertEqual(errors, [error])
+        with self.assertRaises(RuntimeError):
+            future.result()
+
+    def test_callback_added_after_completion_is_invoked_immediately(self):
+        future = QtBasedFuture()
+        future.set_result(5)
+        results = []
+        future.add_done_callback(lambda f: results.append(f.result()))
+        self.assertEqual(results, [5])
+
+    def test_failing_callback_does_not_prevent_other_callbacks(self):
+        future = QtBasedFuture()
+        results = []
+        future.add_done_callback(lambda f: 1 / 0)
+        future.add_done_callback(lambda f: results.append(f.result()))
+        with self.assertLogs(level="ERROR"):
+            future.set_result(5)
+        self.assertEqual(results, [5])
+
+    def test_cancel_pending_future(self):
+        future = QtBasedFuture()
+        cancelled = []
+        future.add_done_callback(lambda f: cancelled.append(f.cancelled()))
+        self.assertTrue(future.cancel())
+        self.assertTrue(future.cancelled())
+        self.assertTrue(future.done())
+        self.assertEqual(cancelled, [True])
+        self.assertFalse(future.set_running_or_notify_cancel())
+        with self.assertRaises(CancelledError):
+            future.result()
+
+    def test_running_future_cannot_be_cancelled(self):
+        future = QtBasedFuture()
+        self.assertTrue(future.set_running_or_notify_cancel())
+        self.assertTrue(future.running())
+        self.assertFalse(future.cancel())
+        future.set_result(5)
+        self.assertFalse(future.cancel())
+        self.assertEqual(future.result(), 5)
+
+    def test_result_times_out(self):
+        future = QtBasedFuture()
+        with self.assertRaises(TimeOutError):
+            future.result(timeout=0.01)
+
+
+class TestSynchronousExecutor(unittest.TestCase):
+    def test_submit_runs_function_immediately(self):
+        executor = SynchronousExecutor()
+        future = executor.submit(divmod, 7, 2)
+        self.assertEqual(future.result(), (3, 1))
+        future = executor.submit(divmod, 7, 0)
+        self.assertIsInstance(future.exception(), ZeroDivisionError)
+
+
+class TestQtBasedThreadPoolExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._executor = QtBasedThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self._executor.shutdown()
+
+    def test_results_and_exceptions(self):
+        ok = self._executor.submit(sum, [1, 2, 3])
+        failed = self._executor.submit(divmod, 1, 0)
+        self.assertEqual(ok.result(timeout=5), 6)
+        self.assertIsInstance(failed.exception(timeout=5), ZeroDivisionError)
+
+    def test_cancelled_request_is_not_run(self):
+        gate = QSemaphore()
+        blockers = [self._executor.submit(gate.acquire) for _ in range(2)]
+        calls = []
+        future = self._executor.submit(calls.append, "called")
+        self.assertTrue(future.cancel())
+        gate.release(2)
+        for blocker in blockers:
+            blocker.result(timeout=5)
+        self._executor.submit(lambda: None).result(timeout=5)
+        self.assertEqual(calls, [])
+
+    def test_pending_requests_are_done_after_shutdown(self):
+        gate = QSemaphore()
+        blockers = [self._executor.submit(gate.acquire) for _ in range(2)]
+        pending = self._executor.submit(lambda: None)
+        gate.release(2)
+        for blocker in blockers:
+            blocker.result(timeout=5)
+        self._executor.shutdown()
+        self.assertTrue(pending.done())
+        with self.assertRaises(RuntimeError):
+            self._executor.submit(lambda: None)
+
+
+class TestQtBasedThreadPoolExecutorThroughput(unittest.TestCase):
+    """A micro-benchmark that catches gross throughput regressions in the executor."""
+
+    _TASK_COUNT = 100000
+    _TIME_BUDGET = 30.0
+    """Seconds; runs take a couple of seconds on a typical development machine."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_many_small_tasks(self):
+        executor = QtBasedThreadPoolExecutor()
+        try:
+            start = time.perf_counter()
+            futures = [executor.submit(abs, -i) for i in range(self._TASK_COUNT)]
+            total = sum(future.result(timeout=self._TIME_BUDGET) for future in futures)
+            elapsed = time.perf_counter() - start
+        finally:
+            executor.shutdown()
+        self.assertEqual(total, self._TASK_COUNT * (self._TASK_COUNT - 1) // 2)
+        self.assertLess(elapsed, self._TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``resource_graph`` module."""
+import unittest
+from spine_engine.project_item.project_item_resource import ProjectItemResource
+from spine_engine.utils.helpers import ExecutionDirection
+from spinetoolbox.resource_graph import ResourceGraph
+
+
+class _Item:
+    def __init__(self, name, label):
+        self.name = name
+        self.label = label
+        self.calls = 0
+
+    def resources_for_direct_successors(self):
+        self.calls += 1
+        return [ProjectItemResource(self.name, "file", self.label, "file:///data.csv")]
+
+    def resources_for_direct_predecessors(self):
+        self.calls += 1
+        return []
+
+
+class TestResourceGraph(unittest.TestCase):
+    def setUp(self):
+        self._graph = ResourceGraph()
+        self._item = _Item("item", "data")
+
+    def test_resources_are_computed_once(self):
+        resources = self._graph.resources(self._item, ExecutionDirection.FORWARD)
+        self.assertIs(self._graph.resources(self._item, ExecutionDirection.FORWARD), resources)
+        self.assertEqual(self._item.calls, 1)
+        self.assertEqual(self._graph.resources(self._item, ExecutionDirection.BACKWARD), [])
+        self.assertEqual(self._item.calls, 2)
+
+    def test_version_changes_only_when_resources_change(self):
+        self._graph.resources(self._item, ExecutionDirection.FORWARD)
+        version = self._graph.version("item", ExecutionDirection.FORWARD)
+        self._graph.refresh(self._item, ExecutionDirection.FORWARD)
+        self.assertEqual(self._graph.version("item", ExecutionDirection.FORWARD), version)
+        self._item.label = "renamed data"
+        self._graph.refresh(self._item, ExecutionDirection.FORWARD)
+        self.assertGreater(self._graph.version("item", ExecutionDirection.FORWARD), version)
+
+    def test_unchanged_delivery_is_skipped(self):
+        resources = self._item.resources_for_direct_successors()
+        self.assertTrue(self._graph.deliver("successor", ExecutionDirection.FORWARD, resources))
+        self.assertFalse(self._graph.deliver("successor", ExecutionDirection.FORWARD, list(resources)))
+        self.assertTrue(self._graph.deliver("successor", ExecutionDirection.FORWARD, []))
+        self._graph.forget_delivery("successor", ExecutionDirection.FORWARD)
+        self.assertTrue(self._graph.deliver("successor", ExecutionDirection.FORWARD, []))
+
+    def test_label_change_is_delivered(self):
+        self._graph.deliver("successor", ExecutionDirection.FORWARD, self._item.resources_for_direct_successors())
+        self._item.label = "other"
+        resources = self._item.resources_for_direct_successors()
+        self.assertTrue(self._graph.deliver("successor", ExecutionDirection.FORWARD, resources))
+
+    def test_rename_and_discard(self):
+        self._graph.resources(self._item, ExecutionDirection.FORWARD)
+        self._graph.deliver("item", ExecutionDirection.FORWARD, [])
+        self._graph.rename("item", "new name")
+        self.assertIsNone(self._graph.version("item", ExecutionDirection.FORWARD))
+        self.assertIsNotNone(self._graph.version("new name", ExecutionDirection.FORWARD))
+        self.assertFalse(self._graph.deliver("new name", ExecutionDirection.FORWARD, []))
+        self._graph.discard("new name")
+        self.assertIsNone(self._graph.version("new name", ExecutionDirection.FORWARD))
+        self.assertTrue(self._graph.deliver("new name", ExecutionDirection.FORWARD, []))
+
+    def test_invalidate_forces_recomputation(self):
+        self._graph.resources(self._item, ExecutionDirection.FORWARD)
+        self._graph.invalidate()
+        self._graph.resources(self._item, ExecutionDirection.FORWARD)
+        self.assertEqual(self._item.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``spine_db_export`` module."""
+import inspect
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from spinedb_api import DatabaseMapping, export_data, import_data
+from spinedb_api.parameter_value import dump_db_value, load_db_value
+from spinedb_api.spine_io.exporters import excel
+from spinedb_api.spine_io.exporters.excel import export_spine_database_to_xlsx
+from spinedb_api.spine_io.importers.excel_reader import get_mapped_data_from_xlsx
+from spinetoolbox.spine_db_export import (
+    ExportCancelled,
+    ExportMonitor,
+    typed_items_from_data,
+    typed_items_from_db_maps,
+    write_excel,
+    write_json,
+    write_sqlite,
+)
+
+
+def _make_data():
+    return {
+        "entity_classes": [("Widget", (), None, None, False), ("Gadget", (), None, None, False)],
+        "entities": [("Widget", "clock", None), ("Gadget", "phone", "Smart.")],
+        "parameter_definitions": [("Widget", "size", 2.0, None, None)],
+        "parameter_values": [("Widget", "clock", "size", 5.0, "Base"), ("Widget", "clock", "size", 7.0, "extra")],
+        "alternatives": [("Base", "Base alternative"), ("extra", "")],
+        "scenarios": [("scenario", False, "")],
+        "scenario_alternatives": [("scenario", "extra", None)],
+    }
+
+
+class TestExportMonitor(unittest.TestCase):
+    def test_advance_reports_progress(self):
+        progress = []
+        monitor = ExportMonitor(progress.append)
+        monitor.advance(0.5)
+        monitor.advance(1.0)
+        self.assertEqual(progress, [0.5, 1.0])
+
+    def test_advance_raises_after_cancel(self):
+        progress = []
+        monitor = ExportMonitor(progress.append)
+        monitor.cancel()
+        self.assertTrue(monitor.cancelled)
+        with self.assertRaises(ExportCancelled):
+            monitor.advance(0.5)
+        self.assertEqual(progress, [])
+
+
+class TestWriteJson(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._file_path = str(Path(self._temp_dir.name, "export.json"))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_output_equals_json_dumps(self):
+        data = _make_data()
+        write_json(self._file_path, typed_items_from_data(data), ExportMonitor())
+        with open(self._file_path, encoding="utf-8") as json_file:
+            self.assertEqual(json_file.read(), json.dumps(data, indent=4))
+
+    def test_empty_data(self):
+        write_json(self._file_path, typed_items_from_data({"entities": []}), ExportMonitor())
+        with open(self._file_path, encoding="utf-8") as json_file:
+            self.assertEqual(json_file.read(), json.dumps({}, indent=4))
+
+    def test_items_from_database_equal_spinedb_api_export_data(self):
+        with DatabaseMapping("sqlite://", create=True) as db_map:
+            import_data(db_map, **_make_data())
+            db_map.commit_session("Add test data.")
+            typed_items = typed_items_from_db_maps({db_map: {}}, load_db_value)
+            write_json(self._file_path, typed_items, ExportMonitor())
+            expected = json.dumps(export_data(db_map, parse_value=load_db_value), indent=4)
+        with open(self._file_path, encoding="utf-8") as json_file:
+            self.assertEqual(json_file.read(), expected)
+
+    def test_cancel_stops_writing(self):
+        monitor = ExportMonitor()
+        calls = []
+
+        def get_items():
+            calls.append(None)
+            monitor.cancel()
+            return [("Widget", (), None, None, False)]
+
+        typed_items = [("entity_classes", get_items), ("entities", get_items)]
+        with self.assertRaises(ExportCancelled):
+            write_json(self._file_path, typed_items, monitor)
+        self.assertEqual(len(calls), 1)
+
+
+class TestWriteSqlite(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._file_path = str(Path(self._temp_dir.name, "export.sqlite"))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_round_trip(self):
+        data = _make_data()
+        progress = []
+        errors = write_sqlite(self._file_path, typed_items_from_data(data), ExportMonitor(progress.append))
+        self.assertEqual(errors, [])
+        self.assertEqual(progress[-1], 1.0)
+        self.assertEqual(progress, sorted(progress))
+        with DatabaseMapping("sqlite:///" + self._file_path) as db_map:
+            exported = export_data(db_map, parse_value=load_db_value)
+        self.assertEqual(
+            exported["entity_classes"], [("Gadget", (), None, None, False), ("Widget", (), None, None, False)]
+        )
+        self.assertEqual(exported["entities"], [("Gadget", "phone", "Smart."), ("Widget", "clock", None)])
+        self.assertEqual(
+            exported["parameter_values"],
+            [("Widget", "clock", "size", 5.0, "Base"), ("Widget", "clock", "size", 7.0, "extra")],
+        )
+        self.assertEqual(exported["scenario_alternatives"], [("scenario", "extra", None)])
+
+    def test_cancel_raises(self):
+        monitor = ExportMonitor()
+        monitor.cancel()
+        with self.assertRaises(ExportCancelled):
+            write_sqlite(self._file_path, typed_items_from_data(_make_data()), monitor)
+
+
+class TestWriteExcel(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._file_path = str(Path(self._temp_dir.name, "export.xlsx"))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_output_reads_same_as_spinedb_api_export(self):
+        errors = write_excel(self._file_path, typed_items_from_data(_make_data()), ExportMonitor())
+        self.assertEqual(errors, [])
+        mapped_data, errors = get_mapped_data_from_xlsx(self._file_path)
+        self.assertEqual(errors, [])
+        reference_path = str(Path(self._temp_dir.name, "reference.xlsx"))
+        with DatabaseMapping("sqlite://", create=True) as db_map:
+            import_data(db_map, **_make_data(), unparse_value=dump_db_value)
+            db_map.commit_session("Add test data.")
+            export_spine_database_to_xlsx(db_map, reference_path)
+        expected, _ = get_mapped_data_from_xlsx(reference_path)
+        self.assertEqual(mapped_data, expected)
+        self.assertEqual(mapped_data["entities"], [("Gadget", "phone"), ("Widget", "clock")])
+
+    def test_cancel_raises(self):
+        monitor = ExportMonitor()
+        monitor.cancel()
+        with self.assertRaises(ExportCancelled):
+            write_excel(self._file_path, typed_items_from_data(_make_data()), monitor)
+
+    def test_errors_are_returned_and_nothing_is_written(self):
+        data = {"entities": [("NonexistentClass", "clock", None)]}
+        errors = write_excel(self._file_path, typed_items_from_data(data), ExportMonitor())
+        self.assertTrue(errors)
+        self.assertFalse(Path(self._file_path).exists())
+
+
+class TestSpineDBAPIPrivateInterface(unittest.TestCase):
+    """Guards the private spinedb_api Excel mapping factories that ``write_excel()`` uses."""
+
+    def test_excel_mapping_factory_signatures_are_unchanged(self):
+        expected_signatures = {
+            "_make_alternative_mapping": "()",
+            "_make_scenario_mapping": "()",
+            "_make_scenario_alternative_mapping": "()",
+            "_make_object_group_mappings": "(db_map)",
+            "_make_parameter_value_mappings": "(db_map)",
+        }
+        for name, expected in expected_signatures.items():
+            with self.subTest(function=name):
+                function = getattr(excel, name, None)
+                self.assertIsNotNone(function, f"spinedb_api's excel exporter no longer has {name}")
+                self.assertEqual(
+                    str(inspect.signature(function)),
+                    expected,
+                    f"signature of spinedb_api's excel exporter {name} has changed; update write_excel()",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``spine_db_field_index`` module."""
+import unittest
+from spinedb_api import DatabaseMapping
+from spinetoolbox.spine_db_field_index import FieldIndex, FieldIndexes
+
+
+class TestFieldIndex(unittest.TestCase):
+    def setUp(self):
+        self._db_map = DatabaseMapping("sqlite://", create=True)
+        self._db_map.add_item("parameter_value_list", name="list_1")
+        self._db_map.add_item("parameter_value_list", name="list_2")
+
+    def tearDown(self):
+        self._db_map.close()
+
+    def _add_list_value(self, list_name, index, value):
+        item, error = self._db_map.add_item(
+            "list_value", parameter_value_list_name=list_name, index=index, value=value, type=None
+        )
+        self.assertIsNone(error)
+        return item
+
+    def _names(self, items):
+        return [item["value"] for item in items]
+
+    def test_find_returns_matching_items_in_mapping_order(self):
+        self._add_list_value("list_1", 0, b"a")
+        self._add_list_value("list_2", 0, b"b")
+        self._add_list_value("list_1", 1, b"c")
+        index = FieldIndex(self._db_map, "list_value", "parameter_value_list_name")
+        self.assertEqual(self._names(index.find("list_1")), [b"a", b"c"])
+        self.assertEqual(self._names(index.find("list_2")), [b"b"])
+        self.assertEqual(index.find("list_3"), [])
+
+    def test_items_added_to_mapping_after_first_lookup_are_found(self):
+        index = FieldIndex(self._db_map, "list_value", "parameter_value_list_name")
+        self.assertEqual(index.find("list_1"), [])
+        self._add_list_value("list_1", 0, b"a")
+        self.assertEqual(self._names(index.find("list_1")), [b"a"])
+
+    def test_removed_items_are_skipped(self):
+        item = self._add_list_value("list_1", 0, b"a")
+        index = FieldIndex(self._db_map, "list_value", "parameter_value_list_name")
+        self.assertEqual(len(index.find("list_1")), 1)
+        self._db_map.remove_item("list_value", item["id"])
+        self.assertEqual(index.find("list_1"), [])
+        self._db_map.restore_item("list_value", item["id"])
+        self.assertEqual(len(index.find("list_1")), 1)
+
+    def test_update_items_moves_item_to_new_value_keeping_mapping_order(self):
+        first = self._add_list_value("list_1", 0, b"a")
+        self._add_list_value("list_2", 0, b"b")
+        index = FieldIndex(self._db_map, "list_value", "value")
+        self.assertEqual(len(index.find(b"a")), 1)
+        self._db_map.update_item("list_value", id=first["id"], value=b"b")
+        index.update_items([first])
+        self.assertEqual(index.find(b"a"), [])
+        self.assertEqual([item["parameter_value_list_name"] for item in index.find(b"b")], ["list_1", "list_2"])
+
+
+class TestFieldIndexes(unittest.TestCase):
+    def setUp(self):
+        self._db_map = DatabaseMapping("sqlite://", create=True)
+        self._indexes = FieldIndexes()
+
+    def tearDown(self):
+        self._db_map.close()
+
+    def test_indexes_of_other_item_types_are_rebuilt_after_changes(self):
+        self._db_map.add_item("entity_class", name="Widget")
+        self._db_map.add_item("entity", entity_class_name="Widget", name="gadget")
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity", "entity_class_name", "Widget")), 1)
+        entity_class = self._db_map.get_item("entity_class", name="Widget")
+        self._db_map.update_item("entity_class", id=entity_class["id"], name="Gizmo")
+        self._indexes.handle_items_changed("entity_class", {self._db_map: [entity_class]})
+        self.assertEqual(self._indexes.find(self._db_map, "entity", "entity_class_name", "Widget"), [])
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity", "entity_class_name", "Gizmo")), 1)
+
+    def test_indexes_of_unrelated_item_types_survive_changes(self):
+        self._db_map.add_item("entity_class", name="Widget")
+        self._db_map.add_item("alternative", name="alt")
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity_class", "name", "Widget")), 1)
+        self.assertEqual(len(self._indexes.find(self._db_map, "alternative", "name", "alt")), 1)
+        indexes = dict(self._indexes._indexes[self._db_map])
+        alternative = self._db_map.get_item("alternative", name="alt")
+        self._db_map.update_item("alternative", id=alternative["id"], name="renamed")
+        self._indexes.handle_items_changed("alternative", {self._db_map: [alternative]})
+        self.assertEqual(self._indexes._indexes[self._db_map], indexes)
+        self.assertEqual(len(self._indexes.find(self._db_map, "alternative", "name", "renamed")), 1)
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity_class", "name", "Widget")), 1)
+
+    def test_indexes_of_indirectly_referring_item_types_are_dropped(self):
+        self._db_map.add_item("entity_class", name="Widget")
+        self._db_map.add_item("entity", entity_class_name="Widget", name="gadget")
+        self._db_map.add_item("metadata", name="source", value="test")
+        self._db_map.add_item(
+            "entity_metadata",
+            entity_class_name="Widget",
+            entity_byname=("gadget",),
+            metadata_name="source",
+            metadata_value="test",
+        )
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity_metadata", "entity_class_name", "Widget")), 1)
+        entity_class = self._db_map.get_item("entity_class", name="Widget")
+        self._db_map.update_item("entity_class", id=entity_class["id"], name="Gizmo")
+        self._indexes.handle_items_changed("entity_class", {self._db_map: [entity_class]})
+        self.assertEqual(self._indexes.find(self._db_map, "entity_metadata", "entity_class_name", "Widget"), [])
+        self.assertEqual(len(self._indexes.find(self._db_map, "entity_metadata", "entity_class_name", "Gizmo")), 1)
+
+    def test_invalidate(self):
+        self._db_map.add_item("alternative", name="alt")
+        self.assertEqual(len(self._indexes.find(self._db_map, "alternative", "name", "alt")), 1)
+        alternative = self._db_map.get_item("alternative", name="alt")
+        self._db_map.update_item("alternative", id=alternative["id"], name="renamed")
+        self._indexes.invalidate(self._db_map)
+        self.assertEqual(len(self._indexes.find(self._db_map, "alternative", "name", "renamed")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``spine_db_query_scheduler`` module."""
+import unittest
+from spinetoolbox.qthread_pool_executor import SynchronousExecutor
+from spinetoolbox.spine_db_query_scheduler import QueryScheduler
+
+
+class _ManualExecutor:
+    """Executor that runs submitted functions only when asked to."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.pending.append((fn, args, kwargs))
+
+    def run_next(self):
+        fn, args, kwargs = self.pending.pop(0)
+        fn(*args, **kwargs)
+
+
+class TestQueryScheduler(unittest.TestCase):
+    def test_synchronous_executor_runs_query_immediately(self):
+        scheduler = QueryScheduler(SynchronousExecutor(), 1)
+        results = []
+        future = scheduler.submit(0, "alternative", lambda x: 2 * x, 21)
+        future.add_done_callback(lambda f: results.append(f.result()))
+        self.assertEqual(results, [42])
+
+    def test_exception_is_set_to_future(self):
+        def fail():
+            raise RuntimeError("query failed")
+
+        scheduler = QueryScheduler(SynchronousExecutor(), 1)
+        future = scheduler.submit(0, None, fail)
+        self.assertIsInstance(future.exception(), RuntimeError)
+
+    def test_concurrency_is_limited(self):
+        executor = _ManualExecutor()
+        scheduler = QueryScheduler(executor, 2)
+        for key in ("a", "b", "c"):
+            scheduler.submit(0, key, lambda: None)
+        self.assertEqual(len(executor.pending), 2)
+        self.assertTrue(scheduler.is_waiting("c"))
+        executor.run_next()
+        self.assertEqual(len(executor.pending), 2)
+        self.assertFalse(scheduler.is_waiting("c"))
+
+    def test_queries_run_in_priority_order(self):
+        executor = _ManualExecutor()
+        scheduler = QueryScheduler(executor, 1)
+        order = []
+        scheduler.submit(0, "first", order.append, "first")
+        scheduler.submit(3, "low", order.append, "low")
+        scheduler.submit(1, "high", order.append, "high")
+        scheduler.submit(1, "high_too", order.append, "high_too")
+        while executor.pending:
+            executor.run_next()
+        self.assertEqual(order, ["first", "high", "high_too", "low"])
+
+    def test_raise_priority(self):
+        executor = _ManualExecutor()
+        scheduler = QueryScheduler(executor, 1)
+        order = []
+        scheduler.submit(0, "first", order.append, "first")
+        scheduler.submit(2, "a", order.append, "a")
+        scheduler.submit(3, "b", order.append, "b")
+        scheduler.raise_priority("b", 1)
+        scheduler.raise_priority("a", 3)
+        while executor.pending:
+            executor.run_next()
+        self.assertEqual(order, ["first", "b", "a"])
+
+    def test_hold_postpones_queries(self):
+        executor = _ManualExecutor()
+        scheduler = QueryScheduler(executor, 4)
+        with scheduler.hold():
+            future = scheduler.submit(0, "alternative", lambda: 23)
+            self.assertEqual(executor.pending, [])
+            self.assertTrue(scheduler.is_waiting("alternative"))
+        self.assertEqual(len(executor.pending), 1)
+        executor.run_next()
+        self.assertEqual(future.result(), 23)
+
+    def test_set_max_concurrent_dispatches_waiting_queries(self):
+        executor = _ManualExecutor()
+        scheduler = QueryScheduler(executor, 1)
+        scheduler.submit(0, "a", lambda: None)
+        scheduler.submit(0, "b", lambda: None)
+        self.assertEqual(len(executor.pending), 1)
+        scheduler.set_max_concurrent(2)
+        self.assertEqual(scheduler.max_concurrent, 2)
+        self.assertEqual(len(executor.pending), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
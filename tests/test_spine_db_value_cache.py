@@ -0,0 +1,83 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``spine_db_value_cache`` module."""
+import unittest
+import numpy as np
+from spinedb_api import TimeSeriesFixedResolution
+from spinetoolbox.spine_db_value_cache import estimate_size, MISSING, ValueCache
+
+
+class TestEstimateSize(unittest.TestCase):
+    def test_time_series_size_includes_arrays(self):
+        values = np.arange(1000.0)
+        time_series = TimeSeriesFixedResolution("2023-01-01T00:00", "1h", values, False, False)
+        self.assertGreater(estimate_size(time_series), 2 * values.nbytes)
+
+
+class TestValueCache(unittest.TestCase):
+    def test_get_returns_cached_value_for_same_version(self):
+        cache = ValueCache(1000)
+        version = b"1.0"
+        cache.put(("db", "parameter_value", 1), "parsed", version, 1.0, size=10)
+        self.assertEqual(cache.get(("db", "parameter_value", 1), "parsed", version), 1.0)
+        self.assertIs(cache.get(("db", "parameter_value", 1), "display", version), MISSING)
+        self.assertIs(cache.get(("db", "parameter_value", 1), "parsed", b"2.0"), MISSING)
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        cache = ValueCache(30)
+        for id_ in range(3):
+            cache.put(("db", "parameter_value", id_), "parsed", None, id_, size=10)
+        cache.get(("db", "parameter_value", 0), "parsed", None)
+        cache.put(("db", "parameter_value", 3), "parsed", None, 3, size=10)
+        self.assertIs(cache.get(("db", "parameter_value", 1), "parsed", None), MISSING)
+        self.assertEqual(cache.get(("db", "parameter_value", 0), "parsed", None), 0)
+        self.assertEqual(cache.total_bytes, 30)
+
+    def test_values_larger_than_budget_are_not_cached(self):
+        cache = ValueCache(10)
+        cache.put(("db", "parameter_value", 1), "parsed", None, "x", size=11)
+        self.assertEqual(len(cache), 0)
+        cache = ValueCache(0)
+        cache.put(("db", "parameter_value", 1), "parsed", None, "x", size=0)
+        self.assertEqual(len(cache), 0)
+
+    def test_set_max_bytes_evicts(self):
+        cache = ValueCache(100)
+        for id_ in range(5):
+            cache.put(("db", "parameter_value", id_), "parsed", None, id_, size=10)
+        cache.set_max_bytes(20)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, 20)
+
+    def test_invalidate_items_drops_all_entries_of_item(self):
+        cache = ValueCache(100)
+        for subkey in ("parsed", "display"):
+            cache.put(("db", "parameter_value", 1), subkey, None, subkey, size=10)
+        cache.put(("db", "parameter_value", 2), "parsed", None, "other", size=10)
+        cache.invalidate_items("parameter_value", {"db": [{"id": 1}]})
+        self.assertIs(cache.get(("db", "parameter_value", 1), "display", None), MISSING)
+        self.assertEqual(cache.get(("db", "parameter_value", 2), "parsed", None), "other")
+        self.assertEqual(cache.total_bytes, 10)
+
+    def test_invalidate_db_map(self):
+        cache = ValueCache(100)
+        cache.put(("db1", "list_value", 1), "parsed", None, 1, size=10)
+        cache.put(("db2", "list_value", 1), "parsed", None, 2, size=10)
+        cache.invalidate_db_map("db1")
+        self.assertIs(cache.get(("db1", "list_value", 1), "parsed", None), MISSING)
+        self.assertEqual(cache.get(("db2", "list_value", 1), "parsed", None), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for ``spine_db_worker`` module."""
+import inspect
+import os.path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+from PySide6.QtWidgets import QApplication
+from spinedb_api import DatabaseMapping
+from spinedb_api.import_functions import import_data
+from spinetoolbox.fetch_parent import ItemTypeFetchParent
+from spinetoolbox.qthread_pool_executor import CancelledError
+from spinetoolbox.spine_db_worker import ChunkSizer, CommitProgress, FetchSettings, _KeysetDatabaseMapping
+from tests.mock_helpers import TestSpineDBManager
+
+
+class TestChunkSizer(unittest.TestCase):
+    def test_first_chunk_uses_initial_size(self):
+        sizer = ChunkSizer(FetchSettings(initial_chunk_size=123))
+        self.assertEqual(sizer.size, 123)
+
+    def test_size_follows_measured_throughput(self):
+        settings = FetchSettings(target_time=0.5, min_chunk_size=10, max_chunk_size=100000, initial_chunk_size=1000)
+        sizer = ChunkSizer(settings)
+        sizer.update(1000, 0.25, 0.0)
+        self.assertEqual(sizer.size, 2000)
+
+    def test_growth_is_limited(self):
+        settings = FetchSettings(target_time=10.0, min_chunk_size=10, max_chunk_size=1000000, initial_chunk_size=100)
+        sizer = ChunkSizer(settings)
+        sizer.update(100, 0.001, 0.0)
+        self.assertEqual(sizer.size, 400)
+
+    def test_size_is_clamped_to_settings(self):
+        settings = FetchSettings(target_time=0.1, min_chunk_size=500, max_chunk_size=800, initial_chunk_size=600)
+        sizer = ChunkSizer(settings)
+        sizer.update(600, 60.0, 0.0)
+        self.assertEqual(sizer.size, 500)
+        sizer.update(600, 0.001, 0.0)
+        self.assertEqual(sizer.size, 800)
+
+    def test_wide_rows_shrink_chunks(self):
+        settings = FetchSettings(target_time=1.0, min_chunk_size=1, max_chunk_size=10**9, initial_chunk_size=10**6)
+        sizer = ChunkSizer(settings)
+        sizer.update(10**6, 0.01, 64 * 1024 * 1024 / 1000)
+        self.assertEqual(sizer.size, 1000)
+
+
+class TestCommitProgress(unittest.TestCase):
+    def test_reports_written_items_per_table(self):
+        reports = []
+        progress = CommitProgress(lambda written, total: reports.append((written, total)))
+        progress.begin_writing([("entity_class", ([1, 2], [3], [])), ("entity", ([4], [], [5, 6]))])
+        progress.table_written("entity_class")
+        progress.table_written("entity")
+        self.assertEqual(reports, [(0, 6), (3, 6), (6, 6)])
+
+    def test_cancel_before_writing_aborts_commit(self):
+        progress = CommitProgress()
+        self.assertTrue(progress.request_cancel())
+        with self.assertRaises(CancelledError):
+            progress.begin_writing([("entity_class", ([1], [], []))])
+
+    def test_cannot_cancel_after_writing_has_begun(self):
+        progress = CommitProgress()
+        progress.begin_writing([("entity_class", ([1], [], []))])
+        self.assertFalse(progress.request_cancel())
+
+
+class TestSpineDBAPIPrivateInterface(unittest.TestCase):
+    """Guards the private spinedb_api methods that ``_KeysetDatabaseMapping`` overrides or calls."""
+
+    def test_overridden_and_called_signatures_are_unchanged(self):
+        expected_signatures = {
+            "_get_next_chunk": "(self, item_type, offset, limit, **kwargs)",
+            "_make_query": "(self, item_type, **kwargs)",
+            "_make_sq": "(self, item_type)",
+            "_dirty_items": "(self)",
+            "_do_add_items": "(self, connection, tablename, *items_to_add)",
+        }
+        for name, expected in expected_signatures.items():
+            with self.subTest(method=name):
+                method = getattr(DatabaseMapping, name, None)
+                self.assertIsNotNone(method, f"spinedb_api's DatabaseMapping.{name} no longer exists")
+                self.assertEqual(
+                    str(inspect.signature(method)),
+                    expected,
+                    f"signature of spinedb_api's DatabaseMapping.{name} has changed; update _KeysetDatabaseMapping",
+                )
+
+    def test_keyset_paging_and_commit_progress_work_with_installed_spinedb_api(self):
+        reports = []
+        with _KeysetDatabaseMapping("sqlite://", create=True) as db_map:
+            for name in ("a", "b", "c"):
+                db_map.add_item("alternative", name=name)
+            progress = CommitProgress(lambda written, total: reports.append((written, total)))
+            db_map.commit_session_with_progress("Add test data.", progress)
+            ids = [x["id"] for x in db_map.query(db_map.alternative_sq).order_by(db_map.alternative_sq.c.id)]
+            chunk = db_map._get_next_chunk("alternative", 0, 2, after_id=ids[1])
+        self.assertEqual([x["id"] for x in chunk], ids[2:])
+        self.assertEqual(reports[-1], (3, 3))
+
+
+class _CollectingFetchParent(ItemTypeFetchParent):
+    def __init__(self, item_type, chunk_size=None):
+        super().__init__(item_type, chunk_size=chunk_size)
+        self.handle_items_added = MagicMock()
+
+    def added_names(self):
+        names = []
+        for call in self.handle_items_added.call_args_list:
+            for items in call.args[0].values():
+                names += [item["name"] for item in items]
+        return names
+
+
+class TestSpineDBWorkerFetching(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._url = "sqlite:///" + os.path.join(self._temp_dir.name, "db.sqlite")
+        self._db_mngr = TestSpineDBManager(MagicMock(), None)
+        self._db_map = None
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+        self._temp_dir.cleanup()
+
+    def _open_database_with_alternatives(self, names, fetch_settings):
+        with DatabaseMapping(self._url, create=True) as db_map:
+            import_data(db_map, alternatives=names)
+            db_map.commit_session("Add alternatives.")
+        with mock.patch("spinetoolbox.spine_db_manager.FetchSettings.from_qsettings", new=lambda _: fetch_settings):
+            self._db_map = self._db_mngr.get_db_map(self._url, MagicMock(), codename="worker_test_db")
+
+    def test_fetch_in_small_chunks_gets_everything(self):
+        names = [f"alt_{i}" for i in range(11)]
+        settings = FetchSettings(min_chunk_size=3, max_chunk_size=3, prefetch=False, initial_chunk_size=3)
+        self._open_database_with_alternatives(names, settings)
+        parent = _CollectingFetchParent("alternative")
+        while self._db_mngr.can_fetch_more(self._db_map, parent):
+            self._db_mngr.fetch_more(self._db_map, parent)
+            QApplication.processEvents()
+        self.assertEqual(parent.added_names(), ["Base"] + names)
+        parent.set_obsolete(True)
+
+    def test_prefetch_queries_next_chunk_ahead(self):
+        names = [f"alt_{i}" for i in range(5)]
+        settings = FetchSettings(min_chunk_size=2, max_chunk_size=2, prefetch=True, initial_chunk_size=2)
+        self._open_database_with_alternatives(names, settings)
+        parent = _CollectingFetchParent("alternative", chunk_size=2)
+        self._db_mngr.can_fetch_more(self._db_map, parent)
+        self._db_mngr.fetch_more(self._db_map, parent)
+        QApplication.processEvents()
+        self.assertEqual(parent.added_names(), ["Base", "alt_0"])
+        fetched = [item["name"] for item in self._db_map.get_items("alternative", fetch=False)]
+        self.assertEqual(fetched, ["Base", "alt_0", "alt_1", "alt_2"])
+        parent.set_obsolete(True)
+
+    def test_query_of_obsolete_parent_gets_cancelled(self):
+        settings = FetchSettings(min_chunk_size=2, max_chunk_size=2, prefetch=False, initial_chunk_size=2)
+        self._open_database_with_alternatives(["alt_0"], settings)
+        worker = self._db_mngr._get_worker(self._db_map)
+        parent = _CollectingFetchParent("alternative")
+        with worker.queries_on_hold():
+            self._db_mngr.fetch_more(self._db_map, parent)
+            parent.set_obsolete(True)
+        QApplication.processEvents()
+        parent.handle_items_added.assert_not_called()
+        self.assertEqual(self._db_map.get_items("alternative", fetch=False), [])
+
+    def test_failed_query_releases_parent(self):
+        settings = FetchSettings(prefetch=False)
+        self._open_database_with_alternatives(["alt_0"], settings)
+        parent = _CollectingFetchParent("alternative")
+        with mock.patch.object(self._db_map, "fetch_more", side_effect=RuntimeError("query failed")):
+            with mock.patch.object(self._db_mngr, "error_msg") as error_msg:
+                self._db_mngr.fetch_more(self._db_map, parent)
+                QApplication.processEvents()
+        error_msg.emit.assert_called_once()
+        self.assertFalse(parent.is_busy)
+        parent.set_obsolete(True)
+
+
+if __name__ == "__main__":
+    unittest.main()
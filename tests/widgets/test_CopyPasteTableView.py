@@ -11,7 +11,9 @@
 ######################################################################################################################
 
 """Unit tests for CopyPasteTableView class."""
-import locale
+from locale import localeconv as _localeconv, setlocale as _setlocale
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 from PySide6.QtCore import QAbstractTableModel, QItemSelection, QModelIndex, QItemSelectionModel, Qt
@@ -66,17 +68,20 @@ class _MockModel(QAbstractTableModel):
             self._data.append(empty)
         self.endInsertRows()
 
+    def removeRows(self, row, count, parent=QModelIndex()):
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._data[row : row + count]
+        self.endRemoveRows()
+        return True
+
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
 
 
-def delocalize_comma_decimal_separator(x):
-    return x.replace(",", ".")
-
-
-def str_with_comma_decimal_separator(x):
-    string = str(x)
-    return string.replace(".", ",")
+def localeconv_with_comma_decimal_separator():
+    conventions = dict(_localeconv())
+    conventions.update(decimal_point=",", thousands_sep="")
+    return conventions
 
 
 class TestCopyPasteTableView(unittest.TestCase):
@@ -85,7 +90,7 @@ class TestCopyPasteTableView(unittest.TestCase):
         if not QApplication.instance():
             QApplication()
 
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.str", str_with_comma_decimal_separator)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
     def test_copy_single_number(self):
         view = CopyPasteTableView()
         model = _MockModel()
@@ -97,7 +102,7 @@ class TestCopyPasteTableView(unittest.TestCase):
         copied = clipboard.text()
         self.assertEqual(copied, "1,1\r\n")
 
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.str", str_with_comma_decimal_separator)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
     def test_copy_row_with_hidden_column(self):
         view = CopyPasteTableView()
         model = _MockModel()
@@ -110,36 +115,30 @@ class TestCopyPasteTableView(unittest.TestCase):
         copied = clipboard.text()
         self.assertEqual(copied, "a\t1,1\r\n")
 
-    @patch("locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.delocalize", delocalize_comma_decimal_separator)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
     def test_paste_single_localized_number(self):
         view = CopyPasteTableView()
         model = _MockModel()
         view.setModel(model)
         view.setCurrentIndex(model.index(0, 2))
-        QApplication.clipboard().setText(locale.str(-1.1))
+        QApplication.clipboard().setText("-1,1")
         self.assertTrue(view.paste())
         self.assertEqual(model.index(0, 2).data(), "-1.1")
 
-    @patch("locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.delocalize", delocalize_comma_decimal_separator)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
     def test_paste_single_localized_row(self):
         view = CopyPasteTableView()
         model = _MockModel()
         view.setModel(model)
         selection_model = view.selectionModel()
         selection_model.select(model.index(0, 0), QItemSelectionModel.Rows | QItemSelectionModel.Select)
-        QApplication.clipboard().setText("A\tB\t{}".format(locale.str(-1.1)))
+        QApplication.clipboard().setText("A\tB\t{}".format("-1,1"))
         self.assertTrue(view.paste())
         self.assertEqual(model.index(0, 0).data(), "A")
         self.assertEqual(model.index(0, 1).data(), "B")
         self.assertEqual(model.index(0, 2).data(), "-1.1")
 
-    @patch("locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.str", str_with_comma_decimal_separator)
-    @patch("spinetoolbox.widgets.custom_qtableview.locale.delocalize", delocalize_comma_decimal_separator)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
     def test_paste_single_comma_separated_string(self):
         view = CopyPasteTableView()
         model = _MockModel()
@@ -181,6 +180,111 @@ class TestCopyPasteTableView(unittest.TestCase):
         data = [model.index(1, column).data() for column in range(3)]
         self.assertEqual(data, ["G", "H", 3.14])
 
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_CELL_THRESHOLD", 0)
+    @patch("spinetoolbox.widgets.custom_qtableview.locale.localeconv", localeconv_with_comma_decimal_separator)
+    def test_copy_large_selection_in_worker_thread(self):
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        view.setColumnHidden(1, True)
+        view.selectAll()
+        QApplication.clipboard().setText("")
+        self.assertTrue(view.copy())
+        _wait_for_clipboard_task(view)
+        self.assertEqual(QApplication.clipboard().text(), "a\t1,1\r\nc\t2,2\r\ne\t3,3\r\n")
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_paste_long_text_in_worker_thread(self):
+        view = CopyPasteTableView()
+        view.set_column_converter_for_pasting("Column 2", float)
+        model = _MockModel()
+        view.setModel(model)
+        selection_model = view.selectionModel()
+        selection_model.setCurrentIndex(model.index(1, 1), QItemSelectionModel.ClearAndSelect)
+        QApplication.clipboard().setText("G\t3.14\nH\t2.3")
+        self.assertTrue(view.paste())
+        _wait_for_clipboard_task(view)
+        self.assertEqual(model._data, [["a", "b", "1.1"], ["c", "G", 3.14], ["e", "H", 2.3]])
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_paste_on_selection_in_worker_thread_repeats_data(self):
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        selection = QItemSelection(model.index(0, 0), model.index(2, 1))
+        view.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        QApplication.clipboard().setText("X")
+        self.assertTrue(view.paste())
+        _wait_for_clipboard_task(view)
+        self.assertEqual(model._data, [["X", "X", "1.1"], ["X", "X", "2.2"], ["X", "X", "3.3"]])
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_paste_on_selection_in_worker_thread_follows_removed_rows(self):
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        selection = QItemSelection(model.index(1, 0), model.index(2, 0))
+        view.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        QApplication.clipboard().setText("X\nY")
+        self.assertTrue(view.paste())
+        model.removeRows(0, 1)
+        _wait_for_clipboard_task(view)
+        self.assertEqual(model._data, [["X", "d", "2.2"], ["Y", "f", "3.3"]])
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_paste_normal_in_worker_thread_follows_removed_rows(self):
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        view.selectionModel().setCurrentIndex(model.index(2, 1), QItemSelectionModel.ClearAndSelect)
+        QApplication.clipboard().setText("G")
+        self.assertTrue(view.paste())
+        model.removeRows(0, 1)
+        _wait_for_clipboard_task(view)
+        self.assertEqual(model._data, [["c", "d", "2.2"], ["e", "G", "3.3"]])
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_paste_normal_in_worker_thread_is_dropped_when_target_is_removed(self):
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        view.selectionModel().setCurrentIndex(model.index(2, 1), QItemSelectionModel.ClearAndSelect)
+        QApplication.clipboard().setText("G")
+        self.assertTrue(view.paste())
+        model.removeRows(2, 1)
+        _wait_for_clipboard_task(view)
+        self.assertEqual(model._data, [["a", "b", "1.1"], ["c", "d", "2.2"]])
+
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_CELL_THRESHOLD", 0)
+    @patch("spinetoolbox.widgets.custom_qtableview._BULK_TEXT_THRESHOLD", 0)
+    def test_worker_threads_do_not_change_locale(self):
+        calling_threads = set()
+
+        def setlocale(*args):
+            calling_threads.add(threading.current_thread())
+            return _setlocale(*args)
+
+        view = CopyPasteTableView()
+        model = _MockModel()
+        view.setModel(model)
+        view.selectAll()
+        with patch("spinetoolbox.widgets.custom_qtableview.locale.setlocale", setlocale):
+            self.assertTrue(view.copy())
+            _wait_for_clipboard_task(view)
+            view.selectionModel().setCurrentIndex(model.index(0, 0), QItemSelectionModel.ClearAndSelect)
+            self.assertTrue(view.paste())
+            _wait_for_clipboard_task(view)
+        self.assertEqual(calling_threads, {threading.main_thread()})
+        self.assertEqual(model._data, [["a", "b", "1.1"], ["c", "d", "2.2"], ["e", "f", "3.3"]])
+
+
+def _wait_for_clipboard_task(view):
+    deadline = time.monotonic() + 5.0
+    while view.clipboard_task_running() and time.monotonic() < deadline:
+        QApplication.processEvents()
+    if view.clipboard_task_running():
+        raise RuntimeError("timeout while waiting for clipboard task")
+
 
 if __name__ == "__main__":
     unittest.main()
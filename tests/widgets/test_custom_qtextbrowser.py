@@ -14,6 +14,7 @@
 import logging
 import unittest
 import sys
+from unittest.mock import MagicMock
 from PySide6.QtWidgets import QApplication
 from spinetoolbox.widgets.custom_qtextbrowser import CustomQTextBrowser
 
@@ -63,6 +64,20 @@ class TestCustomQTextBrowser(unittest.TestCase):
             self.assertEqual(text_block.text(), t)
             text_block = text_block.next()
 
+    def test_add_log_messages_adds_all_messages_under_item_title(self):
+        browser = CustomQTextBrowser(None)
+        toolbox = MagicMock()
+        toolbox.active_project_item = None
+        toolbox.active_link_item = None
+        browser.set_toolbox(toolbox)
+        browser.make_log_entry_point("2023-01-01T00:00:00")
+        browser.add_log_messages("my item", "", ["first", "second", "third"])
+        text = browser.toPlainText()
+        self.assertIn("my item", text)
+        self.assertLess(text.index("my item"), text.index("first"))
+        self.assertLess(text.index("first"), text.index("second"))
+        self.assertLess(text.index("second"), text.index("third"))
+
 
 if __name__ == "__main__":
     unittest.main()
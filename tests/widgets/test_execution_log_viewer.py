@@ -0,0 +1,66 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``execution_log_viewer`` module."""
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.execution_log_store import ExecutionLogStore
+from spinetoolbox.widgets.execution_log_viewer import ExecutionLogViewer
+
+
+class TestExecutionLogViewer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._store = ExecutionLogStore(os.path.join(self._temp_dir.name, "log.sqlite"))
+        self._store.append(
+            [("run 1", 1.0, "Importer", "", "msg", "hello"), ("run 2", 2.0, "Tool", "f", "stderr", "bad")]
+        )
+        self._viewer = ExecutionLogViewer(self._store)
+
+    def tearDown(self):
+        self._viewer.deleteLater()
+        self._store.close()
+        self._temp_dir.cleanup()
+
+    def test_selecting_run_filters_records_and_items(self):
+        self.assertEqual(self._viewer.model().rowCount(), 2)
+        self._viewer._run_combo_box.setCurrentIndex(2)
+        self.assertEqual(self._viewer.model().rowCount(), 1)
+        self.assertEqual(self._viewer._item_combo_box.count(), 2)
+        self.assertEqual(self._viewer._item_combo_box.itemText(1), "Tool")
+
+    def test_refresh_shows_new_runs_and_records(self):
+        self._store.append([("run 3", 3.0, "Tool", "", "msg", "again")])
+        self._viewer.refresh()
+        self.assertEqual(self._viewer._run_combo_box.count(), 4)
+        self.assertEqual(self._viewer.model().rowCount(), 3)
+
+    def test_reload_drops_pruned_runs(self):
+        self._viewer._run_combo_box.setCurrentIndex(1)
+        self._store.prune(1)
+        self._viewer.reload()
+        self.assertEqual(self._viewer._run_combo_box.count(), 2)
+        self.assertEqual(self._viewer._run_combo_box.currentIndex(), 0)
+        self.assertEqual(self._viewer.model().rowCount(), 1)
+        self.assertEqual(self._viewer.model().index(0, 4).data(), "bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+
+"""Unit tests for ``persistent_console_widget`` module."""
+import unittest
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.widgets.persistent_console_widget import PersistentConsoleWidget
+
+
+class TestPersistentConsoleWidget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._console = PersistentConsoleWidget(None, ("tool",), "python")
+
+    def tearDown(self):
+        self._console.close()
+        self._console.deleteLater()
+
+    def _flush(self):
+        while self._console._flush_in_progress:
+            self._console._flush_timer.stop()
+            self._console._flush_text_buffer()
+
+    def test_output_is_inserted_before_prompt(self):
+        self._console.add_stdout("first")
+        self._console.add_stderr("second")
+        self._console.add_stdin("x = 1")
+        self._console.add_stdout("third")
+        self._flush()
+        self.assertEqual(
+            self._console.toPlainText().splitlines()[-5:], ["first", "second", ">>> x = 1", "third", ">>> "]
+        )
+
+    def test_overflow_is_collapsed_into_link(self):
+        capacity = self._console._BUFFER_CAPACITY
+        for i in range(capacity + 3):
+            self._console.add_stdout(f"line {i}")
+        self._flush()
+        lines = self._console.toPlainText().splitlines()
+        self.assertEqual(lines[-2:], [f"line {capacity + 2}", ">>> "])
+        self.assertIn("<--- 3 more lines --->", lines)
+        self.assertEqual(lines[lines.index("<--- 3 more lines --->") + 1], "line 3")
+        self.assertEqual(len(self._console._skipped), 1)
+        spilled, _ = next(iter(self._console._skipped.values()))
+        self.assertEqual(spilled.count, 3)
+        self.assertEqual(
+            self._console._output_buffer.read_spilled(spilled, 10),
+            [("line 0", False), ("line 1", False), ("line 2", False)],
+        )
+
+    def test_trimmed_overflow_link_is_forgotten(self):
+        capacity = self._console._BUFFER_CAPACITY
+        for i in range(capacity + 3):
+            self._console.add_stdout(f"line {i}")
+        self._flush()
+        self.assertEqual(len(self._console._skipped), 1)
+        for _ in range(self._console._MAX_LINES_COUNT // capacity + 1):
+            for i in range(capacity):
+                self._console.add_stdout(f"more {i}")
+            self._flush()
+        self.assertNotIn("<--- 3 more lines --->", self._console.toPlainText().splitlines())
+        self.assertEqual(self._console._skipped, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -78,6 +78,7 @@ class TestSettingsWidget(unittest.TestCase):
             self.assertEqual(self._settings.value("maxProcesses"), str(os.cpu_count()))
             self.assertEqual(self._settings.value("persistentLimiter"), "unlimited")
             self.assertEqual(self._settings.value("maxPersistentProcesses"), str(os.cpu_count()))
+            self.assertEqual(self._settings.value("maxConcurrentDags"), "0")
         finally:
             self._settings.endGroup()
 